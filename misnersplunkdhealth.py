@@ -0,0 +1,417 @@
+#!/usr/bin/env python
+"""
+misnersplunkdhealth.py - Misner Splunk Tool Health Checks
+Copyright (C) 2015-2018 Joe Misner <joe@misner.net>
+http://tools.misner.net/
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program; if not, write to the Free Software Foundation,
+Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301  USA
+
+Dependencies:
+- Python 64-bit v2.7.15, https://www.python.org/
+- Python module 'numpy' v1.16.6, https://pypi.python.org/pypi/numpy
+- Python module 'misnersplunkdrecords.py'
+
+Health checks are data: each is a report entry with the roles it applies to and its conditions, each condition
+comparing one metric against a warning and a caution threshold. Metrics are numbers measured from a polled instance,
+a Splunkd, OfflineSplunkd or PollSnapshot alike, by the extractors in METRICS, or for any other metric name, the
+instance attribute of that name. Custom checks from [healthcheck::<name>] stanzas are added to the built-in
+HEALTH_CHECKS, or replace the built-in check of the same category and name.
+
+HealthChecks compiles the checks once against the [healthchecks] thresholds: conditions with neither threshold set
+are dropped, and every remaining condition becomes a column of a thresholds table, grouped by comparator. Evaluating
+instances measures each metric into a matrix of instances by metrics, then every condition of every check is
+compared with one numpy call per comparator, and the conditions of each check are reduced to its health with
+numpy.maximum.reduceat(). A single polled instance is evaluated as a fleet of one, so the Health Report and fleet-wide
+results always agree.
+
+Changelog:
+2026.10.18 - initial version, table-driven health checks compiled from [healthchecks] and [healthcheck::] stanzas
+             fixed missing metrics breaching the !=, true and false comparators instead of being Unknown
+"""
+
+import time
+import numpy
+from misnersplunkdrecords import format_gb
+
+# Health codes of evaluated checks, worst last but for Unknown; NOT_CHECKED checks are left out of reports
+NOT_CHECKED = -1
+OK = 0
+CAUTION = 1
+WARNING = 2
+UNKNOWN = 3
+HEALTH_NAMES = ('OK', 'Caution', 'Warning', 'Unknown')
+
+
+def _number(value):
+    """Returns a metric as a number, or None if it's missing, zero, or not a number"""
+    try:
+        return float(value) or None
+    except (TypeError, ValueError):
+        return None
+
+
+def _numeric(name):
+    """Returns the extractor of a metric held as a number by the instance attribute of that name"""
+    return lambda instance: _number(getattr(instance, name, None))
+
+
+def _flag(value):
+    return None if value is None else bool(value)
+
+
+def _boolean(name):
+    """Returns the METRICS entry of a flag held by the instance attribute of that name, missing taken as false"""
+    return (lambda instance: bool(getattr(instance, name, None)),
+            lambda instance: str(bool(getattr(instance, name, None))), False)
+
+
+def _text(value):
+    return '?' if value is None else str(value)
+
+
+def _minor_version(instance):
+    """'7.1.2' -> 7.1, or None if the version is unknown"""
+    try:
+        major, minor = instance.version.split('.')[:2]
+        return float('%s.%s' % (major, minor))
+    except (AttributeError, ValueError):
+        return None
+
+
+def _uptime(instance, now):
+    return now - instance.startup_time if getattr(instance, 'startup_time', None) else None
+
+
+def _messages(instance):
+    """Number of messages that aren't informational"""
+    messages = getattr(instance, 'messages', None)
+    if messages is None:
+        return None
+    return sum(1 for message in messages if str(message['severity']).lower() != 'info')
+
+
+def _messages_text(instance):
+    titles = [message['title'] for message in instance.messages if str(message['severity']).lower() != 'info']
+    return ', '.join(titles) if titles else 'None'
+
+
+def _disk_usage(instance):
+    """Percent used of the fullest disk partition"""
+    partitions = getattr(instance, 'disk_partitions', None)
+    return max(mount.used for mount in partitions) if partitions else None
+
+
+def _disk_usage_text(instance):
+    return ', '.join("'%s' %i%% of %s" % (mount.name, mount.used, format_gb(mount.total))
+                     for mount in instance.disk_partitions if mount.used is not None)
+
+
+def _latency(device):
+    return device.total_ms if device.total_ms is not None else device.service_ms or 0
+
+
+def _diskio_utilization(instance):
+    """Percent of time the busiest disk device is busy"""
+    devices = getattr(instance, 'disk_io', None)
+    return max(device.utilization or 0 for device in devices) if devices else None
+
+
+def _diskio_latency(instance):
+    """Milliseconds per request of the slowest disk device"""
+    devices = getattr(instance, 'disk_io', None)
+    return max(_latency(device) for device in devices) if devices else None
+
+
+def _diskio_text(instance):
+    return ', '.join("'%s' %i%% busy, %i IOPS, %.1f ms" % (device.device, device.utilization or 0, device.iops or 0,
+                                                          _latency(device)) for device in instance.disk_io)
+
+
+def _not_ready(listed, ready):
+    """Returns a function measuring how many of an instance's listed peers aren't ready, or None if it lists none"""
+    def measure(instance):
+        peers = getattr(instance, listed, None)
+        return len(peers) - (getattr(instance, ready, None) or 0) if peers else None
+    return measure
+
+
+def _ready_text(listed, ready):
+    return lambda instance: "%s of %s" % (getattr(instance, ready), len(getattr(instance, listed)))
+
+
+def _attribute(name):
+    """Returns the extractor of a metric with no entry in METRICS: the instance attribute of that name, counted if
+    it's a list"""
+    def measure(instance):
+        value = getattr(instance, name, None)
+        if isinstance(value, (list, tuple, dict)):
+            return len(value)
+        if isinstance(value, basestring):
+            try:
+                return float(value)
+            except ValueError:
+                return None
+        return value
+    return measure
+
+
+def _attribute_text(name):
+    def text(instance):
+        value = getattr(instance, name, None)
+        return str(len(value)) if isinstance(value, (list, tuple, dict)) else _text(value)
+    return text
+
+
+# Metrics measured from a polled instance, as name: (extractor, report value, optional). Extractors return a number,
+# True or False, or None if the instance doesn't have the metric. A check whose optional metric is missing is left
+# out of the report instead of reported Unknown. Extractors taking now are given the time the fleet is evaluated.
+METRICS = {
+    'minor_version': (_minor_version, lambda instance: instance.version, False),
+    'uptime': (_uptime, lambda instance: instance.startup_time_formatted, False),
+    'http_ssl': (lambda instance: _flag(getattr(instance, 'http_ssl', None)),
+                 lambda instance: str(instance.http_ssl), False),
+    'messages': (_messages, _messages_text, False),
+    'cores': (_numeric('cores'), lambda instance: str(instance.cores), False),
+    'ram': (_numeric('ram'), lambda instance: "%s MB" % instance.ram, False),
+    'cpu_usage': (_numeric('cpu_usage'), lambda instance: "%i%%" % instance.cpu_usage, False),
+    'mem_usage': (_numeric('mem_usage'), lambda instance: "%i%%" % instance.mem_usage, False),
+    'swap_usage': (_numeric('swap_usage'), lambda instance: "%i%%" % instance.swap_usage, False),
+    'disk_usage': (_disk_usage, _disk_usage_text, False),
+    'diskio_utilization': (_diskio_utilization, _diskio_text, False),
+    'diskio_latency': (_diskio_latency, _diskio_text, False),
+    'cluster_peers_unsearchable': (_not_ready('cluster_peers', 'cluster_peers_searchable'),
+                                   _ready_text('cluster_peers', 'cluster_peers_searchable'), True),
+    'cluster_searchheads_unconnected': (_not_ready('cluster_searchheads', 'cluster_searchheads_connected'),
+                                        _ready_text('cluster_searchheads', 'cluster_searchheads_connected'), True),
+    'cluster_maintenance': _boolean('cluster_maintenance'),
+    'cluster_rollingrestart': _boolean('cluster_rollingrestart'),
+    'cluster_alldatasearchable': _boolean('cluster_alldatasearchable'),
+    'cluster_searchfactormet': _boolean('cluster_searchfactormet'),
+    'cluster_replicationfactormet': _boolean('cluster_replicationfactormet'),
+    'shcluster_rollingrestart': _boolean('shcluster_rollingrestart'),
+    'shcluster_serviceready': _boolean('shcluster_serviceready'),
+    'shcluster_minpeersjoined': _boolean('shcluster_minpeersjoined')
+}
+TIMED_METRICS = ('uptime',)
+
+# Comparators of a metric with a threshold. 'true' and 'false' test flags, breached when the metric is true or false;
+# their thresholds only turn the check on or off.
+COMPARATORS = {
+    '>=': numpy.greater_equal,
+    '>': numpy.greater,
+    '<=': numpy.less_equal,
+    '<': numpy.less,
+    '==': numpy.equal,
+    '!=': numpy.not_equal,
+    'true': numpy.not_equal,
+    'false': numpy.equal
+}
+FLAG_COMPARATORS = ('true', 'false')
+
+# Built-in health checks, in report order within their category, as (category, name, roles, conditions). A check
+# with roles only applies to instances with one of them. Conditions are (metric, comparator, warning, caution),
+# naming the [healthchecks] options holding the thresholds, or None for no threshold. A threshold set to false or 0
+# isn't checked.
+HEALTH_CHECKS = [
+    ('Server', 'Version', (), (('minor_version', '<=', 'version_warning', 'version_caution'),)),
+    ('Server', 'Uptime', (), (('uptime', '<', 'uptime_warning', 'uptime_caution'),)),
+    ('Server', 'HTTP SSL', (), (('http_ssl', 'false', None, 'http_ssl_caution'),)),
+    ('Server', 'Messages', (), (('messages', 'true', None, 'messages_caution'),)),
+    ('Resources', 'CPU Cores', (), (('cores', '<', None, 'cpu_cores_caution'),)),
+    ('Resources', 'RAM Size', (), (('ram', '<', None, 'mem_capacity_caution'),)),
+    ('Resources', 'CPU Usage', (), (('cpu_usage', '>=', 'cpu_usage_warning', 'cpu_usage_caution'),)),
+    ('Resources', 'RAM Usage', (), (('mem_usage', '>=', 'mem_usage_warning', 'mem_usage_caution'),)),
+    ('Resources', 'Swap Usage', (), (('swap_usage', '>=', 'swap_usage_warning', 'swap_usage_caution'),)),
+    ('Resources', 'Disk Usage', (),
+     (('disk_usage', '>=', 'diskpartition_usage_warning', 'diskpartition_usage_caution'),)),
+    ('Resources', 'Disk I/O', (),
+     (('diskio_utilization', '>=', 'diskio_utilization_warning', 'diskio_utilization_caution'),
+      ('diskio_latency', '>=', 'diskio_latency_warning', 'diskio_latency_caution'))),
+    ('Cluster', 'IDXC Maintenance Mode', ('cluster_master',),
+     (('cluster_maintenance', 'true', None, 'cluster_maintenance_caution'),)),
+    ('Cluster', 'IDXC Rolling Restart', ('cluster_master',),
+     (('cluster_rollingrestart', 'true', None, 'cluster_rollingrestart_caution'),)),
+    ('Cluster', 'IDXC All Data Searchable', ('cluster_master',),
+     (('cluster_alldatasearchable', 'false', 'cluster_alldatasearchable_warning', None),)),
+    ('Cluster', 'IDXC Search Factor Met', ('cluster_master',),
+     (('cluster_searchfactormet', 'false', None, 'cluster_searchfactor_caution'),)),
+    ('Cluster', 'IDXC Rep Factor Met', ('cluster_master',),
+     (('cluster_replicationfactormet', 'false', None, 'cluster_replicationfactor_caution'),)),
+    ('Cluster', 'IDXC Searchable Peers', ('cluster_master',),
+     (('cluster_peers_unsearchable', '>', 'cluster_peersnotsearchable_warning', None),)),
+    ('Cluster', 'IDXC Connected Search Heads', ('cluster_master',),
+     (('cluster_searchheads_unconnected', '>', 'cluster_searchheadsnotconnected_warning', None),)),
+    ('Cluster', 'SHC Rolling Restart', ('shc_member',),
+     (('shcluster_rollingrestart', 'true', None, 'shcluster_rollingrestart_caution'),)),
+    ('Cluster', 'SHC Service Ready', ('shc_member',),
+     (('shcluster_serviceready', 'false', 'shcluster_serviceready_warning', None),)),
+    ('Cluster', 'SHC Minimum Peers Joined', ('shc_member',),
+     (('shcluster_minpeersjoined', 'false', 'shcluster_minpeersjoined_warning', None),))
+]
+
+
+def _threshold(comparator, value):
+    """Returns the compiled threshold of a condition, NaN if it isn't checked"""
+    if value is None or value is False or value == 0:
+        return numpy.nan
+    if comparator in FLAG_COMPARATORS:
+        return 0.0
+    if comparator == '>' and value is True:  # A count breached by any
+        return 0.0
+    return float(value)
+
+
+def measure(instances, metrics, now=None):
+    """Returns a matrix of instances by the named metrics, NaN where an instance doesn't have one"""
+    now = time.time() if now is None else now
+    values = numpy.empty((len(instances), len(metrics)), dtype=numpy.float64)
+    for column, metric in enumerate(metrics):
+        extract = METRICS[metric][0] if metric in METRICS else _attribute(metric)
+        if metric in TIMED_METRICS:
+            values[:, column] = [extract(instance, now) for instance in instances]
+        else:
+            values[:, column] = [extract(instance) for instance in instances]
+    return values
+
+
+def has_roles(instances, roles):
+    """Returns a matrix of instances by roles, true where an instance has the role"""
+    return numpy.array([[role in (getattr(instance, 'roles', None) or ()) for role in roles]
+                        for instance in instances], dtype=bool).reshape(len(instances), len(roles))
+
+
+class HealthCheck(object):
+    """A compiled health check, with the report entry it produces and the metrics its conditions compare"""
+    __slots__ = ('category', 'name', 'roles', 'metrics', 'custom')
+
+    def __init__(self, category, name, roles, metrics, custom):
+        self.category = category
+        self.name = name
+        self.roles = roles
+        self.metrics = metrics
+        self.custom = custom
+
+    def __repr__(self):
+        return "<HealthCheck %s/%s>" % (self.category, self.name)
+
+
+class HealthChecks(object):
+    """Health checks compiled against a set of thresholds, evaluated over one polled instance or a whole fleet"""
+    def __init__(self, healthchecks, custom=()):
+        """Constructor, taking the [healthchecks] option values and custom checks as (category, name, roles,
+        conditions) tuples whose conditions hold the thresholds themselves rather than option names. Raises
+        ValueError naming a check with an unknown comparator or threshold that isn't a number."""
+        self.values = healthchecks
+        definitions = [(category, name, roles, [(metric, comparator, healthchecks.get(warning),
+                                                 healthchecks.get(caution))
+                                                for metric, comparator, warning, caution in conditions], False)
+                       for category, name, roles, conditions in HEALTH_CHECKS]
+        for category, name, roles, conditions in custom:
+            definition = (category, name, tuple(roles), list(conditions), True)
+            replaced = [number for number, entry in enumerate(definitions) if entry[:2] == (category, name)]
+            if replaced:
+                definitions[replaced[0]] = definition
+            else:
+                definitions.append(definition)
+
+        self.checks = []   # Enabled checks, in the order they're reported
+        self.metrics = []  # Metrics measured, as matrix columns
+        columns = {}
+        condition_metrics, condition_checks, comparators, warnings, cautions = [], [], [], [], []
+        for category, name, roles, conditions, custom_check in definitions:
+            compiled = []
+            for metric, comparator, warning, caution in conditions:
+                comparator = str(comparator).lower()
+                if comparator not in COMPARATORS:
+                    raise ValueError("Health check '%s' has an unknown comparator '%s'." % (name, comparator))
+                try:
+                    thresholds = _threshold(comparator, warning), _threshold(comparator, caution)
+                except (TypeError, ValueError):
+                    raise ValueError("Health check '%s' has a threshold that isn't a number." % name)
+                if not all(numpy.isnan(thresholds)):
+                    compiled.append((metric, comparator) + thresholds)
+            if not compiled:
+                continue
+            for metric, comparator, warning, caution in compiled:
+                if metric not in columns:
+                    columns[metric] = len(self.metrics)
+                    self.metrics.append(metric)
+                condition_metrics.append(columns[metric])
+                condition_checks.append(len(self.checks))
+                comparators.append(comparator)
+                warnings.append(warning)
+                cautions.append(caution)
+            self.checks.append(HealthCheck(category, name, tuple(roles),
+                                           tuple(metric for metric, _, _, _ in compiled), custom_check))
+
+        self.entries = [(check.category, check.name) for check in self.checks]
+        self._optional = numpy.array([len(METRICS.get(metric, ())) > 2 and METRICS[metric][2]
+                                      for metric in self.metrics], dtype=bool)
+        self._condition_metrics = numpy.array(condition_metrics, dtype=numpy.intp)
+        self._starts = numpy.flatnonzero(numpy.diff(numpy.array([-1] + condition_checks)))
+        self._thresholds = numpy.array([warnings, cautions], dtype=numpy.float64)
+        self._checked = ~numpy.isnan(self._thresholds)  # NaN thresholds compare as different, so they're masked
+        self._comparisons = [(COMPARATORS[comparator], numpy.array(
+            [number for number, used in enumerate(comparators) if used == comparator], dtype=numpy.intp))
+            for comparator in sorted(set(comparators))]
+        self.roles = sorted(set(role for check in self.checks for role in check.roles))
+        self._check_roles = numpy.array([[role in check.roles for role in self.roles] for check in self.checks],
+                                        dtype=bool).reshape(len(self.checks), len(self.roles))
+        self._any_role = ~self._check_roles.any(axis=1)
+
+    def measure(self, instances, now=None):
+        """Returns a matrix of instances by the metrics of self.metrics, NaN where an instance doesn't have one, and a
+        matrix of instances by self.roles, true where an instance has the role"""
+        return measure(instances, self.metrics, now), has_roles(instances, self.roles)
+
+    def health(self, values, roles):
+        """Returns a matrix of instances by self.checks of health codes, from matrices returned by measure()"""
+        if not self.checks:
+            return numpy.zeros((len(values), 0), dtype=numpy.int8)
+        compared = values[:, self._condition_metrics]
+        levels = numpy.zeros(compared.shape, dtype=numpy.int8)
+        with numpy.errstate(invalid='ignore'):
+            for compare, conditions in self._comparisons:
+                subset = compared[:, conditions]
+                present = ~numpy.isnan(subset)  # NaN != threshold is true, so missing metrics never breach
+                warning = compare(subset, self._thresholds[0, conditions]) & self._checked[0, conditions] & present
+                caution = compare(subset, self._thresholds[1, conditions]) & self._checked[1, conditions] & present
+                levels[:, conditions] = numpy.where(warning, WARNING, numpy.where(caution, CAUTION, OK))
+        missing = numpy.isnan(compared)
+        health = numpy.maximum.reduceat(levels, self._starts, axis=1)
+        unknown = numpy.logical_or.reduceat(missing, self._starts, axis=1)
+        omitted = numpy.logical_or.reduceat(missing & self._optional[self._condition_metrics], self._starts, axis=1)
+        health[(health == OK) & unknown] = UNKNOWN
+        applies = self._any_role | (roles.astype(numpy.int8).dot(self._check_roles.T.astype(numpy.int8)) > 0)
+        health[omitted | ~applies] = NOT_CHECKED
+        return health
+
+    def evaluate(self, instances, now=None):
+        """Returns a matrix of instances by self.checks of health codes"""
+        return self.health(*self.measure(instances, now))
+
+    def report(self, instance, now=None):
+        """Returns the (category, name, health, value) report entries of one polled instance's checks, leaving out
+        those that don't apply to it"""
+        entries = []
+        for check, code in zip(self.checks, self.evaluate([instance], now)[0]):
+            if code == NOT_CHECKED:
+                continue
+            if code == UNKNOWN:
+                value = '?'
+            else:
+                value = METRICS.get(check.metrics[0], (None, _attribute_text(check.metrics[0])))[1](instance)
+            entries.append((check.category, check.name, HEALTH_NAMES[code], value))
+        return entries
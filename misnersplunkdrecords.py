@@ -0,0 +1,209 @@
+#!/usr/bin/env python
+"""
+misnersplunkdrecords.py - Misner Splunk Tool Collector Records
+Copyright (C) 2015-2018 Joe Misner <joe@misner.net>
+http://tools.misner.net/
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program; if not, write to the Free Software Foundation,
+Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301  USA
+
+Dependencies:
+- Python 64-bit v2.7.15, https://www.python.org/
+
+Changelog:
+2026.10.18 - initial version, typed row records for the input status, indexer cluster, search head cluster, and
+             deployment collectors
+             added Splunk process records and resource usage samples
+             added tracked process records and duration formatting
+             added disk I/O records and rate formatting
+             added file and directory read rate records, with byte formatting
+             added forwarder load records of receivers and outputs groups, with ratio formatting
+             added fleet statistics records of metrics, health checks and versions
+             added health check change records
+             added disk partition records
+"""
+
+import time
+from collections import namedtuple
+
+
+# Value conversion
+# REST API values arrive as strings; rows keep them as numbers, or None when missing or unparsable
+
+def to_int(value):
+    """Returns the value as an int, or None"""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def to_float(value):
+    """Returns the value as a float, or None"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def to_flag(value):
+    """Returns True for the REST API's '1' flag values"""
+    return value == '1'
+
+
+# Display formatters
+# Only called when a value is shown, so rows never hold formatted strings
+
+def format_percent(value):
+    """45.5 -> '45.5%'"""
+    return '' if value is None else '%g%%' % value
+
+
+def format_gb(value):
+    """Bytes -> '1.23 GB'"""
+    return '' if value is None else '%.2f GB' % (value / 1024 / 1024 / 1024)
+
+
+def format_time(value):
+    """Epoch seconds -> '%m/%d/%Y %I:%M:%S %p' in local time"""
+    return '' if value is None else time.strftime("%m/%d/%Y %I:%M:%S %p", time.localtime(value))
+
+
+def format_yesno(value):
+    """True -> 'Yes', False -> 'No'"""
+    return 'Yes' if value else 'No'
+
+
+def format_bytes(value):
+    """Bytes -> '512 B', '1.5 KB', '12.3 MB' or '1.23 GB'"""
+    if value is None:
+        return ''
+    for unit, size in (('GB', 1024 ** 3), ('MB', 1024 ** 2), ('KB', 1024)):
+        if abs(value) >= size:
+            return '%.*f %s' % (2 if unit == 'GB' else 1, float(value) / size, unit)
+    return '%i B' % value
+
+
+def format_byte_rate(value):
+    """Bytes per second -> '1.5 KB/s'"""
+    return '' if value is None else '%s/s' % format_bytes(value)
+
+
+def format_ratio(value):
+    """1.234 -> '1.23x'"""
+    return '' if value is None else '%.2fx' % value
+
+
+def format_rate(value):
+    """12.345 -> '12.3'"""
+    return '' if value is None else '%.1f' % value
+
+
+def format_duration(value):
+    """Seconds -> '12.5s', '5m 02s' or '3h 07m'"""
+    if value is None:
+        return ''
+    if value < 60:
+        return '%.1fs' % value
+    if value < 3600:
+        return '%dm %02ds' % divmod(int(value), 60)
+    return '%dh %02dm' % divmod(int(value) // 60, 60)
+
+
+def format_copies(value):
+    """Tuple of per-copy percentages -> '2 (100:100%)'"""
+    if not value:
+        return '0'
+    return '%s (%s%%)' % (len(value), ':'.join('%.0f' % percent for percent in value))
+
+
+def record_type(typename, fields):
+    """Returns a named tuple class with no per-instance dictionary, whose fields can also be read by name as in
+    row['location'], so code written against the former row dictionaries keeps working"""
+    base = namedtuple(typename, fields)
+
+    class Record(base):
+        __slots__ = ()
+
+        def __getitem__(self, key):
+            if isinstance(key, basestring):
+                try:
+                    return getattr(self, key)
+                except AttributeError:
+                    raise KeyError(key)
+            return base.__getitem__(self, key)
+
+        def get(self, key, default=None):
+            return getattr(self, key, default)
+
+    Record.__name__ = typename
+    return Record
+
+
+# Input status, GET /services/admin/inputstatus
+FileStatus = record_type('FileStatus', ['location', 'type', 'percent', 'position', 'size', 'parent'])
+ProcessorStatus = record_type('ProcessorStatus', ['location', 'exit_desc', 'opened', 'closed', 'bytes'])
+TCPStatus = record_type('TCPStatus', ['tcptype', 'port', 'source', 'exit_desc', 'opened', 'closed', 'bytes'])
+UDPStatus = record_type('UDPStatus', ['source'])
+ListenerPort = record_type('ListenerPort', ['port'])
+FileRate = record_type('FileRate', ['location', 'type', 'percent', 'position', 'size', 'parent', 'behind',
+                                    'read_rate', 'growth_rate', 'catch_up'])
+DirectoryRate = record_type('DirectoryRate', ['directory', 'files', 'lagging', 'size', 'behind', 'read_rate',
+                                              'growth_rate', 'catch_up'])
+
+# Indexer cluster, GET /services/cluster/master/*
+ClusterPeer = record_type('ClusterPeer', ['name', 'site', 'is_searchable', 'status', 'buckets', 'location',
+                                          'last_heartbeat', 'replication_port', 'base_gen_id', 'guid'])
+ClusterIndex = record_type('ClusterIndex', ['name', 'is_searchable', 'searchable_data_copies',
+                                            'replicated_data_copies', 'buckets', 'cumulative_data_size'])
+ClusterSearchHead = record_type('ClusterSearchHead', ['name', 'site', 'status', 'location', 'guid'])
+
+# Search head cluster, GET /services/shcluster/member/members
+SHClusterMember = record_type('SHClusterMember', ['label', 'site', 'status', 'artifacts', 'location',
+                                                  'last_heartbeat', 'replication_port', 'restart_required', 'guid'])
+
+# Deployment server, GET /services/deployment/server/clients
+DeploymentClient = record_type('DeploymentClient', ['guid', 'dns', 'hostname', 'ip', 'mgmt', 'splunkVersion'])
+
+# Resource usage, GET /services/server/status/resource-usage/*
+SplunkProcess = record_type('SplunkProcess', ['name', 'pid', 'parent_pid', 'cpu', 'mem', 'args'])
+ResourceSample = record_type('ResourceSample', ['time', 'cpu_usage', 'mem', 'mem_used', 'mem_usage', 'swap',
+                                                'swap_used', 'swap_usage', 'splunk_processes', 'disk_io'])
+DiskPartition = record_type('DiskPartition', ['name', 'type', 'used', 'total'])
+DiskIO = record_type('DiskIO', ['device', 'mount_point', 'fs_type', 'reads_ps', 'writes_ps', 'iops', 'read_kbps',
+                                'write_kbps', 'service_ms', 'total_ms', 'utilization'])
+TrackedProcess = record_type('TrackedProcess', ['tree', 'name', 'pid', 'parent_pid', 'cpu', 'mem', 'cpu_seconds',
+                                                'peak_cpu', 'started', 'lifetime', 'running', 'search', 'args'])
+
+# Forwarder load distribution, from the forward servers and receiving status of polled instances
+ReceiverLoad = record_type('ReceiverLoad', ['key', 'name', 'forwarders', 'active', 'inactive', 'groups', 'bytes',
+                                            'load'])
+OutputsGroupLoad = record_type('OutputsGroupLoad', ['key', 'name', 'forwarders', 'receivers', 'inactive', 'bytes',
+                                                    'imbalance', 'busiest', 'imbalanced'])
+
+# Fleet-wide statistics of a discovery's polled instances
+FleetMetric = record_type('FleetMetric', ['metric', 'name', 'instances', 'missing', 'minimum', 'p5', 'p25', 'median',
+                                          'p75', 'p95', 'maximum', 'mean', 'stdev', 'outliers', 'outlier_hosts'])
+FleetCheck = record_type('FleetCheck', ['category', 'name', 'checked', 'ok', 'caution', 'warning', 'unknown',
+                                        'breaching'])
+FleetVersion = record_type('FleetVersion', ['version', 'instances', 'percent'])
+
+# Health check changes between polls of an instance
+HealthChange = record_type('HealthChange', ['time', 'address', 'category', 'name', 'previous', 'health', 'value',
+                                            'polls'])
+
+# Record types by name, for rebuilding rows read back from snapshot files
+RECORD_TYPES = dict((record.__name__, record) for record in (
+    FileStatus, ProcessorStatus, TCPStatus, UDPStatus, ListenerPort, ClusterPeer, ClusterIndex, ClusterSearchHead,
+    SHClusterMember, DeploymentClient, SplunkProcess, DiskPartition, DiskIO))
@@ -22,6 +22,9 @@ Dependencies:
 - Python v2.7.15 64-bit, https://www.python.org/
 - Python package 'requests' v2.19.1, https://pypi.python.org/pypi/requests
 - Python module 'splunk-sdk' v1.6.5, https://pypi.python.org/pypi/splunk-sdk
+- Python module 'numpy' v1.16.6, https://pypi.python.org/pypi/numpy
+- Python module 'misnersplunkdrecords.py'
+- Python module 'misnersplunkdhealth.py'
 
 Changelog:
 2017.02.25 - initial version, forked from misnersplunktool.py
@@ -36,6 +39,14 @@ Changelog:
 2018.07.11 - updated dependencies
 2018.07.12 - updated order of guessing instance's Splunk role, standalone search head going above license master and deployment server
              updated Disk Usage in report to show total capacity along with usage
+2026.10.18 - added optional timeout for connections and REST API calls
+             added REPORT_SCHEMA and report_schema(), the fixed set of entries report_builder can produce
+             input status, cluster, SH cluster, and deployment client rows are typed records holding raw numbers
+             added rest_timings attribute, timing each REST API endpoint polled, and restart_required attribute
+             REST API calls share a pooled session; added sample_resource_usage() for sampling between polls
+             added disk_io attribute from resource-usage/iostats, with Disk I/O in the report
+             report_builder takes compiled HealthChecks, its health checks defined as data in misnersplunkdhealth.py
+             disk partitions are typed records holding the percent used and capacity as numbers
 """
 
 import re
@@ -43,9 +54,14 @@ import time
 import requests
 from requests.packages.urllib3.exceptions import InsecureRequestWarning
 requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
+import splunklib.binding as binding
 import splunklib.client as client
 import splunklib.data as data
 import splunklib.results as results
+from misnersplunkdrecords import to_int, to_float, to_flag, FileStatus, ProcessorStatus, TCPStatus, UDPStatus, \
+    ListenerPort, ClusterPeer, ClusterIndex, ClusterSearchHead, SHClusterMember, DeploymentClient, SplunkProcess, \
+    ResourceSample, DiskPartition, DiskIO
+from misnersplunkdhealth import HEALTH_CHECKS
 
 __version__ = '2018.07.12'
 
@@ -54,12 +70,181 @@ SPLUNK_PORT = 8089
 SPLUNK_USER = 'admin'
 SPLUNK_PASS = 'changeme'
 
+# Every entry report_builder() can produce, in report order, as (category, name), health checks included. Custom
+# health checks are reported after the last entry of their category.
+REPORT_SCHEMA = [
+    ('Server', 'Address'),
+    ('Server', 'Server Name'),
+    ('Server', 'GUID'),
+    ('Server', 'Type'),
+    ('Server', 'Roles'),
+    ('Server', 'Primary Role Guess'),
+    ('Server', 'OS'),
+    ('Server', 'Web Enabled'),
+    ('Server', 'Version'),
+    ('Server', 'Uptime'),
+    ('Server', 'HTTP SSL'),
+    ('Server', 'Messages'),
+    ('Resources', 'CPU Cores'),
+    ('Resources', 'RAM Size'),
+    ('Resources', 'CPU Usage'),
+    ('Resources', 'RAM Usage'),
+    ('Resources', 'Swap Usage'),
+    ('Resources', 'Disk Usage'),
+    ('Resources', 'Disk I/O'),
+    ('Ports', 'Management Port'),
+    ('Ports', 'Web Port'),
+    ('Ports', 'Receiving Ports'),
+    ('Ports', 'TCP Input Ports'),
+    ('Ports', 'UDP Input Ports'),
+    ('Ports', 'Replication Port'),
+    ('Ports', 'KV Store Port'),
+    ('Adjacencies', 'Deployment Server'),
+    ('Adjacencies', 'Deployment Clients'),
+    ('Adjacencies', 'IDXC Master Node'),
+    ('Adjacencies', 'IDXC Peer Nodes'),
+    ('Adjacencies', 'IDXC Search Heads'),
+    ('Adjacencies', 'SHC Deployer'),
+    ('Adjacencies', 'SHC Members'),
+    ('Adjacencies', 'Search Peers'),
+    ('Adjacencies', 'Receivers (Forward Servers)'),
+    ('Adjacencies', 'Forwarders (Cooked TCP Connections)'),
+    ('Adjacencies', 'License Master'),
+    ('Adjacencies', 'License Slaves'),
+    ('Cluster', 'IDXC Label'),
+    ('Cluster', 'IDXC Mode'),
+    ('Cluster', 'IDXC Site'),
+    ('Cluster', 'IDXC Maintenance Mode'),
+    ('Cluster', 'IDXC Rolling Restart'),
+    ('Cluster', 'IDXC All Data Searchable'),
+    ('Cluster', 'IDXC Search Factor'),
+    ('Cluster', 'IDXC Search Factor Met'),
+    ('Cluster', 'IDXC Rep Factor'),
+    ('Cluster', 'IDXC Rep Factor Met'),
+    ('Cluster', 'IDXC Searchable Peers'),
+    ('Cluster', 'IDXC Connected Search Heads'),
+    ('Cluster', 'SHC Label'),
+    ('Cluster', 'SHC Rep Factor'),
+    ('Cluster', 'SHC Rolling Restart'),
+    ('Cluster', 'SHC Service Ready'),
+    ('Cluster', 'SHC Minimum Peers Joined'),
+    ('Counts', 'Messages'),
+    ('Counts', 'Apps'),
+    ('Counts', 'Forwarders')
+]
+HEALTH_CHECK_ENTRIES = set((category, name) for category, name, _, _ in HEALTH_CHECKS)
+
+
+def report_schema(healthchecks):
+    """Returns the (category, name) of every report entry enabled by the given compiled HealthChecks, in report
+    order"""
+    enabled = set(healthchecks.entries)
+    schema = [entry for entry in REPORT_SCHEMA if entry not in HEALTH_CHECK_ENTRIES or entry in enabled]
+    for entry in healthchecks.entries:
+        if entry not in schema:
+            categories = [category for category, _ in schema]
+            if entry[0] in categories:
+                schema.insert(len(categories) - categories[::-1].index(entry[0]), entry)
+            else:
+                schema.append(entry)
+    return schema
+
+
+def _input_fields(status):
+    """Returns an input's status dictionary from /services/admin/inputstatus, or an empty one if it has none"""
+    return status if isinstance(status, dict) else {}
+
+
+def _hostwide_usage(feed):
+    """Returns a dictionary of cpu_usage, mem, mem_used, mem_usage, swap, swap_used, and swap_usage values from a
+    /services/server/status/resource-usage/hostwide feed, with usages as integer percents"""
+    content = feed['feed']['entry']['content']
+    usage = {
+        'cpu_usage': 100 - int(float(content['cpu_idle_pct'])),
+        'mem': content['mem'],
+        'mem_used': content['mem_used'],
+        'swap': content['swap'],
+        'swap_used': content['swap_used']
+    }
+    usage['mem_usage'] = int(float(usage['mem_used']) / float(usage['mem']) * 100)
+    usage['swap_usage'] = int(float(usage['swap_used']) / float(usage['swap']) * 100) if float(usage['swap']) else 0
+    return usage
+
+
+def _splunk_processes(feed):
+    """Returns the SplunkProcess records in a /services/server/status/resource-usage/splunk-processes feed"""
+    try:
+        processes = feed['feed']['entry']
+    except KeyError:
+        return []  # No process entries
+    if type(processes) is not list: processes = [processes]
+    return [SplunkProcess(
+        name=process['content']['process'],
+        pid=to_int(process['content']['pid']),
+        parent_pid=to_int(process['content']['ppid']),
+        cpu=to_float(process['content']['pct_cpu']),
+        mem=to_float(process['content']['pct_memory']),
+        args=process['content']['args']) for process in processes]
+
+
+def _disk_partitions(feed):
+    """Returns the DiskPartition records in a /services/server/status/partitions-space feed, with the percent used of
+    each partition and its capacity in bytes; splunkd reports free space and capacity in megabytes"""
+    try:
+        filesystems = feed['feed']['entry']
+    except KeyError:
+        return []  # No partition entries
+    if type(filesystems) is not list: filesystems = [filesystems]
+    records = []
+    for mount in filesystems:
+        content = mount['content']
+        free = to_float(content.get('free'))
+        capacity = to_float(content.get('capacity'))
+        records.append(DiskPartition(
+            name=content.get('mount_point'),
+            type=content.get('fs_type'),
+            used=(capacity - free) / capacity * 100 if free is not None and capacity else None,
+            total=capacity * 1024 * 1024 if capacity is not None else None))
+    return records
+
+
+def _disk_io(feed):
+    """Returns the DiskIO records in a /services/server/status/resource-usage/iostats feed. Each device's reads,
+    writes, and kilobytes per second are already averaged by splunkd over its own sampling interval; IOPS adds reads
+    and writes, and utilization, the percent of time the device was busy, is IOPS times the average service time."""
+    try:
+        devices = feed['feed']['entry']
+    except KeyError:
+        return []  # No device entries
+    if type(devices) is not list: devices = [devices]
+    records = []
+    for device in devices:
+        content = device['content']
+        reads_ps = to_float(content.get('reads_ps'))
+        writes_ps = to_float(content.get('writes_ps'))
+        service_ms = to_float(content.get('avg_service_ms'))
+        iops = reads_ps + writes_ps if reads_ps is not None and writes_ps is not None else None
+        records.append(DiskIO(
+            device=content.get('device', device.get('title')),
+            mount_point=content.get('mount_point', ''),
+            fs_type=content.get('fs_type', ''),
+            reads_ps=reads_ps,
+            writes_ps=writes_ps,
+            iops=iops,
+            read_kbps=to_float(content.get('reads_kb_ps')),
+            write_kbps=to_float(content.get('writes_kb_ps')),
+            service_ms=service_ms,
+            total_ms=to_float(content.get('avg_total_ms')),
+            utilization=min(iops * service_ms / 10, 100.0) if iops is not None and service_ms is not None else None))
+    return records
+
 
 class Splunkd:
     """Splunkd class"""
     def __init__(self, splunk_host=SPLUNK_HOST, splunk_port=SPLUNK_PORT,
-                 splunk_user=SPLUNK_USER, splunk_pass=SPLUNK_PASS):
-        """Constructor"""
+                 splunk_user=SPLUNK_USER, splunk_pass=SPLUNK_PASS, timeout=None):
+        """Constructor, optionally taking a timeout in seconds for the connection and each REST API call"""
+        self.timeout = timeout
         self._connect(splunk_host, splunk_port, splunk_user, splunk_pass)
         self.mgmt_host, self.mgmt_port, self.mgmt_user, self.mgmt_pass =\
              splunk_host, splunk_port, splunk_user, splunk_pass
@@ -67,6 +252,10 @@ class Splunkd:
         # Define attribute defaults for this instance with the following rules:
         # Private Attributes = None, Strings = (unknown), Integers = 0, Lists = [], Dictionaries = {}, Booleans = None
 
+        # rest_call() and poll_service_*()
+        self.session = requests.Session()  # Keeps connections to the management port open between REST API calls
+        self.rest_timings = {}  # REST API endpoint -> seconds taken by its most recent call
+
         # poll_service_settings()
         self._service_settings = None
         self.host = '(unknown)'
@@ -95,6 +284,7 @@ class Splunkd:
         # poll_service_messages()
         self._service_messages = None
         self.messages = []
+        self.restart_required = None
 
         # get_service_confs()
         self._services_properties = None
@@ -201,6 +391,8 @@ class Splunkd:
         self.cpu_usage = 0
         self.mem_usage = 0
         self.swap_usage = 0
+        self._services_server_status_resourceusage_iostats = None
+        self.disk_io = []
         self._services_server_status_resourceusage_splunkprocesses = None
         self.splunk_processes = []
 
@@ -212,27 +404,32 @@ class Splunkd:
 
     def _connect(self, splunk_host, splunk_port, splunk_user, splunk_pass):
         """Connect to Splunk instance"""
+        handler = binding.handler(timeout=self.timeout) if self.timeout else None
         self.service = client.connect(host=splunk_host, port=splunk_port,
-                                      username=splunk_user, password=splunk_pass)
+                                      username=splunk_user, password=splunk_pass, handler=handler)
         # NOTE: Exceptions are handled in MainWindow class to provide user feedback
 
     # REST API calls
 
-    def rest_call(self, uri, method='GET', output_format='structured', body_input='', **kwargs):
-        """Takes the result of a REST API call and formats the results depending on content type"""
+    def rest_call(self, uri, method='GET', output_format='structured', body_input='', session=None, **kwargs):
+        """Takes the result of a REST API call and formats the results depending on content type. Calls go through the
+        instance's pooled session unless another requests.Session is given, as when sampling from another thread."""
         # Make the REST API call
         # Not using 'self.service.get/post/delete' due to Splunk SDK bug not allowing URLs with "://" in the name,
         # such as when pulling config keys for inputs.conf that have monitor:// in the stanza
         url = "https://%s:%s%s" % (self.mgmt_host, self.mgmt_port, uri)
         auth = (self.mgmt_user, self.mgmt_pass)
+        session = session or self.session
+        start = time.time()
         if method == 'GET':
-            r = requests.get(url, data=body_input, params=kwargs, auth=auth, verify=False)
+            r = session.get(url, data=body_input, params=kwargs, auth=auth, verify=False, timeout=self.timeout)
         elif method == 'POST':
-            r = requests.post(url, data=body_input, params=kwargs, auth=auth, verify=False)
+            r = session.post(url, data=body_input, params=kwargs, auth=auth, verify=False, timeout=self.timeout)
         elif method == 'DELETE':
-            r = requests.delete(url, data=body_input, params=kwargs, auth=auth, verify=False)
+            r = session.delete(url, data=body_input, params=kwargs, auth=auth, verify=False, timeout=self.timeout)
         else:
             raise Exception('Invalid method specified for rest_call()')
+        self.rest_timings[uri] = time.time() - start
 
         # Handle the output
         headers = r.headers
@@ -266,7 +463,9 @@ class Splunkd:
 
     def poll_service_settings(self):
         """Poll splunklib.client.service.settings.content"""
+        start = time.time()
         self._service_settings = self.service.settings.content
+        self.rest_timings['/services/server/settings'] = time.time() - start
         self.host = self._service_settings['host']
         self.SPLUNK_HOME = self._service_settings['SPLUNK_HOME']
         self.SPLUNK_DB = self._service_settings['SPLUNK_DB']
@@ -277,7 +476,9 @@ class Splunkd:
 
     def poll_service_info(self):
         """Poll splunklib.client.service.info"""
+        start = time.time()
         self._service_info = self.service.info
+        self.rest_timings['/services/server/info'] = time.time() - start
         self.version = self._service_info['version']
         self.guid = self._service_info['guid']
         self.startup_time = int(self._service_info['startup_time']) if 'startup_time' in self._service_info else 0
@@ -357,8 +558,11 @@ class Splunkd:
 
     def poll_service_messages(self):
         """Poll splunklib.client.service.messages"""
+        start = time.time()
         self._service_messages = self.service.messages.list()
+        self.rest_timings['/services/messages'] = time.time() - start
         self.messages = []
+        self.restart_required = any(message.name == 'restart_required' for message in self._service_messages)
         try:
             for message in self._service_messages:
                 message_dict = {
@@ -421,75 +625,31 @@ class Splunkd:
         self.udplistenerports_status = []
         try:
             for inputtype in self._services_admin_inputstatus['feed']['entry']:
-                if inputtype['title'] == 'TailingProcessor:FileStatus':
-                    monitors = inputtype['content']['inputs']
+                title = inputtype['title']
+                monitors = inputtype['content'].get('inputs') or {}
+                if title == 'TailingProcessor:FileStatus':
                     for monitor in monitors:
-                        input_dict = {'location': monitor}
-                        try:
-                            input_dict['type'] = monitors[monitor]['type']
-                        except (KeyError, TypeError):
-                            input_dict['type'] = ''
-                        try:
-                            input_dict['percent'] = '%g%%' % float(monitors[monitor]['percent'])
-                        except (KeyError, TypeError):
-                            input_dict['percent'] = ''
-                        try:
-                            input_dict['position'] = monitors[monitor]['file position']
-                        except (KeyError, TypeError):
-                            input_dict['position'] = ''
-                        try:
-                            input_dict['size'] = monitors[monitor]['file size']
-                        except (KeyError, TypeError):
-                            input_dict['size'] = ''
-                        try:
-                            input_dict['parent'] = monitors[monitor]['parent']
-                        except (KeyError, TypeError):
-                            input_dict['parent'] = ''
-                        self.fileinput_status.append(input_dict)
-                if inputtype['title'] == 'ExecProcessor:exec commands':
-                    monitors = inputtype['content']['inputs']
+                        status = _input_fields(monitors[monitor])
+                        self.fileinput_status.append(FileStatus(
+                            location=monitor,
+                            type=status.get('type', ''),
+                            percent=to_float(status.get('percent')),
+                            position=to_int(status.get('file position')),
+                            size=to_int(status.get('file size')),
+                            parent=status.get('parent', '')))
+                elif title in ('ExecProcessor:exec commands', 'ModularInputs:modular input commands'):
+                    processor_status = self.execinput_status if title.startswith('Exec') else self.modularinput_status
                     for monitor in monitors:
-                        input_dict = {'location': monitor}
-                        try:
-                            input_dict['exit_desc'] = monitors[monitor]['exit status description']
-                        except (KeyError, TypeError):
-                            input_dict['exit_desc'] = ''
-                        try:
-                            input_dict['closed'] = monitors[monitor]['time closed']
-                        except (KeyError, TypeError):
-                            input_dict['closed'] = ''
-                        try:
-                            input_dict['opened'] = monitors[monitor]['time opened']
-                        except (KeyError, TypeError):
-                            input_dict['opened'] = ''
-                        try:
-                            input_dict['bytes'] = monitors[monitor]['total bytes']
-                        except (KeyError, TypeError):
-                            input_dict['bytes'] = ''
-                        self.execinput_status.append(input_dict)
-                if inputtype['title'] == 'ModularInputs:modular input commands':
-                    monitors = inputtype['content']['inputs']
-                    for monitor in monitors:
-                        input_dict = {'location': monitor}
-                        try:
-                            input_dict['exit_desc'] = monitors[monitor]['exit status description']
-                        except (KeyError, TypeError):
-                            input_dict['exit_desc'] = ''
-                        try:
-                            input_dict['closed'] = monitors[monitor]['time closed']
-                        except (KeyError, TypeError):
-                            input_dict['closed'] = ''
-                        try:
-                            input_dict['opened'] = monitors[monitor]['time opened']
-                        except (KeyError, TypeError):
-                            input_dict['opened'] = ''
-                        try:
-                            input_dict['bytes'] = monitors[monitor]['total bytes']
-                        except (KeyError, TypeError):
-                            input_dict['bytes'] = ''
-                        self.modularinput_status.append(input_dict)
-                if inputtype['title'] == 'Raw:tcp':
-                    monitors = inputtype['content']['inputs']
+                        status = _input_fields(monitors[monitor])
+                        processor_status.append(ProcessorStatus(
+                            location=monitor,
+                            exit_desc=status.get('exit status description', ''),
+                            opened=status.get('time opened', ''),
+                            closed=status.get('time closed', ''),
+                            bytes=to_int(status.get('total bytes'))))
+                elif title in ('Raw:tcp', 'Cooked:tcp'):
+                    tcptype, tcp_status = ('Raw', self.rawtcp_status) if title == 'Raw:tcp' \
+                        else ('Cooked', self.cookedtcp_status)
                     for monitor in monitors:
                         if monitor == 'tcp':
                             continue
@@ -497,77 +657,35 @@ class Splunkd:
                             port, source = monitor.split(':', 1)
                         except ValueError:
                             port, source = '0', monitor
-                        input_dict = {'port': port, 'source': source}
-                        try:
-                            input_dict['exit_desc'] = monitors[monitor]['exit status description']
-                        except (KeyError, TypeError):
-                            input_dict['exit_desc'] = ''
-                        try:
-                            input_dict['closed'] = monitors[monitor]['time closed']
-                        except (KeyError, TypeError):
-                            input_dict['closed'] = ''
-                        try:
-                            input_dict['opened'] = monitors[monitor]['time opened']
-                        except (KeyError, TypeError):
-                            input_dict['opened'] = ''
-                        try:
-                            input_dict['bytes'] = monitors[monitor]['total bytes']
-                        except (KeyError, TypeError):
-                            input_dict['bytes'] = ''
-                        self.rawtcp_status.append(input_dict)
-                if inputtype['title'] == 'Cooked:tcp':
-                    monitors = inputtype['content']['inputs']
+                        status = _input_fields(monitors[monitor])
+                        tcp_status.append(TCPStatus(
+                            tcptype=tcptype,
+                            port=to_int(port),
+                            source=source,
+                            exit_desc=status.get('exit status description', ''),
+                            opened=status.get('time opened', ''),
+                            closed=status.get('time closed', ''),
+                            bytes=to_int(status.get('total bytes'))))
+                elif title == 'UDP:hosts':
                     for monitor in monitors:
-                        if monitor == 'tcp':
-                            continue
-                        try:
-                            port, source = monitor.split(':', 1)
-                        except ValueError:
-                            port, source = '0', monitor
-                        input_dict = {'port': port, 'source': source}
-                        try:
-                            input_dict['exit_desc'] = monitors[monitor]['exit status description']
-                        except (KeyError, TypeError):
-                            input_dict['exit_desc'] = ''
-                        try:
-                            input_dict['closed'] = monitors[monitor]['time closed']
-                        except (KeyError, TypeError):
-                            input_dict['closed'] = ''
-                        try:
-                            input_dict['opened'] = monitors[monitor]['time opened']
-                        except (KeyError, TypeError):
-                            input_dict['opened'] = ''
-                        try:
-                            input_dict['bytes'] = monitors[monitor]['total bytes']
-                        except (KeyError, TypeError):
-                            input_dict['bytes'] = ''
-                        self.cookedtcp_status.append(input_dict)
-                if inputtype['title'] == 'UDP:hosts':
-                    monitors = inputtype['content']['inputs']
-                    for monitor in monitors:
-                        input_dict = {'source': monitor}
-                        self.udphosts_status.append(input_dict)
-                if inputtype['title'] == 'tcp_raw:listenerports':
-                    monitors = inputtype['content']['inputs']
+                        self.udphosts_status.append(UDPStatus(source=monitor))
+                elif title == 'tcp_raw:listenerports':
                     for monitor in monitors:
-                        input_dict = {'port': monitor}
-                        self.tcprawlistenerports_status.append(input_dict)
-                if inputtype['title'] == 'tcp_cooked:listenerports':
-                    monitors = inputtype['content']['inputs']
+                        self.tcprawlistenerports_status.append(ListenerPort(port=monitor))
+                elif title == 'tcp_cooked:listenerports':
                     for monitor in monitors:
-                        input_dict = {'port': monitor}
-                        self.tcpcookedlistenerports_status.append(input_dict)
-                if inputtype['title'] == 'UDP:listenerports':
-                    monitors = inputtype['content']['inputs']
+                        self.tcpcookedlistenerports_status.append(ListenerPort(port=monitor))
+                elif title == 'UDP:listenerports':
                     for monitor in monitors:
-                        input_dict = {'port': monitor}
-                        self.udplistenerports_status.append(input_dict)
+                        self.udplistenerports_status.append(ListenerPort(port=monitor))
         except KeyError:
             pass  # No input entries
 
     def poll_service_apps(self):
         """Poll splunklib.client.service.apps"""
+        start = time.time()
         self._service_apps = self.service.apps.list()
+        self.rest_timings['/services/apps/local'] = time.time() - start
         self.apps = []
         try:
             if type(self._service_apps) is not list: self._service_apps = [self._service_apps]
@@ -739,23 +857,22 @@ class Splunkd:
             peers = self._services_cluster_master_peers['feed']['entry']
             if type(peers) is not list: peers = [peers]
             for peer in peers:
-                peer_dict = {
-                    'name': peer['content']['label'],
-                    'site': peer['content']['site'],
-                    'is_searchable': 'Yes' if peer['content']['is_searchable'] == '1' else 'No',
-                    'status': peer['content']['status'],
-                    'buckets': peer['content']['bucket_count'],
-                    'location': peer['content']['host_port_pair'],
-                    'last_heartbeat': time.strftime("%m/%d/%Y %I:%M:%S %p",
-                                                    time.localtime(float(peer['content']['last_heartbeat']))),
-                    'replication_port': peer['content']['replication_port'],
-                    'base_gen_id': peer['content']['base_generation_id'],
-                    'guid': peer['title']}
-                if peer_dict['is_searchable'] == 'Yes':
+                cluster_peer = ClusterPeer(
+                    name=peer['content']['label'],
+                    site=peer['content']['site'],
+                    is_searchable=to_flag(peer['content']['is_searchable']),
+                    status=peer['content']['status'],
+                    buckets=to_int(peer['content']['bucket_count']),
+                    location=peer['content']['host_port_pair'],
+                    last_heartbeat=to_float(peer['content']['last_heartbeat']),
+                    replication_port=to_int(peer['content']['replication_port']),
+                    base_gen_id=to_int(peer['content']['base_generation_id']),
+                    guid=peer['title'])
+                if cluster_peer.is_searchable:
                     self.cluster_peers_searchable += 1
-                if peer_dict['status'] == 'Up':
+                if cluster_peer.status == 'Up':
                     self.cluster_peers_up += 1
-                self.cluster_peers.append(peer_dict)
+                self.cluster_peers.append(cluster_peer)
         except KeyError:
             pass  # No peer entries
 
@@ -769,51 +886,24 @@ class Splunkd:
             indexes = self._services_cluster_master_indexes['feed']['entry']
             if type(indexes) is not list: indexes = [indexes]
             for index in indexes:
-                index_dict = {
-                    'name': index['title'],
-                    'is_searchable': 'Yes' if index['content']['is_searchable'] == '1' else 'No',
-                    'buckets': index['content']['num_buckets'],
-                    'cumulative_data_size': '%.2f GB' % (float(index['content']['index_size'])/1024/1024/1024)}
-
-                # Searchable Data Copies, i.e. "2 (100:100%)"
-                copy_total = len(index['content']['searchable_copies_tracker'])
-                text = str(copy_total)
-                copy = 0
-                while copy < copy_total:
-                    actual_copies = float(
-                        index['content']['searchable_copies_tracker'][str(copy)]['actual_copies_per_slot']
-                    )
-                    expected_copies = float(
-                        index['content']['searchable_copies_tracker'][str(copy)]['expected_total_per_slot']
-                    )
-                    if copy == 0:
-                        text += ' (%.0f' % (actual_copies / expected_copies * 100)
-                    else:
-                        text += ':%.0f' % (actual_copies / expected_copies * 100)
-                    copy += 1
-                index_dict['searchable_data_copies'] = '%s%%)' % text
-
-                # Replicated Data Copies, i.e. "3 (100:100:100%)"
-                copy_total = len(index['content']['replicated_copies_tracker'])
-                text = str(copy_total)
-                copy = 0
-                while copy < copy_total:
-                    actual_copies = float(
-                        index['content']['replicated_copies_tracker'][str(copy)]['actual_copies_per_slot']
-                    )
-                    expected_copies = float(
-                        index['content']['replicated_copies_tracker'][str(copy)]['expected_total_per_slot']
-                    )
-                    if copy == 0:
-                        text += ' (%.0f' % (actual_copies / expected_copies * 100)
-                    else:
-                        text += ':%.0f' % (actual_copies / expected_copies * 100)
-                    copy += 1
-                index_dict['replicated_data_copies'] = '%s%%)' % text
-
-                if index_dict['is_searchable'] == 'Yes':
+                # Percentage of each bucket copy present, i.e. (100.0, 100.0) for "2 (100:100%)"
+                copies = {}
+                for tracker in ('searchable_copies_tracker', 'replicated_copies_tracker'):
+                    copy_tracker = index['content'][tracker]
+                    copies[tracker] = tuple(
+                        float(copy_tracker[str(copy)]['actual_copies_per_slot']) /
+                        float(copy_tracker[str(copy)]['expected_total_per_slot']) * 100
+                        for copy in range(len(copy_tracker)))
+                cluster_index = ClusterIndex(
+                    name=index['title'],
+                    is_searchable=to_flag(index['content']['is_searchable']),
+                    searchable_data_copies=copies['searchable_copies_tracker'],
+                    replicated_data_copies=copies['replicated_copies_tracker'],
+                    buckets=to_int(index['content']['num_buckets']),
+                    cumulative_data_size=to_float(index['content']['index_size']))
+                if cluster_index.is_searchable:
                     self.cluster_indexes_searchable += 1
-                self.cluster_indexes.append(index_dict)
+                self.cluster_indexes.append(cluster_index)
         except KeyError:
             pass  # No index entries
 
@@ -827,15 +917,15 @@ class Splunkd:
             searchheads = self._services_cluster_master_searchheads['feed']['entry']
             if type(searchheads) is not list: searchheads = [searchheads]
             for searchhead in searchheads:
-                searchhead_dict = {
-                    'name': searchhead['content']['label'],
-                    'site': searchhead['content']['site'],
-                    'status': searchhead['content']['status'],
-                    'location': searchhead['content']['host_port_pair'],
-                    'guid': searchhead['title']}
-                if searchhead_dict['status'] == 'Connected':
+                cluster_searchhead = ClusterSearchHead(
+                    name=searchhead['content']['label'],
+                    site=searchhead['content']['site'],
+                    status=searchhead['content']['status'],
+                    location=searchhead['content']['host_port_pair'],
+                    guid=searchhead['title'])
+                if cluster_searchhead.status == 'Connected':
                     self.cluster_searchheads_connected += 1
-                self.cluster_searchheads.append(searchhead_dict)
+                self.cluster_searchheads.append(cluster_searchhead)
                 #self._search('host=' + searchhead['content']['label'] + '')
         except KeyError:
             pass  # No search head entries
@@ -886,18 +976,16 @@ class Splunkd:
             # Get list of SHC members
             for member in members:
                 content = member['content']
-                members_dict = {
-                    'label': content['label'],
-                    'site': content['site'],
-                    'status': content['status'],
-                    'artifacts': content['artifact_count'],
-                    'location': content['host_port_pair'],
-                    'last_heartbeat': time.strftime("%m/%d/%Y %I:%M:%S %p",
-                                      time.localtime(float(content['last_heartbeat']))),
-                    'replication_port': content['replication_port'],
-                    'restart_required': 'Yes' if content['advertise_restart_required'] == '1' else 'No',
-                    'guid': member['title']}
-                self.shcluster_members.append(members_dict)
+                self.shcluster_members.append(SHClusterMember(
+                    label=content['label'],
+                    site=content['site'],
+                    status=content['status'],
+                    artifacts=to_int(content['artifact_count']),
+                    location=content['host_port_pair'],
+                    last_heartbeat=to_float(content['last_heartbeat']),
+                    replication_port=to_int(content['replication_port']),
+                    restart_required=to_flag(content['advertise_restart_required']),
+                    guid=member['title']))
         except:
             pass
 
@@ -909,14 +997,13 @@ class Splunkd:
             clients = self._services_deployment_server_clients['feed']['entry']
             if type(clients) is not list: clients = [clients]
             for client in clients:
-                client_dict = {
-                    'guid': client['content']['guid'],
-                    'dns': client['content']['dns'],
-                    'hostname': client['content']['hostname'],
-                    'ip': client['content']['ip'],
-                    'mgmt': client['content']['mgmt'],
-                    'splunkVersion': client['content']['splunkVersion']}
-                self.deployment_clients.append(client_dict)
+                self.deployment_clients.append(DeploymentClient(
+                    guid=client['content']['guid'],
+                    dns=client['content']['dns'],
+                    hostname=client['content']['hostname'],
+                    ip=client['content']['ip'],
+                    mgmt=to_int(client['content']['mgmt']),
+                    splunkVersion=client['content']['splunkVersion']))
         except KeyError:
             pass
 
@@ -973,21 +1060,7 @@ class Splunkd:
         try:
             self._services_server_status_partitionsspace = self.rest_call('/services/server/status/partitions-space',
                                                                           count=-1)
-            self.disk_partitions = []
-            try:
-                filesystems = self._services_server_status_partitionsspace['feed']['entry']
-                if type(filesystems) is not list: filesystems = [filesystems]
-                for mount in filesystems:
-                    free = float(mount['content']['free'])
-                    capacity = float(mount['content']['capacity'])
-                    mount_dict = {
-                        'name': mount['content']['mount_point'],
-                        'type': mount['content']['fs_type'],
-                        'used': '%.1f%%' % ((capacity - free) / capacity*100),
-                        'total': '%.2f GB' % (float(mount['content']['capacity'])/1024)}
-                    self.disk_partitions.append(mount_dict)
-            except KeyError:
-                pass  # No peer entries
+            self.disk_partitions = _disk_partitions(self._services_server_status_partitionsspace)
         except KeyError:
             pass
 
@@ -997,29 +1070,19 @@ class Splunkd:
                 '/services/server/status/resource-usage/hostwide',
                 count=-1
             )
-            cpu_usage = self._services_server_status_resourceusage_hostwide['feed']['entry']['content']['cpu_idle_pct']
-            self.cpu_usage = 100 - int(float(cpu_usage))
-
-            self.mem = self._services_server_status_resourceusage_hostwide['feed']['entry']['content']['mem']
-            self.mem_used = self._services_server_status_resourceusage_hostwide['feed']['entry']['content']['mem_used']
-            self.mem_usage = int(float(self.mem_used) / float(self.mem) * 100)
-
-            self.swap = self._services_server_status_resourceusage_hostwide['feed']['entry']['content']['swap']
-            self.swap_used = \
-                self._services_server_status_resourceusage_hostwide['feed']['entry']['content']['swap_used']
-            self.swap_usage = int(float(self.swap_used) / float(self.swap) * 100)
+            vars(self).update(_hostwide_usage(self._services_server_status_resourceusage_hostwide))
         except KeyError:
             pass
 
         # I/O Stats Resource Usage
-        #try:
-        #    self._services_server_status_resourceusage_iostats = self.rest_call(
-        #      '/services/server/status/resource-usage/iostats',
-        #      count=-1
-        #    )
-        #    pprint(self._services_server_status_resourceusage_iostats)
-        #except KeyError:
-        #    pass
+        try:
+            self._services_server_status_resourceusage_iostats = self.rest_call(
+                '/services/server/status/resource-usage/iostats',
+                count=-1
+            )
+            self.disk_io = _disk_io(self._services_server_status_resourceusage_iostats)
+        except KeyError:
+            pass
 
         # Splunk Process Resource Usage
         try:
@@ -1027,24 +1090,34 @@ class Splunkd:
                 '/services/server/status/resource-usage/splunk-processes',
                 count=-1
             )
-            self.splunk_processes = []
-            try:
-                processes = self._services_server_status_resourceusage_splunkprocesses['feed']['entry']
-                if type(processes) is not list: processes = [processes]
-                for process in processes:
-                    process_dict = {
-                        'name': process['content']['process'],
-                        'pid': process['content']['pid'],
-                        'parent_pid': process['content']['ppid'],
-                        'cpu': '%.0f%%' % int(float(process['content']['pct_cpu'])),
-                        'mem': '%.0f%%' % int(float(process['content']['pct_memory'])),
-                        'args': process['content']['args']}
-                    self.splunk_processes.append(process_dict)
-            except KeyError:
-                pass  # No peer entries
+            self.splunk_processes = _splunk_processes(self._services_server_status_resourceusage_splunkprocesses)
         except KeyError:
             pass
 
+    def sample_resource_usage(self, session=None):
+        """GET only /services/server/status/resource-usage/hostwide, splunk-processes, and iostats, returning a
+        ResourceSample without changing any attributes, so it can be called from another thread between full polls.
+        Raises KeyError if the instance doesn't report host-wide resource usage."""
+        hostwide = _hostwide_usage(self.rest_call('/services/server/status/resource-usage/hostwide',
+                                                  session=session, count=-1))
+        try:
+            processes = _splunk_processes(self.rest_call('/services/server/status/resource-usage/splunk-processes',
+                                                         session=session, count=-1))
+        except KeyError:
+            processes = []
+        try:
+            disk_io = _disk_io(self.rest_call('/services/server/status/resource-usage/iostats',
+                                              session=session, count=-1))
+        except KeyError:
+            disk_io = []
+        return ResourceSample(time=time.time(), splunk_processes=processes, disk_io=disk_io, **hostwide)
+
+    def update_resource_usage(self, sample):
+        """Replaces the host-wide resource usage, Splunk process, and disk I/O attributes with those of a
+        ResourceSample"""
+        for field in ResourceSample._fields[1:]:
+            setattr(self, field, getattr(sample, field))
+
     # Pull configuration values
 
     def get_configuration_kvpairs(self, filename):
@@ -1118,9 +1191,10 @@ class Splunkd:
     # Other
 
     def report_builder(self, healthchecks):
-        """Executes discovery and health checks against connected instance, recording results to self.report"""
-        # In the config, unspecified values will be replaced with defaults, while "False" values won't be checked
-        self.report = []
+        """Executes discovery and health checks against connected instance, recording results to self.report.
+        healthchecks is a compiled misnersplunkdhealth.HealthChecks. Entries added here must also be listed in
+        REPORT_SCHEMA."""
+        entries = {}
 
         # Convenience function to add individual entries to the report
         def report_append(category, name, health, value):
@@ -1128,12 +1202,12 @@ class Splunkd:
                 health = ''
             if value == '(none)':
                 value = ''
-            self.report.append({
+            entries[(category, name)] = {
                 'category': category,
                 'name': name,
                 'health': health,
                 'value': value
-            })
+            }
 
         # Report entries, by category
 
@@ -1148,143 +1222,6 @@ class Splunkd:
         report_append('Server', 'OS', 'N/A', self.os)
         report_append('Server', 'Web Enabled', 'N/A', str(self.http_server))
 
-        if healthchecks['version_warning'] or healthchecks['version_caution']:
-            if self.version:
-                minor_version = float(self.version.split('.')[0] + '.' + self.version.split('.')[1])
-                if minor_version <= healthchecks['version_warning']:
-                    health = 'Warning'
-                elif minor_version <= healthchecks['version_caution']:
-                    health = 'Caution'
-                else:
-                    health = 'OK'
-                value = self.version
-            else:
-                health = 'Unknown'
-                value = '?'
-            report_append('Server', 'Version', health, value)
-
-        if healthchecks['uptime_warning'] or healthchecks['uptime_caution']:
-            if self.startup_time:
-                uptime_seconds = int(time.time()) - self.startup_time
-                if uptime_seconds < healthchecks['uptime_warning']:
-                    health = 'Warning'
-                elif uptime_seconds < healthchecks['uptime_caution']:
-                    health = 'Caution'
-                else:
-                    health = 'OK'
-                value = self.startup_time_formatted
-            else:
-                health = 'Unknown'
-                value = '?'
-            report_append('Server', 'Uptime', health, value)
-
-        if healthchecks['http_ssl_caution']:
-            if not self.http_ssl:
-                if healthchecks['http_ssl_caution']:
-                    health = 'Caution'
-                    value = 'False'
-                else:
-                    health = 'OK'
-                    value = 'True'
-            else:
-                health = 'Unknown'
-                value = '?'
-            report_append('Server', 'HTTP SSL', health, value)
-
-        if healthchecks['messages_caution']:
-            if self.messages:
-                messages = []
-                health = 'OK'
-                for message in self.messages:
-                    if str(message['severity']).lower != 'info':
-                        health = 'Caution'
-                        messages.append(message['title'])
-                value = ', '.join(messages) if messages else 'None'
-            else:
-                health = 'OK'
-                value = 'None'
-            report_append('Server', 'Messages', health, value)
-
-        #  Resources
-        if healthchecks['cpu_cores_caution']:
-            if self.cores:
-                health = 'Caution' if self.cores < healthchecks['cpu_cores_caution'] else 'OK'
-                value = str(self.cores)
-            else:
-                health = 'Unknown'
-                value = '?'
-            report_append('Resources', 'CPU Cores', health, value)
-
-        if healthchecks['mem_capacity_caution']:
-            if self.ram:
-                health = 'Caution' if self.ram < healthchecks['mem_capacity_caution'] else 'OK'
-                value = "%s MB" % self.ram
-            else:
-                health = 'Unknown'
-                value = '?'
-            report_append('Resources', 'RAM Size', health, value)
-
-        if healthchecks['cpu_usage_warning'] or healthchecks['cpu_usage_caution']:
-            if self.cpu_usage:
-                if self.cpu_usage >= healthchecks['cpu_usage_warning']:
-                    health = 'Warning'
-                elif self.cpu_usage >= healthchecks['cpu_usage_caution']:
-                    health = 'Caution'
-                else:
-                    health = 'OK'
-                value = "%i%%" % self.cpu_usage
-            else:
-                health = 'Unknown'
-                value = '?'
-            report_append('Resources', 'CPU Usage', health, value)
-
-        if healthchecks['mem_usage_warning'] or healthchecks['mem_usage_caution']:
-            if self.mem_usage:
-                if self.mem_usage >= healthchecks['mem_usage_warning']:
-                    health = 'Warning'
-                elif self.mem_usage >= healthchecks['mem_usage_caution']:
-                    health = 'Caution'
-                else:
-                    health = 'OK'
-                value = "%i%%" % self.mem_usage
-            else:
-                health = 'Unknown'
-                value = '?'
-            report_append('Resources', 'RAM Usage', health, value)
-
-        if healthchecks['swap_usage_warning'] or healthchecks['swap_usage_caution']:
-            if self.swap_usage:
-                if self.swap_usage >= healthchecks['swap_usage_warning']:
-                    health = 'Warning'
-                elif self.swap_usage >= healthchecks['swap_usage_caution']:
-                    health = 'Caution'
-                else:
-                    health = 'OK'
-                value = "%i%%" % self.swap_usage
-            else:
-                health = 'Unknown'
-                value = '?'
-            report_append('Resources', 'Swap Usage', health, value)
-
-        if healthchecks['diskpartition_usage_warning'] or healthchecks['diskpartition_usage_caution']:
-            if self.disk_partitions:
-                mounts = []
-                health = 'OK'
-                for mount in self.disk_partitions:
-                    name = mount['name']
-                    total = mount['total']
-                    percent_used = float(mount['used'][:-1])
-                    if percent_used >= healthchecks['diskpartition_usage_warning'] and health in ['OK', 'Caution']:
-                        health = 'Warning'
-                    elif percent_used >= healthchecks['diskpartition_usage_caution'] and health == 'OK':
-                        health = 'Caution'
-                    mounts.append("'%s' %i%% of %s" % (name, percent_used, total))
-                value = ', '.join(mounts) if mounts else 'None'
-            else:
-                health = 'Unknown'
-                value = '?'
-            report_append('Resources', 'Disk Usage', health, value)
-
         # Ports
         report_append('Ports', 'Management Port', 'N/A', str(self.mgmt_port))
         report_append('Ports', 'Web Port', 'N/A', str(self.http_port))
@@ -1339,80 +1276,21 @@ class Splunkd:
             report_append('Cluster', 'IDXC Label', 'N/A', self.cluster_label)
             report_append('Cluster', 'IDXC Mode', 'N/A', self.cluster_mode)
             report_append('Cluster', 'IDXC Site', 'N/A', self.cluster_site)
-
-            if healthchecks['cluster_maintenance_caution']:
-                if self.cluster_maintenance:
-                    report_append('Cluster', 'IDXC Maintenance Mode', 'Caution', 'True')
-                else:
-                    report_append('Cluster', 'IDXC Maintenance Mode', 'OK', 'False')
-
-            if healthchecks['cluster_rollingrestart_caution']:
-                if self.cluster_rollingrestart:
-                    report_append('Cluster', 'IDXC Rolling Restart', 'Caution', 'True')
-                else:
-                    report_append('Cluster', 'IDXC Rolling Restart', 'OK', 'False')
-
-            if healthchecks['cluster_alldatasearchable_warning']:
-                if not self.cluster_alldatasearchable:
-                    report_append('Cluster', 'IDXC All Data Searchable', 'Warning', 'False')
-                else:
-                    report_append('Cluster', 'IDXC All Data Searchable', 'OK', 'True')
-
             report_append('Cluster', 'IDXC Search Factor', 'N/A', str(self.cluster_searchfactor))
-            if healthchecks['cluster_searchfactor_caution']:
-                if not self.cluster_searchfactormet:
-                    report_append('Cluster', 'IDXC Search Factor Met', 'Caution', 'False')
-                else:
-                    report_append('Cluster', 'IDXC Search Factor Met', 'OK', 'True')
-
             report_append('Cluster', 'IDXC Rep Factor', 'N/A', str(self.cluster_replicationfactor))
-            if healthchecks['cluster_replicationfactor_caution']:
-                if not self.cluster_replicationfactormet:
-                    report_append('Cluster', 'IDXC Rep Factor Met', 'Caution', 'False')
-                else:
-                    report_append('Cluster', 'IDXC Rep Factor Met', 'OK', 'True')
-
-            if healthchecks['cluster_peersnotsearchable_warning'] and self.cluster_peers:
-                if self.cluster_peers_searchable < len(self.cluster_peers):
-                    health = 'Warning'
-                else:
-                    health = 'OK'
-                report_append('Cluster', 'IDXC Searchable Peers', health,
-                              "%s of %s" % (self.cluster_peers_searchable, len(self.cluster_peers)))
-
-            if healthchecks['cluster_searchheadsnotconnected_warning'] and self.cluster_searchheads:
-                if self.cluster_searchheads_connected < len(self.cluster_searchheads):
-                    health = 'Warning'
-                else:
-                    health = 'OK'
-                report_append('Cluster', 'IDXC Connected Search Heads', health,
-                              "%s of %s" % (self.cluster_searchheads_connected,
-                                            len(self.cluster_searchheads)))
 
         # Search Head Cluster
         if 'shc_member' in self.roles:
             report_append('Cluster', 'SHC Label', 'N/A', self.shcluster_label)
             report_append('Cluster', 'SHC Rep Factor', 'N/A', str(self.shcluster_replicationfactor))
 
-            if healthchecks['shcluster_rollingrestart_caution']:
-                if self.shcluster_rollingrestart:
-                    report_append('Cluster', 'SHC Rolling Restart', 'Caution', 'True')
-                else:
-                    report_append('Cluster', 'SHC Rolling Restart', 'OK', 'False')
-
-            if healthchecks['shcluster_serviceready_warning']:
-                if not self.shcluster_serviceready:
-                    report_append('Cluster', 'SHC Service Ready', 'Warning', 'False')
-                else:
-                    report_append('Cluster', 'SHC Service Ready', 'OK', 'True')
-
-            if healthchecks['shcluster_minpeersjoined_warning']:
-                if not self.shcluster_minpeersjoined:
-                    report_append('Cluster', 'SHC Minimum Peers Joined', 'Warning', 'False')
-                else:
-                    report_append('Cluster', 'SHC Minimum Peers Joined', 'OK', 'True')
-
         # Counts
         report_append('Counts', 'Messages', 'N/A', str(len(self.messages)))
         report_append('Counts', 'Apps', 'N/A', str(len(self.apps)))
         report_append('Counts', 'Forwarders', 'N/A', str(len(self.cookedtcp_status)))
+
+        # Health checks, each only reported for instances with the roles it applies to
+        for category, name, health, value in healthchecks.report(self):
+            report_append(category, name, health, value)
+
+        self.report = [entries[entry] for entry in report_schema(healthchecks) if entry in entries]
@@ -21,14 +21,36 @@ Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301  USA
 Dependencies:
 - Python 64-bit v2.7.15, https://www.python.org/
 - Python module 'splunk-sdk' v1.6.5, https://pypi.python.org/pypi/splunk-sdk
+- Python package 'requests' v2.19.1, https://pypi.python.org/pypi/requests
 - Python module 'PySide2' v5.11, https://pypi.python.org/pypi/PySide2
 - Python module 'Markdown' v2.6.11, https://pypi.python.org/pypi/Markdown
 - Python module 'Pygments' v2.2.0, https://pypi.python.org/pypi/Pygments
 - Python module 'networkx' v2.1, https://pypi.python.org/pypi/networkx
 - Python module 'matplotlib' v2.2.2, https://pypi.python.org/pypi/matplotlib
+- Python module 'numpy' v1.16.6, https://pypi.python.org/pypi/numpy
 - Python module 'misnersplunktoolui.py'
 - Python module 'misnersplunktooldiscoveryreportui.py'
 - Python module 'misnersplunkdwrapper.py'
+- Python module 'misnersplunkdrecords.py'
+- Python module 'misnersplunkdhealth.py'
+- Python module 'misnersplunktoolmodels.py'
+- Python module 'misnersplunktoolconf.py'
+- Python module 'misnersplunktooldiscovery.py'
+- Python module 'misnersplunktoolreport.py'
+- Python module 'misnersplunktoolfleet.py'
+- Python module 'misnersplunktoolsnapshot.py'
+- Python module 'misnersplunktoolcache.py'
+- Python module 'misnersplunktoolmetrics.py'
+- Python module 'misnersplunktoolhealthchanges.py'
+- Python module 'misnersplunktoolsparkline.py'
+- Python module 'misnersplunktoolprocesses.py'
+- Python module 'misnersplunktoolfilerates.py'
+- Python module 'misnersplunktoolpathtree.py'
+- Python module 'misnersplunktoolresolver.py'
+- Python module 'misnersplunktooltopology.py'
+- Python module 'misnersplunktooltopologyview.py'
+- Python module 'misnersplunktooltopologyexport.py'
+- Python module 'misnersplunktoolforwarding.py'
 """
 
 import sys
@@ -38,160 +60,58 @@ import time
 import datetime
 import traceback
 import math
-import re
-import csv
-import ConfigParser
-import markdown
-import networkx
-import matplotlib.pyplot
-from pygments import highlight
-from pygments.lexers import XmlLexer, IniLexer
-from pygments.formatters import HtmlFormatter
+import shutil
+import tempfile
+import requests
 import splunklib.binding as binding
-from PySide2 import QtCore, QtWidgets
+from PySide2 import QtCore, QtGui, QtWidgets
 from misnersplunktoolui import Ui_MainWindow
-from misnersplunktooldiscoveryreportui import Ui_DiscoveryReportWindow
 from misnersplunkdwrapper import Splunkd
+from misnersplunkdrecords import format_percent, format_gb, format_time, format_yesno, format_copies, format_duration, \
+    format_rate, format_bytes, format_byte_rate
+from misnersplunkdhealth import HealthChecks
+from misnersplunktoolconf import CONFIG_FILENAME, CONFIG_DEFAULT, HEALTHCHECKS, TOPOLOGY, read_config, section_values, \
+    custom_healthchecks
+from misnersplunktooldiscovery import POLL_STEPS, read_instances, discover
+from misnersplunktoolsnapshot import SNAPSHOT_EXTENSION, PollSnapshot, SnapshotWriter, read_snapshot
+from misnersplunktoolcache import PollCache
+from misnersplunktoolmetrics import METRICS_FILENAME, MetricsStore
+from misnersplunktoolhealthchanges import HEALTH_STATES_FILENAME, HEALTH_LOG_FILENAME, HealthStates, format_change, \
+    is_worse, log_changes
+from misnersplunktoolsparkline import Sparkline
+from misnersplunktoolprocesses import ProcessTracker, tree_order, format_tree
+from misnersplunktoolfilerates import FileRateTracker
+from misnersplunktoolpathtree import PathTree
+from misnersplunktoolresolver import DNS_FILENAME, DnsCache, Resolver
+from misnersplunktooltopology import LAYOUTS_FILENAME, LayoutStore, build_topology
+from misnersplunktooltopologyview import TopologyWindow
+from misnersplunktoolreport import REPORT_FORMATS, DiscoveryReportWriter, report_comments, write_instance_report, \
+    write_fleet_summary, summary_filename, write_health_changes
+from misnersplunktoolfleet import FleetSummary
+from misnersplunktoolmodels import RowTableModel, PathTreeModel, numeric_key, time_key, copies_key
 
 __version__ = '2018.10.09'
 
 SCRIPT_DIR = os.path.dirname(sys.argv[0])
-CONFIG_FILENAME = 'misnersplunktool.conf'
-CONFIG_DEFAULT = """\
-# misnersplunktool.conf -- Misner Splunk Tool configuration file
-# Place in same directory as misnersplunktool.exe to import settings
-
-# Main configuration entries
-# The default Address, Username, and Password populate these fields when the tool loads
-[main]
-defaultAddress=localhost:8089
-defaultUsername=admin
-defaultPassword=changeme
-
-# REST API endpoints populated in the REST API tab's combo box for easy access
-# Add sequential entries incrementing from 0
-[endpoints]
-endpoint.0=/services/server/info
-endpoint.1=/services/server/settings
-
-# Metrics and key performance indicators used by the Health Report to identify issues
-[healthchecks]
-version_caution=6.0  # floating point version number (only major.minor version supported)
-version_warning=5.0  # floating point version number (only major.minor version supported)
-uptime_caution=604800  # seconds
-uptime_warning=86400  # seconds
-cpu_cores_caution=12  # total
-mem_capacity_caution=31744  # MB
-http_ssl_caution=true  # boolean
-messages_caution=true  # boolean
-cpu_usage_caution=80  # percent utilization
-cpu_usage_warning=90  # percent utilization
-mem_usage_caution=80  # percent utilization
-mem_usage_warning=90  # percent utilization
-swap_usage_caution=80  # percent utilization
-swap_usage_warning=90  # percent utilization
-diskpartition_usage_caution=80  # percent utilization
-diskpartition_usage_warning=90  # percent utilization
-cluster_maintenance_caution=true  # boolean
-cluster_rollingrestart_caution=true  # boolean
-cluster_alldatasearchable_warning=true  # boolean
-cluster_searchfactor_caution=true  # boolean
-cluster_replicationfactor_caution=true  # boolean
-cluster_peersnotsearchable_warning=true  # boolean
-cluster_searchheadsnotconnected_warning=true  # boolean
-shcluster_rollingrestart_caution=true  # boolean
-shcluster_serviceready_warning=true  # boolean
-shcluster_minpeersjoined_warning=true  # boolean
-
-# Settings used to create Discovery Report topology nodes and adjacencies
-# layerheight_ settings determine the y-coordinate layer height or the plotted instance role, from 0-100
-# layeralignment_ settings determine if nodes on the layer are aligned to the left, center, or right
-# nodecolor_ and adjcolor_ settings use hex color codes, starting with a hash
-# nodedraw_ and adjdraw_ settings use boolean values of true or false to determine if they are displayed
-[topology]
-fontsize=8  # integer
-static_width=10  # integer, width in plotted points that nodes on a left- or right-aligned layer are spaced apart
-layerheight_user=100  # integer, Users
-layerheight_mc=94  # integer, Management Consoles
-layerheight_shcd=88  # integer, SHC Deployers
-layerheight_sh=80  # integer, Search Heads
-layerheight_cm=68  # integer, Cluster Masters
-layerheight_idx=60  # integer, Indexers
-layerheight_lm=50  # integer, License Masters
-layerheight_hf=40  # integer, Heavy Forwarders
-layerheight_ds=30  # integer, Deployment Servers
-layerheight_uf=20  # integer, Universal Forwarders
-layerheight_input=10  # integer, Non-Forwarder Inputs
-layerheight_other=0  # integer, Other Instances
-layeralignment_user=center
-layeralignment_mc=right
-layeralignment_shcd=left
-layeralignment_sh=center
-layeralignment_cm=left
-layeralignment_idx=center
-layeralignment_lm=right
-layeralignment_hf=center
-layeralignment_ds=left
-layeralignment_uf=center
-layeralignment_input=center
-layeralignment_other=center
-nodecolor_user=d5d8dc
-nodecolor_searchhead=abebc6
-nodecolor_indexer=aed6f1
-nodecolor_heavyforwarder=d98880
-nodecolor_universalforwarder=f5b7b1
-nodecolor_mgmtconsole=abebc6
-nodecolor_shcdeployer=d2b4de
-nodecolor_clustermaster=fad7a0
-nodecolor_deploymentserver=d7bde2
-nodecolor_licensemaster=f9e79f
-nodecolor_inputs=e6b0aa
-nodecolor_others=d6dbdf
-adjcolor_web=808b96
-adjcolor_clustermgmt=f8c471
-adjcolor_distsearch=82e0aa
-adjcolor_mgmtconsole=82e0aa
-adjcolor_bucketrep=85c1e9
-adjcolor_datafwd=d98880
-adjcolor_shcdeployment=bb8fce
-adjcolor_deployment=c39bd3
-adjcolor_license=f7dc6f
-nodedraw_user=true
-nodedraw_searchhead=true
-nodedraw_indexer=true
-nodedraw_heavyforwarder=true
-nodedraw_universalforwarder=true
-nodedraw_mgmtconsole=True
-nodedraw_shcdeployer=true
-nodedraw_clustermaster=true
-nodedraw_deploymentserver=true
-nodedraw_licensemaster=true
-nodedraw_inputs=true
-nodedraw_others=true
-adjdraw_web=true
-adjdraw_clustermgmt=true
-adjdraw_distsearch=true
-adjdraw_mgmtconsole=True
-adjdraw_bucketrep=true
-adjdraw_datafwdheavyforwarder=true
-adjdraw_datafwduniversalforwarder=true
-adjdraw_datafwdinput=true
-adjdraw_shcdeployment=true
-adjdraw_deployment=true
-adjdraw_license=true
-
-# splunkd locations saved in the Address combo box
-# Create separate stanzas for each saved splunkd location, including the ip/host and management port
-# Optionally include keys with username and/or password to populate these fields when selected
-[splunkd::1.2.3.4:8089]
-username=admin
-password=changeme
-
-[splunkd::splunk.myhost.com:8089]
-username=admin
-password=changeme
-"""
-
+CACHE_DIR = os.path.join(SCRIPT_DIR, 'cache')
+CACHED_COLOR = '#808080'  # Text color of tabs still showing cached values
+EXPAND_MATCHES = 200  # Filtering the File Directories tree down to this many files expands it entirely
+NOTIFY_DELAY = 2  # Seconds health changes are gathered for, so changes arriving together share one notification
+NOTIFY_LINES = 5  # Health changes listed in a notification
+
+# GUI sections refreshed after each Splunkd polling method, once every value they show has been polled
+POLL_SECTIONS = {
+    'poll_service_settings': ('top',),
+    'get_service_confs': ('configuration',),
+    'get_services_admin_inputstatus': ('input_status',),
+    'poll_service_apps': ('apps',),
+    'get_services_cluster': ('general', 'cluster'),
+    'get_services_shcluster': ('shcluster',),
+    'get_services_deployment': ('deployment',),
+    'get_services_server_status': ('resource_usage',),
+    'report_builder': ('report',)
+}
+LAZY_MODULES = ('markdown', 'networkx', 'matplotlib', 'pygments', 'misnersplunktooldiscoveryreportui')
 ABOUT_TEXT = """
 <html>
 <h3>Misner Splunk Tool</h3>
@@ -221,108 +141,6 @@ Click the "Show Details" button below for complete license information.
 </html>
 """
 
-HEALTHCHECKS = {
-    'version_caution': 6.0,
-    'version_warning': 5.0,
-    'uptime_caution': 604800,
-    'uptime_warning': 86400,
-    'cpu_cores_caution': 12,
-    'mem_capacity_caution': 31744,
-    'http_ssl_caution': True,
-    'messages_caution': True,
-    'cpu_usage_caution': 80,
-    'cpu_usage_warning': 90,
-    'mem_usage_caution': 80,
-    'mem_usage_warning': 90,
-    'swap_usage_caution': 80,
-    'swap_usage_warning': 90,
-    'diskpartition_usage_caution': 80,
-    'diskpartition_usage_warning': 90,
-    'cluster_maintenance_caution': True,
-    'cluster_rollingrestart_caution': True,
-    'cluster_alldatasearchable_warning': True,
-    'cluster_searchfactor_caution': True,
-    'cluster_replicationfactor_caution': True,
-    'cluster_peersnotsearchable_warning': True,
-    'cluster_searchheadsnotconnected_warning': True,
-    'shcluster_rollingrestart_caution': True,
-    'shcluster_serviceready_warning': True,
-    'shcluster_minpeersjoined_warning': True
-}
-TOPOLOGY = {
-    'fontsize': 8,
-    'static_width': 10,
-    'layerheight_user': 100,
-    'layerheight_mc': 94,
-    'layerheight_shcd': 88,
-    'layerheight_sh': 80,
-    'layerheight_cm': 68,
-    'layerheight_idx': 60,
-    'layerheight_lm': 50,
-    'layerheight_hf': 40,
-    'layerheight_ds': 30,
-    'layerheight_uf': 20,
-    'layerheight_input': 10,
-    'layerheight_other': 0,
-    'layeralignment_user': 'center',
-    'layeralignment_mc': 'right',
-    'layeralignment_shcd': 'left',
-    'layeralignment_sh': 'center',
-    'layeralignment_cm': 'left',
-    'layeralignment_idx': 'center',
-    'layeralignment_lm': 'right',
-    'layeralignment_hf': 'center',
-    'layeralignment_ds': 'left',
-    'layeralignment_uf': 'center',
-    'layeralignment_input': 'center',
-    'layeralignment_other': 'center',
-    'nodecolor_user': 'd5d8dc',
-    'nodecolor_searchhead': 'abebc6',
-    'nodecolor_indexer': 'aed6f1',
-    'nodecolor_heavyforwarder': 'd98880',
-    'nodecolor_universalforwarder': 'f5b7b1',
-    'nodecolor_mgmtconsole': 'abebc6',
-    'nodecolor_shcdeployer': 'd2b4de',
-    'nodecolor_clustermaster': 'fad7a0',
-    'nodecolor_deploymentserver': 'd7bde2',
-    'nodecolor_licensemaster': 'f9e79f',
-    'nodecolor_inputs': 'e6b0aa',
-    'nodecolor_others': 'd6dbdf',
-    'adjcolor_web': '808b96',
-    'adjcolor_clustermgmt': 'f8c471',
-    'adjcolor_distsearch': '82e0aa',
-    'adjcolor_mgmtconsole': '82e0aa',
-    'adjcolor_bucketrep': '85c1e9',
-    'adjcolor_datafwd': 'd98880',
-    'adjcolor_shcdeployment': 'bb8fce',
-    'adjcolor_deployment': 'c39bd3',
-    'adjcolor_license': 'f7dc6f',
-    'nodedraw_user': True,
-    'nodedraw_searchhead': True,
-    'nodedraw_indexer': True,
-    'nodedraw_heavyforwarder': True,
-    'nodedraw_universalforwarder': True,
-    'nodedraw_mgmtconsole': True,
-    'nodedraw_shcdeployer': True,
-    'nodedraw_clustermaster': True,
-    'nodedraw_deploymentserver': True,
-    'nodedraw_licensemaster': True,
-    'nodedraw_inputs': True,
-    'nodedraw_others': True,
-    'adjdraw_web': True,
-    'adjdraw_clustermgmt': True,
-    'adjdraw_distsearch': True,
-    'adjdraw_mgmtconsole': True,
-    'adjdraw_bucketrep': True,
-    'adjdraw_datafwdheavyforwarder': True,
-    'adjdraw_datafwduniversalforwarder': True,
-    'adjdraw_datafwdinput': True,
-    'adjdraw_shcdeployment': True,
-    'adjdraw_deployment': True,
-    'adjdraw_license': True
-}
-
-
 def fatal_error(txt):
     """Prints error to syserr in standard Unix format with filename, to main window if it exists, as well as to file
      error.log in the current directory, then quits"""
@@ -382,6 +200,48 @@ def pretty_time_delta(seconds):
     return output.strip()
 
 
+def syntax_highlight(data, language):
+    """Returns the data as HTML with Pygments syntax highlighting for the 'ini' or 'xml' language"""
+    from pygments import highlight
+    from pygments.lexers import XmlLexer, IniLexer
+    from pygments.formatters import HtmlFormatter
+    lexer = IniLexer() if language == 'ini' else XmlLexer()
+    return highlight(data, lexer, HtmlFormatter(full=True, style='colorful'))
+
+
+def show_help_window():
+    """Shows the help window, building it the first time it's needed"""
+    global help_window
+    if help_window is None:
+        help_window = HelpWindow()
+    help_window.show()
+
+
+def show_discoveryreport_window():
+    """Shows the Discovery Report window, building it the first time it's needed"""
+    global discoveryreport_window
+    if discoveryreport_window is None:
+        discoveryreport_window = DiscoveryReportWindow()
+    discoveryreport_window.show()
+
+
+def show_healthchanges_window():
+    """Shows the Health Changes window, building it the first time it's needed"""
+    global healthchanges_window
+    if healthchanges_window is None:
+        healthchanges_window = HealthChangesWindow()
+        healthchanges_window.add_changes(main_window.health_changes)
+    healthchanges_window.show()
+    healthchanges_window.raise_()
+    healthchanges_window.activateWindow()
+
+
+def benchmark_startup_finished():
+    """Prints which lazily imported modules were loaded during startup, then quits; see misnersplunktoolbenchmark.py"""
+    print ' '.join(module for module in LAZY_MODULES if module in sys.modules)
+    app.quit()
+
+
 class MainWindow(QtWidgets.QMainWindow):
     """Object class for the main window"""
     def __init__(self):
@@ -392,9 +252,16 @@ class MainWindow(QtWidgets.QMainWindow):
         self.ui = Ui_MainWindow()
         self.ui.setupUi(self)
         self.show()
-        self.disconnect()
+        QtCore.QTimer.singleShot(0, self.load_icons)  # Register the large icon resources after the window is shown
 
         #  General tab
+        self.modelMessages = RowTableModel([
+            ('Time Created', 'time_created', time_key),
+            ('Severity', 'severity'),
+            ('Title', 'title'),
+            ('Description', 'description')
+        ], key='title', parent=self)
+        self.ui.tableMessages.setModel(self.modelMessages)
         self.ui.tableMessages.setColumnWidth(0, 140)  # Time Created
         self.ui.tableMessages.setColumnWidth(1, 55)   # Severity
         self.ui.tableMessages.setColumnWidth(2, 150)  # Title
@@ -402,29 +269,95 @@ class MainWindow(QtWidgets.QMainWindow):
         self.ui.tableMessages.sortByColumn(0, QtCore.Qt.AscendingOrder)
 
         #  Report tab
+        self.modelReport = RowTableModel([
+            ('Category', 'category'),
+            ('Name', 'name'),
+            ('Health', 'health'),
+            ('Value', 'value')
+        ], key=('category', 'name'), sortable=False, parent=self)
+        self.ui.tableReport.setModel(self.modelReport)
         self.ui.tableReport.setColumnWidth(0, 80)   # Category
         self.ui.tableReport.setColumnWidth(1, 170)  # Name
         self.ui.tableReport.setColumnWidth(2, 80)   # Health
         self.ui.tableReport.setColumnWidth(3, 340)  # Value
 
         #  Input Status tab
+        self.modelFileStatus = RowTableModel([
+            ('Location', 'location'),
+            ('Type', 'type'),
+            ('Percent', 'percent', numeric_key, format_percent),
+            ('Position', 'position', numeric_key),
+            ('Size', 'size', numeric_key),
+            ('Behind', 'behind', numeric_key, format_bytes),
+            ('Read Rate', 'read_rate', numeric_key, format_byte_rate),
+            ('Growth Rate', 'growth_rate', numeric_key, format_byte_rate),
+            ('Catch Up', 'catch_up', numeric_key, format_duration),
+            ('Parent', 'parent')
+        ], key='location', parent=self)
+        self.ui.tableFileStatus.setModel(self.modelFileStatus)
         self.ui.tableFileStatus.setColumnWidth(0, 420)  # Location
         self.ui.tableFileStatus.setColumnWidth(1, 100)  # Type
         self.ui.tableFileStatus.setColumnWidth(2, 50)   # Percent
         self.ui.tableFileStatus.setColumnWidth(3, 70)   # Position
         self.ui.tableFileStatus.setColumnWidth(4, 70)   # Size
-        self.ui.tableFileStatus.setColumnWidth(5, 400)  # Parent
-        self.ui.tableFileStatus.sortByColumn(0, QtCore.Qt.AscendingOrder)
-
+        self.ui.tableFileStatus.setColumnWidth(5, 70)   # Behind
+        self.ui.tableFileStatus.setColumnWidth(6, 80)   # Read Rate
+        self.ui.tableFileStatus.setColumnWidth(7, 80)   # Growth Rate
+        self.ui.tableFileStatus.setColumnWidth(8, 70)   # Catch Up
+        self.ui.tableFileStatus.setColumnWidth(9, 400)  # Parent
+        self.ui.tableFileStatus.sortByColumn(5, QtCore.Qt.DescendingOrder)  # Files furthest behind first
+        self.file_rates = FileRateTracker()
+        self.file_directories = None  # File read rates not yet shown in the File Directories tree
+
+        self.modelFileDirectories = PathTreeModel([
+            ('Name', 'directory'),
+            ('Files', 'files', numeric_key),
+            ('Lagging', 'lagging', numeric_key),
+            ('Size', 'size', numeric_key, format_bytes),
+            ('Behind', 'behind', numeric_key, format_bytes),
+            ('Read Rate', 'read_rate', numeric_key, format_byte_rate),
+            ('Growth Rate', 'growth_rate', numeric_key, format_byte_rate),
+            ('Catch Up', 'catch_up', numeric_key, format_duration)
+        ], parent=self)
+        self.ui.treeFileDirectories.setModel(self.modelFileDirectories)
+        self.ui.treeFileDirectories.setColumnWidth(0, 300)  # Name
+        self.ui.treeFileDirectories.setColumnWidth(1, 50)   # Files
+        self.ui.treeFileDirectories.setColumnWidth(2, 55)   # Lagging
+        self.ui.treeFileDirectories.setColumnWidth(3, 70)   # Size
+        self.ui.treeFileDirectories.setColumnWidth(4, 70)   # Behind
+        self.ui.treeFileDirectories.setColumnWidth(5, 80)   # Read Rate
+        self.ui.treeFileDirectories.setColumnWidth(6, 80)   # Growth Rate
+        self.ui.treeFileDirectories.setColumnWidth(7, 70)   # Catch Up
+        self.ui.treeFileDirectories.sortByColumn(4, QtCore.Qt.DescendingOrder)  # Directories furthest behind first
+
+        self.modelTCP = RowTableModel([
+            ('TCP Type', 'tcptype'),
+            ('Port', 'port', numeric_key),
+            ('Source', 'source'),
+            ('Time Opened', 'opened')
+        ], key=('tcptype', 'port', 'source'), parent=self)
+        self.ui.tableTCP.setModel(self.modelTCP)
         self.ui.tableTCP.setColumnWidth(0, 70)   # TCP Type
         self.ui.tableTCP.setColumnWidth(1, 50)   # Port
         self.ui.tableTCP.setColumnWidth(2, 300)  # Source
         self.ui.tableTCP.setColumnWidth(3, 150)  # Time Opened
         self.ui.tableTCP.sortByColumn(0, QtCore.Qt.AscendingOrder)
 
+        self.modelUDP = RowTableModel([
+            ('Hosts', 'source')
+        ], key='source', parent=self)
+        self.ui.tableUDP.setModel(self.modelUDP)
         self.ui.tableUDP.setColumnWidth(0, 300)  # Source
         self.ui.tableUDP.sortByColumn(0, QtCore.Qt.AscendingOrder)
 
+        self.modelModular = RowTableModel([
+            ('Location', 'location'),
+            ('Exit Status', 'exit_desc'),
+            ('Opened', 'opened'),
+            ('Closed', 'closed'),
+            ('Total Bytes', 'bytes', numeric_key)
+        ], key='location', parent=self)
+        self.ui.tableModular.setModel(self.modelModular)
         self.ui.tableModular.setColumnWidth(0, 420)  # Location
         self.ui.tableModular.setColumnWidth(1, 110)  # Exit Status
         self.ui.tableModular.setColumnWidth(2, 150)  # Opened
@@ -432,6 +365,14 @@ class MainWindow(QtWidgets.QMainWindow):
         self.ui.tableModular.setColumnWidth(4, 70)   # Total Bytes
         self.ui.tableModular.sortByColumn(0, QtCore.Qt.AscendingOrder)
 
+        self.modelExec = RowTableModel([
+            ('Location', 'location'),
+            ('Exit Status', 'exit_desc'),
+            ('Opened', 'opened'),
+            ('Closed', 'closed'),
+            ('Total Bytes', 'bytes', numeric_key)
+        ], key='location', parent=self)
+        self.ui.tableExec.setModel(self.modelExec)
         self.ui.tableExec.setColumnWidth(0, 420)  # Location
         self.ui.tableExec.setColumnWidth(1, 110)  # Exit Status
         self.ui.tableExec.setColumnWidth(2, 150)  # Opened
@@ -440,6 +381,14 @@ class MainWindow(QtWidgets.QMainWindow):
         self.ui.tableExec.sortByColumn(0, QtCore.Qt.AscendingOrder)
 
         #  Apps tab
+        self.modelApps = RowTableModel([
+            ('Active', 'disabled'),
+            ('Title', 'title'),
+            ('Version', 'version'),
+            ('Label', 'label'),
+            ('Description', 'description')
+        ], key='title', parent=self)
+        self.ui.tableApps.setModel(self.modelApps)
         self.ui.tableApps.setColumnWidth(0, 50)   # Active
         self.ui.tableApps.setColumnWidth(1, 180)  # Title
         self.ui.tableApps.setColumnWidth(2, 50)   # Version
@@ -449,6 +398,19 @@ class MainWindow(QtWidgets.QMainWindow):
 
         #  Indexer Cluster tab
         #   Peers tab
+        self.modelClusterPeers = RowTableModel([
+            ('Peer Name', 'name'),
+            ('Site', 'site'),
+            ('Fully Searchable', 'is_searchable', numeric_key, format_yesno),
+            ('Status', 'status'),
+            ('Buckets', 'buckets', numeric_key),
+            ('Location', 'location'),
+            ('Last Heartbeat', 'last_heartbeat', numeric_key, format_time),
+            ('Replication Port', 'replication_port', numeric_key),
+            ('Base Generation ID', 'base_gen_id', numeric_key),
+            ('GUID', 'guid')
+        ], key='guid', parent=self)
+        self.ui.tableClusterPeers.setModel(self.modelClusterPeers)
         self.ui.tableClusterPeers.setColumnWidth(0, 200)  # Peer Name
         self.ui.tableClusterPeers.setColumnWidth(1, 50)   # Site
         self.ui.tableClusterPeers.setColumnWidth(2, 100)  # Fully Searchable
@@ -461,6 +423,15 @@ class MainWindow(QtWidgets.QMainWindow):
         self.ui.tableClusterPeers.setColumnWidth(9, 250)  # GUID
         self.ui.tableClusterPeers.sortByColumn(0, QtCore.Qt.AscendingOrder)
         #   Indexes tab
+        self.modelClusterIndexes = RowTableModel([
+            ('Index Name', 'name'),
+            ('Fully Searchable', 'is_searchable', numeric_key, format_yesno),
+            ('Searchable Data Copies', 'searchable_data_copies', copies_key, format_copies),
+            ('Replicated Data Copies', 'replicated_data_copies', copies_key, format_copies),
+            ('Buckets', 'buckets', numeric_key),
+            ('Cumulative Raw Data Size', 'cumulative_data_size', numeric_key, format_gb)
+        ], key='name', parent=self)
+        self.ui.tableClusterIndexes.setModel(self.modelClusterIndexes)
         self.ui.tableClusterIndexes.setColumnWidth(0, 150)  # Index Name
         self.ui.tableClusterIndexes.setColumnWidth(1, 100)  # Fully Searchable
         self.ui.tableClusterIndexes.setColumnWidth(2, 150)  # Searchable Data Copies
@@ -469,6 +440,14 @@ class MainWindow(QtWidgets.QMainWindow):
         self.ui.tableClusterIndexes.setColumnWidth(5, 150)  # Cumulative Raw Data Size
         self.ui.tableClusterIndexes.sortByColumn(0, QtCore.Qt.AscendingOrder)
         #   Search Heads tab
+        self.modelClusterSearchHeads = RowTableModel([
+            ('Search Head Name', 'name'),
+            ('Site', 'site'),
+            ('Status', 'status'),
+            ('Location', 'location'),
+            ('GUID', 'guid')
+        ], key='guid', parent=self)
+        self.ui.tableClusterSearchHeads.setModel(self.modelClusterSearchHeads)
         self.ui.tableClusterSearchHeads.setColumnWidth(0, 200)  # Search Head Name
         self.ui.tableClusterSearchHeads.setColumnWidth(1, 50)   # Site
         self.ui.tableClusterSearchHeads.setColumnWidth(2, 100)  # Status
@@ -477,6 +456,18 @@ class MainWindow(QtWidgets.QMainWindow):
         self.ui.tableClusterSearchHeads.sortByColumn(0, QtCore.Qt.AscendingOrder)
 
         #  Search Head Cluster tab
+        self.modelSHClusterMembers = RowTableModel([
+            ('Member Name', 'label'),
+            ('Site', 'site'),
+            ('Status', 'status'),
+            ('Artifacts', 'artifacts', numeric_key),
+            ('Location', 'location'),
+            ('Last Heartbeat', 'last_heartbeat', numeric_key, format_time),
+            ('Replication Port', 'replication_port', numeric_key),
+            ('Restart Required', 'restart_required', numeric_key, format_yesno),
+            ('GUID', 'guid')
+        ], key='guid', parent=self)
+        self.ui.tableSHClusterMembers.setModel(self.modelSHClusterMembers)
         self.ui.tableSHClusterMembers.setColumnWidth(0, 200)  # Peer Name
         self.ui.tableSHClusterMembers.setColumnWidth(1, 50)   # Site
         self.ui.tableSHClusterMembers.setColumnWidth(2, 50)   # Status
@@ -488,6 +479,24 @@ class MainWindow(QtWidgets.QMainWindow):
         self.ui.tableSHClusterMembers.setColumnWidth(8, 250)  # GUID
         self.ui.tableSHClusterMembers.sortByColumn(0, QtCore.Qt.AscendingOrder)
 
+        #  Deployment Clients tab
+        self.modelDeploymentClients = RowTableModel([
+            ('Hostname', 'hostname'),
+            ('DNS Name', 'dns'),
+            ('IP Address', 'ip'),
+            ('Management Port', 'mgmt', numeric_key),
+            ('Splunk Version', 'splunkVersion'),
+            ('GUID', 'guid')
+        ], key='guid', parent=self)
+        self.ui.tableDeploymentClients.setModel(self.modelDeploymentClients)
+        self.ui.tableDeploymentClients.setColumnWidth(0, 150)  # Hostname
+        self.ui.tableDeploymentClients.setColumnWidth(1, 200)  # DNS Name
+        self.ui.tableDeploymentClients.setColumnWidth(2, 100)  # IP Address
+        self.ui.tableDeploymentClients.setColumnWidth(3, 100)  # Management Port
+        self.ui.tableDeploymentClients.setColumnWidth(4, 90)   # Splunk Version
+        self.ui.tableDeploymentClients.setColumnWidth(5, 250)  # GUID
+        self.ui.tableDeploymentClients.sortByColumn(0, QtCore.Qt.AscendingOrder)
+
         # Resource Usage tab
         self.ui.progressResourceUsageCPU.setStyleSheet(
             "QProgressBar { border: 2px solid grey; border-radius: 0px; text-align: center; } "
@@ -498,22 +507,112 @@ class MainWindow(QtWidgets.QMainWindow):
         self.ui.progressResourceUsageSwap.setStyleSheet(
             "QProgressBar { border: 2px solid grey; border-radius: 0px; text-align: center; } "
             "QProgressBar::chunk {background-color: #3add36; width: 1px;}")
-        self.ui.tableResourceUsageProcesses.setColumnWidth(0, 70)   # Process
-        self.ui.tableResourceUsageProcesses.setColumnWidth(1, 40)   # PID
-        self.ui.tableResourceUsageProcesses.setColumnWidth(2, 40)   # PPID
-        self.ui.tableResourceUsageProcesses.setColumnWidth(3, 40)   # CPU
-        self.ui.tableResourceUsageProcesses.setColumnWidth(4, 40)   # RAM
-        self.ui.tableResourceUsageProcesses.setColumnWidth(5, 200)  # Args
-        self.ui.tableResourceUsageProcesses.sortByColumn(1, QtCore.Qt.AscendingOrder)
+        self.modelResourceUsageProcesses = RowTableModel([
+            ('Process', 'tree', tree_order, format_tree),
+            ('PID', 'pid', numeric_key),
+            ('PPID', 'parent_pid', numeric_key),
+            ('CPU', 'cpu', numeric_key, format_percent),
+            ('Mem', 'mem', numeric_key, format_percent),
+            ('CPU Time', 'cpu_seconds', numeric_key, format_duration),
+            ('Peak CPU', 'peak_cpu', numeric_key, format_percent),
+            ('Started', 'started', numeric_key, format_time),
+            ('Lifetime', 'lifetime', numeric_key, format_duration),
+            ('Search', 'search'),
+            ('Arguments', 'args')
+        ], key=('pid', 'started'), parent=self)
+        self.ui.tableResourceUsageProcesses.setModel(self.modelResourceUsageProcesses)
+        self.ui.tableResourceUsageProcesses.setColumnWidth(0, 90)    # Process
+        self.ui.tableResourceUsageProcesses.setColumnWidth(1, 40)    # PID
+        self.ui.tableResourceUsageProcesses.setColumnWidth(2, 40)    # PPID
+        self.ui.tableResourceUsageProcesses.setColumnWidth(3, 40)    # CPU
+        self.ui.tableResourceUsageProcesses.setColumnWidth(4, 40)    # RAM
+        self.ui.tableResourceUsageProcesses.setColumnWidth(5, 60)    # CPU Time
+        self.ui.tableResourceUsageProcesses.setColumnWidth(6, 60)    # Peak CPU
+        self.ui.tableResourceUsageProcesses.setColumnWidth(7, 130)   # Started
+        self.ui.tableResourceUsageProcesses.setColumnWidth(8, 60)    # Lifetime
+        self.ui.tableResourceUsageProcesses.setColumnWidth(9, 250)   # Search
+        self.ui.tableResourceUsageProcesses.setColumnWidth(10, 200)  # Args
+        self.ui.tableResourceUsageProcesses.sortByColumn(0, QtCore.Qt.AscendingOrder)
+        self.process_tracker = ProcessTracker()
+        self.modelResourceUsageDisks = RowTableModel([
+            ('Mount', 'name'),
+            ('Type', 'type'),
+            ('Used', 'used', numeric_key, format_percent),
+            ('Total', 'total', numeric_key, format_gb)
+        ], key='name', parent=self)
+        self.ui.tableResourceUsageDisks.setModel(self.modelResourceUsageDisks)
         self.ui.tableResourceUsageDisks.setColumnWidth(0, 170)  # Mount
         self.ui.tableResourceUsageDisks.setColumnWidth(1, 50)   # Type
         self.ui.tableResourceUsageDisks.setColumnWidth(2, 40)   # Used
         self.ui.tableResourceUsageDisks.setColumnWidth(3, 60)   # Total
         self.ui.tableResourceUsageDisks.sortByColumn(0, QtCore.Qt.AscendingOrder)
+        self.modelResourceUsageIO = RowTableModel([
+            ('Device', 'device'),
+            ('Mount', 'mount_point'),
+            ('Util', 'utilization', numeric_key, format_percent),
+            ('IOPS', 'iops', numeric_key, format_rate),
+            ('Reads/s', 'reads_ps', numeric_key, format_rate),
+            ('Writes/s', 'writes_ps', numeric_key, format_rate),
+            ('Read KB/s', 'read_kbps', numeric_key, format_rate),
+            ('Write KB/s', 'write_kbps', numeric_key, format_rate),
+            ('Service ms', 'service_ms', numeric_key, format_rate),
+            ('Wait ms', 'total_ms', numeric_key, format_rate)
+        ], key='device', parent=self)
+        self.ui.tableResourceUsageIO.setModel(self.modelResourceUsageIO)
+        self.ui.tableResourceUsageIO.setColumnWidth(0, 60)  # Device
+        self.ui.tableResourceUsageIO.setColumnWidth(1, 90)  # Mount
+        self.ui.tableResourceUsageIO.setColumnWidth(2, 45)  # Util
+        self.ui.tableResourceUsageIO.setColumnWidth(3, 50)  # IOPS
+        self.ui.tableResourceUsageIO.setColumnWidth(4, 55)  # Reads/s
+        self.ui.tableResourceUsageIO.setColumnWidth(5, 55)  # Writes/s
+        self.ui.tableResourceUsageIO.setColumnWidth(6, 65)  # Read KB/s
+        self.ui.tableResourceUsageIO.setColumnWidth(7, 65)  # Write KB/s
+        self.ui.tableResourceUsageIO.setColumnWidth(8, 65)  # Service ms
+        self.ui.tableResourceUsageIO.setColumnWidth(9, 55)  # Wait ms
+        self.ui.tableResourceUsageIO.sortByColumn(0, QtCore.Qt.AscendingOrder)
+        self.sparkResourceUsageCPU = Sparkline(parent=self.ui.tabResourceUsage)
+        self.sparkResourceUsageCPU.setGeometry(50, 32, 111, 20)
+        self.sparkResourceUsageMemory = Sparkline(parent=self.ui.tabResourceUsage)
+        self.sparkResourceUsageMemory.setGeometry(240, 32, 111, 20)
+        self.sparkResourceUsageSwap = Sparkline(parent=self.ui.tabResourceUsage)
+        self.sparkResourceUsageSwap.setGeometry(510, 32, 111, 20)
+        self.sampler = None  # ResourceSamplerWorker while sampling
+
+        #  Status bar
+        self.labelCached = QtWidgets.QLabel(self)
+        self.labelCached.setStyleSheet("QLabel { background-color: #f9e79f; padding: 0px 4px; }")
+        self.ui.statusbar.addPermanentWidget(self.labelCached)
+        self.section_tabs = {  # GUI section -> tab it fills in, for marking tabs still showing cached values
+            'general': self.ui.tabGeneral,
+            'report': self.ui.tab,
+            'configuration': self.ui.tabConfiguration,
+            'input_status': self.ui.tabInputStatus,
+            'apps': self.ui.tabApps,
+            'cluster': self.ui.tabCluster,
+            'shcluster': self.ui.tabSHCluster,
+            'deployment': self.ui.tabDeployment,
+            'resource_usage': self.ui.tabResourceUsage
+        }
+
+        #  Automatic polling, restarted after each poll so a slow poll never overlaps the next
+        self.pollTimer = QtCore.QTimer(self)
+        self.pollTimer.setSingleShot(True)
+        self.pollTimer.timeout.connect(self.poll)
+
+        #  Health change notifications, shown from the system tray once changes stop arriving
+        self.notifyTimer = QtCore.QTimer(self)
+        self.notifyTimer.setSingleShot(True)
+        self.notifyTimer.timeout.connect(self.show_health_notification)
+        self.notify_changes = []  # Health changes waiting for the next notification
+        self.tray_icon = None     # Built with the first notification
+
+        self.disconnect()
 
         # Signals and Slots
         #  Menubar
         self.ui.actionBuildMisnersplunktoolConf.triggered.connect(self.actionBuildMisnersplunktoolConf_triggered)
+        self.ui.actionOpenSnapshot.triggered.connect(self.actionOpenSnapshot_triggered)
+        self.ui.actionSaveSnapshot.triggered.connect(self.actionSaveSnapshot_triggered)
         self.ui.actionSaveReport.triggered.connect(self.actionSaveReport_triggered)
         #self.ui.actionSaveSplunkInstanceCredentials.triggered.connect(
         #  self.actionSaveSplunkInstanceCredentials_triggered
@@ -523,6 +622,7 @@ class MainWindow(QtWidgets.QMainWindow):
         self.ui.actionRefreshConfigurations.triggered.connect(self.actionRefreshConfigurations_clicked)
         self.ui.actionChangeDeploymentServer.triggered.connect(self.actionChangeDeploymentServer_clicked)
         self.ui.actionDiscoveryReport.triggered.connect(self.actionDiscoveryReport_clicked)
+        self.ui.actionHealthChanges.triggered.connect(self.actionHealthChanges_clicked)
         self.ui.actionHelp.triggered.connect(self.actionHelp_triggered)
         self.ui.actionAbout.triggered.connect(self.actionAbout_triggered)
         #  Top
@@ -540,6 +640,10 @@ class MainWindow(QtWidgets.QMainWindow):
         self.ui.comboConfig.activated.connect(self.comboConfig_activated)
 
         #  Input Status tab
+        self.ui.editFileStatusFilter.textChanged.connect(self.editFileStatusFilter_textChanged)
+        self.ui.editFileDirectoriesFilter.textChanged.connect(self.editFileDirectoriesFilter_textChanged)
+        self.ui.tabWidgetMain.currentChanged.connect(self.tabWidget_currentChanged)
+        self.ui.tabWidgetInputStatus.currentChanged.connect(self.tabWidget_currentChanged)
         #  Apps tab
         #  Cluster tab
         self.ui.checkClusterDataSearchable.clicked.connect(self.checkCluster_clicked)
@@ -556,17 +660,29 @@ class MainWindow(QtWidgets.QMainWindow):
         self.ui.checkSHClusterMinimumPeersJoinedFlag.clicked.connect(self.checkSHCluster_clicked)
         self.ui.checkSHClusterDynamicCaptain.clicked.connect(self.checkSHCluster_clicked)
         self.ui.checkSHClusterRollingRestartFlag.clicked.connect(self.checkSHCluster_clicked)
+        #  Resource Usage tab
+        self.ui.comboResourceUsageProcesses.activated.connect(self.comboResourceUsageProcesses_activated)
+        self.ui.checkResourceUsageSample.toggled.connect(self.checkResourceUsageSample_toggled)
+        self.ui.spinResourceUsageSampleInterval.valueChanged.connect(self.spinResourceUsageSampleInterval_changed)
         #  REST API tab
         self.ui.comboRestURI.lineEdit().returnPressed.connect(self.buttonRestSend_clicked)
         self.ui.buttonRestSend.clicked.connect(self.buttonRestSend_clicked)
 
         # Load defaults
-        #self.poll_interval = POLL_INTERVAL
+        self.poll_interval = 0  # Seconds between automatic polls while connected, 0 to only poll when Poll is clicked
+        self.log_health_changes = True
+        self.notify_health_changes = True
+        self.health_changes = []  # HealthChange records of every poll since the tool was started, oldest first
 
         # Load misnersplunktool.conf configurations
-        # Build health checks dictionary of defaults, in case values in configuration are not present
-        self.healthchecks = HEALTHCHECKS
-        self.topology = TOPOLOGY
+        # Compile health checks from defaults, in case values in configuration are not present
+        self.healthchecks = HealthChecks(HEALTHCHECKS)
+        self.topology = dict(TOPOLOGY)
+        self.poll_cache = PollCache(CACHE_DIR, "v%s" % __version__)
+        self.metrics = MetricsStore(os.path.join(CACHE_DIR, METRICS_FILENAME))
+        self.health_states = HealthStates(os.path.join(CACHE_DIR, HEALTH_STATES_FILENAME))
+        self.resolver = Resolver(DnsCache(os.path.join(CACHE_DIR, DNS_FILENAME)))
+        self.layout_store = LayoutStore(os.path.join(CACHE_DIR, LAYOUTS_FILENAME))
         try:
             self.pull_configs()
         except:
@@ -575,6 +691,10 @@ class MainWindow(QtWidgets.QMainWindow):
             self.critical_msg(msg)
             fatal_error(msg)
 
+    def closeEvent(self, event):
+        """Executed when the MainWindow() object is closed"""
+        self.stop_sampling()
+
     def resizeEvent(self, event):
         """Resizes widgets as window size changes"""
         # MainWindow
@@ -607,7 +727,10 @@ class MainWindow(QtWidgets.QMainWindow):
 
         # Input Status tab
         self.ui.tabWidgetInputStatus.resize(t.width() - 20, t.height() - 40)
-        self.ui.tableFileStatus.resize(t.width() - 40, t.height() - 80)
+        self.ui.editFileStatusFilter.resize(t.width() - 40, self.ui.editFileStatusFilter.height())
+        self.ui.tableFileStatus.resize(t.width() - 40, t.height() - 110)
+        self.ui.editFileDirectoriesFilter.resize(t.width() - 40, self.ui.editFileDirectoriesFilter.height())
+        self.ui.treeFileDirectories.resize(t.width() - 40, t.height() - 110)
         self.ui.tableTCP.resize(t.width() - 40, t.height() - 80)
         self.ui.tableUDP.resize(t.width() - 40, t.height() - 80)
         self.ui.tableModular.resize(t.width() - 40, t.height() - 80)
@@ -625,9 +748,16 @@ class MainWindow(QtWidgets.QMainWindow):
         # Search Head Cluster tab
         self.ui.tableSHClusterMembers.resize(t.width() - 20, t.height() - 110)
 
+        # Deployment Clients tab
+        self.ui.tableDeploymentClients.resize(t.width() - 20, t.height() - 40)
+
         # Resource Usage tab
-        self.ui.tableResourceUsageProcesses.resize(self.ui.tableResourceUsageProcesses.width(), t.height() - 90)
-        self.ui.tableResourceUsageDisks.resize(t.width() - 380, t.height() - 90)
+        self.ui.tableResourceUsageProcesses.resize(self.ui.tableResourceUsageProcesses.width(), t.height() - 112)
+        disks_height = (t.height() - 139) // 2  # Disk Partitions and Disk I/O share the height, with a label between
+        self.ui.tableResourceUsageDisks.resize(t.width() - 380, disks_height)
+        self.ui.labelResourceUsageIO.move(self.ui.labelResourceUsageIO.x(), 89 + disks_height)
+        self.ui.tableResourceUsageIO.setGeometry(self.ui.tableResourceUsageIO.x(), 109 + disks_height,
+                                                 t.width() - 380, t.height() - 139 - disks_height)
 
         # REST API tab
         self.ui.comboRestURI.resize(t.width() - 210, self.ui.comboRestURI.height())
@@ -639,6 +769,11 @@ class MainWindow(QtWidgets.QMainWindow):
         """Sends a message to the statusbar"""
         self.ui.statusbar.showMessage(msg)
 
+    def load_icons(self):
+        """Imports the compiled icons resource module, then applies the window icon referenced before it was loaded"""
+        import icons_rc
+        self.setWindowIcon(QtGui.QIcon(':/favorites.png'))
+
     def question_msg_yesno(self, msg):
         dialog_answer = QtWidgets.QMessageBox.question(self, "Misner Splunk Tool", msg,
                                                        QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No)
@@ -673,49 +808,15 @@ class MainWindow(QtWidgets.QMainWindow):
                 self.ui.comboRestURI.addItem(uri)
                 endpoint_number += 1
 
-        def fixtype(object):
-            """Returns the object as the correct type: a boolean, integer, floating point, or string"""
-            if object.lower() == 'true':
-                return True
-            elif object.lower() == 'false':
-                return False
-            try:
-                return int(object)
-            except ValueError:
-                try:
-                    return float(object)
-                except ValueError:
-                    return str(object)
-
-        # Pull health check values
-        if config.has_section('healthchecks'):
-            for option in config.options('healthchecks'):
-                value = config.get('healthchecks', option)
-                try:  # Remove comments from key=value pair
-                    if '#' in value:
-                        value = re.findall(r"^([\.\w]+)\s*#.*$", value)[0]
-                except:  # Some bad formatting broke the regex parser
-                    msg = "Error while pulling configurations from misnersplunktool.conf\n" \
-                          "Check formatting of [healthchecks] option %s within this file." % option
-                    self.critical_msg(msg)
-                    fatal_error(msg)
-
-                self.healthchecks[option] = fixtype(value.strip())
-
-        # Pull topology values
-        if config.has_section('topology'):
-            for option in config.options('topology'):
-                value = config.get('topology', option)
-                try:  # Remove comments from key=value pair
-                    if '#' in value:
-                        value = re.findall(r"^([\.\w]+)\s*#.*$", value)[0]
-                except:  # Some bad formatting broke the regex parser
-                    msg = "Error while pulling configurations from misnersplunktool.conf\n" \
-                          "Check formatting of [topology] option %s within this file." % option
-                    self.critical_msg(msg)
-                    fatal_error(msg)
-
-                self.topology[option] = fixtype(value.strip())
+        # Pull health check and topology values
+        try:
+            self.healthchecks = HealthChecks(section_values(config, 'healthchecks', HEALTHCHECKS),
+                                             custom_healthchecks(config))
+            self.topology = section_values(config, 'topology', TOPOLOGY)
+        except ValueError as e:
+            msg = "Error while pulling configurations from misnersplunktool.conf\n%s" % e
+            self.critical_msg(msg)
+            fatal_error(msg)
 
         # Pull other config values
         if config.has_option('main', 'defaultAddress'):
@@ -729,6 +830,44 @@ class MainWindow(QtWidgets.QMainWindow):
                 self.poll_interval = config.getint('main', 'pollInterval')
             except:
                 self.warning_msg("Bad poll interval value in configuration, must be an integer")
+        if config.has_option('main', 'cacheLastPoll'):
+            try:
+                if not config.getboolean('main', 'cacheLastPoll'):
+                    self.poll_cache = None
+            except ValueError:
+                self.warning_msg("Bad cache last poll value in configuration, must be true or false")
+        if config.has_option('main', 'recordMetrics'):
+            try:
+                if not config.getboolean('main', 'recordMetrics'):
+                    self.metrics = None
+            except ValueError:
+                self.warning_msg("Bad record metrics value in configuration, must be true or false")
+        if config.has_option('main', 'healthDebounce'):
+            try:
+                self.health_states.debounce = max(1, config.getint('main', 'healthDebounce'))
+            except ValueError:
+                self.warning_msg("Bad health debounce value in configuration, must be an integer")
+        for option, attribute, name in (('logHealthChanges', 'log_health_changes', 'log health changes'),
+                                        ('notifyHealthChanges', 'notify_health_changes', 'notify health changes')):
+            if config.has_option('main', option):
+                try:
+                    setattr(self, attribute, config.getboolean('main', option))
+                except ValueError:
+                    self.warning_msg("Bad %s value in configuration, must be true or false" % name)
+        if config.has_option('main', 'sampleInterval'):
+            try:
+                self.ui.spinResourceUsageSampleInterval.setValue(config.getfloat('main', 'sampleInterval'))
+            except ValueError:
+                self.warning_msg("Bad sample interval value in configuration, must be a number")
+        if config.has_option('main', 'sampleWindow'):
+            try:
+                window = config.getfloat('main', 'sampleWindow')
+            except ValueError:
+                self.warning_msg("Bad sample window value in configuration, must be a number")
+            else:
+                for sparkline in (self.sparkResourceUsageCPU, self.sparkResourceUsageMemory,
+                                  self.sparkResourceUsageSwap):
+                    sparkline.window = window
 
     def connect(self):
         """Connect to Splunkd"""
@@ -755,23 +894,35 @@ class MainWindow(QtWidgets.QMainWindow):
             self.warning_msg("Invalid port specified")
             return
 
+        # Show this instance's last poll while connecting and polling, marked as cached until each section refreshes
+        address = '%s:%s' % (splunk_host, splunk_port)
+        cached = self.poll_cache.load(address) if self.poll_cache else None
+        if cached is not None:
+            self.show_cached(cached)
+
         # Create Splunk instance
-        host = "'%s:%s'" % (splunk_host, splunk_port)
+        host = "'%s'" % address
         self.statusbar_msg("Connecting to host %s..." % host)
         try:
-            self.splunkd = Splunkd(splunk_host, splunk_port, splunk_user, splunk_pass)
+            splunkd = Splunkd(splunk_host, splunk_port, splunk_user, splunk_pass)
         except binding.AuthenticationError:
-            self.warning_msg("Authentication error connecting to host %s" % host)
-            return
+            error = "Authentication error connecting to host %s" % host
         except socket.gaierror:
-            self.warning_msg("Unable to connect to host %s" % host)
-            return
-        except socket.error as error:
-            self.warning_msg("Unable to connect to host %s:\n"
-                             "%s" % (host, error))
-            return
-        finally:
+            error = "Unable to connect to host %s" % host
+        except socket.error as e:
+            error = "Unable to connect to host %s:\n%s" % (host, e)
+        else:
+            error = None
+        if error:
+            if cached is not None:
+                self.disconnect()
             self.statusbar_msg('Connection failed')
+            self.warning_msg(error)
+            return
+        self.splunkd = splunkd
+        # Process history and file read rates start with the first live poll, not the cached one
+        self.process_tracker.clear()
+        self.file_rates.clear()
         self.statusbar_msg('Connected')
 
         # Toggle GUI fields
@@ -784,6 +935,7 @@ class MainWindow(QtWidgets.QMainWindow):
 
         # Poll Splunk instance
         self.poll()
+        self.ui.checkResourceUsageSample.setEnabled(True)
         self.setWindowTitle('%s - Misner Splunk Tool' % self.splunkd.server_name)
         if 'cluster_master' in self.splunkd.roles:
             self.ui.tabCluster.setEnabled(True)
@@ -793,9 +945,17 @@ class MainWindow(QtWidgets.QMainWindow):
             self.ui.tabSHCluster.setEnabled(True)
         else:
             self.ui.tabSHCluster.setEnabled(False)
+        if 'deployment_server' in self.splunkd.roles or self.splunkd.deployment_clients:
+            self.ui.tabDeployment.setEnabled(True)
+        else:
+            self.ui.tabDeployment.setEnabled(False)
 
     def disconnect(self):
         """Disconnect from Splunkd"""
+        self.pollTimer.stop()
+        self.ui.checkResourceUsageSample.setChecked(False)  # Stops the sampler
+        self.ui.checkResourceUsageSample.setEnabled(False)
+
         # Destroy the splunkd instance
         try:
             del self.splunkd
@@ -824,7 +984,7 @@ class MainWindow(QtWidgets.QMainWindow):
         self.ui.labelUptime.setText('(none)')
         self.ui.labelUptime.setToolTip(None)
         #  General tab
-        self.ui.tableMessages.setRowCount(0)
+        self.modelMessages.clear()
         self.ui.labelRestartRequired.setText('?')
         self.ui.labelDeploymentServer.setText('(none)')
         self.ui.labelDeploymentServer.setToolTip(None)
@@ -834,16 +994,21 @@ class MainWindow(QtWidgets.QMainWindow):
         self.ui.labelSHCDeployer.setText('(none)')
         self.ui.labelSHCDeployer.setToolTip(None)
         #  Report tab
-        self.ui.tableReport.setRowCount(0)
+        self.modelReport.clear()
         #  Configuration tab
         self.ui.editConfig.setHtml(None)
         #  Input Status tab
-        self.ui.tableFileStatus.setRowCount(0)
-        self.ui.tableTCP.setRowCount(0)
-        self.ui.tableUDP.setRowCount(0)
-        self.ui.tableModular.setRowCount(0)
-        self.ui.tableExec.setRowCount(0)
-        self.ui.tableApps.setRowCount(0)
+        self.ui.editFileStatusFilter.clear()
+        self.ui.editFileDirectoriesFilter.clear()
+        self.file_rates.clear()
+        self.file_directories = None
+        self.modelFileStatus.clear()
+        self.modelFileDirectories.clear()
+        self.modelTCP.clear()
+        self.modelUDP.clear()
+        self.modelModular.clear()
+        self.modelExec.clear()
+        self.modelApps.clear()
         #  Indexer Cluster tab
         self.ui.checkClusterDataSearchable.setChecked(False)
         self.ui.checkClusterSearchFactorMet.setChecked(False)
@@ -859,9 +1024,9 @@ class MainWindow(QtWidgets.QMainWindow):
         self.ui.checkClusterInitializedFlag.setChecked(False)
         self.ui.checkClusterServiceReadyFlag.setChecked(False)
         self.ui.checkClusterIndexingReadyFlag.setChecked(False)
-        self.ui.tableClusterPeers.setRowCount(0)
-        self.ui.tableClusterIndexes.setRowCount(0)
-        self.ui.tableClusterSearchHeads.setRowCount(0)
+        self.modelClusterPeers.clear()
+        self.modelClusterIndexes.clear()
+        self.modelClusterSearchHeads.clear()
         #  Search Head Cluster tab
         self.ui.checkSHClusterInitializedFlag.setChecked(False)
         self.ui.checkSHClusterServiceReadyFlag.setChecked(False)
@@ -870,7 +1035,9 @@ class MainWindow(QtWidgets.QMainWindow):
         self.ui.checkSHClusterRollingRestartFlag.setChecked(False)
         self.ui.labelSHClusterCaptain.setText('(none)')
         self.ui.labelSHClusterCaptainElected.setText('(none)')
-        self.ui.tableSHClusterMembers.setRowCount(0)
+        self.modelSHClusterMembers.clear()
+        #  Deployment Clients tab
+        self.modelDeploymentClients.clear()
         #  Resource Usage tab
         self.ui.progressResourceUsageCPU.setValue(0)
         self.ui.progressResourceUsageMemory.setValue(0)
@@ -878,15 +1045,24 @@ class MainWindow(QtWidgets.QMainWindow):
         self.ui.labelResourceUsageSwapHeader.setText('Swap:')
         self.ui.progressResourceUsageSwap.setValue(0)
         self.ui.labelResourceUsageSwap.setText('(none)')
-        self.ui.tableResourceUsageProcesses.setRowCount(0)
-        self.ui.tableResourceUsageDisks.setRowCount(0)
+        self.process_tracker.clear()
+        self.modelResourceUsageProcesses.clear()
+        self.modelResourceUsageDisks.clear()
+        self.modelResourceUsageIO.clear()
+        self.sparkResourceUsageCPU.clear()
+        self.sparkResourceUsageMemory.clear()
+        self.sparkResourceUsageSwap.clear()
         #  REST API tab
         self.ui.editRestResult.setHtml(None)
+        #  Cached marks
+        for section in self.section_tabs:
+            self.mark_cached(section, False)
+        self.labelCached.hide()
 
         self.statusbar_msg('Disconnected')
 
     def poll(self):
-        """Poll for new Splunkd values"""
+        """Poll for new Splunkd values, refreshing each section of the GUI as soon as its values are polled"""
         # Check connection with splunkd
         try:
             self.splunkd.service.settings
@@ -905,45 +1081,185 @@ class MainWindow(QtWidgets.QMainWindow):
             return
 
         # Poll splunkd
+        polled_time = time.time()
         try:
-            self.statusbar_msg('Polling service info...')
-            self.splunkd.poll_service_info()
-            self.statusbar_msg('Polling settings...')
-            self.splunkd.poll_service_settings()
-            self.statusbar_msg('Polling messages...')
-            self.splunkd.poll_service_messages()
-            self.statusbar_msg('Polling configurations...')
-            self.splunkd.get_service_confs()
-            self.statusbar_msg('Polling input status...')
-            self.splunkd.get_services_admin_inputstatus()
-            self.statusbar_msg('Polling apps...')
-            self.splunkd.poll_service_apps()
-            self.statusbar_msg('Polling data collection info...')
-            self.splunkd.get_services_data()
-            self.statusbar_msg('Polling KV store info...')
-            self.splunkd.get_services_kvstore()
-            self.statusbar_msg('Polling cluster master info...')
-            self.splunkd.get_services_cluster()
-            self.statusbar_msg('Polling search head cluster info...')
-            self.splunkd.get_services_shcluster()
-            self.statusbar_msg('Polling deployment info...')
-            self.splunkd.get_services_deployment()
-            self.statusbar_msg('Polling licensing info...')
-            self.splunkd.get_services_licenser()
-            self.statusbar_msg('Polling distributed search info...')
-            self.splunkd.get_services_search()
-            self.statusbar_msg('Polling introspection...')
-            self.splunkd.get_services_server_status()
+            for msg, method in POLL_STEPS:
+                self.statusbar_msg(msg)
+                getattr(self.splunkd, method)()
+                self.refresh_sections(method, polled_time)
+                if method == 'get_services_server_status' and getattr(self.splunkd, 'mem', None) is not None:
+                    self.add_sparkline_samples(self.splunkd.cpu_usage, self.splunkd.mem_usage,
+                                               self.splunkd.swap_usage)
         except socket.error as e:
             self.disconnect()
             self.critical_msg("Socket error while attempting to poll splunkd:\n"
                               "%s" % e)
             return
+        except requests.RequestException as e:
+            self.disconnect()
+            self.critical_msg("Request error while attempting to poll splunkd:\n"
+                              "%s" % e)
+            return
 
-        # Build instance report
+        # Build instance report, then compare its health checks with the last poll
         self.statusbar_msg('Building report...')
         self.splunkd.report_builder(self.healthchecks)
+        self.refresh_sections('report_builder', polled_time)
+        self.populate_finished(polled_time)
+        address = '%s:%s' % (self.splunkd.mgmt_host, self.splunkd.mgmt_port)
+        self.add_health_changes(self.health_states.update(address, self.splunkd.report, polled_time))
+        try:
+            self.health_states.save()
+        except (IOError, OSError):
+            pass
 
+        # Save this poll, to show the next time this instance is connected to, and add its resource usage to the
+        # metrics history
+        if self.poll_cache:
+            try:
+                self.poll_cache.save(address, self.splunkd, polled_time)
+            except (IOError, OSError):
+                pass  # The cache only speeds up connecting, so polling carries on without it
+        if self.metrics:
+            self.metrics.record(address, self.splunkd, polled_time)
+            try:
+                self.metrics.save()
+            except (IOError, OSError):
+                pass
+
+        # Schedule the next automatic poll
+        if self.poll_interval > 0:
+            self.pollTimer.start(self.poll_interval * 1000)
+
+    def add_health_changes(self, changes):
+        """Adds health changes from a poll or discovery to Tools > Health Changes, the health log, and the next
+        desktop notification"""
+        if not changes:
+            return
+        self.health_changes.extend(changes)
+        if healthchanges_window is not None:
+            healthchanges_window.add_changes(changes)
+        if self.log_health_changes:
+            try:
+                log_changes(os.path.join(SCRIPT_DIR, HEALTH_LOG_FILENAME), changes)
+            except IOError:
+                pass
+        if self.notify_health_changes:
+            self.notify_changes.extend(changes)
+            self.notifyTimer.start(NOTIFY_DELAY * 1000)
+
+    def show_health_notification(self):
+        """Shows the health changes gathered since the last notification as one desktop notification, or in the
+        status bar where there's no system tray"""
+        changes, self.notify_changes = self.notify_changes, []
+        if not changes:
+            return
+        addresses = set(change.address for change in changes)
+        if len(changes) == 1:
+            title = "Health changed on %s" % changes[0].address
+        else:
+            title = "%s health checks changed on %s instances" % (len(changes), len(addresses))
+        lines = [format_change(change) for change in changes[:NOTIFY_LINES]]
+        if len(changes) > NOTIFY_LINES:
+            lines.append("...and %s more" % (len(changes) - NOTIFY_LINES))
+        if not QtWidgets.QSystemTrayIcon.isSystemTrayAvailable():
+            self.statusbar_msg("%s: %s" % (title, lines[0]))
+            return
+        if self.tray_icon is None:
+            self.tray_icon = QtWidgets.QSystemTrayIcon(self.windowIcon(), self)
+            self.tray_icon.setToolTip("Misner Splunk Tool")
+            self.tray_icon.messageClicked.connect(show_healthchanges_window)
+            self.tray_icon.activated.connect(lambda reason: show_healthchanges_window())
+            self.tray_icon.show()
+        icon = QtWidgets.QSystemTrayIcon.Warning if any(is_worse(change) for change in changes) \
+            else QtWidgets.QSystemTrayIcon.Information
+        self.tray_icon.showMessage(title, '\n'.join(lines), icon)
+
+    def refresh_sections(self, method, polled_time):
+        """Fills in the GUI sections whose values were polled by the Splunkd method, clearing their cached marks and
+        drawing them right away rather than after the whole poll"""
+        sections = POLL_SECTIONS.get(method)
+        if not sections:
+            return
+        self.polled_time = polled_time
+        for section in sections:
+            getattr(self, 'populate_%s' % section)()
+            self.mark_cached(section, False)
+        QtWidgets.QApplication.processEvents(QtCore.QEventLoop.ExcludeUserInputEvents)
+
+    def add_sparkline_samples(self, cpu_usage, mem_usage, swap_usage, t=None):
+        """Adds host-wide resource usage from a poll or sample to the Resource Usage tab's sparklines"""
+        t = t or time.time()
+        self.sparkResourceUsageCPU.add(t, cpu_usage)
+        self.sparkResourceUsageMemory.add(t, mem_usage)
+        self.sparkResourceUsageSwap.add(t, swap_usage)
+
+    def show_processes(self):
+        """Fills in the Resource Usage tab's process table from the process history, as selected: the running
+        processes, every process since connecting in tree order, or those with the most CPU time"""
+        view = self.ui.comboResourceUsageProcesses.currentIndex()
+        if view == 0:
+            self.modelResourceUsageProcesses.update(self.process_tracker.processes(running_only=True))
+        elif view == 1:
+            self.modelResourceUsageProcesses.update(self.process_tracker.processes())
+        else:
+            self.modelResourceUsageProcesses.update(self.process_tracker.top())
+
+    def stop_sampling(self):
+        """Stops the resource usage sampler, waiting for its current sample to finish"""
+        if self.sampler is not None:
+            self.sampler.stop_execution = True
+            self.sampler.wait()
+            self.sampler = None
+
+    def mark_cached(self, section, cached):
+        """Greys out the tab of a GUI section still showing cached values, or restores its normal color"""
+        tab = self.section_tabs.get(section)
+        if tab is not None:
+            index = self.ui.tabWidgetMain.indexOf(tab)
+            color = QtGui.QColor(CACHED_COLOR) if cached else QtGui.QColor()  # Invalid colors restore the default
+            self.ui.tabWidgetMain.tabBar().setTabTextColor(index, color)
+
+    def show_cached(self, splunkd):
+        """Show an instance's last poll from the cache while connecting to it, marking every section as cached"""
+        self.splunkd = splunkd
+        self.ui.comboAddress.setEnabled(False)
+        self.ui.editUsername.setEnabled(False)
+        self.ui.editPassword.setEnabled(False)
+        self.ui.tabWidgetMain.setEnabled(True)
+
+        self.populate(splunkd.polled_time)
+        for section in self.section_tabs:
+            self.mark_cached(section, True)
+        self.setWindowTitle('%s (cached) - Misner Splunk Tool' % splunkd.server_name)
+        self.ui.tabCluster.setEnabled('cluster_master' in splunkd.roles)
+        self.ui.tabSHCluster.setEnabled('shc_member' in splunkd.roles)
+        self.ui.tabDeployment.setEnabled('deployment_server' in splunkd.roles or bool(splunkd.deployment_clients))
+        polled_local = time.strftime("%m/%d/%Y %I:%M:%S %p", time.localtime(splunkd.polled_time))
+        self.labelCached.setText("Showing cached poll from %s, refreshing..." % polled_local)
+        self.labelCached.show()
+        QtWidgets.QApplication.processEvents(QtCore.QEventLoop.ExcludeUserInputEvents)
+
+    def populate(self, polled_time=None):
+        """Fill in the GUI from the Splunkd values, polled at the given time or just now"""
+        if polled_time is None:
+            polled_time = time.time()
+        self.polled_time = polled_time
+
+        self.populate_top()
+        self.populate_general()
+        self.populate_report()
+        self.populate_configuration()
+        self.populate_input_status()
+        self.populate_apps()
+        self.populate_cluster()
+        self.populate_shcluster()
+        self.populate_deployment()
+        self.populate_resource_usage()
+        self.populate_finished(polled_time)
+
+    def populate_top(self):
+        """Fill in the Splunk icon and top labels"""
         # Setup Splunk icon
         self.statusbar_msg('Populating GUI, Splunk icon...')
         roles = ['Server Roles:']
@@ -978,15 +1294,16 @@ class MainWindow(QtWidgets.QMainWindow):
                                                               '' if self.splunkd.cores == 1 else 's',
                                                               self.splunkd.ram if self.splunkd.ram > 0 else '?'))
         if self.splunkd.startup_time:
-            uptime = pretty_time_delta(int(time.time()) - self.splunkd.startup_time)
+            uptime = pretty_time_delta(int(self.polled_time) - self.splunkd.startup_time)
         else:
             uptime = '(unknown)'
         self.ui.labelUptime.setText(uptime)
         self.ui.labelUptime.setToolTip('splunkd start time: %s' % self.splunkd.startup_time_formatted)
 
-        # Fill in General tab
+    def populate_general(self):
+        """Fill in General tab"""
         self.statusbar_msg('Populating GUI, General tab...')
-        restart_required = 'Yes' if self.splunkd.service.restart_required else 'No'
+        restart_required = 'Yes' if self.splunkd.restart_required else 'No'
         self.ui.labelRestartRequired.setText(restart_required)
         if 'Enterprise' in self.splunkd.type:
             self.ui.buttonRefreshConfigurations.setEnabled(True)
@@ -1009,23 +1326,16 @@ class MainWindow(QtWidgets.QMainWindow):
         self.ui.labelSHCDeployer.setText(self.splunkd.shcluster_deployer)
         self.ui.labelSHCDeployer.setToolTip(self.splunkd.shcluster_deployer)
 
-        self.table_builder(
-            self.ui.tableMessages,
-            self.splunkd.messages,
-            ['time_created', 'severity', 'title', 'description']
-        )
+        self.modelMessages.update(self.splunkd.messages)
         self.ui.tableMessages.resizeRowsToContents()
 
-        # Fill in Report tab
+    def populate_report(self):
+        """Fill in Report tab"""
         self.statusbar_msg('Populating GUI, Report tab...')
-        self.table_builder(
-            self.ui.tableReport,
-            self.splunkd.report,
-            ['category', 'name', 'health', 'value'],
-            sorting=False
-        )
-
-        # Fill in Configuration tab
+        self.modelReport.update(self.splunkd.report)
+
+    def populate_configuration(self):
+        """Fill in Configuration tab"""
         self.statusbar_msg('Populating GUI, Configuration tab...')
         self.ui.comboConfig.clear()
         self.ui.comboConfig.addItems(self.splunkd.configuration_files)
@@ -1033,59 +1343,49 @@ class MainWindow(QtWidgets.QMainWindow):
         self.ui.editConfig.setHtml(None)
         self.comboConfig_activated()
 
-        # Fill in Input Status tab
+    def show_file_directories(self):
+        """Fills in the Input Status > File Directories tree from the latest file read rates, expanding the same
+        directories again. Only done while the tree is shown, as building it for many files takes a while."""
+        tree = self.ui.treeFileDirectories
+        if self.file_directories is None or not tree.isVisible():
+            return
+        expanded = self.modelFileDirectories.directory_paths(
+            [index for index in self.modelFileDirectories.expandable_indexes() if tree.isExpanded(index)])
+        self.modelFileDirectories.load(PathTree(self.file_directories))
+        self.file_directories = None
+        for path in expanded:
+            tree.expand(self.modelFileDirectories.find(path))
+
+    def populate_input_status(self):
+        """Fill in Input Status tab"""
         self.statusbar_msg('Populating GUI, Input Status tab...')
         #  Input Status > File Status
-        self.table_builder(
-            self.ui.tableFileStatus,
-            self.splunkd.fileinput_status,
-            ['location', 'type', 'percent', 'position', 'size', 'parent']
-        )
+        file_rates = self.file_rates.observe(self.polled_time, self.splunkd.fileinput_status)
+        self.modelFileStatus.update(file_rates)
+
+        #  Input Status > File Directories
+        self.file_directories = file_rates
+        self.show_file_directories()
 
         #  Input Status > TCP
-        tcp_monitors = []
-        for monitor in self.splunkd.rawtcp_status:
-            monitor['tcptype'] = 'Raw'
-            tcp_monitors.append(monitor)
-        for monitor in self.splunkd.cookedtcp_status:
-            monitor['tcptype'] = 'Cooked'
-            tcp_monitors.append(monitor)
-        self.table_builder(
-            self.ui.tableTCP,
-            tcp_monitors,
-            ['tcptype', 'port', 'source', 'opened']
-        )
+        self.modelTCP.update(self.splunkd.rawtcp_status + self.splunkd.cookedtcp_status)
 
         #  Input Status > UDP
-        self.table_builder(
-            self.ui.tableUDP,
-            self.splunkd.udphosts_status,
-            ['source']
-        )
+        self.modelUDP.update(self.splunkd.udphosts_status)
 
         #  Input Status > Modular
-        self.table_builder(
-            self.ui.tableModular,
-            self.splunkd.modularinput_status,
-            ['location', 'exit_desc', 'opened', 'closed', 'bytes']
-        )
+        self.modelModular.update(self.splunkd.modularinput_status)
 
         #  Input Status > Exec
-        self.table_builder(
-            self.ui.tableExec,
-            self.splunkd.execinput_status,
-            ['location', 'exit_desc', 'opened', 'closed', 'bytes']
-        )
+        self.modelExec.update(self.splunkd.execinput_status)
 
-        # Fill in Apps tab
+    def populate_apps(self):
+        """Fill in Apps tab"""
         self.statusbar_msg('Populating GUI, Apps tab...')
-        self.table_builder(
-            self.ui.tableApps,
-            self.splunkd.apps,
-            ['disabled', 'title', 'version', 'label', 'description']
-        )
+        self.modelApps.update(self.splunkd.apps)
 
-        # Fill in Indexer Cluster tab
+    def populate_cluster(self):
+        """Fill in Indexer Cluster tab"""
         self.statusbar_msg('Populating GUI, Indexer Cluster tab...')
         self.checkCluster_clicked()
         if 'cluster_master' in self.splunkd.roles:
@@ -1101,87 +1401,81 @@ class MainWindow(QtWidgets.QMainWindow):
                                                       % (self.splunkd.cluster_searchheads_connected,
                                                          len(self.splunkd.cluster_searchheads)))
 
-            self.table_builder(
-                self.ui.tableClusterPeers,
-                self.splunkd.cluster_peers,
-                ['name', 'site', 'is_searchable', 'status', 'buckets', 'location', 'last_heartbeat',
-                      'replication_port', 'base_gen_id', 'guid']
-            )
-
-            self.table_builder(
-                self.ui.tableClusterIndexes,
-                self.splunkd.cluster_indexes,
-                ['name', 'is_searchable', 'searchable_data_copies', 'replicated_data_copies',
-                      'buckets', 'cumulative_data_size']
-            )
-
-            self.table_builder(
-                self.ui.tableClusterSearchHeads,
-                self.splunkd.cluster_searchheads,
-                ['name', 'site', 'status', 'location', 'guid']
-            )
-
-        # Fill in Search Head Cluster tab
+            self.modelClusterPeers.update(self.splunkd.cluster_peers)
+            self.modelClusterIndexes.update(self.splunkd.cluster_indexes)
+            self.modelClusterSearchHeads.update(self.splunkd.cluster_searchheads)
+        else:
+            # Clear values left by a cached poll of this address
+            self.modelClusterPeers.clear()
+            self.modelClusterIndexes.clear()
+            self.modelClusterSearchHeads.clear()
+
+    def populate_shcluster(self):
+        """Fill in Search Head Cluster tab"""
         self.statusbar_msg('Populating GUI, SH Cluster tab...')
         self.checkSHCluster_clicked()
         if 'shc_member' in self.splunkd.roles:
             self.ui.labelSHClusterCaptain.setText(self.splunkd.shcluster_captainlabel)
             self.ui.labelSHClusterCaptainElected.setText(self.splunkd.shcluster_electedcaptain)
 
-            self.table_builder(
-                self.ui.tableSHClusterMembers,
-                self.splunkd.shcluster_members,
-                ['label', 'site', 'status', 'artifacts', 'location', 'last_heartbeat', 'replication_port',
-                      'restart_required', 'guid']
-            )
+            self.modelSHClusterMembers.update(self.splunkd.shcluster_members)
+        else:
+            self.modelSHClusterMembers.clear()
+
+    def populate_deployment(self):
+        """Fill in Deployment Clients tab"""
+        self.statusbar_msg('Populating GUI, Deployment Clients tab...')
+        self.modelDeploymentClients.update(self.splunkd.deployment_clients)
 
-        # Fill in Resource Usage tab
+    def populate_resource_usage(self):
+        """Fill in Resource Usage tab"""
         self.statusbar_msg('Populating GUI, Resource Usage tab...')
-        if self.splunkd.cpu_usage:
-            self.ui.progressResourceUsageCPU.setValue(self.splunkd.cpu_usage)
-        if self.splunkd.mem_usage:
-            self.ui.progressResourceUsageMemory.setValue(self.splunkd.mem_usage)
+        # Every widget is set, even to 0 or empty, so no value of a cached poll is left showing
+        self.ui.progressResourceUsageCPU.setValue(self.splunkd.cpu_usage or 0)
+        self.ui.progressResourceUsageMemory.setValue(self.splunkd.mem_usage or 0)
+        self.ui.progressResourceUsageSwap.setValue(self.splunkd.swap_usage or 0)
+        # On Windows systems, the 'swap' variable is actually Commit Charge
+        self.ui.labelResourceUsageSwapHeader.setText('Commit:' if 'Windows' in self.splunkd.os else 'Swap:')
+        if getattr(self.splunkd, 'mem', None) is not None:  # Set once resource-usage/hostwide has been polled
             self.ui.labelResourceUsageMemory.setText('%.1f / %.1f GB' % (float(self.splunkd.mem_used) / 1024,
                                                                          float(self.splunkd.mem) / 1024))
-        if self.splunkd.swap_usage:
-            # On Windows systems, the 'swap' variable is actually Commit Charge
-            swap_header = 'Commit:' if 'Windows' in self.splunkd.os else 'Swap:'
-            self.ui.labelResourceUsageSwapHeader.setText(swap_header)
-            self.ui.progressResourceUsageSwap.setValue(self.splunkd.swap_usage)
             self.ui.labelResourceUsageSwap.setText('%.1f / %.1f GB' % (float(self.splunkd.swap_used) / 1024,
                                                                        float(self.splunkd.swap) / 1024))
-        if self.splunkd.splunk_processes:
-            self.table_builder(
-                self.ui.tableResourceUsageProcesses,
-                self.splunkd.splunk_processes,
-                ['name', 'pid', 'parent_pid', 'cpu', 'mem', 'args']
-            )
-        if self.splunkd.disk_partitions:
-            self.table_builder(
-                self.ui.tableResourceUsageDisks,
-                self.splunkd.disk_partitions,
-                ['name', 'type', 'used', 'total']
-            )
-
-        # Update status bar with latest poll
-        current_local = time.strftime("%m/%d/%Y %I:%M:%S %p", time.localtime())
-        self.statusbar_msg("Last poll completed %s" % current_local)
-
-    @staticmethod
-    def table_builder(table, collection, fields, sorting=True):
-        table.setRowCount(0)
-        table.setRowCount(len(collection))
-        table.setSortingEnabled(False)  # Fixes bug where rows don't repopulate after a sort
-        row = 0
-        for entry in collection:
-            column = 0
-            for field in fields:
-                table.setItem(row, column, QtWidgets.QTableWidgetItem())
-                table.item(row, column).setText(entry[field])
-                column += 1
-            row += 1
-        if sorting:
-            table.setSortingEnabled(True)  # Fixes bug where rows don't repopulate after a sort
+        else:
+            self.ui.labelResourceUsageMemory.setText('(none)')
+            self.ui.labelResourceUsageSwap.setText('(none)')
+        self.process_tracker.observe(self.polled_time, self.splunkd.splunk_processes or [])
+        self.show_processes()
+        self.modelResourceUsageDisks.update(self.splunkd.disk_partitions or [])
+        self.modelResourceUsageIO.update(getattr(self.splunkd, 'disk_io', None) or [])  # Missing from older snapshots
+
+    def populate_finished(self, polled_time):
+        """Update status bar with latest poll, now that no section shows cached values"""
+        self.labelCached.hide()
+        polled_local = time.strftime("%m/%d/%Y %I:%M:%S %p", time.localtime(polled_time))
+        self.statusbar_msg("Last poll completed %s" % polled_local)
+
+    def load_snapshot(self, splunkd, filename):
+        """Show an instance read from a snapshot file, with no connection to splunkd"""
+        self.disconnect()
+        self.splunkd = splunkd
+
+        # Toggle GUI fields, leaving polling disabled
+        self.ui.comboAddress.setEditText('%s:%s' % (splunkd.mgmt_host, splunkd.mgmt_port))
+        self.ui.comboAddress.setEnabled(False)
+        self.ui.editUsername.setText(splunkd.mgmt_user)
+        self.ui.editUsername.setEnabled(False)
+        self.ui.editPassword.setEnabled(False)
+        self.ui.tabWidgetMain.setEnabled(True)
+        self.ui.buttonToggle.setText('Close')
+
+        self.populate(splunkd.polled_time)
+        self.setWindowTitle('%s (snapshot) - Misner Splunk Tool' % splunkd.server_name)
+        self.ui.tabCluster.setEnabled('cluster_master' in splunkd.roles)
+        self.ui.tabSHCluster.setEnabled('shc_member' in splunkd.roles)
+        self.ui.tabDeployment.setEnabled('deployment_server' in splunkd.roles or bool(splunkd.deployment_clients))
+        polled_local = time.strftime("%m/%d/%Y %I:%M:%S %p", time.localtime(splunkd.polled_time))
+        self.statusbar_msg("Snapshot '%s', polled %s" % (os.path.basename(filename), polled_local))
 
     # Qt slots
 
@@ -1196,6 +1490,69 @@ class MainWindow(QtWidgets.QMainWindow):
             except:
                 self.warning_msg("Unable to write default configuration to '%s'" % filename)
 
+    def actionOpenSnapshot_triggered(self):
+        """File > Open Snapshot"""
+        filename, _ = QtWidgets.QFileDialog.getOpenFileName(
+            self, "Open Snapshot", SCRIPT_DIR,
+            "Misner Splunk Tool Snapshots (*%s);;All Files (*.*)" % SNAPSHOT_EXTENSION)
+        if not filename:
+            return
+
+        try:
+            # Discovery snapshots hold many instances, so ask which one to show
+            header, instances = read_snapshot(filename)
+            address = None
+            if header['kind'] == 'discovery':
+                addresses = [address for address, status, splunkd in instances if splunkd]
+                if not addresses:
+                    self.warning_msg("No successfully polled instances in snapshot '%s'." % filename)
+                    return
+                address, ok = QtWidgets.QInputDialog.getItem(self, "Open Snapshot", "Splunk instance:",
+                                                             addresses, 0, False)
+                if not ok:
+                    return
+                header, instances = read_snapshot(filename)
+            for instance_address, status, splunkd in instances:
+                if splunkd and (address is None or instance_address == address):
+                    self.load_snapshot(splunkd, filename)
+                    return
+            self.warning_msg("No successfully polled instances in snapshot '%s'." % filename)
+        except ValueError as e:
+            self.critical_msg(str(e))
+        except:
+            exc = traceback.format_exception(*sys.exc_info())
+            self.warning_msg("Exception while opening snapshot:\n\n%s" % ''.join(exc))
+
+    def actionSaveSnapshot_triggered(self):
+        """File > Save Snapshot"""
+        # Throw an error if we haven't successfully connected to a Splunk instance yet
+        try:
+            self.splunkd.report
+        except AttributeError:
+            self.warning_msg("No collected data to save.")
+            return
+
+        local_datetime_short = time.strftime("%Y%m%d-%H%M%S", time.localtime())
+        server = self.splunkd.server_name if self.splunkd.server_name else self.splunkd.mgmt_host
+        default_filename = "%s %s%s" % (local_datetime_short, server, SNAPSHOT_EXTENSION)
+
+        filename, _ = QtWidgets.QFileDialog.getSaveFileName(
+            self, "Save Snapshot", os.path.join(SCRIPT_DIR, default_filename),
+            "Misner Splunk Tool Snapshots (*%s);;All Files (*.*)" % SNAPSHOT_EXTENSION)
+        if not filename:
+            return
+
+        try:
+            host_port_pair = '%s:%s' % (self.splunkd.mgmt_host, self.splunkd.mgmt_port)
+            writer = SnapshotWriter(open(filename, 'wb'), 'instance', "v%s" % __version__)
+            writer.write(host_port_pair, 'Complete', self.splunkd, self.polled_time)
+            writer.close()
+            self.information_msg("Snapshot saved to location:\n%s" % filename.replace('/', '\\'))
+        except:
+            exc = traceback.format_exception(*sys.exc_info())
+            msg = "Exception while saving snapshot:\n\n%s" % ''.join(exc)
+            self.warning_msg(msg)
+
     def actionSaveReport_triggered(self):
         """File > Save Report"""
         # Throw an error if we haven't successfully connected to a Splunk instance yet
@@ -1205,7 +1562,6 @@ class MainWindow(QtWidgets.QMainWindow):
             self.warning_msg("No collected reporting data to save.")
             return
 
-        local_datetime_full = time.strftime("%m/%d/%Y %I:%M:%S %p", time.localtime())
         local_datetime_short = time.strftime("%Y%m%d-%H%M%S", time.localtime())
         server = self.splunkd.server_name if self.splunkd.server_name else self.splunkd.mgmt_host
         default_filename = "%s %s" % (local_datetime_short, server)
@@ -1216,18 +1572,11 @@ class MainWindow(QtWidgets.QMainWindow):
             return
 
         try:
-            # Build report text
-            report = ""
-            report += "# Misner Splunk Tool v%s by Joe Misner - http://tools.misner.net/\n" % __version__
-            report += "# Instance Report produced %s\n" % local_datetime_full
-            report += "Category,Name,Health,Value\n"
-            for entry in self.splunkd.report:
-                report += "%s,%s,%s,%s\n" % (entry['category'], entry['name'], entry['health'],
-                                             str(entry['value']).replace(',', ';'))
-
             # Save file
+            host_port_pair = '%s:%s' % (self.splunkd.mgmt_host, self.splunkd.mgmt_port)
             with open(filename, 'w') as f:
-                f.write(report)
+                write_instance_report(f, host_port_pair, self.splunkd.report, 'csv',
+                                      report_comments("v%s" % __version__, "Instance Report"))
             self.information_msg("Report saved to location:\n%s" % filename.replace('/', '\\'))
         except:
             exc = traceback.format_exception(*sys.exc_info())
@@ -1263,7 +1612,7 @@ class MainWindow(QtWidgets.QMainWindow):
 
     def actionHelp_triggered(self):
         """Help > Help dialog box"""
-        help_window.show()
+        show_help_window()
 
     def actionAbout_triggered(self):
         """Help > About dialog box"""
@@ -1297,6 +1646,46 @@ class MainWindow(QtWidgets.QMainWindow):
         if config.has_option(section, 'password'):
             self.ui.editPassword.setText(config.get(section, 'password'))
 
+    def comboResourceUsageProcesses_activated(self, index):
+        """Switches the process table between running processes, the process tree and the top CPU offenders"""
+        self.show_processes()
+        if index == 2:
+            self.ui.tableResourceUsageProcesses.sortByColumn(5, QtCore.Qt.DescendingOrder)  # CPU Time
+        else:
+            self.ui.tableResourceUsageProcesses.sortByColumn(0, QtCore.Qt.AscendingOrder)  # Process tree
+
+    def checkResourceUsageSample_toggled(self, checked):
+        """Starts or stops sampling resource usage between full polls"""
+        self.stop_sampling()
+        if checked:
+            self.sampler = ResourceSamplerWorker(self.splunkd, self.ui.spinResourceUsageSampleInterval.value())
+            self.sampler.signalSample.connect(self.sampler_sample)
+            self.sampler.signalFailed[str].connect(self.sampler_failed)
+            self.sampler.start()
+
+    def spinResourceUsageSampleInterval_changed(self, value):
+        """Changes the sampling interval, taking effect after the next sample"""
+        if self.sampler is not None:
+            self.sampler.interval = value
+
+    def sampler_sample(self, sample):
+        """Shows a resource usage sample from the sampler thread"""
+        if self.sampler is None or getattr(self, 'splunkd', None) is not self.sampler.splunkd:
+            return  # Sample arrived after sampling stopped
+        self.splunkd.update_resource_usage(sample)
+        self.ui.progressResourceUsageCPU.setValue(sample.cpu_usage)
+        self.ui.progressResourceUsageMemory.setValue(sample.mem_usage)
+        self.ui.progressResourceUsageSwap.setValue(sample.swap_usage)
+        self.process_tracker.observe(sample.time, sample.splunk_processes)
+        self.show_processes()
+        self.modelResourceUsageIO.update(sample.disk_io)
+        self.add_sparkline_samples(sample.cpu_usage, sample.mem_usage, sample.swap_usage, sample.time)
+
+    def sampler_failed(self, msg):
+        """Stops sampling after the sampler thread failed"""
+        self.ui.checkResourceUsageSample.setChecked(False)
+        self.warning_msg(msg)
+
     def actionRestartSplunkd_clicked(self):
         """Restart splunkd process"""
         # Check connection with splunkd
@@ -1359,6 +1748,9 @@ class MainWindow(QtWidgets.QMainWindow):
         # Check connection with splunkd
         try:
             self.splunkd.service.settings
+        except AttributeError:
+            self.ui.editConfig.setPlainText('Configuration values are only available while connected to splunkd.')
+            return
         except binding.AuthenticationError:
             self.disconnect()
             self.critical_msg('Splunk connection reset')
@@ -1372,7 +1764,7 @@ class MainWindow(QtWidgets.QMainWindow):
         data = self.splunkd.get_configuration_kvpairs(filename)
 
         # Use Pygments to perform syntax highlighting and translate into HTML, then display results
-        html = highlight(data, IniLexer(), HtmlFormatter(full=True, style='colorful'))
+        html = syntax_highlight(data, 'ini')
         self.ui.editConfig.setHtml(html)
         self.statusbar_msg("Poll for '%s' configuration values complete" % filename)
 
@@ -1441,7 +1833,25 @@ class MainWindow(QtWidgets.QMainWindow):
 
     def actionDiscoveryReport_clicked(self):
         """Shows DiscoveryReportWindow()"""
-        discoveryreport_window.show()
+        show_discoveryreport_window()
+
+    def actionHealthChanges_clicked(self):
+        """Shows HealthChangesWindow()"""
+        show_healthchanges_window()
+
+    def editFileStatusFilter_textChanged(self, text):
+        """Filters the Input Status > File Status table by location"""
+        self.modelFileStatus.set_filter(text.strip(), column=0)
+
+    def tabWidget_currentChanged(self, index):
+        """Fills in trees only built while shown, when their tab is chosen"""
+        self.show_file_directories()
+
+    def editFileDirectoriesFilter_textChanged(self, text):
+        """Filters the Input Status > File Directories tree by location, expanding it when few files match"""
+        self.modelFileDirectories.set_filter(text.strip())
+        if text.strip() and self.modelFileDirectories.match_count() <= EXPAND_MATCHES:
+            self.ui.treeFileDirectories.expandAll()
 
     def checkCluster_clicked(self):
         """Returns any clicked check boxes in Indexer Cluster tab back to actual values"""
@@ -1467,6 +1877,9 @@ class MainWindow(QtWidgets.QMainWindow):
         # Check connection with splunkd
         try:
             self.splunkd.service.settings
+        except AttributeError:
+            self.warning_msg("Not connected to splunkd")
+            return
         except binding.AuthenticationError:
             self.disconnect()
             self.critical_msg('Splunk connection reset')
@@ -1492,7 +1905,7 @@ class MainWindow(QtWidgets.QMainWindow):
         # Send REST API query, then use Pygments to perform syntax highlighting, translate into HTML, and display result
         try:
             result = self.splunkd.rest_call(uri, method, output_format='plaintext', body_input=body_input, **parameters)
-            html = highlight(result, XmlLexer(), HtmlFormatter(full=True, style='colorful'))
+            html = syntax_highlight(result, 'xml')
             self.ui.editRestResult.setHtml(html)
         except:
             return
@@ -1511,6 +1924,7 @@ class DiscoveryReportWindow(QtWidgets.QMainWindow):
     def __init__(self):
         """Executed when the DiscoveryReportWindow() object is created"""
         # GUI Setup
+        from misnersplunktooldiscoveryreportui import Ui_DiscoveryReportWindow
         QtWidgets.QMainWindow.__init__(self)
         self.ui = Ui_DiscoveryReportWindow()
         self.ui.setupUi(self)
@@ -1523,13 +1937,17 @@ class DiscoveryReportWindow(QtWidgets.QMainWindow):
         self.ui.buttonToggle.clicked.connect(self.buttonToggle_clicked)
         self.ui.buttonTopology.clicked.connect(self.buttonTopology_clicked)
         self.ui.buttonSaveReport.clicked.connect(self.buttonSaveReport_clicked)
+        self.ui.buttonSaveSnapshot.clicked.connect(self.buttonSaveSnapshot_clicked)
 
         # Threading Setup
         self.threadWorker = DiscoveryReportWorker()
         self.threadWorker.signalUpdateProgress[int].connect(self.threadWorker_updateprogress)
         self.threadWorker.signalUpdateTable[dict].connect(self.threadWorker_updatetable)
+        self.threadWorker.signalInstancePolled.connect(self.threadWorker_instancepolled)
+        self.threadWorker.signalHealthChanged[list].connect(self.threadWorker_healthchanged)
         self.threadWorker.signalPollingComplete[dict].connect(self.threadWorker_complete)
 
+        self.topology_window = None  # Built by the Topology button
         self.cleanup()
 
     def closeEvent(self, event):
@@ -1559,6 +1977,7 @@ class DiscoveryReportWindow(QtWidgets.QMainWindow):
         self.ui.buttonCsvBrowse.setEnabled(True)
         self.ui.buttonTopology.setEnabled(False)
         self.ui.buttonSaveReport.setEnabled(False)
+        self.ui.buttonSaveSnapshot.setEnabled(False)
         self.ui.buttonReset.setEnabled(True)
         self.ui.buttonToggle.setEnabled(True)
         self.ui.buttonToggle.setText('Start')
@@ -1567,47 +1986,37 @@ class DiscoveryReportWindow(QtWidgets.QMainWindow):
         self.filename = None
         self.instances = None
         self.splunkd_polls = None
+        if self.topology_window is not None:
+            self.topology_window.close()
+            self.topology_window = None
         self.threadWorker.quit()
         self.threadWorker.stop_execution = True
+        self.threadWorker.remove_spool()
 
     def labelHelp_linkActivated(self):
-        help_window.show()
+        show_help_window()
 
     def buttonCsvBrowse_clicked(self):
         """Selects the CSV file completed with Splunk instances and loads into memory, checking for syntax errors"""
         try:
-            # Open file dialog to have user locate the CSV file
-            self.filename, _ = QtWidgets.QFileDialog.getOpenFileName(self, "Select CSV File", os.path.dirname(sys.argv[0]),
-                                                                 "Comma-Separated Value Files (*.csv)")
+            # Open file dialog to have user locate the CSV file, or a snapshot of an earlier discovery
+            self.filename, _ = QtWidgets.QFileDialog.getOpenFileName(
+                self, "Select CSV File", os.path.dirname(sys.argv[0]),
+                "Comma-Separated Value Files (*.csv);;Misner Splunk Tool Snapshots (*%s)" % SNAPSHOT_EXTENSION)
             if not self.filename:
                 return
             self.ui.editCsvFilename.setText(self.filename.replace('/', '\\'))
-            with open(self.filename, 'rb') as f:
-                reader = csv.reader(f)
-                csvfile = list(reader)
+            if self.filename.lower().endswith(SNAPSHOT_EXTENSION):
+                self.load_snapshot(self.filename)
+                return
 
             # Build self.instances list made up of each Splunk instance in the CSV file
-            self.instances = []
-            line_number = 0
-            for line in csvfile:
-                line_number += 1
-                if not line:  # Blank line
-                    continue
-                if line[0][0] == '#':  # Comments
-                    continue
-                if line[0] == 'address':  # CSV header
-                    continue
-                if len(line) != 4:  # Not 4 comma-separated values
-                    self.critical_msg("Error on line %s of '%s':\n\nMust have four comma-separated values."
-                                      % (line_number, self.filename))
-                    self.cleanup()
-                    return
-                self.instances.append({
-                    'address': line[0],
-                    'port': int(line[1]),
-                    'username': line[2],
-                    'password': line[3].strip()
-                })
+            try:
+                self.instances = read_instances(self.filename)
+            except ValueError as e:
+                self.critical_msg(str(e))
+                self.cleanup()
+                return
 
             # Load instances into the Discovery Report window's table
             table = self.ui.tableInstances
@@ -1626,6 +2035,40 @@ class DiscoveryReportWindow(QtWidgets.QMainWindow):
             self.critical_msg("Unspecified error while loading file '%s'" % self.filename)
             self.cleanup()
 
+    def load_snapshot(self, filename):
+        """Loads a snapshot file's instances as a completed discovery, without contacting any Splunk instance"""
+        try:
+            header, instances = read_snapshot(filename)
+        except ValueError as e:
+            self.critical_msg(str(e))
+            self.cleanup()
+            return
+
+        # Fill in the table, and rebuild the spooled reports and snapshot from the saved polls
+        self.instances = []
+        splunkd_polls = {}
+        table = self.ui.tableInstances
+        report_writers, snapshot_writer = self.threadWorker.open_spool()
+        try:
+            for address, status, splunkd in instances:
+                row_number = len(self.instances)
+                self.instances.append(address)
+                table.setRowCount(row_number + 1)
+                table.setItem(row_number, 0, QtWidgets.QTableWidgetItem(address))
+                table.setItem(row_number, 1, QtWidgets.QTableWidgetItem(status))
+                for writer in report_writers:
+                    writer.write(address, status, splunkd.report if splunkd else None)
+                snapshot_writer.write(address, status, splunkd, splunkd.polled_time if splunkd else None)
+                if splunkd:
+                    splunkd_polls[address] = PollSnapshot.from_splunkd(splunkd)
+        finally:
+            self.threadWorker.close_spool(report_writers, snapshot_writer)
+
+        self.ui.buttonCsvBrowse.setEnabled(False)
+        self.show_results(splunkd_polls)
+        created_local = time.strftime("%m/%d/%Y %I:%M:%S %p", time.localtime(header.get('created', 0)))
+        self.statusbar_msg("Snapshot of %s instances, saved %s" % (len(self.instances), created_local))
+
     def buttonReset_clicked(self):
         """Reset the Discovery Report window"""
         self.cleanup()
@@ -1645,6 +2088,7 @@ class DiscoveryReportWindow(QtWidgets.QMainWindow):
                 self.critical_msg("CSV file has not been selected.")
                 return
             self.statusbar_msg("Executing discovery report...")
+            self.splunkd_polls = {}  # Filled as instances are polled, so the topology can be built along the way
             self.ui.buttonCsvBrowse.setEnabled(False)
             self.ui.buttonReset.setEnabled(False)
             self.ui.buttonToggle.setText("Stop")
@@ -1657,336 +2101,120 @@ class DiscoveryReportWindow(QtWidgets.QMainWindow):
     def buttonTopology_clicked(self):
         """Build topology from report adjacency data, then display window for adjustment and saving"""
         try:
-            # Create instances and dictionaries needed for topology building
-            Graph = networkx.Graph()         # Object containing visual topology (nodes, adjacencies, locations, etc)
+            # Build topology from polled instances, resolving the IP addresses of unmatched peers all at once
             topology = main_window.topology  # Topology configuration
-            pos = {}    # Positions of each node on the topology, representing x=0-100,y=0-100
-            labels = {  # Labels given to each node
-                'webuser': "Web User"
-            }
-            nodes = {   # Splunkd instances categorized by their discovered primary role
-                'user': frozenset({'webuser'}),
-                'sh': set(),
-                'idx': set(),
-                'hf': set(),
-                'uf': set(),
-                'mc': set(),
-                'shcd': set(),
-                'cm': set(),
-                'ds': set(),
-                'lm': set(),
-                'input': set(),
-                'other': set()
-            }
-
-            # Build invisible corner nodes to make sure matplotlib.pyplot displays a proportionate topology in 100x100
-            Graph.add_nodes_from({'cornernw', 'cornerne', 'cornersw', 'cornerse'}, color='#ffffff')
-            pos.update({'cornernw': (-10, 110), 'cornerne': (110, 110), 'cornersw': (-10, -10), 'cornerse': (110, -10)})
-
-            # Iterate through splunkd instances
-            instances = {}
-            for instance in self.splunkd_polls:
-                clean_name = str.lower(self.splunkd_polls[instance].server_name).split('.')[0]
-                instances[clean_name] = self.splunkd_polls[instance]
-                primary_role = instances[clean_name].primary_role
-                all_roles = instances[clean_name].roles
-                labels[clean_name] = "%s\n%s" % (clean_name, primary_role)
-
-                # Add to nodes dictionary based on primary role
-                if primary_role[0:11] == "Search Head":
-                    nodes['sh'].add(clean_name)
-                elif primary_role[0:7] == "Indexer":
-                    nodes['idx'].add(clean_name)
-                elif primary_role == "Heavy Forwarder":
-                    nodes['hf'].add(clean_name)
-                elif primary_role == "Universal Forwarder":
-                    nodes['uf'].add(clean_name)
-                elif primary_role == "Management Console":
-                    nodes['mc'].add(clean_name)
-                elif primary_role == "Deployer (SHC)":
-                    nodes['shcd'].add(clean_name)
-                elif primary_role == "Cluster Master":
-                    nodes['cm'].add(clean_name)
-                elif primary_role == "Deployment Server":
-                    nodes['ds'].add(clean_name)
-                elif primary_role == "License Master":
-                    nodes['lm'].add(clean_name)
-                elif primary_role == "Forwarder":
-                    nodes['uf'].add(clean_name)
-
-                # Add additional roles to label
-                if ('universal_forwarder' in all_roles) and ("Universal Forwarder" not in labels[clean_name]):
-                    labels[clean_name] += "\nUniversal Forwarder"
-                if ('management_console' in all_roles) and ("Management Console" not in labels[clean_name]):
-                    labels[clean_name] += "\nManagement Console"
-                if ('cluster_slave' in all_roles) and ("Indexer" not in labels[clean_name]):
-                    labels[clean_name] += "\nIndexer (Cluster Slave)"
-                if ('indexer' in all_roles) and ("Indexer" not in labels[clean_name]):
-                    labels[clean_name] += "\nIndexer (Standalone)"
-                if ('shc_deployer' in all_roles) and ("Deployer (SHC)" not in labels[clean_name]):
-                    labels[clean_name] += "\nDeployer (SHC)"
-                if ('shc_captain' in all_roles) and ("Search Head" not in labels[clean_name]):
-                    labels[clean_name] += "\nSearch Head (SHC Captain)"
-                if ('shc_member' in all_roles) and ("Search Head" not in labels[clean_name]):
-                    labels[clean_name] += "\nSearch Head (SHC Member)"
-                if ('cluster_master' in all_roles) and ("Cluster Master" not in labels[clean_name]):
-                    labels[clean_name] += "\nCluster Master"
-                if ('search_head' in all_roles) and ("Search Head" not in labels[clean_name]):
-                    labels[clean_name] += "\nSearch Head (Standalone)"
-                if ('deployment_server' in all_roles) and ("Deployment Server" not in labels[clean_name]):
-                    labels[clean_name] += "\nDeployment Server"
-                if ('heavyweight_forwarder' in all_roles) and ("Heavy Forwarder" not in labels[clean_name]):
-                    labels[clean_name] += "\nHeavy Forwarder"
-                if ('license_master' in all_roles) and ("License Master" not in labels[clean_name]):
-                    labels[clean_name] += "\nLicense Master"
-
-            ent_nodes = set().union(nodes['sh'], nodes['idx'], nodes['hf'], nodes['mc'],
-                                    nodes['shcd'], nodes['cm'], nodes['ds'], nodes['uf'])
-
-            # Add nodes to graph
-            if topology['nodedraw_user']:
-                Graph.add_nodes_from(nodes['user'], color='#' + topology['nodecolor_user'])
-            if topology['nodedraw_searchhead']:
-                Graph.add_nodes_from(nodes['sh'], color='#' + topology['nodecolor_searchhead'])
-            if topology['nodedraw_indexer']:
-                Graph.add_nodes_from(nodes['idx'], color='#' + topology['nodecolor_indexer'])
-            if topology['nodedraw_heavyforwarder']:
-                Graph.add_nodes_from(nodes['hf'], color='#' + topology['nodecolor_heavyforwarder'])
-            if topology['nodedraw_universalforwarder']:
-                Graph.add_nodes_from(nodes['uf'], color='#' + topology['nodecolor_universalforwarder'])
-            if topology['nodedraw_mgmtconsole']:
-                Graph.add_nodes_from(nodes['mc'], color='#' + topology['nodecolor_mgmtconsole'])
-            if topology['nodedraw_shcdeployer']:
-                Graph.add_nodes_from(nodes['shcd'], color='#' + topology['nodecolor_shcdeployer'])
-            if topology['nodedraw_clustermaster']:
-                Graph.add_nodes_from(nodes['cm'], color='#' + topology['nodecolor_clustermaster'])
-            if topology['nodedraw_deploymentserver']:
-                Graph.add_nodes_from(nodes['ds'], color='#' + topology['nodecolor_deploymentserver'])
-            if topology['nodedraw_licensemaster']:
-                Graph.add_nodes_from(nodes['lm'], color='#' + topology['nodecolor_licensemaster'])
-            if topology['nodedraw_inputs']:
-                Graph.add_nodes_from(nodes['input'], color='#' + topology['nodecolor_inputs'])
-
-            # Function used to add adjacencies and discover new Splunk instances
-            def add_adjacency(discovered_node, dn_role, dn_color, adj_node, adj_color):
-                if discovered_node[0] == '(' and discovered_node[-1:] == ')':
-                    return
-                discovered_node = discovered_node.split(':')[0]  # Return address without port
 
-                # If IP address, try and resolve to host
-                ipaddr_regex = r"\b(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\b"
-                if re.findall(ipaddr_regex, discovered_node):
-                    try:
-                        discovered_node = socket.gethostbyaddr(discovered_node)[0].lower().split('.')[0]  # Resolved by DNS, return hostname without suffix
-                    except:
-                        pass  # Not found by DNS, return IP
-                else:
-                    discovered_node = discovered_node.lower().split('.')[0]  # Not an IP, return hostname without suffix
-
-                if discovered_node not in Graph.nodes:
-                    nodes[dn_role].add(discovered_node)
-                    labels[discovered_node] = "%s\nDiscovered Node" % discovered_node
-                    Graph.add_node(discovered_node, color='#' + topology[dn_color])
-                Graph.add_edge(discovered_node, adj_node, color='#' + topology[adj_color])
-
-            # Map adjacencies between nodes
-            #  Web Access to Search Heads
-            if topology['adjdraw_web']:
-                for sh in nodes['sh']:
-                    if sh not in instances:
-                        continue
-                    if instances[sh].http_server:
-                        if (nodes['user'] in Graph.nodes) and (sh in Graph.nodes):
-                            Graph.add_edge(nodes['user'], sh, color='#' + topology['adjcolor_web'])
-            #  Distributed Search from Search Heads
-            if topology['adjdraw_distsearch']:
-                for sh in nodes['sh']:
-                    if sh not in instances:
-                        continue
-                    for peer in instances[sh].distributedsearch_peers:
-                        add_adjacency(peer['peerName'], 'idx', 'nodecolor_indexer', sh, 'adjcolor_distsearch')
-            #  Data Forwarding from Heavy Forwarder
-            if topology['adjdraw_datafwdheavyforwarder']:
-                for hf in nodes['hf']:
-                    if hf not in instances:
-                        continue
-                    for server in instances[hf].forward_servers:
-                        add_adjacency(server['title'], 'idx', 'nodecolor_indexer', hf, 'adjcolor_datafwd')
-            #  Data Forwarding from Universal Forwarder
-            if topology['adjdraw_datafwduniversalforwarder']:
-                for uf in nodes['uf']:
-                    if uf not in instances:
-                        continue
-                    for server in instances[uf].forward_servers:
-                        add_adjacency(server['title'], 'idx', 'nodecolor_indexer', uf, 'adjcolor_datafwd')
-            #  Data Forwarding from Inputs
-            if topology['adjdraw_datafwdinput']:
-                for ipt in nodes['input']:
-                    if ipt not in instances:
-                        continue
-                    for server in instances[ipt].forward_servers:
-                        add_adjacency(server['title'], 'idx', 'nodecolor_indexer', ipt, 'adjcolor_datafwd')
-            #  Cluster Management
-            if topology['adjdraw_clustermgmt']:
-                for cm in nodes['cm']:
-                    if cm not in instances:
-                        continue
-                    for peer in instances[cm].cluster_peers:
-                        add_adjacency(peer['location'], 'idx', 'nodecolor_indexer', cm, 'adjcolor_clustermgmt')
-            #  Bucket Replication
-            if topology['adjdraw_bucketrep']:
-                for idx in nodes['idx']:
-                    if idx not in instances:
-                        continue
-                    for peer in instances[idx].cluster_peers:
-                        add_adjacency(peer['location'], 'idx', 'nodecolor_indexer', idx, 'adjcolor_bucketrep')
-            #  SHC Deployer
-            if topology['adjdraw_shcdeployment']:
-                for sh in nodes['sh']:
-                    if sh not in instances:
-                        continue
-                    deployer = instances[sh].shcluster_deployer
-                    add_adjacency(deployer, 'shcd', 'nodecolor_shcdeployer', sh, 'adjcolor_shcdeployment')
-            #  Since potentially discovered nodes below don't have a clear Splunk role, discover them last
-            #  Distributed Search from Management Console
-            if topology['adjdraw_mgmtconsole']:
-                for mc in nodes['mc']:
-                    for peer in instances[mc].distributedsearch_peers:
-                        add_adjacency(peer['peerName'], 'other', 'nodecolor_others', mc, 'adjcolor_mgmtconsole')
-            #  Deployment Server
-            if topology['adjdraw_deployment']:
-                for ds in nodes['ds']:
-                    for client in instances[ds].deployment_clients:
-                        dns_mgmt_pair = '%s:%s' % (client['dns'], client['mgmt'])
-                        add_adjacency(dns_mgmt_pair, 'other', 'nodecolor_others', ds, 'adjcolor_deployment')
-            #  License
-            if topology['adjdraw_license']:
-                for slave in ent_nodes:
-                    license_master = instances[slave].license_master
-                    add_adjacency(license_master, 'other', 'nodecolor_others', slave, 'adjcolor_license')
+            def resolve(addresses):
+                self.statusbar_msg("Resolving %s addresses..." % len(addresses))
+                QtWidgets.QApplication.processEvents(QtCore.QEventLoop.ExcludeUserInputEvents)
+                try:
+                    return main_window.resolver.resolve(addresses, threads=topology['dns_threads'],
+                                                        timeout=topology['dns_timeout'], ttl=topology['dns_ttl'],
+                                                        negative_ttl=topology['dns_negative_ttl'])
+                finally:
+                    self.statusbar_msg(None)
+
+            built = build_topology(dict(self.splunkd_polls), topology, resolve)  # Copied, as polls arrive meanwhile
 
             # Return error if not enough nodes to paint
-            if len(Graph.nodes) <= 1:
+            if len(built.visible(topology)[0]) <= 1:
                 self.warning_msg("Not enough nodes found to build topology.")
                 return
 
-            # Function used to compute positions where nodes are placed on each layer
-            def layer_positions(layernodes, layerheight=0, bufferwidth=10, xalignment='justify'):
-                if not layernodes:
-                    return {}
-                positions = {}
-                # If statically separated nodes are too wide, justify instead
-                if (topology['static_width'] * len(layernodes)) > 100 - (bufferwidth * 2):
-                    xalignment = 'justify'
-                if xalignment == 'left':  # left-aligned and statically separated
-                    xpos = bufferwidth
-                    for node in layernodes:
-                        positions[node] = (xpos, layerheight)
-                        xpos += topology['static_width']
-                if xalignment == 'right':  # right-aligned and statically separated
-                    xpos = 100 - bufferwidth
-                    for node in layernodes:
-                        positions[node] = (xpos, layerheight)
-                        xpos -= topology['static_width']
-                if xalignment in ('center', 'justify'):  # center-aligned and evenly justified
-                    nodewidth = (100 - (bufferwidth * 2)) / len(layernodes)
-                    xpos = bufferwidth + (nodewidth / 2)
-                    for node in layernodes:
-                        positions[node] = (xpos, layerheight)
-                        xpos += nodewidth
-                return positions
-
-            # Determine x-coordinate positions of nodes, along with y-coordinate layer height
-            pos.update(layer_positions(sorted(nodes['user']), layerheight=topology['layerheight_user'],
-                                       xalignment=topology['layeralignment_user']))
-            pos.update(layer_positions(sorted(nodes['mc']), layerheight=topology['layerheight_mc'],
-                                       xalignment=topology['layeralignment_mc']))
-            pos.update(layer_positions(sorted(nodes['shcd']), layerheight=topology['layerheight_shcd'],
-                                       xalignment=topology['layeralignment_shcd']))
-            pos.update(layer_positions(sorted(nodes['sh']), layerheight=topology['layerheight_sh'],
-                                       xalignment=topology['layeralignment_sh']))
-            pos.update(layer_positions(sorted(nodes['cm']), layerheight=topology['layerheight_cm'],
-                                       xalignment=topology['layeralignment_cm']))
-            pos.update(layer_positions(sorted(nodes['idx']), layerheight=topology['layerheight_idx'],
-                                       xalignment=topology['layeralignment_idx']))
-            pos.update(layer_positions(sorted(nodes['lm']), layerheight=topology['layerheight_lm'],
-                                       xalignment=topology['layeralignment_lm']))
-            pos.update(layer_positions(sorted(nodes['hf']), layerheight=topology['layerheight_hf'],
-                                       xalignment=topology['layeralignment_hf']))
-            pos.update(layer_positions(sorted(nodes['ds']), layerheight=topology['layerheight_ds'],
-                                       xalignment=topology['layeralignment_ds']))
-            pos.update(layer_positions(sorted(nodes['uf']), layerheight=topology['layerheight_uf'],
-                                       xalignment=topology['layeralignment_uf']))
-            pos.update(layer_positions(sorted(nodes['input']), layerheight=topology['layerheight_input'],
-                                       xalignment=topology['layeralignment_input']))
-            pos.update(layer_positions(sorted(nodes['other']), layerheight=topology['layerheight_other'],
-                                       xalignment=topology['layeralignment_other']))
-
-            # Draw topology
-            node_colors = [Graph.nodes[n]['color'] for n in Graph.nodes()]
-            edge_colors = [Graph[a][b]['color'] for a, b in Graph.edges()]
-            networkx.draw(Graph, pos=pos, labels=labels, with_labels=True, font_size=topology['fontsize'],
-                          alpha=0.8, node_color=node_colors, edge_color=edge_colors)
-
-            # Open new window displaying topology, with option to save
-            matplotlib.pyplot.get_current_fig_manager().canvas.set_window_title('Topology')
-            matplotlib.pyplot.show()
+            # Update the open topology window, keeping its nodes in place, or open a new one
+            if self.topology_window is not None and self.topology_window.isVisible():
+                self.topology_window.set_topology(built)
+                self.topology_window.raise_()
+                self.topology_window.activateWindow()
+                return
+            if self.topology_window is not None:
+                self.topology_window.close()
+            self.topology_window = TopologyWindow(built, topology, main_window.layout_store)
+            self.topology_window.setWindowIcon(main_window.windowIcon())
+            self.topology_window.instanceActivated.connect(self.topology_window_instanceActivated)
+            self.topology_window.show()
         except:
             exc = traceback.format_exception(*sys.exc_info())
             msg = "Exception while building topology:\n\n%s" % ''.join(exc)
             self.warning_msg(msg)
 
-    def buttonSaveReport_clicked(self):
-        """Save the discovered data as a CSV file"""
-        # Build report
+    def topology_window_instanceActivated(self, address):
+        """Shows the polled data of an instance clicked on the topology in the main window, read back from the
+        snapshot spooled while polling"""
+        filename = self.threadWorker.spool_files.get('snapshot')
         try:
-            # Build report text
-            local_datetime_full = time.strftime("%m/%d/%Y %I:%M:%S %p", time.localtime())
-            local_datetime_short = time.strftime("%Y%m%d-%H%M%S", time.localtime())
-            report = ""
-            report += "# Misner Splunk Tool v%s by Joe Misner - http://tools.misner.net/\n" % __version__
-            report += "# Discovery Report produced %s\n" % local_datetime_full
-
-            # Get "category / name" columns from a successful splunkd's report to build the header, then break
-            header = []
-            for instance in self.splunkd_polls:
-                if self.splunkd_polls[instance].report:
-                    for entry in self.splunkd_polls[instance].report:
-                        header.append('%s: %s' % (entry['category'], entry['name']))
-                    report += "%s\n" % ','.join(header)
-                    break
-
-            # Return error if not enough nodes to paint
-            if not header:
-                self.warning_msg("No successful splunkd polls retrieved to generate a report.")
-                return
+            if filename:
+                header, instances = read_snapshot(filename)
+                for instance_address, status, splunkd in instances:
+                    if instance_address == address and splunkd:
+                        main_window.load_snapshot(splunkd, filename)
+                        main_window.show()
+                        main_window.raise_()
+                        main_window.activateWindow()
+                        return
+            self.warning_msg("No polled data for instance '%s'." % address)
+        except:
+            exc = traceback.format_exception(*sys.exc_info())
+            self.warning_msg("Exception while opening polled data:\n\n%s" % ''.join(exc))
 
-            # Pull values from each instance into a comma-separated string
-            for instance in self.splunkd_polls:
-                entries = []
-                for entry in self.splunkd_polls[instance].report:
-                    entries.append(str(entry['value']).replace(',', ';'))
-                report += "%s\n" % ','.join(entries)
+    def buttonSaveReport_clicked(self):
+        """Save the discovered data as a CSV or JSON Lines file, copying the report spooled while polling, with a
+        fleet summary sheet of the polled instances next to it"""
+        # Return error if no instances made it into the report
+        if not self.threadWorker.report_rows:
+            self.warning_msg("No successful splunkd polls retrieved to generate a report.")
+            return
 
+        try:
             # Get destination filename from user for the completed report
+            local_datetime_short = time.strftime("%Y%m%d-%H%M%S", time.localtime())
             default_filename = "%s Discovery Report" % local_datetime_short
-            filename, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Save Discovery Report",
-                                                            os.path.join(SCRIPT_DIR, default_filename),
-                                                            "CSV (Comma delimited) (*.csv);;All Files (*.*)")
+            filename, selected_filter = QtWidgets.QFileDialog.getSaveFileName(
+                self, "Save Discovery Report", os.path.join(SCRIPT_DIR, default_filename),
+                "CSV (Comma delimited) (*.csv);;JSON Lines (*.jsonl);;All Files (*.*)")
 
             # If user cancels the Save Discovery Report dialog, report data is discarded
             if not filename:
                 return
 
             # Save file
-            with open(filename, 'w') as f:
-                f.write(report)
-                self.information_msg("Report saved to location:\n%s" % filename.replace('/', '\\'))
+            if filename.lower().endswith('.jsonl') or selected_filter.startswith('JSON'):
+                output_format = 'jsonl'
+            else:
+                output_format = 'csv'
+            shutil.copyfile(self.threadWorker.spool_files[output_format], filename)
+            summary_file = summary_filename(filename)
+            with open(summary_file, 'w') as f:
+                write_fleet_summary(f, FleetSummary(main_window.healthchecks, self.splunkd_polls), output_format,
+                                    report_comments("v%s" % __version__, "Discovery Report Summary"))
+            self.information_msg("Report saved to location:\n%s\n\nFleet summary saved to location:\n%s"
+                                 % (filename.replace('/', '\\'), summary_file.replace('/', '\\')))
         except:
             exc = traceback.format_exception(*sys.exc_info())
             msg = "Exception while building report:\n\n%s" % ''.join(exc)
             self.warning_msg(msg)
 
+    def buttonSaveSnapshot_clicked(self):
+        """Save every polled instance as a snapshot file, copying the snapshot spooled while polling"""
+        if 'snapshot' not in self.threadWorker.spool_files:
+            self.warning_msg("No discovery data to save.")
+            return
+
+        try:
+            local_datetime_short = time.strftime("%Y%m%d-%H%M%S", time.localtime())
+            default_filename = "%s Discovery%s" % (local_datetime_short, SNAPSHOT_EXTENSION)
+            filename, _ = QtWidgets.QFileDialog.getSaveFileName(
+                self, "Save Snapshot", os.path.join(SCRIPT_DIR, default_filename),
+                "Misner Splunk Tool Snapshots (*%s);;All Files (*.*)" % SNAPSHOT_EXTENSION)
+            if not filename:
+                return
+            shutil.copyfile(self.threadWorker.spool_files['snapshot'], filename)
+            self.information_msg("Snapshot saved to location:\n%s" % filename.replace('/', '\\'))
+        except:
+            exc = traceback.format_exception(*sys.exc_info())
+            msg = "Exception while saving snapshot:\n\n%s" % ''.join(exc)
+            self.warning_msg(msg)
+
     def threadWorker_updateprogress(self, progress):
         """Update the statusbar with a message from the worker thread"""
         if progress == 0:
@@ -2006,20 +2234,34 @@ class DiscoveryReportWindow(QtWidgets.QMainWindow):
         except AttributeError:  # table was likely reset
             pass
 
+    def threadWorker_instancepolled(self, address, poll):
+        """Adds an instance polled by the worker thread, so the topology can be built before the discovery is done"""
+        if self.splunkd_polls is not None:
+            self.splunkd_polls[address] = poll
+            self.ui.buttonTopology.setEnabled(True)
+
+    def threadWorker_healthchanged(self, changes):
+        """Passes on the health checks of a polled instance that changed since it was last polled"""
+        main_window.add_health_changes(changes)
+
     def threadWorker_complete(self, splunkd_polls):
         """Called when the worker thread is done polling Splunk instances"""
-        # splunkd_polls is a list of dictionaries, one for each polled Splunk instance
+        # Notify user that polling is complete
+        self.show_results(splunkd_polls)
+        self.statusbar_msg("Complete")
+        self.information_msg("Discovery Report generation complete.")
+
+    def show_results(self, splunkd_polls):
+        """Enables the topology and saving once a discovery is complete"""
+        # splunkd_polls is a dictionary of PollSnapshot records keyed by host:port, one for each polled Splunk instance
         # Save to instance attribute for use later when creating a Topology
         self.splunkd_polls = splunkd_polls
-
-        # Notify user that polling is complete
         self.ui.buttonReset.setEnabled(True)
         self.ui.buttonToggle.setEnabled(False)
         self.ui.buttonTopology.setEnabled(True)
         self.ui.buttonSaveReport.setEnabled(True)
+        self.ui.buttonSaveSnapshot.setEnabled(True)
         self.ui.progressBar.setValue(100)
-        self.statusbar_msg("Complete")
-        self.information_msg("Discovery Report generation complete.")
 
 
 class DiscoveryReportWorker(QtCore.QThread):
@@ -2029,6 +2271,8 @@ class DiscoveryReportWorker(QtCore.QThread):
     signalUpdateProgress = QtCore.Signal(int)
     signalUpdateTable = QtCore.Signal(dict)
     signalPollingComplete = QtCore.Signal(dict)
+    signalInstancePolled = QtCore.Signal(str, object)
+    signalHealthChanged = QtCore.Signal(list)
     mutex = QtCore.QMutex()
 
     def __init__(self):
@@ -2037,6 +2281,40 @@ class DiscoveryReportWorker(QtCore.QThread):
         self.signalInstanceData[list].connect(self.signalInstanceData_write)
         self.stop_execution = True
         self.instances = []
+        self.spool_files = {}  # Report format or 'snapshot' -> temporary file written to while polling
+        self.report_rows = 0
+
+    def open_spool(self):
+        """Replaces the temporary files with new ones, returning a report writer for each format and a snapshot
+        writer"""
+        self.remove_spool()
+        report_writers = []
+        comments = report_comments("v%s" % __version__, "Discovery Report")
+        for output_format in REPORT_FORMATS:
+            handle, filename = tempfile.mkstemp(prefix='misnersplunktool-', suffix='.%s' % output_format)
+            self.spool_files[output_format] = filename
+            report_writers.append(DiscoveryReportWriter(os.fdopen(handle, 'w'), main_window.healthchecks,
+                                                        output_format, comments))
+        handle, filename = tempfile.mkstemp(prefix='misnersplunktool-', suffix=SNAPSHOT_EXTENSION)
+        self.spool_files['snapshot'] = filename
+        snapshot_writer = SnapshotWriter(os.fdopen(handle, 'wb'), 'discovery', "v%s" % __version__)
+        return report_writers, snapshot_writer
+
+    def close_spool(self, report_writers, snapshot_writer):
+        """Closes the writers returned by open_spool()"""
+        for writer in report_writers + [snapshot_writer]:
+            writer.close()
+        self.report_rows = report_writers[0].rows
+
+    def remove_spool(self):
+        """Deletes the temporary report and snapshot files from the last discovery"""
+        for filename in self.spool_files.values():
+            try:
+                os.remove(filename)
+            except OSError:
+                pass
+        self.spool_files = {}
+        self.report_rows = 0
 
     def signalInstanceData_write(self, instances):
         """Capture list of Splunk instances to iterate through from the main thread"""
@@ -2048,96 +2326,172 @@ class DiscoveryReportWorker(QtCore.QThread):
 
     def poll(self):
         """Execute the discovery report, polling all Splunk instances"""
+        # Spool the report in each format and a snapshot to temporary files as instances complete, ready for saving
+        report_writers, snapshot_writer = self.open_spool()
+
         # Iterate through instances
         splunkd_polls = {}
-        for instance in self.instances:
-            if self.stop_execution:
-                self.signalUpdateProgress.emit(0)
-                return
-
-            # Setup before polling
-            instance_number = self.instances.index(instance) + 1
-            self.signalUpdateProgress.emit(instance_number)
-            splunk_host = instance['address']
-            splunk_port = instance['port']
-            splunk_user = instance['username']
-            splunk_pass = instance['password']
-
-            def instance_status(msg):
-                """Update Discovery Report window's table with Splunk instance's polling status"""
-                row_number = instance_number - 1
-                self.signalUpdateTable.emit({'row': row_number, 'text': msg})
-
-            # Connect to Splunk instance
-            instance_status("Connecting...")
-            try:
-                splunkd = Splunkd(splunk_host, splunk_port, splunk_user, splunk_pass)
-            except binding.AuthenticationError:
-                instance_status("Failed: Authentication error")
-                continue
-            except socket.gaierror:
-                instance_status("Failed: Unable to connect")
-                continue
-            except socket.error as error:
-                instance_status("Failed: Unable to connect (%s)" % error)
-                continue
-            except:
-                instance_status("Failed: Unable to connect (unknown exception)")
-                continue
-            instance_status("Connected")
+        statuses = {}
+        self.signalUpdateProgress.emit(1)
 
-            # Poll Splunk instance
-            try:
-                instance_status('Polling service info...')
-                splunkd.poll_service_info()
-                instance_status('Polling settings...')
-                splunkd.poll_service_settings()
-                instance_status('Polling messages...')
-                splunkd.poll_service_messages()
-                instance_status('Polling configurations...')
-                splunkd.get_service_confs()
-                instance_status('Polling input status...')
-                splunkd.get_services_admin_inputstatus()
-                instance_status('Polling apps...')
-                splunkd.poll_service_apps()
-                instance_status('Polling data collection info...')
-                splunkd.get_services_data()
-                instance_status('Polling KV store info...')
-                splunkd.get_services_kvstore()
-                instance_status('Polling cluster master info...')
-                splunkd.get_services_cluster()
-                instance_status('Polling search head cluster info...')
-                splunkd.get_services_shcluster()
-                instance_status('Polling deployment info...')
-                splunkd.get_services_deployment()
-                instance_status('Polling licensing info...')
-                splunkd.get_services_licenser()
-                instance_status('Polling distributed search info...')
-                splunkd.get_services_search()
-                instance_status('Polling introspection...')
-                splunkd.get_services_server_status()
-            except socket.error as e:
-                instance_status("Failed: Socket error while attempting to poll splunkd:\n%s" % e)
-                continue
-
-            # Build instance report
-            instance_status('Building instance report...')
-            try:
-                splunkd.report_builder(main_window.healthchecks)
-            except:
-                instance_status("Failed: Unable to build instance report")
-                continue
+        def instance_status(instance_number, msg):
+            """Update Discovery Report window's table with Splunk instance's polling status"""
+            statuses[instance_number] = msg
+            self.signalUpdateTable.emit({'row': instance_number - 1, 'text': msg})
 
-            # Success
-            host_port_pair = "%s:%s" % (splunk_host, splunk_port)
-            splunkd_polls[host_port_pair] = splunkd
-            instance_status("Complete")
+        try:
+            completed = 0
+            for instance_number, instance, splunkd in discover(self.instances, main_window.healthchecks,
+                                                               status=instance_status,
+                                                               stopped=lambda: self.stop_execution):
+                if self.stop_execution:
+                    self.signalUpdateProgress.emit(0)
+                    return
+                completed += 1
+                self.signalUpdateProgress.emit(min(completed + 1, len(self.instances)))
+
+                # Write to the report and snapshot, then keep a compact snapshot of successful polls for the topology
+                host_port_pair = "%s:%s" % (instance['address'], instance['port'])
+                status = statuses.get(instance_number, 'Failed')
+                for writer in report_writers:
+                    writer.write(host_port_pair, status, splunkd.report if splunkd else None)
+                snapshot_writer.write(host_port_pair, status, splunkd)
+                if splunkd:
+                    splunkd_polls[host_port_pair] = PollSnapshot.from_splunkd(splunkd)
+                    self.signalInstancePolled.emit(host_port_pair, splunkd_polls[host_port_pair])
+                    if main_window.metrics:
+                        main_window.metrics.record(host_port_pair, splunkd)
+                    changes = main_window.health_states.update(host_port_pair, splunkd.report)
+                    if changes:
+                        self.signalHealthChanged.emit(changes)
+        finally:
+            self.close_spool(report_writers, snapshot_writer)
+            for store in (main_window.metrics, main_window.health_states):
+                if store:
+                    try:
+                        store.save()
+                    except (IOError, OSError):
+                        pass
 
         # Notify main thread that polling is complete, sending over the data from all instances
         self.signalPollingComplete.emit(splunkd_polls)
         self.quit()
 
 
+class ResourceSamplerWorker(QtCore.QThread):
+    """Samples host-wide and Splunk process resource usage on its own worker thread, using its own pooled session,
+    without running the rest of a full poll"""
+    # Class attribute used for cross-thread communications
+    signalSample = QtCore.Signal(object)
+    signalFailed = QtCore.Signal(str)
+
+    def __init__(self, splunkd, interval):
+        """Constructor, taking the connected Splunkd and the seconds between samples"""
+        QtCore.QThread.__init__(self)
+        self.splunkd = splunkd
+        self.interval = interval
+        self.stop_execution = False
+
+    def run(self):
+        """Worker thread started"""
+        session = requests.Session()
+        try:
+            while not self.stop_execution:
+                started = time.time()
+                try:
+                    sample = self.splunkd.sample_resource_usage(session)
+                except KeyError:
+                    self.signalFailed.emit("This instance doesn't report host-wide resource usage")
+                    return
+                except (socket.error, requests.RequestException) as e:
+                    self.signalFailed.emit("Stopped sampling resource usage:\n%s" % e)
+                    return
+                self.signalSample.emit(sample)
+
+                # Wait out the rest of the interval in short steps, so stopping is quick
+                while not self.stop_execution and time.time() - started < self.interval:
+                    self.msleep(20)
+        finally:
+            session.close()
+
+
+class HealthChangesWindow(QtWidgets.QMainWindow):
+    """Window listing only the health checks that changed between polls, of the connected instance and of every
+    discovery, newest first"""
+    def __init__(self):
+        """Executed when the HealthChangesWindow() object is created"""
+        # GUI Setup
+        QtWidgets.QMainWindow.__init__(self)
+        self.setWindowTitle("Health Changes")
+        self.setWindowIcon(main_window.windowIcon())
+        self.resize(900, 400)
+        self.modelChanges = RowTableModel([
+            ('Time', 'time', numeric_key, format_time),
+            ('Address', 'address'),
+            ('Category', 'category'),
+            ('Name', 'name'),
+            ('Previous', 'previous'),
+            ('Health', 'health'),
+            ('Value', 'value'),
+            ('Polls', 'polls', numeric_key)
+        ], parent=self)
+        self.tableChanges = QtWidgets.QTableView(self)
+        self.tableChanges.setModel(self.modelChanges)
+        self.tableChanges.setSortingEnabled(True)
+        self.tableChanges.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.tableChanges.verticalHeader().hide()
+        self.tableChanges.setColumnWidth(0, 140)  # Time
+        self.tableChanges.setColumnWidth(1, 150)  # Address
+        self.tableChanges.setColumnWidth(3, 170)  # Name
+        self.tableChanges.setColumnWidth(7, 50)   # Polls
+        self.tableChanges.sortByColumn(0, QtCore.Qt.DescendingOrder)
+        self.setCentralWidget(self.tableChanges)
+
+        toolbar = self.addToolBar("Health Changes")
+        toolbar.setMovable(False)
+        self.editFilter = QtWidgets.QLineEdit(self)
+        self.editFilter.setPlaceholderText("Filter by address")
+        self.editFilter.setMaximumWidth(250)
+        self.editFilter.textChanged.connect(self.editFilter_textChanged)
+        toolbar.addWidget(self.editFilter)
+        toolbar.addAction("Save...", self.save)
+        toolbar.addAction("Clear", self.clear)
+        self.changes = []
+
+    def add_changes(self, changes):
+        """Adds HealthChange records to the list"""
+        self.changes.extend(changes)
+        self.modelChanges.load(self.changes)
+        worse = sum(1 for change in self.changes if is_worse(change))
+        self.statusBar().showMessage("%s changes, %s to a worse health" % (len(self.changes), worse))
+
+    def clear(self):
+        """Clears the list, and the changes kept since the tool was started"""
+        self.changes = []
+        del main_window.health_changes[:]
+        self.add_changes([])
+
+    def save(self):
+        """Saves the listed changes as a CSV or JSON Lines file"""
+        local_datetime_short = time.strftime("%Y%m%d-%H%M%S", time.localtime())
+        filename, selected_filter = QtWidgets.QFileDialog.getSaveFileName(
+            self, "Save Health Changes", os.path.join(SCRIPT_DIR, "%s Health Changes" % local_datetime_short),
+            "CSV (Comma delimited) (*.csv);;JSON Lines (*.jsonl);;All Files (*.*)")
+        if not filename:
+            return
+        output_format = 'jsonl' if filename.lower().endswith('.jsonl') or selected_filter.startswith('JSON') else 'csv'
+        try:
+            with open(filename, 'w') as f:
+                write_health_changes(f, self.changes, output_format,
+                                     report_comments("v%s" % __version__, "Health Changes"))
+        except IOError as e:
+            QtWidgets.QMessageBox.warning(self, "Health Changes", "Unable to save health changes:\n%s" % e)
+
+    def editFilter_textChanged(self, text):
+        """Filters the list by address"""
+        self.modelChanges.set_filter(text.strip(), column=1)
+
+
 class HelpWindow(QtWidgets.QTextEdit):
     """Object class for the help window"""
     def __init__(self):
@@ -2151,6 +2505,7 @@ class HelpWindow(QtWidgets.QTextEdit):
         self.resize(500, 400)
 
         # Retrieve markdown text from the README.md file in the script directory
+        import markdown
         try:
             with open(os.path.join(SCRIPT_DIR, 'README.md'), 'r') as f:
                 readme_file = f.read()
@@ -2162,25 +2517,16 @@ class HelpWindow(QtWidgets.QTextEdit):
 
 if __name__ == '__main__':
     # Pull available configs from misnertraptool.conf
-    config = ConfigParser.ConfigParser(allow_no_value=True)
     config_file = os.path.join(SCRIPT_DIR, CONFIG_FILENAME)
-    if os.path.isfile(config_file):  # Read in configuration file if it exists
-        try:
-            config.read(config_file)
-        except ConfigParser.ParsingError, e:
-            pass
-    else:  # If configuration file is missing, build a default file
-        try:
-            with open(config_file, 'w') as f:
-                f.write(CONFIG_DEFAULT)
-            config.read(config_file)
-        except:
-            pass
+    config = read_config(config_file)
 
     # PySide GUI
     app = QtWidgets.QApplication(sys.argv)
     main_window = MainWindow()
-    help_window = HelpWindow()
-    discoveryreport_window = DiscoveryReportWindow()
+    help_window = None  # Built on first use by show_help_window()
+    discoveryreport_window = None  # Built on first use by show_discoveryreport_window()
+    healthchanges_window = None  # Built on first use by show_healthchanges_window()
+    if '--benchmark-startup' in sys.argv:
+        QtCore.QTimer.singleShot(0, benchmark_startup_finished)
 
     sys.exit(app.exec_())
@@ -10,6 +10,7 @@ added_files1 = [
 a = Analysis(
   ['misnersplunktool.py'],
   hookspath=None,
+  hiddenimports=['numpy'],  # Required by the health checks, fleet summary and load distribution
   datas=added_files1,
   excludes=[
     #'FixTk',
@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+"""
+misnersplunktoolbenchmark.py - Misner Splunk Tool Startup Benchmark
+Copyright (C) 2015-2018 Joe Misner <joe@misner.net>
+http://tools.misner.net/
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program; if not, write to the Free Software Foundation,
+Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301  USA
+
+Dependencies:
+- Python 64-bit v2.7.15, https://www.python.org/
+- Python module 'misnersplunktool.py'
+
+Launches misnersplunktool.py with --benchmark-startup, which quits as soon as the main window is shown and the
+event loop is idle, and times each launch. Exits with status 1 if the best launch exceeds the startup budget, or if
+any module meant to be imported lazily was loaded during startup.
+
+Usage:
+  python misnersplunktoolbenchmark.py [--runs 5] [--budget 2.0] [--offscreen]
+
+Changelog:
+2026.10.18 - initial version
+"""
+
+import sys
+import os
+import time
+import argparse
+import subprocess
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+STARTUP_BUDGET = 2.0  # seconds from process launch until the main window is usable
+
+
+def launch(offscreen):
+    """Runs misnersplunktool.py once, returning the elapsed seconds and the lazy modules it reported as loaded"""
+    command = [sys.executable, os.path.join(SCRIPT_DIR, 'misnersplunktool.py'), '--benchmark-startup']
+    if offscreen:
+        command += ['-platform', 'offscreen']
+    start = time.time()
+    output = subprocess.check_output(command, cwd=SCRIPT_DIR)
+    elapsed = time.time() - start
+    return elapsed, output.split()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure Misner Splunk Tool cold start time against a budget")
+    parser.add_argument('--runs', type=int, default=5, help="number of launches to time (default 5)")
+    parser.add_argument('--budget', type=float, default=STARTUP_BUDGET,
+                        help="maximum seconds allowed for the best launch (default %s)" % STARTUP_BUDGET)
+    parser.add_argument('--offscreen', action='store_true', help="use Qt's offscreen platform, for headless hosts")
+    args = parser.parse_args()
+
+    timings = []
+    loaded = set()
+    for run in range(args.runs):
+        elapsed, modules = launch(args.offscreen)
+        timings.append(elapsed)
+        loaded.update(modules)
+        print "Run %s: %.3f seconds" % (run + 1, elapsed)
+
+    timings.sort()
+    best = timings[0]
+    median = timings[len(timings) // 2]
+    print "Best %.3f seconds, median %.3f seconds, budget %.3f seconds" % (best, median, args.budget)
+
+    failed = False
+    if loaded:
+        print "FAIL: lazily imported modules loaded during startup: %s" % ', '.join(sorted(loaded))
+        failed = True
+    if best > args.budget:
+        print "FAIL: startup exceeded budget"
+        failed = True
+    if not failed:
+        print "PASS"
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
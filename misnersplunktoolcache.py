@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+"""
+misnersplunktoolcache.py - Misner Splunk Tool Last Poll Cache
+Copyright (C) 2015-2018 Joe Misner <joe@misner.net>
+http://tools.misner.net/
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program; if not, write to the Free Software Foundation,
+Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301  USA
+
+Dependencies:
+- Python 64-bit v2.7.15, https://www.python.org/
+- Python module 'misnersplunktoolsnapshot.py'
+
+The cache directory holds one instance snapshot file per splunkd GUID, named after the GUID, plus an index.json file
+mapping each host:port address to the GUID last polled there. Addresses are only known before connecting, and GUIDs
+only after polling, so the index is what lets the last poll be found the moment a connection starts.
+
+Changelog:
+2026.10.18 - initial version, per-GUID cache of each instance's last poll, shown while connecting
+             added replacing(), saving cache folder files through a temporary file
+"""
+
+import os
+import re
+import json
+from contextlib import contextmanager
+from misnersplunktoolsnapshot import SNAPSHOT_EXTENSION, SnapshotWriter, read_snapshot
+
+CACHE_INDEX = 'index.json'
+
+
+@contextmanager
+def replacing(filename, mode='w'):
+    """Opens a temporary file in place of the given file, which replaces the file once the block finishes without
+    error, so an interrupted save never leaves a truncated file behind. The file's directory is created if needed."""
+    directory = os.path.dirname(filename)
+    if directory and not os.path.isdir(directory):
+        os.makedirs(directory)
+    with open(filename + '.tmp', mode) as f:
+        yield f
+    if os.name == 'nt' and os.path.exists(filename):
+        os.remove(filename)  # os.rename() won't replace an existing file on Windows, but is atomic elsewhere
+    os.rename(filename + '.tmp', filename)
+
+
+class PollCache(object):
+    """Last poll of each Splunk instance, saved as instance snapshot files. Nothing is cached for an address whose
+    index entry or snapshot file is missing or unreadable."""
+    def __init__(self, directory, product):
+        """Constructor, taking the cache directory, created on first save, and the program writing the snapshots"""
+        self.directory = directory
+        self.product = product
+
+    def _index_path(self):
+        return os.path.join(self.directory, CACHE_INDEX)
+
+    def _snapshot_path(self, guid):
+        return os.path.join(self.directory, re.sub(r'[^\w\-]', '_', guid) + SNAPSHOT_EXTENSION)
+
+    def _read_index(self):
+        try:
+            with open(self._index_path(), 'r') as f:
+                index = json.load(f)
+        except (IOError, ValueError):
+            return {}
+        return index if isinstance(index, dict) else {}
+
+    def load(self, address):
+        """Returns the OfflineSplunkd last polled at the host:port address, or None when there's nothing cached"""
+        guid = self._read_index().get(address)
+        if not guid:
+            return None
+        try:
+            header, instances = read_snapshot(self._snapshot_path(guid))
+            for _, _, splunkd in instances:
+                return splunkd
+        except (IOError, ValueError, KeyError, EOFError):
+            pass
+        return None
+
+    def save(self, address, splunkd, polled_time):
+        """Saves a completed poll of the instance at the host:port address, replacing its previous cache entry.
+        Raises IOError or OSError if the cache directory can't be written."""
+        if getattr(splunkd, 'guid', '(unknown)') in (None, '', '(unknown)'):
+            return
+        with replacing(self._snapshot_path(splunkd.guid), 'wb') as f:
+            writer = SnapshotWriter(f, 'instance', self.product)
+            try:
+                writer.write(address, 'Complete', splunkd, polled_time)
+            finally:
+                writer.close()
+
+        index = self._read_index()
+        index[address] = splunkd.guid
+        with open(self._index_path(), 'w') as f:
+            json.dump(index, f, indent=1, sort_keys=True)
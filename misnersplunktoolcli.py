@@ -0,0 +1,483 @@
+#!/usr/bin/env python
+"""
+misnersplunktoolcli.py - Misner Splunk Tool Command Line
+Copyright (C) 2015-2018 Joe Misner <joe@misner.net>
+http://tools.misner.net/
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program; if not, write to the Free Software Foundation,
+Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301  USA
+
+Dependencies:
+- Python 64-bit v2.7.15, https://www.python.org/
+- Python module 'splunk-sdk' v1.6.5, https://pypi.python.org/pypi/splunk-sdk
+- Python module 'numpy' v1.16.6, https://pypi.python.org/pypi/numpy
+- Python module 'misnersplunkdwrapper.py'
+- Python module 'misnersplunkdhealth.py'
+- Python module 'misnersplunktoolconf.py'
+- Python module 'misnersplunktooldiscovery.py'
+- Python module 'misnersplunktoolreport.py'
+- Python module 'misnersplunktoolfleet.py'
+- Python module 'misnersplunktoolsnapshot.py'
+- Python module 'misnersplunktoolmetrics.py'
+- Python module 'misnersplunktoolhealthchanges.py'
+- Python module 'misnersplunktoolresolver.py'
+- Python module 'misnersplunktooltopology.py'
+- Python module 'misnersplunktooltopologyexport.py'
+
+Runs Discovery Reports and Instance Reports without the graphical interface, for use from cron jobs, CI runners, and
+headless hosts. Qt is never imported.
+
+Usage:
+  python misnersplunktoolcli.py discovery discovery.csv [--threads 8] [--timeout 30] [--format csv|jsonl] [-o FILE]
+                                                        [--snapshot FILE] [--topology FILE] [--summary FILE]
+                                                        [--changes FILE] [--debounce POLLS]
+  python misnersplunktoolcli.py instance splunk.myhost.com:8089 [-u admin] [-p changeme] [--format csv|jsonl] [-o FILE]
+                                                              [--snapshot FILE] [--changes FILE] [--debounce POLLS]
+  python misnersplunktoolcli.py trend [splunk.myhost.com:8089] [--metric cpu_usage] [--hours 24] [--step SECONDS]
+                                      [--format csv|jsonl] [-o FILE]
+  python misnersplunktoolcli.py topology discovery.snapshot topology.svg [topology.png topology.graphml topology.dot]
+
+Polled resource usage is added to the metrics history in the cache folder, unless --no-metrics is given or
+recordMetrics is false in misnersplunktool.conf. The trend command reads it back for one instance, or for the whole
+fleet when no address is given.
+
+Topologies are exported by file extension: .svg, .png, .graphml, or .dot. The discovery command's --topology option,
+given once for each file, exports the topology of the instances it polled; the topology command exports one from the
+instances in a discovery snapshot file, without polling them again. Both are laid out once for every file exported,
+keeping nodes where the last export of the same deployment placed them.
+
+The discovery command's --summary option writes a fleet summary sheet in the report's format: the distribution,
+percentiles and outliers of each resource metric across the polled instances, the number of instances at each health
+of every health check, and the Splunk versions found.
+
+Each polled instance's health checks are compared with the last time it was polled, by either command or the GUI,
+and health checks that changed are printed and appended to health.log, unless logHealthChanges is false in
+misnersplunktool.conf. The --changes option writes only the changes, in the report's format, for monitoring many
+instances from repeated runs. A new health must hold for healthDebounce polls in a row, or --debounce, before it's a
+change.
+
+Exit status is 0 when every instance was polled, 1 when any instance failed, and 2 for bad arguments or input files.
+
+Changelog:
+2026.10.18 - initial version
+             added --snapshot option, saving polled instances to a snapshot file for opening in the GUI
+             added trend command and metrics history of polled resource usage
+             added topology command and --topology option, exporting topologies to SVG, PNG, GraphML and DOT files
+             health checks are compiled once from [healthchecks] and [healthcheck::<name>] stanzas
+             added --summary option, writing a fleet summary sheet of the polled instances
+             added health check changes since the last poll, with --changes and --debounce options
+"""
+
+import sys
+import os
+import getpass
+import time
+import json
+import argparse
+from misnersplunkdhealth import HealthChecks
+from misnersplunktoolconf import CONFIG_FILENAME, HEALTHCHECKS, TOPOLOGY, read_config, section_values, \
+    custom_healthchecks
+from misnersplunktooldiscovery import read_instances, poll_instance, discover
+from misnersplunktoolreport import REPORT_FORMATS, DiscoveryReportWriter, report_comments, write_instance_report, \
+    write_fleet_summary, write_health_changes
+from misnersplunktoolfleet import FleetSummary
+from misnersplunktoolsnapshot import PollSnapshot, SnapshotWriter, read_snapshot
+from misnersplunktoolmetrics import METRICS_FILENAME, FLEET, MetricsStore
+from misnersplunktoolhealthchanges import HEALTH_STATES_FILENAME, HEALTH_LOG_FILENAME, HealthStates, format_change, \
+    log_changes
+from misnersplunktoolresolver import DNS_FILENAME, DnsCache, Resolver
+from misnersplunktooltopology import LAYOUTS_FILENAME, LayoutStore, TopologyLayouts, build_topology
+from misnersplunktooltopologyexport import export_format, export_topology
+
+__version__ = '2026.10.18'
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def open_output(filename):
+    """Returns a file object for the report, writing to stdout when no filename or '-' is given"""
+    if not filename or filename == '-':
+        return sys.stdout
+    return open(filename, 'w')
+
+
+def open_snapshot(filename, kind):
+    """Returns a snapshot writer for the --snapshot option, or None when it wasn't given"""
+    if not filename:
+        return None
+    return SnapshotWriter(open(filename, 'wb'), kind, "CLI v%s" % __version__)
+
+
+def open_metrics(args, config):
+    """Returns the metrics store polled instances are recorded to, or None when recording is turned off"""
+    if args.no_metrics:
+        return None
+    if config.has_option('main', 'recordMetrics') and not config.getboolean('main', 'recordMetrics'):
+        return None
+    return MetricsStore(args.metrics)
+
+
+def save_metrics(metrics):
+    """Saves the metrics store after polling, warning rather than failing since the reports are already written"""
+    if metrics is None:
+        return
+    try:
+        metrics.save()
+    except (IOError, OSError) as e:
+        sys.stderr.write("Unable to save metrics to %s: %s\n" % (metrics.filename, e))
+
+
+def open_health_states(args, config):
+    """Returns the health states polled instances are compared with, debounced by --debounce or healthDebounce.
+    Raises ValueError for a debounce that isn't a number."""
+    debounce = args.debounce
+    if debounce is None:
+        try:
+            debounce = config.getint('main', 'healthDebounce') if config.has_option('main', 'healthDebounce') else 1
+        except ValueError:
+            raise ValueError("Bad health debounce value in configuration, must be an integer")
+    return HealthStates(args.health_states, debounce)
+
+
+def report_changes(args, config, health_states, changes):
+    """Saves the health states, then prints the health check changes, appends them to the health log unless
+    logHealthChanges is false, and writes them to the --changes file"""
+    try:
+        health_states.save()
+    except (IOError, OSError) as e:
+        sys.stderr.write("Unable to save health states to %s: %s\n" % (health_states.filename, e))
+    if not args.quiet:
+        for change in changes:
+            sys.stderr.write("Health changed: %s\n" % format_change(change))
+    if not config.has_option('main', 'logHealthChanges') or config.getboolean('main', 'logHealthChanges'):
+        try:
+            log_changes(os.path.join(SCRIPT_DIR, HEALTH_LOG_FILENAME), changes)
+        except IOError as e:
+            sys.stderr.write("Unable to log health changes: %s\n" % e)
+    if args.changes:
+        f = open_output(args.changes)
+        try:
+            write_health_changes(f, changes, args.format, report_comments("CLI v%s" % __version__, "Health Changes"))
+        finally:
+            if f is not sys.stdout:
+                f.close()
+
+
+def load_healthchecks(config_file):
+    """Returns health checks compiled from misnersplunktool.conf, or from the defaults when the file is missing"""
+    config = read_config(config_file, create_default=False)
+    return config, HealthChecks(section_values(config, 'healthchecks', HEALTHCHECKS), custom_healthchecks(config))
+
+
+def topology_options(config, filenames):
+    """Returns the [topology] options, first checking every file to export to has a known format, so bad arguments
+    are errors before polling rather than after. Raises ValueError for either."""
+    for filename in filenames:
+        export_format(filename)
+    return section_values(config, 'topology', TOPOLOGY)
+
+
+def export_topologies(instances, filenames, options, quiet):
+    """Exports the topology of polled instances, given as a dictionary of the host:port each was polled at to its
+    PollSnapshot, to each of the files. Returns 1 when there are too few nodes to export, otherwise 0."""
+    resolver = Resolver(DnsCache(os.path.join(SCRIPT_DIR, 'cache', DNS_FILENAME)))
+
+    def resolve(addresses):
+        if not quiet:
+            sys.stderr.write("Resolving %s addresses...\n" % len(addresses))
+        return resolver.resolve(addresses, threads=options['dns_threads'], timeout=options['dns_timeout'],
+                                ttl=options['dns_ttl'], negative_ttl=options['dns_negative_ttl'])
+
+    layouts = TopologyLayouts(build_topology(instances, options, resolve), options,
+                              LayoutStore(os.path.join(SCRIPT_DIR, 'cache', LAYOUTS_FILENAME)))
+    _, keys, edges, _ = layouts.get()
+    if len(keys) <= 1:
+        sys.stderr.write("Not enough nodes found to build topology\n")
+        return 1
+    for filename in filenames:
+        export_topology(filename, layouts)
+        if not quiet:
+            sys.stderr.write("Topology of %s nodes and %s adjacencies exported to %s\n"
+                             % (len(keys), len(edges), filename))
+    return 0
+
+
+def command_discovery(args, config, healthchecks, metrics, health_states):
+    """Polls every instance in the discovery CSV file, writing each one to the report as it completes"""
+    options = topology_options(config, args.topology) if args.topology else None
+    instances = read_instances(args.csvfile)
+    total = len(instances)
+    statuses = {}
+    polls = {}  # Address -> PollSnapshot, kept for --topology and --summary
+    changes = []
+
+    def instance_status(number, msg):
+        statuses[number] = msg
+        if args.verbose:
+            sys.stderr.write("[%s/%s] %s:%s %s\n" % (number, total, instances[number - 1]['address'],
+                                                     instances[number - 1]['port'], msg))
+
+    f = open_output(args.output)
+    writer = DiscoveryReportWriter(f, healthchecks, args.format,
+                                   report_comments("CLI v%s" % __version__, "Discovery Report"))
+    snapshot = open_snapshot(args.snapshot, 'discovery')
+    try:
+        completed = 0
+        for number, instance, splunkd in discover(instances, healthchecks, threads=args.threads,
+                                                  timeout=args.timeout, status=instance_status):
+            completed += 1
+            address = "%s:%s" % (instance['address'], instance['port'])
+            status = statuses.get(number, 'Failed')
+            if not args.quiet:
+                sys.stderr.write("[%s/%s] %s %s\n" % (completed, total, address, status.split('\n')[0]))
+            writer.write(address, status, splunkd.report if splunkd else None)
+            if snapshot:
+                snapshot.write(address, status, splunkd)
+            if metrics and splunkd:
+                metrics.record(address, splunkd)
+            if splunkd:
+                changes += health_states.update(address, splunkd.report)
+            if (args.topology or args.summary) and splunkd:
+                polls[address] = PollSnapshot.from_splunkd(splunkd)
+    finally:
+        if f is not sys.stdout:
+            writer.close()
+        if snapshot:
+            snapshot.close()
+        save_metrics(metrics)
+
+    report_changes(args, config, health_states, changes)
+    if not args.quiet:
+        sys.stderr.write("Discovery complete: %s of %s instances polled\n" % (writer.rows, total))
+    exit_status = 1 if writer.failures else 0
+    if args.summary:
+        with open(args.summary, 'w') as f:
+            write_fleet_summary(f, FleetSummary(healthchecks, polls), args.format,
+                                report_comments("CLI v%s" % __version__, "Discovery Report Summary"))
+    if args.topology:
+        exit_status = export_topologies(polls, args.topology, options, args.quiet) or exit_status
+    return exit_status
+
+
+def command_instance(args, healthchecks, config, metrics, health_states):
+    """Polls a single instance, then writes its instance report"""
+    if ':' in args.address:
+        address, port = args.address.rsplit(':', 1)
+        port = int(port)
+    else:
+        address, port = args.address, 8089
+    section = 'splunkd::%s:%s' % (address, port)
+
+    # Fall back to the saved credentials in misnersplunktool.conf, then prompt for the password
+    username, password = args.username, args.password
+    if not username:
+        for section_name, option in ((section, 'username'), ('main', 'defaultUsername')):
+            if config.has_option(section_name, option):
+                username = config.get(section_name, option)
+                break
+    if not password:
+        if config.has_option(section, 'password'):
+            password = config.get(section, 'password')
+        elif sys.stdin.isatty():
+            password = getpass.getpass("Password for %s@%s:%s: " % (username, address, port))
+    if not username or not password:
+        sys.stderr.write("Missing Splunk username or password\n")
+        return 2
+
+    instance = {'address': address, 'port': port, 'username': username, 'password': password}
+    status = {}
+
+    def instance_status(msg):
+        status['last'] = msg
+        if args.verbose:
+            sys.stderr.write("%s:%s %s\n" % (address, port, msg))
+
+    splunkd = poll_instance(instance, healthchecks, instance_status, args.timeout)
+    if splunkd is None:
+        sys.stderr.write("%s:%s %s\n" % (address, port, status.get('last', 'Failed')))
+        return 1
+
+    snapshot = open_snapshot(args.snapshot, 'instance')
+    if snapshot:
+        snapshot.write("%s:%s" % (address, port), status.get('last', 'Complete'), splunkd)
+        snapshot.close()
+    if metrics:
+        metrics.record("%s:%s" % (address, port), splunkd)
+        save_metrics(metrics)
+    report_changes(args, config, health_states, health_states.update("%s:%s" % (address, port), splunkd.report))
+
+    f = open_output(args.output)
+    try:
+        write_instance_report(f, "%s:%s" % (address, port), splunkd.report, args.format,
+                              report_comments("CLI v%s" % __version__, "Instance Report"))
+    finally:
+        if f is not sys.stdout:
+            f.close()
+    return 0
+
+
+def command_topology(args, config):
+    """Exports the topology of the instances in a discovery snapshot file"""
+    options = topology_options(config, args.filenames)
+    header, instances = read_snapshot(args.snapshot)
+    polls = dict((address, PollSnapshot.from_splunkd(splunkd)) for address, _, splunkd in instances if splunkd)
+    return export_topologies(polls, args.filenames, options, args.quiet)
+
+
+def command_trend(args):
+    """Writes the recorded trend of a metric for one instance, or across the fleet"""
+    metrics = MetricsStore(args.metrics)
+    address = args.address or FLEET
+    if args.address and ':' not in address:
+        address += ':8089'
+    end = time.time()
+    start = end - args.hours * 3600 if args.hours > 0 else None
+    if address == FLEET:
+        trend = metrics.fleet_trend(args.metric, start, end, args.step)
+    else:
+        trend = metrics.trend(address, args.metric, start, end, args.step or 0)
+    if trend is None:
+        known = ', '.join(metrics.metrics(address)) or '(none)'
+        sys.stderr.write("No '%s' metrics recorded for %s. Recorded metrics: %s\n"
+                         % (args.metric, args.address or 'the fleet', known))
+        return 1
+
+    f = open_output(args.output)
+    try:
+        if args.format == 'csv':
+            f.write("Time,Average,Minimum,Maximum,Samples\n")
+        for row in zip(*trend):
+            t, average, minimum, maximum, count = row
+            local_time = time.strftime("%m/%d/%Y %I:%M:%S %p", time.localtime(t))
+            if args.format == 'jsonl':
+                f.write("%s\n" % json.dumps({'time': t, 'address': args.address or FLEET, 'metric': args.metric,
+                                             'average': average, 'minimum': minimum, 'maximum': maximum,
+                                             'samples': count}))
+            else:
+                f.write("%s,%.2f,%.2f,%.2f,%s\n" % (local_time, average, minimum, maximum, count))
+    finally:
+        if f is not sys.stdout:
+            f.close()
+    return 0
+
+
+def main(argv=None):
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--config', default=os.path.join(SCRIPT_DIR, CONFIG_FILENAME),
+                        help="misnersplunktool.conf used for health check values and saved credentials")
+    common.add_argument('--format', choices=REPORT_FORMATS, default='csv', help="report format (default csv)")
+    common.add_argument('-o', '--output', help="report filename, or - for stdout (default)")
+    common.add_argument('--metrics', metavar='FILE', default=os.path.join(SCRIPT_DIR, 'cache', METRICS_FILENAME),
+                        help="metrics history file (default cache/%s in the tool's folder)" % METRICS_FILENAME)
+    common.add_argument('-q', '--quiet', action='store_true', help="only print errors")
+    common.add_argument('-v', '--verbose', action='store_true', help="print every polling step")
+
+    polling = argparse.ArgumentParser(add_help=False, parents=[common])
+    polling.add_argument('--timeout', type=float, default=30,
+                         help="seconds to wait on each connection and REST API call, 0 to wait forever (default 30)")
+    polling.add_argument('--snapshot', metavar='FILE',
+                         help="also save every polled instance to a snapshot file, for opening in the GUI")
+    polling.add_argument('--no-metrics', action='store_true',
+                         help="don't add polled resource usage to the metrics history")
+    polling.add_argument('--health-states', metavar='FILE',
+                         default=os.path.join(SCRIPT_DIR, 'cache', HEALTH_STATES_FILENAME),
+                         help="health states of the last polls, compared with to find health changes (default "
+                              "cache/%s in the tool's folder)" % HEALTH_STATES_FILENAME)
+    polling.add_argument('--changes', metavar='FILE',
+                         help="also write the health checks that changed since each instance was last polled, in the "
+                              "report's format, or - for stdout")
+    polling.add_argument('--debounce', metavar='POLLS', type=int,
+                         help="polls in a row a new health must hold to be a change (default healthDebounce in "
+                              "misnersplunktool.conf, or 1)")
+
+    exporting = argparse.ArgumentParser(add_help=False)
+    exporting.add_argument('--config', default=os.path.join(SCRIPT_DIR, CONFIG_FILENAME),
+                           help="misnersplunktool.conf used for topology options")
+    exporting.add_argument('-q', '--quiet', action='store_true', help="only print errors")
+
+    parser = argparse.ArgumentParser(description="Misner Splunk Tool command line, producing Discovery Reports and "
+                                                 "Instance Reports without the graphical interface")
+    subparsers = parser.add_subparsers(dest='command')
+
+    parser_discovery = subparsers.add_parser('discovery', parents=[polling],
+                                             help="poll every Splunk instance in a discovery CSV file")
+    parser_discovery.add_argument('csvfile', help="CSV file with address,port,username,password lines")
+    parser_discovery.add_argument('--threads', type=int, default=8,
+                                  help="number of instances polled concurrently (default 8)")
+    parser_discovery.add_argument('--topology', metavar='FILE', action='append', default=[],
+                                  help="also export the topology of the polled instances to a .svg, .png, .graphml, "
+                                       "or .dot file; may be given more than once")
+    parser_discovery.add_argument('--summary', metavar='FILE',
+                                  help="also write a fleet summary sheet of the polled instances' metric "
+                                       "distributions and health check breaches, in the report's format")
+
+    parser_instance = subparsers.add_parser('instance', parents=[polling], help="poll a single Splunk instance")
+    parser_instance.add_argument('address', help="Splunk instance address, optionally with :port (default 8089)")
+    parser_instance.add_argument('-u', '--username', help="Splunk username")
+    parser_instance.add_argument('-p', '--password', help="Splunk password, prompted for when missing")
+
+    parser_trend = subparsers.add_parser('trend', parents=[common],
+                                         help="show the recorded resource usage of an instance, or the whole fleet")
+    parser_trend.add_argument('address', nargs='?',
+                              help="Splunk instance address, optionally with :port (default 8089); the fleet if omitted")
+    parser_trend.add_argument('--metric', default='cpu_usage',
+                              help="cpu_usage (default), mem_usage, swap_usage, disk_usage:<mount point>, or "
+                                   "io_utilization:<device>")
+    parser_trend.add_argument('--hours', type=float, default=24,
+                              help="hours of history to show, 0 for all (default 24)")
+    parser_trend.add_argument('--step', type=float,
+                              help="coarsest seconds between points; by default, every sample for an instance and "
+                                   "about 200 points for the fleet")
+
+    parser_topology = subparsers.add_parser('topology', parents=[exporting],
+                                            help="export the topology of the instances in a discovery snapshot file")
+    parser_topology.add_argument('snapshot', help="snapshot file saved by the discovery command or Discovery Report")
+    parser_topology.add_argument('filenames', metavar='FILE', nargs='+',
+                                 help="file to export to, as .svg, .png, .graphml, or .dot")
+
+    args = parser.parse_args(argv)
+    if args.command == 'trend':
+        return command_trend(args)
+    if args.command == 'topology':
+        try:
+            return command_topology(args, read_config(args.config, create_default=False))
+        except (IOError, ValueError) as e:
+            sys.stderr.write("%s\n" % e)
+            return 2
+    if args.timeout <= 0:
+        args.timeout = None
+
+    try:
+        config, healthchecks = load_healthchecks(args.config)
+    except ValueError as e:
+        sys.stderr.write("Error while pulling configurations from %s\n%s\n" % (args.config, e))
+        return 2
+
+    try:
+        metrics = open_metrics(args, config)
+        health_states = open_health_states(args, config)
+        if args.command == 'discovery':
+            return command_discovery(args, config, healthchecks, metrics, health_states)
+        else:
+            return command_instance(args, healthchecks, config, metrics, health_states)
+    except (IOError, ValueError) as e:
+        sys.stderr.write("%s\n" % e)
+        return 2
+    except KeyboardInterrupt:
+        sys.stderr.write("Cancelled\n")
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
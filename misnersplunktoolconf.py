@@ -0,0 +1,415 @@
+#!/usr/bin/env python
+"""
+misnersplunktoolconf.py - Misner Splunk Tool Configuration
+Copyright (C) 2015-2018 Joe Misner <joe@misner.net>
+http://tools.misner.net/
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program; if not, write to the Free Software Foundation,
+Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301  USA
+
+Dependencies:
+- Python 64-bit v2.7.15, https://www.python.org/
+
+Changelog:
+2026.10.18 - initial version, forked from misnersplunktool.py so the command line tool can read misnersplunktool.conf
+             without importing Qt
+             added cacheLastPoll option
+             added pollInterval and recordMetrics options
+             added sampleInterval and sampleWindow options
+             added diskio_ health checks
+             added dns_ topology options
+             added aggregate_ topology options
+             added export_ topology options
+             added load_imbalance topology option
+             added [healthcheck::<name>] stanzas of custom health checks; comments may follow any value
+             added healthDebounce, logHealthChanges and notifyHealthChanges options
+"""
+
+import os
+import re
+import ConfigParser
+
+CONFIG_FILENAME = 'misnersplunktool.conf'
+CONFIG_DEFAULT = """\
+# misnersplunktool.conf -- Misner Splunk Tool configuration file
+# Place in same directory as misnersplunktool.exe to import settings
+
+# Main configuration entries
+# The default Address, Username, and Password populate these fields when the tool loads
+# cacheLastPoll saves each instance's last poll in the cache folder, shown as soon as it's connected to again
+# healthDebounce is the number of polls in a row a health check must hold a new health before it's reported as changed
+# logHealthChanges appends every health check change between polls of an instance to health.log
+# notifyHealthChanges shows a desktop notification when health checks change between polls
+# pollInterval is the number of seconds between automatic polls while connected, 0 to only poll when Poll is clicked
+# recordMetrics keeps a history of every polled instance's resource usage in the cache folder, for trends
+# sampleInterval is the default seconds between resource usage samples in the Resource Usage tab, from 0.2-60
+# sampleWindow is the number of seconds of samples averaged in the Resource Usage tab's sparklines
+[main]
+defaultAddress=localhost:8089
+defaultUsername=admin
+defaultPassword=changeme
+cacheLastPoll=true
+healthDebounce=1
+logHealthChanges=true
+notifyHealthChanges=true
+pollInterval=0
+recordMetrics=true
+sampleInterval=1
+sampleWindow=60
+
+# REST API endpoints populated in the REST API tab's combo box for easy access
+# Add sequential entries incrementing from 0
+[endpoints]
+endpoint.0=/services/server/info
+endpoint.1=/services/server/settings
+
+# Metrics and key performance indicators used by the Health Report to identify issues
+[healthchecks]
+version_caution=6.0  # floating point version number (only major.minor version supported)
+version_warning=5.0  # floating point version number (only major.minor version supported)
+uptime_caution=604800  # seconds
+uptime_warning=86400  # seconds
+cpu_cores_caution=12  # total
+mem_capacity_caution=31744  # MB
+http_ssl_caution=true  # boolean
+messages_caution=true  # boolean
+cpu_usage_caution=80  # percent utilization
+cpu_usage_warning=90  # percent utilization
+mem_usage_caution=80  # percent utilization
+mem_usage_warning=90  # percent utilization
+swap_usage_caution=80  # percent utilization
+swap_usage_warning=90  # percent utilization
+diskpartition_usage_caution=80  # percent utilization
+diskpartition_usage_warning=90  # percent utilization
+diskio_utilization_caution=70  # percent of time a disk device is busy
+diskio_utilization_warning=90  # percent of time a disk device is busy
+diskio_latency_caution=20  # milliseconds per disk I/O request
+diskio_latency_warning=50  # milliseconds per disk I/O request
+cluster_maintenance_caution=true  # boolean
+cluster_rollingrestart_caution=true  # boolean
+cluster_alldatasearchable_warning=true  # boolean
+cluster_searchfactor_caution=true  # boolean
+cluster_replicationfactor_caution=true  # boolean
+cluster_peersnotsearchable_warning=true  # boolean
+cluster_searchheadsnotconnected_warning=true  # boolean
+shcluster_rollingrestart_caution=true  # boolean
+shcluster_serviceready_warning=true  # boolean
+shcluster_minpeersjoined_warning=true  # boolean
+
+# Custom health checks, one stanza each named for its Health Report entry, compare a metric of every polled instance
+# against warning and caution thresholds, either set to false to not check it. metric is one of minor_version, uptime,
+# http_ssl, messages, cores, ram, cpu_usage, mem_usage, swap_usage, disk_usage, diskio_utilization, diskio_latency,
+# or the name of any other polled value, lists of values counted. comparator is >=, >, <=, <, ==, !=, or true or
+# false for values that are true or false. roles optionally limits the check to instances with one of the
+# comma-separated server roles. A stanza with the category and name of a built-in health check replaces it.
+#[healthcheck::Apps Installed]
+#category=Counts  # report category, Custom by default
+#metric=apps
+#comparator=>=
+#warning=false
+#caution=200
+#roles=search_head
+
+# Settings used to create Discovery Report topology nodes and adjacencies
+# layerheight_ settings determine the y-coordinate layer height or the plotted instance role, from 0-100
+# layeralignment_ settings determine if nodes on the layer are aligned to the left, center, or right
+# nodecolor_ and adjcolor_ settings use hex color codes, starting with a hash
+# nodedraw_ and adjdraw_ settings use boolean values of true or false to determine if they are displayed
+# dns_ settings control reverse DNS lookups of discovered IP addresses, cached in cache/dns.json between runs
+# aggregate_ settings group forwarders sending to the same indexers, or polling the same deployment server, into one
+#   node each, clicked to show its forwarders
+# export_ settings size topology images exported from the topology window or the command line tool
+# load_imbalance is how far above the even share of its outputs group a receiver's load is before the group is
+#   reported imbalanced in the topology window's Load Distribution
+[topology]
+fontsize=8  # integer
+static_width=10  # integer, width in plotted points that nodes on a left- or right-aligned layer are spaced apart
+layerheight_user=100  # integer, Users
+layerheight_mc=94  # integer, Management Consoles
+layerheight_shcd=88  # integer, SHC Deployers
+layerheight_sh=80  # integer, Search Heads
+layerheight_cm=68  # integer, Cluster Masters
+layerheight_idx=60  # integer, Indexers
+layerheight_lm=50  # integer, License Masters
+layerheight_hf=40  # integer, Heavy Forwarders
+layerheight_ds=30  # integer, Deployment Servers
+layerheight_uf=20  # integer, Universal Forwarders
+layerheight_input=10  # integer, Non-Forwarder Inputs
+layerheight_other=0  # integer, Other Instances
+layeralignment_user=center
+layeralignment_mc=right
+layeralignment_shcd=left
+layeralignment_sh=center
+layeralignment_cm=left
+layeralignment_idx=center
+layeralignment_lm=right
+layeralignment_hf=center
+layeralignment_ds=left
+layeralignment_uf=center
+layeralignment_input=center
+layeralignment_other=center
+nodecolor_user=d5d8dc
+nodecolor_searchhead=abebc6
+nodecolor_indexer=aed6f1
+nodecolor_heavyforwarder=d98880
+nodecolor_universalforwarder=f5b7b1
+nodecolor_mgmtconsole=abebc6
+nodecolor_shcdeployer=d2b4de
+nodecolor_clustermaster=fad7a0
+nodecolor_deploymentserver=d7bde2
+nodecolor_licensemaster=f9e79f
+nodecolor_inputs=e6b0aa
+nodecolor_others=d6dbdf
+adjcolor_web=808b96
+adjcolor_clustermgmt=f8c471
+adjcolor_distsearch=82e0aa
+adjcolor_mgmtconsole=82e0aa
+adjcolor_bucketrep=85c1e9
+adjcolor_datafwd=d98880
+adjcolor_shcdeployment=bb8fce
+adjcolor_deployment=c39bd3
+adjcolor_license=f7dc6f
+nodedraw_user=true
+nodedraw_searchhead=true
+nodedraw_indexer=true
+nodedraw_heavyforwarder=true
+nodedraw_universalforwarder=true
+nodedraw_mgmtconsole=True
+nodedraw_shcdeployer=true
+nodedraw_clustermaster=true
+nodedraw_deploymentserver=true
+nodedraw_licensemaster=true
+nodedraw_inputs=true
+nodedraw_others=true
+adjdraw_web=true
+adjdraw_clustermgmt=true
+adjdraw_distsearch=true
+adjdraw_mgmtconsole=True
+adjdraw_bucketrep=true
+adjdraw_datafwdheavyforwarder=true
+adjdraw_datafwduniversalforwarder=true
+adjdraw_datafwdinput=true
+adjdraw_shcdeployment=true
+adjdraw_deployment=true
+adjdraw_license=true
+dns_threads=32  # integer, lookups run at once
+dns_timeout=5  # integer, seconds to wait for all lookups, leaving addresses not resolved by then as IP addresses
+dns_ttl=86400  # integer, seconds a resolved hostname is remembered, 0 to not remember
+dns_negative_ttl=3600  # integer, seconds an address that didn't resolve is remembered, 0 to not remember
+aggregate_by=indexers  # indexers, deploymentserver, or none to draw every forwarder
+aggregate_minimum=50  # integer, forwarders on a layer before they're grouped
+export_width=16  # integer, width in inches of exported images
+export_height=10  # integer, height in inches of exported images
+export_dpi=100  # integer, dots per inch of exported PNG images
+load_imbalance=1.5  # float, busiest receiver's load over the mean of its outputs group
+
+# splunkd locations saved in the Address combo box
+# Create separate stanzas for each saved splunkd location, including the ip/host and management port
+# Optionally include keys with username and/or password to populate these fields when selected
+[splunkd::1.2.3.4:8089]
+username=admin
+password=changeme
+
+[splunkd::splunk.myhost.com:8089]
+username=admin
+password=changeme
+"""
+
+HEALTHCHECK_STANZA = 'healthcheck::'
+HEALTHCHECK_DEFAULTS = {
+    'category': 'Custom',
+    'metric': '',
+    'comparator': '>=',
+    'warning': False,
+    'caution': False,
+    'roles': ''
+}
+HEALTHCHECKS = {
+    'version_caution': 6.0,
+    'version_warning': 5.0,
+    'uptime_caution': 604800,
+    'uptime_warning': 86400,
+    'cpu_cores_caution': 12,
+    'mem_capacity_caution': 31744,
+    'http_ssl_caution': True,
+    'messages_caution': True,
+    'cpu_usage_caution': 80,
+    'cpu_usage_warning': 90,
+    'mem_usage_caution': 80,
+    'mem_usage_warning': 90,
+    'swap_usage_caution': 80,
+    'swap_usage_warning': 90,
+    'diskpartition_usage_caution': 80,
+    'diskpartition_usage_warning': 90,
+    'diskio_utilization_caution': 70,
+    'diskio_utilization_warning': 90,
+    'diskio_latency_caution': 20,
+    'diskio_latency_warning': 50,
+    'cluster_maintenance_caution': True,
+    'cluster_rollingrestart_caution': True,
+    'cluster_alldatasearchable_warning': True,
+    'cluster_searchfactor_caution': True,
+    'cluster_replicationfactor_caution': True,
+    'cluster_peersnotsearchable_warning': True,
+    'cluster_searchheadsnotconnected_warning': True,
+    'shcluster_rollingrestart_caution': True,
+    'shcluster_serviceready_warning': True,
+    'shcluster_minpeersjoined_warning': True
+}
+TOPOLOGY = {
+    'fontsize': 8,
+    'static_width': 10,
+    'layerheight_user': 100,
+    'layerheight_mc': 94,
+    'layerheight_shcd': 88,
+    'layerheight_sh': 80,
+    'layerheight_cm': 68,
+    'layerheight_idx': 60,
+    'layerheight_lm': 50,
+    'layerheight_hf': 40,
+    'layerheight_ds': 30,
+    'layerheight_uf': 20,
+    'layerheight_input': 10,
+    'layerheight_other': 0,
+    'layeralignment_user': 'center',
+    'layeralignment_mc': 'right',
+    'layeralignment_shcd': 'left',
+    'layeralignment_sh': 'center',
+    'layeralignment_cm': 'left',
+    'layeralignment_idx': 'center',
+    'layeralignment_lm': 'right',
+    'layeralignment_hf': 'center',
+    'layeralignment_ds': 'left',
+    'layeralignment_uf': 'center',
+    'layeralignment_input': 'center',
+    'layeralignment_other': 'center',
+    'nodecolor_user': 'd5d8dc',
+    'nodecolor_searchhead': 'abebc6',
+    'nodecolor_indexer': 'aed6f1',
+    'nodecolor_heavyforwarder': 'd98880',
+    'nodecolor_universalforwarder': 'f5b7b1',
+    'nodecolor_mgmtconsole': 'abebc6',
+    'nodecolor_shcdeployer': 'd2b4de',
+    'nodecolor_clustermaster': 'fad7a0',
+    'nodecolor_deploymentserver': 'd7bde2',
+    'nodecolor_licensemaster': 'f9e79f',
+    'nodecolor_inputs': 'e6b0aa',
+    'nodecolor_others': 'd6dbdf',
+    'adjcolor_web': '808b96',
+    'adjcolor_clustermgmt': 'f8c471',
+    'adjcolor_distsearch': '82e0aa',
+    'adjcolor_mgmtconsole': '82e0aa',
+    'adjcolor_bucketrep': '85c1e9',
+    'adjcolor_datafwd': 'd98880',
+    'adjcolor_shcdeployment': 'bb8fce',
+    'adjcolor_deployment': 'c39bd3',
+    'adjcolor_license': 'f7dc6f',
+    'nodedraw_user': True,
+    'nodedraw_searchhead': True,
+    'nodedraw_indexer': True,
+    'nodedraw_heavyforwarder': True,
+    'nodedraw_universalforwarder': True,
+    'nodedraw_mgmtconsole': True,
+    'nodedraw_shcdeployer': True,
+    'nodedraw_clustermaster': True,
+    'nodedraw_deploymentserver': True,
+    'nodedraw_licensemaster': True,
+    'nodedraw_inputs': True,
+    'nodedraw_others': True,
+    'adjdraw_web': True,
+    'adjdraw_clustermgmt': True,
+    'adjdraw_distsearch': True,
+    'adjdraw_mgmtconsole': True,
+    'adjdraw_bucketrep': True,
+    'adjdraw_datafwdheavyforwarder': True,
+    'adjdraw_datafwduniversalforwarder': True,
+    'adjdraw_datafwdinput': True,
+    'adjdraw_shcdeployment': True,
+    'adjdraw_deployment': True,
+    'adjdraw_license': True,
+    'dns_threads': 32,
+    'dns_timeout': 5,
+    'dns_ttl': 86400,
+    'dns_negative_ttl': 3600,
+    'aggregate_by': 'indexers',
+    'aggregate_minimum': 50,
+    'export_width': 16,
+    'export_height': 10,
+    'export_dpi': 100,
+    'load_imbalance': 1.5
+}
+
+
+def fixtype(object):
+    """Returns the object as the correct type: a boolean, integer, floating point, or string"""
+    if object.lower() == 'true':
+        return True
+    elif object.lower() == 'false':
+        return False
+    try:
+        return int(object)
+    except ValueError:
+        try:
+            return float(object)
+        except ValueError:
+            return str(object)
+
+
+def read_config(config_file, create_default=True):
+    """Returns a ConfigParser loaded from config_file, first writing the default configuration if the file is missing"""
+    config = ConfigParser.ConfigParser(allow_no_value=True)
+    if os.path.isfile(config_file):  # Read in configuration file if it exists
+        try:
+            config.read(config_file)
+        except ConfigParser.ParsingError:
+            pass
+    elif create_default:  # If configuration file is missing, build a default file
+        try:
+            with open(config_file, 'w') as f:
+                f.write(CONFIG_DEFAULT)
+            config.read(config_file)
+        except:
+            pass
+    return config
+
+
+def section_values(config, section, defaults):
+    """Returns a copy of the defaults dictionary updated with typed values from a section such as [healthchecks],
+    raising ValueError naming the option if one can't be parsed"""
+    values = dict(defaults)
+    if config.has_section(section):
+        for option in config.options(section):
+            value = config.get(section, option)
+            try:  # Remove comments from key=value pair
+                if '#' in value:
+                    value = re.findall(r"^([^#]*[^#\s])\s*#.*$", value)[0]
+            except:  # Some bad formatting broke the regex parser
+                raise ValueError("Check formatting of [%s] option %s within this file." % (section, option))
+            values[option] = fixtype(value.strip())
+    return values
+
+
+def custom_healthchecks(config):
+    """Returns the custom health checks of [healthcheck::<name>] stanzas as (category, name, roles, conditions)
+    tuples, as misnersplunkdhealth.HealthChecks takes them, raising ValueError naming a stanza without a metric"""
+    checks = []
+    for section in config.sections():
+        if section.startswith(HEALTHCHECK_STANZA):
+            values = section_values(config, section, HEALTHCHECK_DEFAULTS)
+            if not values['metric']:
+                raise ValueError("Check [%s] within this file, it has no metric." % section)
+            roles = [role.strip() for role in str(values['roles']).split(',') if role.strip()]
+            checks.append((str(values['category']), section[len(HEALTHCHECK_STANZA):], roles,
+                           [(str(values['metric']), str(values['comparator']), values['warning'], values['caution'])]))
+    return checks
@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+"""
+misnersplunktooldiscovery.py - Misner Splunk Tool Discovery Engine
+Copyright (C) 2015-2018 Joe Misner <joe@misner.net>
+http://tools.misner.net/
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program; if not, write to the Free Software Foundation,
+Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301  USA
+
+Dependencies:
+- Python 64-bit v2.7.15, https://www.python.org/
+- Python module 'splunk-sdk' v1.6.5, https://pypi.python.org/pypi/splunk-sdk
+- Python package 'requests' v2.19.1, https://pypi.python.org/pypi/requests
+- Python module 'misnersplunkdwrapper.py'
+
+Changelog:
+2026.10.18 - initial version, forked from the DiscoveryReportWorker class in misnersplunktool.py so discovery reports
+             can run without Qt
+             a request error or unexpected exception while polling fails only that instance
+"""
+
+import csv
+import socket
+import requests
+from multiprocessing.pool import ThreadPool
+import splunklib.binding as binding
+from misnersplunkdwrapper import Splunkd
+
+# Status message and Splunkd method for each step of polling an instance, in order
+POLL_STEPS = [
+    ('Polling service info...', 'poll_service_info'),
+    ('Polling settings...', 'poll_service_settings'),
+    ('Polling messages...', 'poll_service_messages'),
+    ('Polling configurations...', 'get_service_confs'),
+    ('Polling input status...', 'get_services_admin_inputstatus'),
+    ('Polling apps...', 'poll_service_apps'),
+    ('Polling data collection info...', 'get_services_data'),
+    ('Polling KV store info...', 'get_services_kvstore'),
+    ('Polling cluster master info...', 'get_services_cluster'),
+    ('Polling search head cluster info...', 'get_services_shcluster'),
+    ('Polling deployment info...', 'get_services_deployment'),
+    ('Polling licensing info...', 'get_services_licenser'),
+    ('Polling distributed search info...', 'get_services_search'),
+    ('Polling introspection...', 'get_services_server_status')
+]
+
+
+def read_instances(filename):
+    """Returns the list of Splunk instances in a discovery CSV file, as dictionaries with address, port, username, and
+    password keys, raising ValueError describing the first line with bad syntax"""
+    with open(filename, 'rb') as f:
+        csvfile = list(csv.reader(f))
+
+    instances = []
+    line_number = 0
+    for line in csvfile:
+        line_number += 1
+        if not line:  # Blank line
+            continue
+        if line[0][0] == '#':  # Comments
+            continue
+        if line[0] == 'address':  # CSV header
+            continue
+        if len(line) != 4:  # Not 4 comma-separated values
+            raise ValueError("Error on line %s of '%s':\n\nMust have four comma-separated values."
+                             % (line_number, filename))
+        try:
+            port = int(line[1])
+        except ValueError:
+            raise ValueError("Error on line %s of '%s':\n\nPort must be an integer." % (line_number, filename))
+        instances.append({
+            'address': line[0],
+            'port': port,
+            'username': line[2],
+            'password': line[3].strip()
+        })
+    return instances
+
+
+def poll_instance(instance, healthchecks, status=None, timeout=None):
+    """Connects to and polls a Splunk instance, then builds its instance report. Progress is sent to the status
+    function as text; returns the polled Splunkd, or None after sending a status starting with 'Failed'."""
+    if status is None:
+        status = lambda msg: None
+
+    # Connect to Splunk instance
+    status("Connecting...")
+    try:
+        splunkd = Splunkd(instance['address'], instance['port'], instance['username'], instance['password'],
+                          timeout=timeout)
+    except binding.AuthenticationError:
+        status("Failed: Authentication error")
+        return None
+    except socket.gaierror:
+        status("Failed: Unable to connect")
+        return None
+    except socket.error as error:
+        status("Failed: Unable to connect (%s)" % error)
+        return None
+    except:
+        status("Failed: Unable to connect (unknown exception)")
+        return None
+    status("Connected")
+
+    # Poll Splunk instance
+    try:
+        for msg, method in POLL_STEPS:
+            status(msg)
+            getattr(splunkd, method)()
+    except socket.error as e:
+        status("Failed: Socket error while attempting to poll splunkd:\n%s" % e)
+        return None
+    except requests.RequestException as e:
+        status("Failed: Request error while attempting to poll splunkd:\n%s" % e)
+        return None
+    except Exception as e:
+        status("Failed: Unable to poll splunkd (%s: %s)" % (e.__class__.__name__, e))
+        return None
+
+    # Build instance report
+    status('Building instance report...')
+    try:
+        splunkd.report_builder(healthchecks)
+    except:
+        status("Failed: Unable to build instance report")
+        return None
+
+    status("Complete")
+    return splunkd
+
+
+def discover(instances, healthchecks, threads=1, timeout=None, status=None, stopped=None):
+    """Polls each instance using a pool of worker threads, yielding (instance number, instance, Splunkd or None)
+    tuples as instances complete. The status function receives (instance number, text) as polling progresses, and
+    instances not yet started are skipped once the stopped function returns True."""
+    if status is None:
+        status = lambda number, msg: None
+    if stopped is None:
+        stopped = lambda: False
+
+    def work(job):
+        number, instance = job
+        if stopped():
+            return number, instance, None
+        splunkd = poll_instance(instance, healthchecks, lambda msg: status(number, msg), timeout)
+        return number, instance, splunkd
+
+    jobs = [(number, instance) for number, instance in enumerate(instances, 1)]
+    if threads <= 1:
+        for job in jobs:
+            yield work(job)
+        return
+
+    pool = ThreadPool(min(threads, len(jobs)) or 1)
+    try:
+        for result in pool.imap_unordered(work, jobs):
+            yield result
+    finally:
+        pool.terminate()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+"""
+misnersplunktoolfleet.py - Misner Splunk Tool Fleet Statistics
+Copyright (C) 2015-2018 Joe Misner <joe@misner.net>
+http://tools.misner.net/
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program; if not, write to the Free Software Foundation,
+Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301  USA
+
+Dependencies:
+- Python 64-bit v2.7.15, https://www.python.org/
+- Python module 'numpy' v1.16.6, https://pypi.python.org/pypi/numpy
+- Python module 'misnersplunkdhealth.py'
+- Python module 'misnersplunkdrecords.py'
+
+Sums up a discovery's polled instances as a whole. The numeric metrics of every poll are loaded into a matrix of
+instances by metrics, the health checks are evaluated into a matrix of instances by checks, and every statistic is
+then a numpy reduction along the instances axis, computed for all metrics at once: percentiles, means and standard
+deviations, outliers beyond Tukey's fences, and counts of instances at each health of each check.
+
+Changelog:
+2026.10.18 - initial version, metric distributions and outliers, health check breach counts, and Splunk versions
+             0% CPU, RAM and swap usage count as values rather than missing
+"""
+
+import warnings
+import numpy
+from misnersplunkdhealth import OK, CAUTION, WARNING, UNKNOWN, NOT_CHECKED, measure
+from misnersplunkdrecords import FleetMetric, FleetCheck, FleetVersion
+
+# Metrics summed up, as (metric, name, unit divided by)
+FLEET_METRICS = [
+    ('cores', 'CPU Cores', 1),
+    ('ram', 'RAM Size (MB)', 1),
+    ('cpu_usage', 'CPU Usage (%)', 1),
+    ('mem_usage', 'RAM Usage (%)', 1),
+    ('swap_usage', 'Swap Usage (%)', 1),
+    ('disk_usage', 'Disk Usage (%)', 1),
+    ('uptime', 'Uptime (days)', 86400),
+    ('minor_version', 'Version', 1)
+]
+PERCENTILES = (5, 25, 50, 75, 95)
+OUTLIER_RANGE = 1.5  # Interquartile ranges beyond the quartiles from which a value is an outlier
+OUTLIER_HOSTS = 5    # Outlying instances named for each metric, furthest from the median first
+
+
+def _number(value):
+    """Returns a statistic as a float, or None for NaN"""
+    return None if numpy.isnan(value) else float(value)
+
+
+def _polled_usage(name):
+    """Returns the extractor of a host-wide usage percent, None until the instance's resource usage was polled. Unlike
+    the health checks, which report 0% as Unknown, 0% is a value here, so idle hosts count towards the distribution."""
+    def extract(instance):
+        if getattr(instance, 'mem', None) is None:  # Set once resource-usage/hostwide has been polled
+            return None
+        try:
+            return float(getattr(instance, name))
+        except (AttributeError, TypeError, ValueError):
+            return None
+    return extract
+
+
+# Fleet metrics measured differently than by their health checks' extractors
+FLEET_EXTRACTORS = {
+    'cpu_usage': _polled_usage('cpu_usage'),
+    'mem_usage': _polled_usage('mem_usage'),
+    'swap_usage': _polled_usage('swap_usage')
+}
+
+
+def fleet_values(instances, now=None):
+    """Returns a matrix of instances by FLEET_METRICS, in their units, NaN where an instance doesn't have one"""
+    values = numpy.empty((len(instances), len(FLEET_METRICS)), dtype=numpy.float64)
+    for column, (metric, _, unit) in enumerate(FLEET_METRICS):
+        extract = FLEET_EXTRACTORS.get(metric)
+        if extract is None:
+            values[:, column] = measure(instances, [metric], now)[:, 0]
+        else:
+            values[:, column] = [extract(instance) for instance in instances]
+    return values / numpy.array([unit for _, _, unit in FLEET_METRICS], dtype=numpy.float64)
+
+
+class FleetSummary(object):
+    """Fleet-wide statistics of polled instances, as FleetMetric, FleetCheck and FleetVersion records"""
+    def __init__(self, healthchecks, polls, now=None):
+        """Constructor, taking compiled HealthChecks and a dictionary of polled instances, such as PollSnapshot
+        records, keyed by host:port"""
+        self.addresses = sorted(polls)
+        instances = [polls[address] for address in self.addresses]
+        self.values = fleet_values(instances, now)
+        self.health = healthchecks.evaluate(instances, now)
+
+        # Distributions and outliers of every metric at once
+        present = ~numpy.isnan(self.values)
+        sample = self.values if len(instances) else numpy.full((1, len(FLEET_METRICS)), numpy.nan)
+        with warnings.catch_warnings():  # Metrics no instance has are all NaN, and stay NaN
+            warnings.simplefilter('ignore', RuntimeWarning)
+            percentiles = numpy.nanpercentile(sample, PERCENTILES, axis=0)
+            statistics = numpy.vstack([numpy.nanmin(sample, axis=0), percentiles, numpy.nanmax(sample, axis=0),
+                                       numpy.nanmean(sample, axis=0), numpy.nanstd(sample, axis=0)])
+        quartile1, median, quartile3 = [percentiles[PERCENTILES.index(percent)] for percent in (25, 50, 75)]
+        spread = OUTLIER_RANGE * (quartile3 - quartile1)
+        with numpy.errstate(invalid='ignore'):
+            outlying = (self.values < quartile1 - spread) | (self.values > quartile3 + spread)
+        distance = numpy.where(outlying, numpy.abs(self.values - median), -1)
+        furthest = numpy.argsort(-distance, axis=0, kind='mergesort')[:OUTLIER_HOSTS]
+        self.metrics = []
+        for column, (metric, name, _) in enumerate(FLEET_METRICS):
+            hosts = [self.addresses[row] for row in furthest[:, column] if outlying[row, column]]
+            self.metrics.append(FleetMetric(*(
+                [metric, name, int(present[:, column].sum()), int((~present[:, column]).sum())] +
+                [_number(value) for value in statistics[:, column]] + [int(outlying[:, column].sum()), hosts])))
+
+        # Instances at each health of every check at once
+        counts = (self.health[:, :, numpy.newaxis] ==
+                  numpy.array([NOT_CHECKED, OK, CAUTION, WARNING, UNKNOWN], dtype=numpy.int8)).sum(axis=0)
+        self.checks = [FleetCheck(check.category, check.name, len(instances) - int(row[0]), int(row[1]), int(row[2]),
+                                  int(row[3]), int(row[4]), int(row[2] + row[3]))
+                       for check, row in zip(healthchecks.checks, counts)]
+
+        # Splunk versions, most common first
+        versions, version_counts = numpy.unique([str(getattr(instance, 'version', None) or '(unknown)')
+                                                 for instance in instances], return_counts=True)
+        self.versions = [FleetVersion(str(versions[number]), int(version_counts[number]),
+                                      100.0 * version_counts[number] / len(instances))
+                         for number in sorted(range(len(versions)), key=lambda number: (-version_counts[number],
+                                                                                         versions[number]))]
+
+    def breaching(self):
+        """Returns the number of instances breaching at least one health check's caution or warning threshold"""
+        return int(((self.health == CAUTION) | (self.health == WARNING)).any(axis=1).sum())
@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+"""
+misnersplunktoolforwarding.py - Misner Splunk Tool Forwarder Load Distribution
+Copyright (C) 2015-2018 Joe Misner <joe@misner.net>
+http://tools.misner.net/
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program; if not, write to the Free Software Foundation,
+Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301  USA
+
+Dependencies:
+- Python 64-bit v2.7.15, https://www.python.org/
+- Python module 'numpy' v1.16.6, https://pypi.python.org/pypi/numpy
+- Python module 'misnersplunkdrecords.py'
+
+Forwarders don't report the outputs group their forward servers belong to, so forwarders listing the same receivers
+are taken as one outputs group, as aggregated topologies group them. Every forwarding adjacency of a topology is
+numbered by its outputs group and receiver, and numpy.bincount() adds up the forwarders, inactive forward servers and
+bytes of every outputs group and receiver pair at once, into matrices of outputs groups by receivers. Receiver fan-in,
+outputs group imbalance and the heat map are all sums and ratios of those matrices, so tens of thousands of
+forwarders are analyzed without a Python loop over each pair.
+
+A receiver's load is the bytes it reports receiving from an outputs group's forwarders, or where no receiver of the
+group reports any, the number of those forwarders actively connected to it. Load balanced forwarders spread their
+load evenly over their outputs group, so each receiver's load is compared with the even share of its outputs group.
+
+Changelog:
+2026.10.18 - initial version, receiver fan-in, outputs group imbalance and inactive forward servers
+"""
+
+from itertools import count, izip, repeat
+from operator import itemgetter
+import numpy
+from misnersplunkdrecords import ReceiverLoad, OutputsGroupLoad
+
+FORWARDING_EDGE = 'datafwd'
+GROUP_LABEL_NAMES = 3  # Receivers named in an outputs group's name
+
+
+def _group_name(names):
+    """Returns an outputs group's name from the names of its receivers"""
+    names = sorted(names)
+    if len(names) > GROUP_LABEL_NAMES:
+        names[GROUP_LABEL_NAMES:] = ["+%d more" % (len(names) - GROUP_LABEL_NAMES)]
+    return ', '.join(names)
+
+
+class ForwarderLoad(object):
+    """Load distribution of a Topology's forwarders over the receivers they forward to, as matrices of outputs groups
+    by receivers, with the receivers and outputs groups summed up as ReceiverLoad and OutputsGroupLoad records"""
+    def __init__(self, topology, imbalance):
+        """Constructor, taking a Topology from build_topology(), not aggregated, and the ratio of an outputs group's
+        busiest receiver's load to the group's mean load from which the group is taken as imbalanced"""
+        nodes = topology.nodes
+        edges = [edge for edge in topology.edges if edge[2] == FORWARDING_EDGE]
+        sources, targets = map(itemgetter(0), edges), map(itemgetter(1), edges)
+        self.receiver_keys = sorted(set(targets), key=lambda key: (nodes[key].name, key))
+        sender_keys = list(set(sources))
+        senders = numpy.array(map(dict(izip(sender_keys, count())).__getitem__, sources), dtype=numpy.intp)
+        receivers = numpy.array(map(dict(izip(self.receiver_keys, count())).__getitem__, targets), dtype=numpy.intp)
+        inactive = numpy.zeros(len(edges))
+        if topology.edge_inactive:  # Inactive every time it's listed
+            inactive = (numpy.array(map(topology.edge_inactive.get, edges, repeat(0, len(edges)))) >=
+                        numpy.array(map(topology.edges.__getitem__, edges))).astype(numpy.float64)
+        sent = numpy.array(map(topology.edge_bytes.get, edges, repeat(0, len(edges))), dtype=numpy.float64)
+
+        # Outputs group of each forwarder, by the bits of the receivers it lists, numbered from the most forwarders down
+        listed = numpy.zeros((len(sender_keys), len(self.receiver_keys) // 8 + 1), dtype=numpy.uint8)
+        bits = numpy.right_shift(128, receivers % 8).astype(numpy.uint8)
+        numpy.bitwise_or.at(listed, (senders, receivers // 8), bits)
+        _, firsts, sender_groups = numpy.unique(listed.view(numpy.dtype((numpy.void, listed.shape[1]))).ravel(),
+                                                return_index=True, return_inverse=True)
+        group_receivers = [numpy.flatnonzero(numpy.unpackbits(listed[first])) for first in firsts]
+        group_forwarders = numpy.bincount(sender_groups, minlength=len(group_receivers))
+        names = [nodes[key].name for key in self.receiver_keys]
+        group_names = [_group_name(names[receiver] for receiver in group) for group in group_receivers]
+        ranked = sorted(range(len(group_receivers)),
+                        key=lambda number: (-group_forwarders[number], group_names[number]))
+        renumbered = numpy.zeros(len(ranked), dtype=numpy.intp)
+        renumbered[ranked] = numpy.arange(len(ranked))
+        sender_groups = renumbered[sender_groups]
+        group_receivers = [group_receivers[number] for number in ranked]
+        group_names = [group_names[number] for number in ranked]
+        group_forwarders = group_forwarders[ranked]
+
+        # Outputs groups by receivers
+        shape = (len(group_receivers), len(self.receiver_keys))
+        cells = sender_groups[senders] * shape[1] + receivers
+        size = shape[0] * shape[1]
+        self.forwarders = numpy.bincount(cells, minlength=size).reshape(shape)
+        self.inactive = numpy.bincount(cells, weights=inactive, minlength=size).reshape(shape).astype(int)
+        self.bytes = numpy.bincount(cells, weights=sent, minlength=size).reshape(shape)
+        group_bytes = self.bytes.sum(axis=1)
+        self.load = numpy.where((group_bytes > 0)[:, numpy.newaxis], self.bytes, self.forwarders - self.inactive)
+        member = self.forwarders > 0
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            mean = self.load.sum(axis=1) / member.sum(axis=1)
+            self.share = numpy.where(member, self.load / mean[:, numpy.newaxis], numpy.nan)  # 1.0 is an even share
+            group_imbalance = self.load.max(axis=1, initial=0) / mean
+            receiver_load = self.load.sum(axis=0) / numpy.where(member, mean[:, numpy.newaxis], 0).sum(axis=0)
+        busiest = self.load.argmax(axis=1) if size else numpy.zeros(0, dtype=numpy.intp)
+
+        self.receivers = [
+            ReceiverLoad(key, names[number], int(forwarders), int(forwarders - inactive), int(inactive), int(groups),
+                         int(received) if received else None, None if numpy.isnan(load) else float(load))
+            for number, (key, forwarders, inactive, groups, received, load) in enumerate(zip(
+                self.receiver_keys, self.forwarders.sum(axis=0), self.inactive.sum(axis=0), member.sum(axis=0),
+                self.bytes.sum(axis=0), receiver_load))]
+        self.groups = []
+        for number, group in enumerate(group_receivers):
+            ratio = None if numpy.isnan(group_imbalance[number]) else float(group_imbalance[number])
+            self.groups.append(OutputsGroupLoad(
+                ','.join(self.receiver_keys[receiver] for receiver in group), group_names[number],
+                int(group_forwarders[number]), len(group), int(self.inactive[number].sum()),
+                int(group_bytes[number]) if group_bytes[number] else None, ratio,
+                names[busiest[number]] if ratio else None, ratio is not None and ratio >= imbalance))
+
+    def receiver_names(self):
+        """Returns the names of the receivers, in the order of the matrices' columns"""
+        return [receiver.name for receiver in self.receivers]
+
+    def group_names(self):
+        """Returns the names of the outputs groups, in the order of the matrices' rows"""
+        return [group.name for group in self.groups]
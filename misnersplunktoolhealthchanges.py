@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+"""
+misnersplunktoolhealthchanges.py - Misner Splunk Tool Health Changes
+Copyright (C) 2015-2018 Joe Misner <joe@misner.net>
+http://tools.misner.net/
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program; if not, write to the Free Software Foundation,
+Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301  USA
+
+Dependencies:
+- Python 64-bit v2.7.15, https://www.python.org/
+- Python module 'misnersplunkdrecords.py'
+- Python module 'misnersplunktoolcache.py'
+
+Remembers the health of every check of every polled instance, so each poll's report can be compared with the last
+one and only what changed is shown. A new health must hold for a number of polls in a row, the debounce, before it's
+reported as a change; a check flapping between two healths within the debounce isn't reported at all. Checks seen for
+the first time, or that stop applying to an instance, start or stop being tracked without being reported.
+
+Health states are saved to a JSON file in the cache folder between runs, so discoveries run from cron jobs report
+changes since the last run too.
+
+Changelog:
+2026.10.18 - initial version, health check changes between polls with debounce, and a log of changes
+"""
+
+import json
+import time
+import threading
+from misnersplunkdrecords import HealthChange
+from misnersplunktoolcache import replacing
+
+HEALTH_STATES_FILENAME = 'health.json'
+HEALTH_LOG_FILENAME = 'health.log'
+SEVERITY = {'OK': 0, 'Unknown': 1, 'Caution': 2, 'Warning': 3}  # Unknown only ranks above OK
+
+
+def is_worse(change):
+    """Returns True if a HealthChange is to a worse health than before"""
+    return SEVERITY.get(change.health, 0) > SEVERITY.get(change.previous, 0)
+
+
+def format_change(change):
+    """Returns a HealthChange as one line of text, such as 'splunk1:8089 Resources: CPU Usage OK -> Warning (95%)'"""
+    text = "%s %s: %s %s -> %s" % (change.address, change.category, change.name, change.previous, change.health)
+    return "%s (%s)" % (text, change.value) if change.value not in (None, '') else text
+
+
+def log_changes(filename, changes):
+    """Appends HealthChanges to a log file, one line each with the time it was polled. Raises IOError if the file
+    can't be written."""
+    if not changes:
+        return
+    with open(filename, 'a') as f:
+        for change in changes:
+            polled_local = time.strftime("%m/%d/%Y %I:%M:%S %p", time.localtime(change.time))
+            f.write("%s - %s\n" % (polled_local, format_change(change)))
+
+
+class HealthStates(object):
+    """Last reported health of every health check of every instance, compared with each new poll's report. Safe to
+    use from discovery worker threads."""
+    def __init__(self, filename=None, debounce=1):
+        """Constructor, taking the health states file, or None to keep them in memory only, and the polls in a row a
+        new health must hold before it's reported, 1 to report it on the first poll"""
+        self.filename = filename
+        self.debounce = max(1, int(debounce))
+        self.lock = threading.RLock()
+        self._states = None  # Address -> (category, name) -> [reported health, pending health, polls pending held]
+        self._changed = False
+
+    def _load(self):
+        if self._states is not None:
+            return
+        states = {}
+        if self.filename:
+            try:
+                with open(self.filename, 'r') as f:
+                    for address, checks in json.load(f).iteritems():
+                        states[address] = dict(((category, name), [health, pending, polls])
+                                               for category, name, health, pending, polls in checks)
+            except (IOError, ValueError, TypeError, AttributeError):
+                states = {}  # Missing or unreadable states file, every instance starts over
+        self._states = states
+
+    def update(self, address, report, polled_time=None):
+        """Compares an instance's report entries with its last reported healths, returning a list of HealthChange
+        records for the checks whose new health has now held for the debounce"""
+        t = polled_time or time.time()
+        entries = [entry for entry in report if entry['health']]
+        changes = []
+        with self.lock:
+            self._load()
+            previous = self._states.get(address, {})
+            states = {}
+            for entry in entries:
+                key = (entry['category'], entry['name'])
+                health = entry['health']
+                state = previous.get(key)
+                if state is None:
+                    state = [health, health, 0]
+                elif health == state[0]:
+                    state = [health, health, 0]  # Back to the reported health, any pending change is dropped
+                else:
+                    polls = state[2] + 1 if health == state[1] else 1
+                    state = [state[0], health, polls]
+                    if polls >= self.debounce:
+                        changes.append(HealthChange(t, address, key[0], key[1], state[0], health, entry['value'],
+                                                    polls))
+                        state = [health, health, 0]
+                states[key] = state
+            self._states[address] = states
+            self._changed = True
+        return changes
+
+    def save(self):
+        """Writes the health states file if any instance was updated. Raises IOError or OSError if the file can't be
+        written."""
+        if self.filename is None:
+            return
+        with self.lock:
+            if not self._changed:
+                return
+            with replacing(self.filename) as f:
+                json.dump(dict((address, sorted(list(key) + state for key, state in checks.iteritems()))
+                               for address, checks in self._states.iteritems()), f, sort_keys=True)
+            self._changed = False
@@ -0,0 +1,344 @@
+#!/usr/bin/env python
+"""
+misnersplunktoolmetrics.py - Misner Splunk Tool Fleet Metrics
+Copyright (C) 2015-2018 Joe Misner <joe@misner.net>
+http://tools.misner.net/
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program; if not, write to the Free Software Foundation,
+Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301  USA
+
+Dependencies:
+- Python 64-bit v2.7.15, https://www.python.org/
+- Python module 'misnersplunktoolcache.py'
+
+Resource usage from each poll is kept as time series, one per instance and metric, in fixed-size ring buffers backed by
+typed arrays: the latest raw samples, plus rollups of older samples into 5-minute and hourly buckets holding the sample
+count, sum, minimum, and maximum. Every sample also goes into fleet rollups of the same metric across all instances, so
+fleet trends are read straight from one series instead of being merged from every instance at query time.
+
+The metrics file starts with a JSON header line listing every series and its row counts, followed by the raw array
+bytes of each series' columns, oldest row first.
+
+Changelog:
+2026.10.18 - initial version, fleet metrics time series store fed by polls and discoveries
+             added disk I/O utilization metrics
+"""
+
+import sys
+import json
+import time
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+from misnersplunktoolcache import replacing
+
+METRICS_FILENAME = 'metrics.dat'
+METRICS_FORMAT = 'misnersplunktool-metrics'
+METRICS_VERSION = 1
+# Host-wide metrics; disk partitions are 'disk_usage:<mount>' and disk devices are 'io_utilization:<device>'
+METRICS = ('cpu_usage', 'mem_usage', 'swap_usage')
+RAW_CAPACITY = 2880                    # Latest samples kept per instance and metric
+ROLLUPS = ((300, 2016), (3600, 2160))  # Bucket seconds and buckets kept: 7 days of 5-minute, 90 days of hourly
+RAW_COLUMNS = 'df'                     # Time, value
+ROLLUP_COLUMNS = 'dIdff'               # Bucket time, sample count, sum, minimum, maximum
+FLEET = '*'                            # Address of the fleet series
+TREND_POINTS = 200                     # Points returned by fleet trends when no step is given
+
+# Columns returned by trend queries, oldest first; raw samples have a count of 1 and the same average, min, and max
+Trend = namedtuple('Trend', ['times', 'averages', 'minimums', 'maximums', 'counts'])
+
+
+class RingBuffer(object):
+    """Fixed number of rows of numbers, one typed array per column, overwriting the oldest row once full. Rows are
+    appended in time order, so the first column stays sorted once rotated oldest first."""
+    __slots__ = ('capacity', 'columns', 'start')
+
+    def __init__(self, capacity, typecodes):
+        """Constructor, taking the row capacity and an array typecode for each column"""
+        self.capacity = capacity
+        self.columns = [array(typecode) for typecode in typecodes]
+        self.start = 0  # Position of the oldest row once full
+
+    def __len__(self):
+        return len(self.columns[0])
+
+    def append(self, *row):
+        """Adds a row, replacing the oldest one when full"""
+        if len(self.columns[0]) < self.capacity:
+            for column, value in zip(self.columns, row):
+                column.append(value)
+        else:
+            for column, value in zip(self.columns, row):
+                column[self.start] = value
+            self.start = (self.start + 1) % self.capacity
+
+    def position(self, index):
+        """Returns the array position of the row index, counted from the oldest row"""
+        return (self.start + index) % len(self.columns[0])
+
+    def first_time(self):
+        """Returns the time of the oldest row, or None when empty"""
+        return self.columns[0][self.start] if self.columns[0] else None
+
+    def last_time(self):
+        """Returns the time of the newest row, or None when empty"""
+        return self.columns[0][self.start - 1] if self.columns[0] else None
+
+    def ordered(self, index):
+        """Returns a copy of one column, oldest row first"""
+        column = self.columns[index]
+        return column[self.start:] + column[:self.start] if self.start else column[:]
+
+    def find(self, t):
+        """Returns the array position of the row at time t, or None"""
+        lo, hi = 0, len(self)
+        times = self.columns[0]
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if times[self.position(mid)] < t:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(self) and times[self.position(lo)] == t:
+            return self.position(lo)
+        return None
+
+    def between(self, start=None, end=None):
+        """Returns every column for rows with start <= time <= end, oldest first, as arrays"""
+        times = self.ordered(0)
+        lo = 0 if start is None else bisect_left(times, start)
+        hi = len(times) if end is None else bisect_right(times, end)
+        return [times[lo:hi]] + [self.ordered(index)[lo:hi] for index in range(1, len(self.columns))]
+
+    def rows(self):
+        """Returns the raw bytes of every column, oldest row first"""
+        return ''.join(self.ordered(index).tostring() for index in range(len(self.columns)))
+
+    def load(self, data, offset, length, byteswap=False):
+        """Replaces the rows with length rows of raw bytes from rows(), starting at offset in data and keeping the
+        newest rows that fit. Returns the offset just past them."""
+        for index, column in enumerate(self.columns):
+            size = length * column.itemsize
+            column = array(column.typecode)
+            column.fromstring(data[offset:offset + size])
+            if byteswap:
+                column.byteswap()
+            self.columns[index] = column[-self.capacity:]
+            offset += size
+        self.start = 0
+        return offset
+
+
+class Rollup(RingBuffer):
+    """Ring buffer of fixed time buckets, each holding the count, sum, minimum, and maximum of its samples"""
+    __slots__ = ('step',)
+
+    def __init__(self, step, capacity):
+        """Constructor, taking the bucket length in seconds and the number of buckets kept"""
+        RingBuffer.__init__(self, capacity, ROLLUP_COLUMNS)
+        self.step = step
+
+    def add(self, t, value):
+        """Adds a sample to its bucket. Late samples are dropped when their bucket is no longer kept, or was skipped."""
+        bucket = t - t % self.step
+        last = self.last_time()
+        if last is None or bucket > last:
+            self.append(bucket, 1, value, value, value)
+            return
+        position = self.start - 1 if bucket == last else self.find(bucket)
+        if position is None:
+            return
+        _, counts, sums, minimums, maximums = self.columns
+        counts[position] += 1
+        sums[position] += value
+        if value < minimums[position]:
+            minimums[position] = value
+        if value > maximums[position]:
+            maximums[position] = value
+
+    def trend(self, start=None, end=None):
+        """Returns a Trend of the buckets between start and end"""
+        times, counts, sums, minimums, maximums = self.between(start, end)
+        averages = [total / count for total, count in zip(sums, counts)]
+        return Trend(times, averages, minimums, maximums, counts)
+
+
+class MetricSeries(object):
+    """One metric's samples: the latest raw samples, unless this is the fleet series, plus each rollup"""
+    __slots__ = ('raw', 'rollups')
+
+    def __init__(self, raw=True):
+        """Constructor; the fleet series keeps no raw samples since they come from many instances"""
+        self.raw = RingBuffer(RAW_CAPACITY, RAW_COLUMNS) if raw else None
+        self.rollups = [Rollup(step, capacity) for step, capacity in ROLLUPS]
+
+    def buffers(self):
+        """Returns every ring buffer, finest first"""
+        return ([self.raw] if self.raw is not None else []) + self.rollups
+
+    def add(self, t, value):
+        """Adds a sample. Raw samples must arrive in time order, so older ones only go into the rollups."""
+        if self.raw is not None:
+            last = self.raw.last_time()
+            if last is None or t > last:
+                self.raw.append(t, value)
+        for rollup in self.rollups:
+            rollup.add(t, value)
+
+    def trend(self, start=None, end=None, step=0):
+        """Returns a Trend between start and end, at the coarsest resolution no coarser than step seconds that still
+        reaches back to start. When none does, coarser rollups are only used if they hold older samples."""
+        levels = self.buffers()
+        fine = [level for level in levels if getattr(level, 'step', 0) <= step] or levels[:1]
+        chosen = next((level for level in reversed(fine)
+                       if len(level) and (start is None or level.first_time() <= start)), None)
+        if chosen is None:
+            chosen = fine[-1]
+            for level in levels[len(fine):]:
+                if len(level) and (not len(chosen) or level.first_time() + level.step <= chosen.first_time()):
+                    chosen = level
+        if chosen is self.raw:
+            times, values = self.raw.between(start, end)
+            return Trend(times, values, values, values, [1] * len(times))
+        return chosen.trend(start, end)
+
+
+def metric_samples(splunkd):
+    """Returns a dictionary of metric name to value from a polled Splunkd's resource usage, leaving out anything the
+    instance didn't report"""
+    samples = {}
+    if getattr(splunkd, 'mem', None) is not None:  # Set once resource-usage/hostwide has been polled
+        for metric in METRICS:
+            samples[metric] = float(getattr(splunkd, metric))
+    for partition in getattr(splunkd, 'disk_partitions', None) or ():
+        if partition.used is not None:
+            samples['disk_usage:%s' % partition.name] = partition.used
+    for device in getattr(splunkd, 'disk_io', None) or ():
+        if device.utilization is not None:
+            samples['io_utilization:%s' % device.device] = device.utilization
+    return samples
+
+
+class MetricsStore(object):
+    """Time series of every instance's resource usage, plus fleet series of each metric across all instances. The
+    metrics file is read the first time it's needed. Safe to use from discovery worker threads."""
+    def __init__(self, filename=None):
+        """Constructor, taking the metrics file, or None to keep metrics in memory only"""
+        self.filename = filename
+        self.series = {}  # (address, metric) -> MetricSeries, with the fleet series under the FLEET address
+        self.lock = threading.RLock()
+        self.loaded = filename is None
+
+    def _load_once(self):
+        if not self.loaded:
+            self.loaded = True
+            try:
+                self.load()
+            except (IOError, ValueError, KeyError, EOFError):
+                self.series = {}  # Missing or unreadable metrics file, start over
+
+    def add(self, address, metric, t, value):
+        """Adds one sample to the instance's series and the fleet series"""
+        with self.lock:
+            self._load_once()
+            for key, raw in (((address, metric), True), ((FLEET, metric), False)):
+                series = self.series.get(key)
+                if series is None:
+                    series = self.series[key] = MetricSeries(raw)
+                series.add(t, value)
+
+    def record(self, address, splunkd, polled_time=None):
+        """Adds every resource usage sample from a polled Splunkd, at the time it was polled"""
+        t = polled_time or time.time()
+        for metric, value in metric_samples(splunkd).iteritems():
+            self.add(address, metric, t, value)
+
+    def addresses(self):
+        """Returns the sorted host:port addresses of every instance with samples"""
+        with self.lock:
+            self._load_once()
+            return sorted(set(address for address, _ in self.series if address != FLEET))
+
+    def metrics(self, address=FLEET):
+        """Returns the sorted metric names recorded for an instance, or across the fleet"""
+        with self.lock:
+            self._load_once()
+            return sorted(metric for series_address, metric in self.series if series_address == address)
+
+    def trend(self, address, metric, start=None, end=None, step=0):
+        """Returns a Trend of an instance's metric between start and end, at a resolution of at most step seconds
+        where kept, or None when the metric was never recorded"""
+        with self.lock:
+            self._load_once()
+            series = self.series.get((address, metric))
+            return series.trend(start, end, step) if series is not None else None
+
+    def fleet_trend(self, metric, start=None, end=None, step=None):
+        """Returns a Trend of a metric across every instance, whose counts are samples per bucket. Without a step,
+        the step is chosen to give about TREND_POINTS points between start and end."""
+        if step is None:
+            step = ((end or time.time()) - start) / TREND_POINTS if start is not None else ROLLUPS[-1][0]
+        return self.trend(FLEET, metric, start, end, max(step, ROLLUPS[0][0]))
+
+    def latest(self, metric):
+        """Returns a dictionary of host:port address to the (time, value) of each instance's newest sample"""
+        with self.lock:
+            self._load_once()
+            values = {}
+            for (address, name), series in self.series.iteritems():
+                if name == metric and address != FLEET and len(series.raw):
+                    values[address] = (series.raw.last_time(), series.raw.columns[1][series.raw.start - 1])
+            return values
+
+    def load(self):
+        """Reads the metrics file, replacing every series. Raises IOError or ValueError if it can't be read."""
+        with open(self.filename, 'rb') as f:
+            header = json.loads(f.readline())
+            if header.get('format') != METRICS_FORMAT or header.get('version', 0) > METRICS_VERSION:
+                raise ValueError("'%s' is not a metrics file this version can read" % self.filename)
+            data = f.read()
+        byteswap = header.get('byteorder', sys.byteorder) != sys.byteorder  # Saved on a machine of other endianness
+        series = {}
+        offset = 0
+        for entry in header['series']:
+            metric_series = MetricSeries(raw=entry['address'] != FLEET)
+            buffers = metric_series.buffers()
+            if len(entry['rows']) != len(buffers):
+                raise ValueError("'%s' has series saved with different rollups" % self.filename)
+            for buffer, length in zip(buffers, entry['rows']):
+                offset = buffer.load(data, offset, length, byteswap)
+            series[(entry['address'], entry['metric'])] = metric_series
+        with self.lock:
+            self.series = series
+            self.loaded = True
+
+    def save(self):
+        """Writes every series to the metrics file. Raises IOError or OSError if it can't be written."""
+        if self.filename is None:
+            return
+        with self.lock:
+            if not self.series:
+                return
+            keys = sorted(self.series)
+            header = {'format': METRICS_FORMAT, 'version': METRICS_VERSION, 'byteorder': sys.byteorder, 'series': [
+                {'address': address, 'metric': metric,
+                 'rows': [len(buffer) for buffer in self.series[(address, metric)].buffers()]}
+                for address, metric in keys]}
+
+            with replacing(self.filename, 'wb') as f:
+                f.write("%s\n" % json.dumps(header, separators=(',', ':')))
+                for key in keys:
+                    for buffer in self.series[key].buffers():
+                        f.write(buffer.rows())
@@ -0,0 +1,676 @@
+#!/usr/bin/env python
+"""
+misnersplunktoolmodels.py - Misner Splunk Tool Table Models
+Copyright (C) 2015-2018 Joe Misner <joe@misner.net>
+http://tools.misner.net/
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program; if not, write to the Free Software Foundation,
+Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301  USA
+
+Dependencies:
+- Python 64-bit v2.7.15, https://www.python.org/
+- Python module 'PySide2' v5.11, https://pypi.python.org/pypi/PySide2
+
+Changelog:
+2026.10.18 - initial version, virtualized table models for large result sets
+             added diff-based updates keyed on a stable row identity, highlighting changed cells
+             added per-column display formatters, so rows can hold raw numbers that sort and filter as shown
+             added faster loading of records and filtering without re-sorting, for hundreds of thousands of rows
+             added lazy tree model of monitored file paths
+             added heat map model of a matrix of values, shading each cell by how far it is from an even value
+             updates show or hide changed rows whose filtered column changed
+"""
+
+import re
+import time
+import operator
+from itertools import compress, imap, repeat
+from PySide2 import QtCore, QtGui
+
+NUMBER_REGEX = re.compile(r'^\s*(-?\d+(?:\.\d+)?)')
+UNPARSABLE = float('-inf')
+HIGHLIGHT_SECONDS = 3
+HIGHLIGHT_COLOR = '#fff3b0'
+HEAT_COLORS = ('#4575b4', '#ffffff', '#d73027')  # Heat map cells below, at and above the even value
+HEAT_STEPS = 10  # Shades between the even value and either end
+
+
+# Sort keys
+# Numeric keys are floats, with values that can't be parsed sorting ahead of all numbers
+
+def display_text(value):
+    """Default display formatter, showing missing values as blank"""
+    if isinstance(value, basestring):
+        return value
+    return '' if value is None else str(value)
+
+
+def text_key(value):
+    """Case-insensitive text sort key"""
+    return str(value).lower()
+
+
+def numeric_key(value):
+    """Sort key for numbers, including display values such as '45%' or '1.23 GB'"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        pass
+    match = NUMBER_REGEX.match(str(value))
+    return float(match.group(1)) if match else UNPARSABLE
+
+
+def copies_key(value):
+    """Sort key for bucket copy percentages, ordering by number of copies, then by the least complete copy"""
+    if not value:
+        return (0, UNPARSABLE)
+    return (len(value), min(value))
+
+
+def time_key(value):
+    """Sort key for timestamps formatted as '%m/%d/%Y %I:%M:%S %p'"""
+    if isinstance(value, (int, long, float)):
+        return float(value)
+    try:
+        return time.mktime(time.strptime(str(value), "%m/%d/%Y %I:%M:%S %p"))
+    except ValueError:
+        return UNPARSABLE
+
+
+class RowTableModel(QtCore.QAbstractTableModel):
+    """Read-only table model over compact row storage, with lazy display, in-place sorting and filtering"""
+    def __init__(self, columns, key=None, sortable=True, parent=None):
+        """Constructor, taking a list of (header, field), (header, field, sort key function), or
+        (header, field, sort key function, display formatter) tuples, and optionally the field or tuple of fields
+        identifying a row between updates. Formatters turn a raw value into its display text, which is also what the
+        filter matches and text columns sort on."""
+        QtCore.QAbstractTableModel.__init__(self, parent)
+        self._headers = [column[0] for column in columns]
+        self._fields = [column[1] for column in columns]
+        self._sortkeys = [column[2] if len(column) > 2 else text_key for column in columns]
+        self._formatters = [column[3] if len(column) > 3 else display_text for column in columns]
+        if key is None:
+            self._rowkey = None
+        else:
+            key_fields = (key,) if isinstance(key, basestring) else tuple(key)
+            self._rowkey = operator.itemgetter(*[self._fields.index(field) for field in key_fields])
+        self._sortable = sortable
+        self._rows = []          # One tuple per row, holding one value per column
+        self._order = []         # Indexes into self._rows currently shown, in display order
+        self._sorted = None      # Indexes of all rows in sort order, so filters don't re-sort, or None when stale
+        self._sort_column = None
+        self._sort_order = QtCore.Qt.AscendingOrder
+        self._filter_text = ''
+        self._filter_column = 0
+        self._keys_cache = {}    # column -> list of sort keys, aligned with self._rows
+        self._lowered_cache = {}  # column -> list of lowercase display strings, aligned with self._rows
+        self._index = {}         # row key -> index into self._rows
+        self._highlights = {}    # index into self._rows -> (time changed, set of changed columns)
+        self._highlight_brush = QtGui.QBrush(QtGui.QColor(HIGHLIGHT_COLOR))
+        self._highlight_timer = QtCore.QTimer(self)
+        self._highlight_timer.setSingleShot(True)
+        self._highlight_timer.timeout.connect(self._expire_highlights)
+
+    # Qt model interface
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._order)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._fields)
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role == QtCore.Qt.DisplayRole and orientation == QtCore.Qt.Horizontal:
+            return self._headers[section]
+        return None
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role in (QtCore.Qt.DisplayRole, QtCore.Qt.ToolTipRole):
+            return self._formatters[index.column()](self._rows[self._order[index.row()]][index.column()])
+        if role == QtCore.Qt.UserRole:
+            return self._sortkeys[index.column()](self._rows[self._order[index.row()]][index.column()])
+        if role == QtCore.Qt.BackgroundRole and self._highlights:
+            highlight = self._highlights.get(self._order[index.row()])
+            if highlight and index.column() in highlight[1]:
+                return self._highlight_brush
+        return None
+
+    def sort(self, column, order=QtCore.Qt.AscendingOrder):
+        """Sorts the visible rows using cached sort keys, keeping selections on the same rows"""
+        if not self._sortable:
+            return
+        self._sort_column = column
+        self._sort_order = order
+        self._sorted = None
+        if not self._order:
+            return
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        persistent_rows = [self._order[index.row()] for index in persistent]
+        self._apply_sort()
+        if persistent:
+            positions = dict((row, position) for position, row in enumerate(self._order))
+            self.changePersistentIndexList(persistent, [self.index(positions[row], index.column())
+                                                        for row, index in zip(persistent_rows, persistent)])
+        self.layoutChanged.emit()
+
+    # Loading, filtering and access
+
+    def load(self, collection):
+        """Replaces all rows with the given collection of dictionaries or records"""
+        self.beginResetModel()
+        self._rows = self._values(collection)
+        self._sorted = None
+        self._keys_cache = {}
+        self._lowered_cache = {}
+        self._highlights = {}
+        self._index = dict((self._rowkey(row), i) for i, row in enumerate(self._rows)) if self._rowkey else {}
+        self._order = self._filtered(self._all_sorted())
+        self.endResetModel()
+
+    def update(self, collection):
+        """Applies only the rows inserted, removed or changed since the last load or update, matching rows by key.
+        Scroll position, selection and sort order are kept, and changed cells are highlighted briefly."""
+        if self._rowkey is None or not self._rows:
+            self.load(collection)
+            return
+        fields = self._fields
+        rowkey = self._rowkey
+        new_rows = self._values(collection)
+        new_index = dict((rowkey(row), row) for row in new_rows)
+        if len(new_index) != len(new_rows) or len(self._index) != len(self._rows):
+            self.load(collection)  # Keys aren't unique, so rows can't be matched up
+            return
+        now = time.time()
+        self._sorted = None
+
+        # Removed rows
+        removed = set(i for key, i in self._index.iteritems() if key not in new_index)
+        if removed:
+            positions = [position for position, i in enumerate(self._order) if i in removed]
+            for first, last in reversed(self._ranges(positions)):
+                self.beginRemoveRows(QtCore.QModelIndex(), first, last)
+                del self._order[first:last + 1]
+                self.endRemoveRows()
+            self._compact(removed)
+
+        # Changed and inserted rows
+        changed = {}
+        inserted = []
+        refiltered = False
+        for key, row in new_index.iteritems():
+            i = self._index.get(key)
+            if i is None:
+                inserted.append(row)
+            elif self._rows[i] != row:
+                old = self._rows[i]
+                changed[i] = set(column for column in range(len(fields)) if old[column] != row[column])
+                self._rows[i] = row
+        if changed:
+            for column, cache in self._lowered_cache.items():
+                formatter = self._formatters[column]
+                for i in changed:
+                    cache[i] = formatter(self._rows[i][column]).lower()
+            for column, cache in self._keys_cache.items():
+                key = self._sortkeys[column]
+                for i in changed:
+                    cache[i] = key(self._rows[i][column])
+            if self._filter_text:
+                # Rows whose filtered column changed may now be shown or hidden by the filter
+                candidates = [i for i, columns in changed.iteritems() if self._filter_column in columns]
+                matching = set(self._filtered(candidates))
+                unmatched = set(candidates) - matching
+                hidden = [position for position, i in enumerate(self._order) if i in unmatched]
+                for first, last in reversed(self._ranges(hidden)):
+                    self.beginRemoveRows(QtCore.QModelIndex(), first, last)
+                    del self._order[first:last + 1]
+                    self.endRemoveRows()
+                shown = sorted(matching.difference(self._order))
+                if shown:
+                    self.beginInsertRows(QtCore.QModelIndex(), len(self._order), len(self._order) + len(shown) - 1)
+                    self._order.extend(shown)
+                    self.endInsertRows()
+                refiltered = bool(hidden or shown)
+            for i, columns in changed.iteritems():
+                self._highlights[i] = (now, columns)
+            for position, i in enumerate(self._order):
+                if i in changed:
+                    self.dataChanged.emit(self.index(position, min(changed[i])), self.index(position, max(changed[i])))
+        if inserted:
+            start = len(self._rows)
+            self._rows.extend(inserted)
+            for column, cache in self._lowered_cache.items():
+                formatter = self._formatters[column]
+                cache.extend(formatter(row[column]).lower() for row in inserted)
+            for column, cache in self._keys_cache.items():
+                key = self._sortkeys[column]
+                cache.extend(key(row[column]) for row in inserted)
+            all_columns = set(range(len(fields)))
+            for i in range(start, len(self._rows)):
+                self._index[rowkey(self._rows[i])] = i
+                self._highlights[i] = (now, all_columns)
+            visible = self._filtered(range(start, len(self._rows)))
+            if visible:
+                self.beginInsertRows(QtCore.QModelIndex(), len(self._order), len(self._order) + len(visible) - 1)
+                self._order.extend(visible)
+                self.endInsertRows()
+
+        # Put rows back in sort order, or in the collection's order for tables that aren't sortable
+        if self._sort_column is not None and (inserted or changed):
+            self.sort(self._sort_column, self._sort_order)
+        elif not self._sortable and (inserted or removed or refiltered):
+            self.layoutAboutToBeChanged.emit()
+            visible = set(self._order)
+            self._order = [i for i in (self._index[rowkey(row)] for row in new_rows) if i in visible]
+            self.layoutChanged.emit()
+        if changed or inserted:
+            self._highlight_timer.start(HIGHLIGHT_SECONDS * 1000)
+
+    def clear(self):
+        """Removes all rows"""
+        self.load([])
+
+    def set_filter(self, text, column=0):
+        """Shows only rows where the given column contains the text, ignoring case"""
+        text = text.lower()
+        narrowing = column == self._filter_column and self._filter_text and self._filter_text in text
+        self.beginResetModel()
+        if narrowing:  # The new filter only removes rows, so test the currently visible rows alone
+            candidates = self._order
+        else:
+            candidates = self._all_sorted()
+        self._filter_text = text
+        self._filter_column = column
+        self._order = self._filtered(candidates)  # Candidates are in sort order, and so are the rows kept
+        self.endResetModel()
+
+    def row(self, position):
+        """Returns the row's dictionary of raw field values, for the row shown at the given position"""
+        return dict(zip(self._fields, self._rows[self._order[position]]))
+
+    def total_count(self):
+        """Returns the number of rows loaded, including rows hidden by the filter"""
+        return len(self._rows)
+
+    # Internal helpers
+
+    @staticmethod
+    def _ranges(positions):
+        """Groups sorted positions into a list of contiguous (first, last) ranges"""
+        ranges = []
+        for position in positions:
+            if ranges and ranges[-1][1] == position - 1:
+                ranges[-1][1] = position
+            else:
+                ranges.append([position, position])
+        return ranges
+
+    def _compact(self, removed):
+        """Drops removed rows from storage, renumbering the remaining rows"""
+        keep = [i for i in range(len(self._rows)) if i not in removed]
+        renumber = dict((old, new) for new, old in enumerate(keep))
+        self._rows = [self._rows[i] for i in keep]
+        for cache in (self._lowered_cache, self._keys_cache):
+            for column in cache:
+                cache[column] = [cache[column][i] for i in keep]
+        self._order = [renumber[i] for i in self._order]
+        self._index = dict((self._rowkey(row), i) for i, row in enumerate(self._rows))
+        self._highlights = dict((renumber[i], highlight) for i, highlight in self._highlights.iteritems()
+                                if i in renumber)
+
+    def _expire_highlights(self):
+        """Removes highlighting from cells that changed more than HIGHLIGHT_SECONDS ago"""
+        expiry = time.time() - HIGHLIGHT_SECONDS
+        expired = set(i for i, highlight in self._highlights.iteritems() if highlight[0] <= expiry)
+        for i in expired:
+            del self._highlights[i]
+        if expired and self._order:
+            for position, i in enumerate(self._order):
+                if i in expired:
+                    self.dataChanged.emit(self.index(position, 0), self.index(position, len(self._fields) - 1))
+        if self._highlights:
+            self._highlight_timer.start(HIGHLIGHT_SECONDS * 1000)
+
+    def _values(self, collection):
+        """Returns a tuple of column values for each dictionary or record in the collection. Records of one type are
+        read by position from plain tuples, as record fields read by name are much slower."""
+        fields = self._fields
+        if not isinstance(collection, list):
+            collection = list(collection)
+        record_fields = getattr(collection[0], '_fields', None) if collection else None
+        if record_fields is None or not set(fields) <= set(record_fields) or len(set(map(type, collection))) > 1:
+            return [tuple(entry[field] for field in fields) for entry in collection]
+        if len(fields) == 1:
+            position = record_fields.index(fields[0])
+            return [(value[position],) for value in map(tuple, collection)]
+        return map(operator.itemgetter(*[record_fields.index(field) for field in fields]), map(tuple, collection))
+
+    def _all_sorted(self):
+        """Returns the indexes of all rows in sort order, cached until the rows or sort order change"""
+        if self._sorted is None:
+            self._sorted = range(len(self._rows))
+            if self._sort_column is not None:
+                self._sorted.sort(key=self._keys(self._sort_column).__getitem__,
+                                  reverse=self._sort_order == QtCore.Qt.DescendingOrder)
+        return self._sorted
+
+    def _filtered(self, candidates):
+        if not self._filter_text:
+            return list(candidates)
+        lowered = map(self._lowered(self._filter_column).__getitem__, candidates)
+        return list(compress(candidates, imap(operator.contains, lowered, repeat(self._filter_text))))
+
+    def _lowered(self, column):
+        if column not in self._lowered_cache:
+            formatter = self._formatters[column]
+            self._lowered_cache[column] = [formatter(row[column]).lower() for row in self._rows]
+        return self._lowered_cache[column]
+
+    def _keys(self, column):
+        if self._sortkeys[column] is text_key:  # Text keys are the lowercase strings already used for filtering
+            return self._lowered(column)
+        if column not in self._keys_cache:
+            key = self._sortkeys[column]
+            self._keys_cache[column] = [key(row[column]) for row in self._rows]
+        return self._keys_cache[column]
+
+    def _apply_sort(self):
+        if self._sort_column is None or not self._order:
+            return
+        keys = self._keys(self._sort_column)
+        self._order.sort(key=keys.__getitem__, reverse=self._sort_order == QtCore.Qt.DescendingOrder)
+
+
+class _PathItem(object):
+    """Row of a PathTreeModel, either a directory's PathNode or the sorted position of a file"""
+    __slots__ = ('node', 'position', 'parent', 'row', 'children', 'values')
+
+    def __init__(self, node, position, parent, values):
+        self.node = node
+        self.position = position
+        self.parent = parent
+        self.row = 0
+        self.children = None  # Built when first asked for
+        self.values = values
+
+
+class PathTreeModel(QtCore.QAbstractItemModel):
+    """Read-only tree model over a PathTree, building each directory's rows only when they're first asked for, as
+    when it's expanded, so only what's shown costs anything however many files there are. The filter hides files whose
+    location doesn't contain its text, and directories left without any, and directories then count only matching
+    files, while their other totals stay those of every file."""
+    def __init__(self, columns, parent=None):
+        """Constructor, taking a list of (header, field, sort key function, display formatter) tuples like
+        RowTableModel, naming DirectoryRate fields"""
+        QtCore.QAbstractItemModel.__init__(self, parent)
+        self._headers = [column[0] for column in columns]
+        self._fields = [column[1] for column in columns]
+        self._sortkeys = [column[2] if len(column) > 2 else text_key for column in columns]
+        self._formatters = [column[3] if len(column) > 3 else display_text for column in columns]
+        self._tree = None
+        self._root = None
+        self._sort_column = None
+        self._sort_order = QtCore.Qt.AscendingOrder
+        self._filter_text = ''
+        self._matches = None  # Sorted positions of the files matching the filter, or None without one
+
+    # Qt model interface
+
+    def index(self, row, column, parent=QtCore.QModelIndex()):
+        children = self._children(parent.internalPointer() if parent.isValid() else self._root)
+        if 0 <= row < len(children) and 0 <= column < len(self._fields):
+            return self.createIndex(row, column, children[row])
+        return QtCore.QModelIndex()
+
+    def parent(self, index):
+        if not index.isValid():
+            return QtCore.QModelIndex()
+        item = index.internalPointer().parent
+        if item is None or item is self._root:
+            return QtCore.QModelIndex()
+        return self.createIndex(item.row, 0, item)
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid() and parent.column() > 0:
+            return 0
+        return len(self._children(parent.internalPointer() if parent.isValid() else self._root))
+
+    def hasChildren(self, parent=QtCore.QModelIndex()):
+        if not parent.isValid():
+            return self._root is not None
+        return parent.column() == 0 and parent.internalPointer().node is not None
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return len(self._fields)
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role == QtCore.Qt.DisplayRole and orientation == QtCore.Qt.Horizontal:
+            return self._headers[section]
+        return None
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        item = index.internalPointer()
+        if role == QtCore.Qt.DisplayRole:
+            return self._formatters[index.column()](item.values[index.column()])
+        if role == QtCore.Qt.ToolTipRole:
+            return item.node.path if item.node is not None else self._tree.locations[item.position]
+        if role == QtCore.Qt.UserRole:
+            return self._sortkeys[index.column()](item.values[index.column()])
+        return None
+
+    def sort(self, column, order=QtCore.Qt.AscendingOrder):
+        """Sorts every directory's rows built so far, keeping expanded directories and selections on the same rows"""
+        self._sort_column = column
+        self._sort_order = order
+        if self._root is None:
+            return
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        items = [(index.internalPointer(), index.column()) for index in persistent]
+        stack = [self._root]
+        while stack:
+            item = stack.pop()
+            if item.children:
+                self._sort(item.children)
+                stack.extend(item.children)
+        if persistent:
+            self.changePersistentIndexList(persistent, [self.createIndex(item.row, column, item)
+                                                        for item, column in items])
+        self.layoutChanged.emit()
+
+    # Loading, filtering and access
+
+    def load(self, tree):
+        """Replaces the tree shown with the given PathTree, or None to show nothing. The filter is applied again."""
+        self.beginResetModel()
+        self._tree = tree
+        self._matches = tree.match(self._filter_text) if tree is not None and self._filter_text else None
+        self._root = _PathItem(tree.root, None, None, None) if tree is not None else None
+        self.endResetModel()
+
+    def clear(self):
+        """Removes the tree"""
+        self.load(None)
+
+    def set_filter(self, text):
+        """Shows only files with a location containing the text, ignoring case, and the directories holding them"""
+        text = text.lower()
+        within = self._matches if self._filter_text and self._filter_text in text else None
+        self.beginResetModel()
+        self._filter_text = text
+        if self._tree is None or not text:
+            self._matches = None
+        else:
+            self._matches = self._tree.match(text, within)
+        if self._root is not None:
+            self._root = _PathItem(self._tree.root, None, None, None)
+        self.endResetModel()
+
+    def match_count(self):
+        """Returns the number of files matching the filter, or of all files without one"""
+        if self._tree is None:
+            return 0
+        return len(self._tree.locations) if self._matches is None else len(self._matches)
+
+    def directory_paths(self, indexes):
+        """Returns the paths of the directories at the given indexes"""
+        return [index.internalPointer().node.path for index in indexes
+                if index.isValid() and index.internalPointer().node is not None]
+
+    def expandable_indexes(self):
+        """Returns the index of each directory whose rows have been built, which any expanded directory is"""
+        indexes = []
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            item = stack.pop()
+            if item.children is not None:
+                if item is not self._root:
+                    indexes.append(self.createIndex(item.row, 0, item))
+                stack.extend(child for child in item.children if child.node is not None)
+        return indexes
+
+    def find(self, path):
+        """Returns the index of the directory with the given path, or an invalid index if it isn't shown"""
+        item = self._root
+        while item is not None:
+            parent, item = item, None
+            for child in self._children(parent):
+                node = child.node
+                if node is None:
+                    continue
+                if node.path == path:
+                    return self.createIndex(child.row, 0, child)
+                if path.startswith(node.path) and (node.path[-1] in '/\\' or path[len(node.path)] in '/\\'):
+                    item = child  # An ancestor of the directory
+                    break
+        return QtCore.QModelIndex()
+
+    # Internal helpers
+
+    def _children(self, item):
+        """Returns the item's child rows, building them the first time"""
+        if item is None or item.node is None:
+            return []
+        if item.children is None:
+            tree = self._tree
+            matches = self._matches
+            children = []
+            for node in tree.subdirectories(item.node):
+                values = tree.totals(node)
+                if matches is not None:
+                    count = tree.count(node.first, node.last, matches)
+                    if not count:
+                        continue
+                    values = values._replace(files=count)
+                children.append(_PathItem(node, None, item, values))
+            files = item.node.files
+            if matches is not None:
+                files = [position for position in files if tree.count(position, position + 1, matches)]
+            children.extend(_PathItem(None, position, item, tree.file_totals(position)) for position in files)
+            self._sort(children)
+            item.children = children
+        return item.children
+
+    def _sort(self, children):
+        """Sorts sibling rows in place, directories first, numbering their rows again"""
+        if self._sort_column is not None:
+            column = self._sort_column
+            key = self._sortkeys[column]
+            formatter = self._formatters[column]
+            if key is text_key:
+                children.sort(key=lambda child: formatter(child.values[column]).lower(),
+                              reverse=self._sort_order == QtCore.Qt.DescendingOrder)
+            else:
+                children.sort(key=lambda child: key(child.values[column]),
+                              reverse=self._sort_order == QtCore.Qt.DescendingOrder)
+            children.sort(key=lambda child: child.node is None)
+        for row, child in enumerate(children):
+            child.row = row
+
+
+class HeatMapModel(QtCore.QAbstractTableModel):
+    """Read-only table model over a matrix of numbers, such as a numpy array, with a header for each row and column.
+    Each cell is shaded from HEAT_COLORS by how far its value is from the even value, fully at either end, and cells
+    without a value (NaN) are left blank. Shades are read as cells are shown, so large matrices cost nothing until
+    scrolled to."""
+    def __init__(self, formatter=display_text, tooltip=None, parent=None):
+        """Constructor, taking the display formatter of cell values, and optionally a function returning a cell's
+        tooltip from its row and column numbers"""
+        QtCore.QAbstractTableModel.__init__(self, parent)
+        self._formatter = formatter
+        self._tooltip = tooltip
+        self._rows = []
+        self._columns = []
+        self._values = None
+        self._range = (0.0, 1.0, 2.0)
+        self._brushes = {}  # Shade step -> brush, negative below the even value
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._columns)
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role in (QtCore.Qt.DisplayRole, QtCore.Qt.ToolTipRole):
+            return self._columns[section] if orientation == QtCore.Qt.Horizontal else self._rows[section]
+        return None
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        value = float(self._values[index.row(), index.column()])
+        if value != value:  # NaN
+            return None
+        if role == QtCore.Qt.DisplayRole:
+            return self._formatter(value)
+        if role == QtCore.Qt.ToolTipRole and self._tooltip:
+            return self._tooltip(index.row(), index.column())
+        if role == QtCore.Qt.BackgroundRole:
+            low, even, high = self._range
+            if value >= even:
+                step = int(round(min((value - even) / ((high - even) or 1), 1.0) * HEAT_STEPS))
+            else:
+                step = -int(round(min((even - value) / ((even - low) or 1), 1.0) * HEAT_STEPS))
+            return self._brush(step)
+        if role == QtCore.Qt.TextAlignmentRole:
+            return QtCore.Qt.AlignCenter
+        return None
+
+    def load(self, rows, columns, values, low=0.0, even=1.0, high=2.0):
+        """Replaces the matrix, taking the row and column headers, the values indexed as values[row, column], and the
+        values shaded fully below, not at all, and fully above"""
+        self.beginResetModel()
+        self._rows = list(rows)
+        self._columns = list(columns)
+        self._values = values
+        self._range = (low, even, high)
+        self.endResetModel()
+
+    def clear(self):
+        self.load([], [], None)
+
+    def _brush(self, step):
+        brush = self._brushes.get(step)
+        if brush is None:
+            end = QtGui.QColor(HEAT_COLORS[0 if step < 0 else 2])
+            start = QtGui.QColor(HEAT_COLORS[1])
+            mix = abs(step) / float(HEAT_STEPS)
+            brush = self._brushes[step] = QtGui.QBrush(QtGui.QColor(
+                *[int(a + (b - a) * mix) for a, b in zip(start.getRgb()[:3], end.getRgb()[:3])]))
+        return brush
@@ -0,0 +1,175 @@
+#!/usr/bin/env python
+"""
+misnersplunktoolpathtree.py - Misner Splunk Tool Monitored File Path Tree
+Copyright (C) 2015-2018 Joe Misner <joe@misner.net>
+http://tools.misner.net/
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program; if not, write to the Free Software Foundation,
+Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301  USA
+
+Dependencies:
+- Python 64-bit v2.7.15, https://www.python.org/
+- Python module 'misnersplunkdrecords.py'
+- Python module 'misnersplunktoolfilerates.py'
+
+Monitored files are sorted by their path components, so every directory's files, including those in its
+subdirectories, form one contiguous range of the sorted files. Given the sorted positions of the files matching a
+filter, two binary searches then count any directory's matching files, so filtering only tests each location once,
+and nothing is counted for a directory until it's shown. Per-directory totals are added up once per tree, by column.
+
+Changelog:
+2026.10.18 - initial version, prefix tree of monitored file paths with per-directory totals and fast filtering
+"""
+
+import operator
+from bisect import bisect_left
+from itertools import compress, groupby, imap, repeat
+from misnersplunkdrecords import FileRate, DirectoryRate
+from misnersplunktoolfilerates import catch_up_seconds
+
+SEPARATOR_KEY = '\x00'  # Replaces path separators in sort keys, sorting a directory's files ahead of longer names
+
+
+class PathNode(object):
+    """Directory in a PathTree, covering the sorted files from first up to last. Directories holding nothing but a
+    single subdirectory are merged into it, so a chain like /var/log is one node."""
+    __slots__ = ('name', 'path', 'parent', 'subdirectories', 'files', 'first', 'last', 'totals')
+
+    def __init__(self, name, path, parent):
+        self.name = name
+        self.path = path
+        self.parent = parent
+        self.subdirectories = {}  # Name -> PathNode
+        self.files = []           # Sorted positions of the files directly in this directory
+        self.first = self.last = None
+        self.totals = None        # [lagging, size, behind, files with rates, read rate, growth rate]
+
+
+class PathTree(object):
+    """Prefix tree of monitored file locations, built from FileRate records"""
+    def __init__(self, file_rates):
+        """Constructor, taking FileRate records. Records without a read position, such as monitored directories
+        themselves, are left out."""
+        # Records are read by column with tuple.__getitem__(), as record fields read by name are much slower
+        columns = [map(tuple.__getitem__, file_rates, repeat(FileRate._fields.index(field), len(file_rates)))
+                   for field in ('location', 'size', 'behind', 'read_rate', 'growth_rate', 'catch_up')]
+        if None in columns[2]:
+            kept = [position for position, value in enumerate(columns[2]) if value is not None]
+            columns = [map(column.__getitem__, kept) for column in columns]
+        self._size, self._behind, self._read_rate, self._growth_rate, self._catch_up = columns[1:]
+        keys = map(operator.methodcaller('replace', '\\', SEPARATOR_KEY),
+                   map(operator.methodcaller('replace', '/', SEPARATOR_KEY), columns[0]))
+        self._order = sorted(xrange(len(keys)), key=keys.__getitem__)  # Sorted position -> column position
+        self.locations = map(columns[0].__getitem__, self._order)
+        self._lowered = None
+        self._build(map(keys.__getitem__, self._order))
+        self._totals()
+
+    def _build(self, keys):
+        self.root = PathNode('', '', None)
+        directories = {}  # Directory key -> PathNode
+        directory_keys = map(operator.itemgetter(0), map(operator.methodcaller('rpartition', SEPARATOR_KEY), keys))
+        for directory, positions in groupby(xrange(len(keys)), directory_keys.__getitem__):
+            positions = list(positions)
+            node = directories.get(directory)
+            if node is None:
+                node = directories[directory] = self._directory(directory, self.locations[positions[0]])
+            node.files.extend(positions)
+        self._merge(self.root)
+        self._ranges(self.root)
+
+    def _directory(self, directory, location):
+        """Returns the new node of a directory key, creating any missing parent nodes"""
+        node = self.root
+        length = 0
+        for name in directory.split(SEPARATOR_KEY):
+            length += len(name) + 1
+            child = node.subdirectories.get(name)
+            if child is None:
+                child = node.subdirectories[name] = PathNode(name or location[0], location[:length - 1] or
+                                                             location[0], node)
+            node = child
+        return node
+
+    def _merge(self, node):
+        for name, child in node.subdirectories.items():
+            while len(child.subdirectories) == 1 and not child.files:
+                grandchild = child.subdirectories.values()[0]
+                grandchild.name = '%s%s%s' % (child.name, '' if child.name in ('/', '\\') else
+                                              grandchild.path[len(child.path)], grandchild.name)
+                grandchild.parent = node
+                child = grandchild
+            node.subdirectories[name] = child
+            self._merge(child)
+
+    def _ranges(self, node):
+        first, last = (node.files[0], node.files[-1] + 1) if node.files else (None, None)
+        for child in node.subdirectories.itervalues():
+            self._ranges(child)
+            first = child.first if first is None else min(first, child.first)
+            last = child.last if last is None else max(last, child.last)
+        node.first, node.last = first or 0, last or 0
+
+    def _totals(self):
+        """Adds up each directory's files by column, then adds in the totals of its subdirectories"""
+        rated = [rate is not None for rate in self._read_rate]
+        self._add_totals(self.root, (self._size, self._behind, rated, [rate or 0.0 for rate in self._read_rate],
+                                     [rate or 0.0 for rate in self._growth_rate]))
+
+    def _add_totals(self, node, columns):
+        files = map(self._order.__getitem__, node.files)
+        size, behind, rated, read_rate, growth_rate = [map(column.__getitem__, files) for column in columns]
+        totals = [len(behind) - behind.count(0), sum(size), sum(behind), sum(rated), sum(read_rate), sum(growth_rate)]
+        for child in node.subdirectories.itervalues():
+            self._add_totals(child, columns)
+            totals = map(operator.add, totals, child.totals)
+        node.totals = totals
+
+    def subdirectories(self, node):
+        """Returns the node's subdirectory nodes"""
+        return node.subdirectories.values()
+
+    def totals(self, node):
+        """Returns a DirectoryRate record totalling every file under the directory node"""
+        lagging, size, behind, rated, read_rate, growth_rate = node.totals
+        if not rated:
+            read_rate = growth_rate = None
+        return DirectoryRate(directory=node.name, files=node.last - node.first, lagging=lagging, size=size,
+                             behind=behind, read_rate=read_rate, growth_rate=growth_rate,
+                             catch_up=catch_up_seconds(behind, read_rate, growth_rate))
+
+    def file_totals(self, position):
+        """Returns a DirectoryRate record of the single file at a sorted position, named after the file alone"""
+        location = self.locations[position]
+        name = location[max(location.rfind('/'), location.rfind('\\')) + 1:]
+        i = self._order[position]
+        return DirectoryRate(directory=name, files=None, lagging=None, size=self._size[i], behind=self._behind[i],
+                             read_rate=self._read_rate[i], growth_rate=self._growth_rate[i],
+                             catch_up=self._catch_up[i])
+
+    def match(self, text, within=None):
+        """Returns the sorted positions of the files whose location contains the text, ignoring case. Passing the
+        matches of a shorter text contained in this one only checks those files again."""
+        if self._lowered is None:
+            self._lowered = map(operator.methodcaller('lower'), self.locations)
+        text = text.lower()
+        if within is None or len(within) > len(self._lowered) / 2:  # Checking every file is faster then
+            return list(compress(xrange(len(self._lowered)), imap(operator.contains, self._lowered, repeat(text))))
+        lowered = map(self._lowered.__getitem__, within)
+        return list(compress(within, imap(operator.contains, lowered, repeat(text))))
+
+    @staticmethod
+    def count(first, last, matches):
+        """Returns how many of the sorted matching positions fall from first up to last"""
+        return bisect_left(matches, last) - bisect_left(matches, first)
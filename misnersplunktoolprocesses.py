@@ -0,0 +1,194 @@
+#!/usr/bin/env python
+"""
+misnersplunktoolprocesses.py - Misner Splunk Tool Process Tracking
+Copyright (C) 2015-2018 Joe Misner <joe@misner.net>
+http://tools.misner.net/
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program; if not, write to the Free Software Foundation,
+Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301  USA
+
+Dependencies:
+- Python 64-bit v2.7.15, https://www.python.org/
+- Python module 'misnersplunkdrecords.py'
+
+The splunk-processes endpoint only reports each process's CPU usage right now, as a percentage of one core. CPU time
+is estimated by averaging the percentages of consecutive observations of a PID over the time between them, so it
+grows more accurate the more often polls or resource usage samples arrive.
+
+Changelog:
+2026.10.18 - initial version, per-PID history of Splunk processes across polls, with CPU time, lifetime, process tree
+             and search identification
+"""
+
+from collections import deque
+from misnersplunkdrecords import TrackedProcess
+
+EXITED_LIMIT = 500  # Exited processes remembered, so short-lived searches still show up as top offenders
+TOP_COUNT = 10
+
+# Search types, by the prefix of the search ID, checked in order
+SEARCH_TYPES = (
+    ('remote_', 'remote'),
+    ('rt_', 'real-time'),
+    ('scheduler_', 'scheduled'),
+    ('_ACCELERATE_', 'acceleration'),
+    ('SummaryDirector_', 'summary'),
+    ('subsearch_', 'subsearch'),
+)
+
+
+def search_identity(args):
+    """Returns a description of the search a process is running, such as 'scheduled search by admin:
+    scheduler__admin__search__RMD5..._at_1500000000_123', from its 'search --id=<sid> --user=<user> ...' arguments,
+    or '' for processes that aren't searches"""
+    words = (args or '').split()
+    if not words or words[0] != 'search':
+        return ''
+    options = dict(word[2:].split('=', 1) for word in words[1:] if word.startswith('--') and '=' in word)
+    sid = options.get('id', '')
+    kind = 'ad hoc'
+    for prefix, search_type in SEARCH_TYPES:
+        if sid.startswith(prefix):
+            kind = search_type
+            break
+    user = options.get('user')
+    return '%s search%s: %s' % (kind, ' by %s' % user if user else '', sid)
+
+
+def tree_order(value):
+    """Sort key for a process's (order, depth, name, running) tree position, sorting parents just ahead of their
+    children"""
+    return value[0]
+
+
+def format_tree(value):
+    """(order, depth, name, running) -> the process name, indented under its parent"""
+    order, depth, name, running = value
+    return '%s%s%s' % ('   ' * depth, name, '' if running else ' (exited)')
+
+
+class _History(object):
+    """One process's observations, from the first poll listing its PID until the first poll that doesn't"""
+    __slots__ = ('pid', 'parent_pid', 'name', 'args', 'search', 'started', 'last_seen', 'cpu', 'mem', 'peak_cpu',
+                 'cpu_seconds', 'running')
+
+    def __init__(self, process, t):
+        self.pid = process.pid
+        self.name = process.name
+        self.args = process.args
+        self.search = search_identity(process.args)
+        self.started = self.last_seen = t
+        self.cpu_seconds = 0.0
+        self.peak_cpu = None
+        self.running = True
+        self.observe(process, t)
+
+    def observe(self, process, t):
+        cpu = process.cpu or 0.0
+        if self.running and t > self.last_seen:
+            self.cpu_seconds += (self.cpu + cpu) / 2 / 100 * (t - self.last_seen)
+        self.last_seen = t
+        self.parent_pid = process.parent_pid
+        self.cpu = cpu
+        self.mem = process.mem
+        self.peak_cpu = cpu if self.peak_cpu is None else max(self.peak_cpu, cpu)
+
+
+class ProcessTracker(object):
+    """Per-PID history of the Splunk processes of one instance, fed by each poll or resource usage sample. A PID
+    listed again with a different name or arguments is taken as reused by a new process."""
+    def __init__(self, exited_limit=EXITED_LIMIT):
+        """Constructor, taking the number of exited processes to remember"""
+        self.exited_limit = exited_limit
+        self.clear()
+
+    def clear(self):
+        """Forgets every process, as when connecting to another instance"""
+        self._running = {}  # PID -> _History
+        self._exited = deque(maxlen=self.exited_limit)  # Oldest first
+        self.last_time = None
+
+    def observe(self, t, processes):
+        """Adds the SplunkProcess records listed at time t. Observations older than the latest are ignored, since
+        polls and samples can finish out of order."""
+        if self.last_time is not None and t < self.last_time:
+            return
+        self.last_time = t
+        listed = set()
+        for process in processes:
+            if process.pid is None:
+                continue
+            history = self._running.get(process.pid)
+            if history is not None and (history.name != process.name or history.args != process.args):
+                self._exit(history)
+                history = None
+            if history is None:
+                self._running[process.pid] = _History(process, t)
+            else:
+                history.observe(process, t)
+            listed.add(process.pid)
+        for pid in [pid for pid in self._running if pid not in listed]:
+            self._exit(self._running[pid])
+
+    def _exit(self, history):
+        history.running = False
+        del self._running[history.pid]
+        self._exited.append(history)
+
+    def processes(self, running_only=False):
+        """Returns TrackedProcess records in process tree order, each parent followed by its children, including
+        exited processes unless running_only"""
+        histories = self._running.values() if running_only else self._running.values() + list(self._exited)
+        children = {}
+        for history in histories:
+            children.setdefault(history.parent_pid, []).append(history)
+        for siblings in children.itervalues():
+            siblings.sort(key=lambda history: (history.started, history.pid))
+
+        # Roots are processes whose parent isn't running, such as the main splunkd process
+        roots = [history for history in histories
+                 if history.parent_pid not in self._running or history.parent_pid == history.pid]
+        roots.sort(key=lambda history: (history.started, history.pid))
+        records = []
+        visited = set()
+        stack = [(history, 0) for history in reversed(roots)]
+        while stack:
+            history, depth = stack.pop()
+            if id(history) in visited:
+                continue
+            visited.add(id(history))
+            records.append(self._record(history, len(records), depth))
+            if history.running:
+                stack.extend((child, depth + 1) for child in reversed(children.get(history.pid, ())))
+        return records
+
+    def top(self, count=TOP_COUNT):
+        """Returns the TrackedProcess records of the count processes with the most CPU time, running or not"""
+        return sorted(self.processes(), key=lambda record: record.cpu_seconds, reverse=True)[:count]
+
+    def _record(self, history, order, depth):
+        return TrackedProcess(
+            tree=(order, depth, history.name, history.running),
+            name=history.name,
+            pid=history.pid,
+            parent_pid=history.parent_pid,
+            cpu=history.cpu if history.running else None,
+            mem=history.mem if history.running else None,
+            cpu_seconds=history.cpu_seconds,
+            peak_cpu=history.peak_cpu,
+            started=history.started,
+            lifetime=history.last_seen - history.started,
+            running=history.running,
+            search=history.search,
+            args=history.args)
@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+"""
+misnersplunktoolreport.py - Misner Splunk Tool Report Writers
+Copyright (C) 2015-2018 Joe Misner <joe@misner.net>
+http://tools.misner.net/
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program; if not, write to the Free Software Foundation,
+Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301  USA
+
+Dependencies:
+- Python 64-bit v2.7.15, https://www.python.org/
+- Python module 'misnersplunkdwrapper.py'
+
+Changelog:
+2026.10.18 - initial version, streaming Discovery Report writer with a fixed schema, in CSV or JSON Lines format
+             added fleet summary sheets, written next to a Discovery Report
+             added health changes, the changes-only view of repeated polls
+"""
+
+import os
+import time
+import json
+from misnersplunkdwrapper import report_schema
+
+REPORT_FORMATS = ('csv', 'jsonl')
+
+
+def report_comments(product, report_type):
+    """Returns the comment lines written at the top of CSV reports"""
+    local_datetime_full = time.strftime("%m/%d/%Y %I:%M:%S %p", time.localtime())
+    return ["Misner Splunk Tool %s by Joe Misner - http://tools.misner.net/" % product,
+            "%s produced %s" % (report_type, local_datetime_full)]
+
+
+def csv_value(value):
+    """Formats a report value for a CSV cell, replacing commas since cells aren't quoted"""
+    return str(value).replace(',', ';')
+
+
+def summary_filename(filename):
+    """Returns the filename of the fleet summary saved next to a Discovery Report"""
+    root, extension = os.path.splitext(filename)
+    return "%s Summary%s" % (root, extension)
+
+
+def summary_value(value):
+    """Formats a fleet statistic, rounded to two decimals without trailing zeros"""
+    if value is None:
+        return ''
+    if isinstance(value, float):
+        return ('%.2f' % value).rstrip('0').rstrip('.')
+    if isinstance(value, list):
+        return '; '.join(value)
+    return csv_value(value)
+
+
+# Fleet summary sheet sections, as (JSON Lines section name, records attribute, CSV column headers)
+SUMMARY_SECTIONS = [
+    ('metric', 'metrics', ['Metric', 'Name', 'Instances', 'Missing', 'Minimum', '5th Percentile', '25th Percentile',
+                           'Median', '75th Percentile', '95th Percentile', 'Maximum', 'Mean', 'Standard Deviation',
+                           'Outliers', 'Outlying Instances']),
+    ('healthcheck', 'checks', ['Category', 'Name', 'Checked', 'OK', 'Caution', 'Warning', 'Unknown', 'Breaching']),
+    ('version', 'versions', ['Version', 'Instances', 'Percent'])
+]
+
+
+def write_fleet_summary(f, summary, output_format='csv', comments=()):
+    """Writes a FleetSummary as a sheet of metric distributions, health check breach counts, and Splunk versions.
+    CSV sections are separated by blank lines; JSON Lines records are tagged with their section."""
+    if output_format == 'jsonl':
+        for section, attribute, _ in SUMMARY_SECTIONS:
+            for record in getattr(summary, attribute):
+                line = dict(record._asdict())
+                line['section'] = section
+                f.write("%s\n" % json.dumps(line, default=str))
+        return
+    for comment in comments:
+        f.write("# %s\n" % comment)
+    for number, (_, attribute, headers) in enumerate(SUMMARY_SECTIONS):
+        if number:
+            f.write("\n")
+        f.write("%s\n" % ','.join(headers))
+        for record in getattr(summary, attribute):
+            f.write("%s\n" % ','.join(summary_value(value) for value in record))
+
+
+def write_health_changes(f, changes, output_format='csv', comments=()):
+    """Writes HealthChange records, the changes-only view of repeated polls, oldest first"""
+    if output_format == 'jsonl':
+        for change in changes:
+            f.write("%s\n" % json.dumps(dict(change._asdict()), default=str))
+        return
+    for comment in comments:
+        f.write("# %s\n" % comment)
+    f.write("Time,Address,Category,Name,Previous,Health,Value,Polls\n")
+    for change in changes:
+        polled_local = time.strftime("%m/%d/%Y %I:%M:%S %p", time.localtime(change.time))
+        f.write("%s\n" % ','.join([polled_local] + [csv_value(value) for value in change[1:]]))
+
+
+def write_instance_report(f, address, report, output_format='csv', comments=()):
+    """Writes a single instance's report entries in the given format"""
+    if output_format == 'jsonl':
+        for entry in report:
+            f.write("%s\n" % json.dumps({'address': address, 'category': entry['category'], 'name': entry['name'],
+                                         'health': entry['health'], 'value': entry['value']}, default=str))
+    else:
+        for comment in comments:
+            f.write("# %s\n" % comment)
+        f.write("Category,Name,Health,Value\n")
+        for entry in report:
+            f.write("%s,%s,%s,%s\n" % (entry['category'], entry['name'], entry['health'], csv_value(entry['value'])))
+
+
+class DiscoveryReportWriter(object):
+    """Writes a Discovery Report one instance at a time as polls complete, keeping nothing but counters in memory.
+    Columns are fixed up front from the enabled health checks, so every row lines up no matter which instance finishes
+    first or which roles it has; entries an instance doesn't report are left blank."""
+    def __init__(self, f, healthchecks, output_format='csv', comments=()):
+        """Constructor, taking an open file, compiled HealthChecks, 'csv' or 'jsonl', and CSV comment lines"""
+        if output_format not in REPORT_FORMATS:
+            raise ValueError("Invalid report format '%s'" % output_format)
+        self.f = f
+        self.output_format = output_format
+        self.columns = report_schema(healthchecks)
+        self.rows = 0      # Instances written with a report
+        self.failures = 0  # Instances that failed polling
+        if output_format == 'csv':
+            for comment in comments:
+                f.write("# %s\n" % comment)
+            f.write("%s\n" % ','.join('%s: %s' % column for column in self.columns))
+            f.flush()
+
+    def write(self, address, status, report=None):
+        """Writes one instance; report is the instance's list of report entries, or None if polling failed.
+        Failed instances are only recorded in JSON Lines output, CSV rows are reserved for polled instances."""
+        if report is None:
+            self.failures += 1
+            if self.output_format == 'jsonl':
+                self.f.write("%s\n" % json.dumps({'address': address, 'status': status, 'report': None}))
+                self.f.flush()
+            return
+
+        entries = dict(((entry['category'], entry['name']), entry) for entry in report)
+        if self.output_format == 'jsonl':
+            row = []
+            for category, name in self.columns:
+                entry = entries.get((category, name))
+                row.append({'category': category, 'name': name,
+                            'health': entry['health'] if entry else '',
+                            'value': entry['value'] if entry else ''})
+            self.f.write("%s\n" % json.dumps({'address': address, 'status': status, 'report': row}, default=str))
+        else:
+            self.f.write("%s\n" % ','.join(csv_value(entries[column]['value']) if column in entries else ''
+                                           for column in self.columns))
+        self.f.flush()
+        self.rows += 1
+
+    def close(self):
+        """Closes the underlying file"""
+        self.f.close()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+"""
+misnersplunktoolresolver.py - Misner Splunk Tool Reverse DNS Resolver
+Copyright (C) 2015-2018 Joe Misner <joe@misner.net>
+http://tools.misner.net/
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program; if not, write to the Free Software Foundation,
+Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301  USA
+
+Dependencies:
+- Python 64-bit v2.7.15, https://www.python.org/
+- Python module 'misnersplunktoolcache.py'
+
+socket.gethostbyaddr() can't be given a timeout, so lookups run on daemon threads, and a batch returns once every
+lookup has finished or the timeout has passed. Lookups still running then are left to finish on their own, and their
+addresses go unresolved and uncached, so they're tried again next time.
+
+Changelog:
+2026.10.18 - initial version, concurrent reverse DNS lookups of discovered addresses with a persistent TTL cache
+"""
+
+import re
+import json
+import time
+import Queue
+import socket
+import threading
+from misnersplunktoolcache import replacing
+
+DNS_FILENAME = 'dns.json'
+DNS_THREADS = 32         # Lookups run at once
+DNS_TIMEOUT = 5.0        # Seconds to wait for a batch of lookups
+DNS_TTL = 86400          # Seconds a resolved hostname is remembered
+DNS_NEGATIVE_TTL = 3600  # Seconds an address that didn't resolve is remembered
+IP_REGEX = re.compile(r"\b(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}"
+                      r"(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\b")
+
+
+def is_ip_address(address):
+    """Returns True if the address contains an IPv4 address, as opposed to being a hostname"""
+    return IP_REGEX.search(address) is not None
+
+
+class DnsCache(object):
+    """Reverse DNS results by IP address, each remembered until it expires, including addresses that didn't resolve.
+    Saved to a JSON file between runs; a missing or unreadable file starts an empty cache."""
+    def __init__(self, filename):
+        """Constructor, taking the cache file, read on first use and created on first save"""
+        self.filename = filename
+        self._entries = None  # Address -> [hostname, or None if it didn't resolve, expiry time]
+        self._changed = False
+
+    def _load(self):
+        if self._entries is not None:
+            return
+        try:
+            with open(self.filename, 'r') as f:
+                entries = json.load(f)
+        except (IOError, ValueError):
+            entries = {}
+        self._entries = entries if isinstance(entries, dict) else {}
+
+    def get(self, address, now=None):
+        """Returns (found, hostname) for the address, hostname being None for an address remembered as not
+        resolving, and found being False if the address isn't cached or has expired"""
+        self._load()
+        entry = self._entries.get(address)
+        if not entry or entry[1] <= (time.time() if now is None else now):
+            return False, None
+        return True, entry[0]
+
+    def put(self, address, hostname, ttl, now=None):
+        """Remembers the hostname of the address, or None if it didn't resolve, for ttl seconds"""
+        self._load()
+        if ttl > 0:
+            self._entries[address] = [hostname, (time.time() if now is None else now) + ttl]
+            self._changed = True
+
+    def save(self):
+        """Writes the cache file if anything was added, leaving out expired entries. Raises IOError or OSError if the
+        file can't be written."""
+        if not self._changed:
+            return
+        now = time.time()
+        self._entries = dict((address, entry) for address, entry in self._entries.iteritems() if entry[1] > now)
+        with replacing(self.filename) as f:
+            json.dump(self._entries, f, indent=1, sort_keys=True)
+        self._changed = False
+
+
+class Resolver(object):
+    """Reverse DNS resolver shared by everything looking up discovered addresses, resolving each batch concurrently
+    and answering from its DnsCache where it can"""
+    def __init__(self, cache):
+        """Constructor, taking the DnsCache to use"""
+        self.cache = cache
+        self._lock = threading.Lock()
+
+    def resolve(self, addresses, threads=DNS_THREADS, timeout=DNS_TIMEOUT, ttl=DNS_TTL, negative_ttl=DNS_NEGATIVE_TTL):
+        """Returns a dictionary of each IP address to its hostname, or None if it didn't resolve within timeout
+        seconds. Lookups run on up to threads threads at once, and hostnames are cached for ttl seconds, and addresses
+        that didn't resolve for negative_ttl seconds."""
+        with self._lock:
+            results = {}
+            pending = Queue.Queue()
+            for address in set(addresses):
+                found, hostname = self.cache.get(address)
+                if found:
+                    results[address] = hostname
+                else:
+                    results[address] = None
+                    pending.put(address)
+            count = pending.qsize()
+            if count:
+                self._lookup(pending, count, threads, timeout, ttl, negative_ttl, results)
+            try:
+                self.cache.save()
+            except (IOError, OSError):
+                pass  # Only costs lookups next time
+            return results
+
+    def _lookup(self, pending, count, threads, timeout, ttl, negative_ttl, results):
+        done = Queue.Queue()
+
+        def work():
+            while True:
+                try:
+                    address = pending.get_nowait()
+                except Queue.Empty:
+                    return
+                try:
+                    hostname = socket.gethostbyaddr(address)[0]
+                except (socket.error, UnicodeError):  # Including socket.herror and socket.gaierror
+                    hostname = None
+                done.put((address, hostname))
+
+        for _ in range(max(min(threads, count), 1)):
+            thread = threading.Thread(target=work, name='Resolver')
+            thread.daemon = True  # A lookup that never returns can't keep the program running
+            thread.start()
+
+        deadline = time.time() + timeout
+        for _ in range(count):
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            try:
+                address, hostname = done.get(timeout=remaining)
+            except Queue.Empty:
+                break
+            results[address] = hostname
+            self.cache.put(address, hostname, ttl if hostname else negative_ttl)
+
+        # Lookups not started by now never will be
+        while True:
+            try:
+                pending.get_nowait()
+            except Queue.Empty:
+                break
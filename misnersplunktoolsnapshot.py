@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+"""
+misnersplunktoolsnapshot.py - Misner Splunk Tool Poll Snapshots
+Copyright (C) 2015-2018 Joe Misner <joe@misner.net>
+http://tools.misner.net/
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program; if not, write to the Free Software Foundation,
+Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301  USA
+
+Dependencies:
+- Python 64-bit v2.7.15, https://www.python.org/
+- Python module 'misnersplunkdrecords.py'
+
+Snapshot files are gzip-compressed JSON Lines. The first line is a header naming the format, its version, and whether
+the file holds a single instance or a whole discovery; each following line is one polled instance with its address,
+polling status, time polled, and every collected Splunkd attribute, including per-endpoint REST API timings.
+
+Changelog:
+2026.10.18 - initial version, compact slotted snapshots of polled Splunkd instances for the Discovery Report
+             added versioned snapshot files, saving full instance and discovery polls for loading back offline
+             PollSnapshot keeps messages, for evaluating the Messages health check over a fleet
+"""
+
+import time
+import gzip
+import json
+from misnersplunkdrecords import RECORD_TYPES
+
+SNAPSHOT_FORMAT = 'misnersplunktool-snapshot'
+SNAPSHOT_VERSION = 1
+SNAPSHOT_EXTENSION = '.snapshot'
+SNAPSHOT_KINDS = ('instance', 'discovery')
+# Splunkd attributes never written to snapshot files
+UNSAVED_FIELDS = ('service', 'session', 'mgmt_pass', 'timeout', 'polled_time')
+
+# Splunkd attributes kept in a PollSnapshot: identity, resources, cluster state, and the adjacency lists the topology
+# is built from. Not kept are the splunklib service, the password, every raw '_service*' REST feed, and the bulky
+# per-input, per-app, and per-process lists, none of which a Discovery Report or topology uses.
+SNAPSHOT_FIELDS = (
+    # Server
+    'mgmt_host', 'mgmt_port', 'mgmt_user', 'host', 'server_name', 'SPLUNK_HOME', 'SPLUNK_DB', 'guid', 'version',
+    'product', 'mode', 'type', 'os', 'roles', 'actual_role', 'primary_role', 'startup_time', 'startup_time_formatted',
+    'http_port', 'http_ssl', 'http_server', 'messages',
+    # Resources
+    'cores', 'ram', 'cpu_usage', 'mem', 'mem_used', 'mem_usage', 'swap', 'swap_used', 'swap_usage', 'disk_partitions',
+    'disk_io',
+    # Ports and adjacencies
+    'receiving_ports', 'rawtcp_ports', 'udp_ports', 'kvstore_port', 'forward_servers', 'cookedtcp_status',
+    'deployment_server', 'deployment_clients', 'license_master', 'license_slaves', 'distributedsearch_peers',
+    # Indexer cluster
+    'cluster_master_uri', 'cluster_mode', 'cluster_site', 'cluster_label', 'cluster_replicationport',
+    'cluster_peers', 'cluster_peers_searchable', 'cluster_peers_up', 'cluster_searchheads',
+    'cluster_searchheads_connected', 'cluster_indexes_searchable', 'cluster_alldatasearchable',
+    'cluster_searchfactor', 'cluster_searchfactormet', 'cluster_replicationfactor', 'cluster_replicationfactormet',
+    'cluster_maintenance', 'cluster_rollingrestart', 'cluster_initialized', 'cluster_serviceready',
+    'cluster_indexingready',
+    # Search head cluster
+    'shcluster_deployer', 'shcluster_label', 'shcluster_members', 'shcluster_replicationfactor',
+    'shcluster_replicationport', 'shcluster_captainid', 'shcluster_captainlabel', 'shcluster_captainuri',
+    'shcluster_electedcaptain', 'shcluster_dynamiccaptain', 'shcluster_initialized', 'shcluster_serviceready',
+    'shcluster_minpeersjoined', 'shcluster_rollingrestart'
+)
+REPORT_KEYS = ('category', 'name', 'health', 'value')
+
+
+class PollSnapshot(object):
+    """Compact, read-only record of a polled Splunk instance, holding the SNAPSHOT_FIELDS attributes under the same
+    names as Splunkd so topology and report code can use either. Report entries are stored as tuples."""
+    __slots__ = SNAPSHOT_FIELDS + ('_report',)
+
+    def __init__(self, **fields):
+        """Constructor, taking SNAPSHOT_FIELDS values as keyword arguments plus an optional report list"""
+        for field in SNAPSHOT_FIELDS:
+            setattr(self, field, fields.get(field))
+        self._report = tuple(tuple(entry[key] for key in REPORT_KEYS) for entry in fields.get('report') or ())
+
+    @classmethod
+    def from_splunkd(cls, splunkd):
+        """Returns a snapshot of a polled Splunkd, which can then be discarded along with its raw feeds"""
+        fields = dict((field, getattr(splunkd, field, None)) for field in SNAPSHOT_FIELDS)
+        fields['report'] = getattr(splunkd, 'report', None)
+        return cls(**fields)
+
+    @property
+    def report(self):
+        """List of report entry dictionaries, as built by Splunkd.report_builder()"""
+        return [dict(zip(REPORT_KEYS, entry)) for entry in self._report]
+
+    def __repr__(self):
+        return "<PollSnapshot %s:%s %s>" % (self.mgmt_host, self.mgmt_port, self.server_name)
+
+
+def _encode(value):
+    """Returns an attribute value ready for JSON, storing lists of records as their type name and rows"""
+    if isinstance(value, list) and value and hasattr(value[0], '_fields'):
+        return {'__record__': type(value[0]).__name__, 'rows': [list(row) for row in value]}
+    return value
+
+
+def _decode(value):
+    """Reverses _encode(), rebuilding lists of records"""
+    if isinstance(value, dict) and '__record__' in value:
+        try:
+            record = RECORD_TYPES[value['__record__']]
+        except KeyError:
+            raise ValueError("Unknown record type '%s'" % value['__record__'])
+        return [record(*[tuple(field) if isinstance(field, list) else field for field in row])
+                for row in value['rows']]
+    return value
+
+
+def splunkd_fields(splunkd):
+    """Returns a dictionary of every public attribute collected by a polled Splunkd, ready for JSON"""
+    return dict((name, _encode(value)) for name, value in vars(splunkd).iteritems()
+                if not name.startswith('_') and name not in UNSAVED_FIELDS)
+
+
+class OfflineSplunkd(object):
+    """Polled Splunk instance read back from a snapshot file. It has the same attributes as the Splunkd it was saved
+    from, but no service, so anything needing a live connection fails as though disconnected."""
+    def __init__(self, fields, polled_time=None):
+        """Constructor, taking the saved attributes and the time the instance was polled"""
+        for name, value in fields.iteritems():
+            setattr(self, str(name), _decode(value))
+        self.polled_time = polled_time
+
+    def __repr__(self):
+        return "<OfflineSplunkd %s:%s %s>" % (self.mgmt_host, self.mgmt_port, self.server_name)
+
+
+class SnapshotWriter(object):
+    """Writes a snapshot file one instance at a time, so discoveries are saved without holding every instance in
+    memory"""
+    def __init__(self, f, kind, product):
+        """Constructor, taking a file opened for binary writing, 'instance' or 'discovery', and the writing program"""
+        if kind not in SNAPSHOT_KINDS:
+            raise ValueError("Invalid snapshot kind '%s'" % kind)
+        self.f = f
+        self.gzip = gzip.GzipFile(fileobj=f, mode='wb')
+        self.rows = 0      # Instances written with their polled values
+        self.failures = 0  # Instances that failed polling
+        self._write({'format': SNAPSHOT_FORMAT, 'version': SNAPSHOT_VERSION, 'kind': kind, 'product': product,
+                     'created': time.time()})
+
+    def _write(self, line):
+        self.gzip.write("%s\n" % json.dumps(line, separators=(',', ':'), default=str))
+
+    def write(self, address, status, splunkd=None, polled_time=None):
+        """Writes one instance; splunkd is the polled Splunkd, or None if polling failed"""
+        if splunkd is None:
+            self.failures += 1
+            fields = None
+        else:
+            self.rows += 1
+            fields = splunkd_fields(splunkd)
+        self._write({'address': address, 'status': status, 'polled': polled_time or time.time(), 'fields': fields})
+
+    def close(self):
+        """Finishes compression and closes the underlying file"""
+        self.gzip.close()
+        self.f.close()
+
+
+def read_snapshot(filename):
+    """Opens a snapshot file, returning its header dictionary and an iterator of (address, status, OfflineSplunkd or
+    None) tuples, one for each instance. Raises ValueError if the file isn't a snapshot this version can read."""
+    f = gzip.open(filename, 'rb')
+    try:
+        header = json.loads(f.readline())
+        if header.get('format') != SNAPSHOT_FORMAT:
+            raise ValueError
+    except (IOError, ValueError, AttributeError):
+        f.close()
+        raise ValueError("'%s' is not a Misner Splunk Tool snapshot file." % filename)
+    if header.get('version', 0) > SNAPSHOT_VERSION:
+        f.close()
+        raise ValueError("'%s' was saved by a newer version of Misner Splunk Tool (snapshot version %s)."
+                         % (filename, header['version']))
+
+    def instances():
+        with f:
+            for line in f:
+                entry = json.loads(line)
+                fields = entry['fields']
+                splunkd = OfflineSplunkd(fields, entry.get('polled')) if fields is not None else None
+                yield entry['address'], entry['status'], splunkd
+    return header, instances()
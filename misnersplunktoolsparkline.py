@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+"""
+misnersplunktoolsparkline.py - Misner Splunk Tool Sparklines
+Copyright (C) 2015-2018 Joe Misner <joe@misner.net>
+http://tools.misner.net/
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program; if not, write to the Free Software Foundation,
+Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301  USA
+
+Dependencies:
+- Python 64-bit v2.7.15, https://www.python.org/
+- Python module 'PySide2' v5.11, https://pypi.python.org/pypi/PySide2
+- Python module 'misnersplunktoolmetrics.py'
+
+Changelog:
+2026.10.18 - initial version, sparklines of resource usage samples with rolling averages
+"""
+
+from PySide2 import QtCore, QtGui, QtWidgets
+from misnersplunktoolmetrics import RingBuffer, RAW_COLUMNS
+
+SPARKLINE_SAMPLES = 120  # Latest samples drawn, and kept for the rolling average
+LINE_COLOR = '#3add36'
+AVERAGE_COLOR = '#808080'
+
+
+class Sparkline(QtWidgets.QWidget):
+    """Small line chart of the latest percentage samples, kept in a ring buffer, with the rolling average over the last
+    window seconds drawn as a dashed line and written in the corner. Only repainted when a sample arrives."""
+    def __init__(self, window=60, parent=None):
+        """Constructor, taking the rolling average window in seconds"""
+        QtWidgets.QWidget.__init__(self, parent)
+        self.window = window
+        self.samples = RingBuffer(SPARKLINE_SAMPLES, RAW_COLUMNS)
+        self.average = None
+        self.setAttribute(QtCore.Qt.WA_OpaquePaintEvent)
+
+    def add(self, t, value):
+        """Adds a sample taken at time t, updating the rolling average"""
+        self.samples.append(t, value)
+        times, values = self.samples.between(t - self.window)
+        self.average = sum(values) / len(values) if values else None
+        self.setToolTip("%s samples, %.0f%% average over the last %g seconds"
+                        % (len(values), self.average, self.window) if values else None)
+        self.update()
+
+    def clear(self):
+        """Removes every sample"""
+        self.samples = RingBuffer(SPARKLINE_SAMPLES, RAW_COLUMNS)
+        self.average = None
+        self.setToolTip(None)
+        self.update()
+
+    def paintEvent(self, event):
+        """Draws the samples scaled from 0-100% over the widget's height, newest at the right edge"""
+        painter = QtGui.QPainter(self)
+        width, height = self.width() - 1, self.height() - 1
+        painter.fillRect(self.rect(), QtCore.Qt.white)
+        painter.setPen(QtGui.QColor('grey'))
+        painter.drawRect(0, 0, width, height)
+        values = self.samples.ordered(1)
+        if not values:
+            return
+
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        scale = (height - 2) / 100.0
+        step = float(width - 2) / (SPARKLINE_SAMPLES - 1)
+        left = width - 1 - step * (len(values) - 1)
+        points = [QtCore.QPointF(left + step * index, height - 1 - min(max(value, 0), 100) * scale)
+                  for index, value in enumerate(values)]
+        painter.setPen(QtGui.QPen(QtGui.QColor(LINE_COLOR), 1.5))
+        painter.drawPolyline(QtGui.QPolygonF(points))
+
+        if self.average is not None:
+            y = height - 1 - self.average * scale
+            painter.setPen(QtGui.QPen(QtGui.QColor(AVERAGE_COLOR), 1, QtCore.Qt.DashLine))
+            painter.drawLine(QtCore.QPointF(1, y), QtCore.QPointF(width - 1, y))
+            font = painter.font()
+            font.setPointSize(7)
+            painter.setFont(font)
+            painter.setPen(QtGui.QColor('black'))
+            painter.drawText(self.rect().adjusted(3, 0, 0, 0), QtCore.Qt.AlignLeft | QtCore.Qt.AlignVCenter,
+                             "avg %.0f%%" % self.average)
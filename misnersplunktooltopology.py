@@ -0,0 +1,667 @@
+#!/usr/bin/env python
+"""
+misnersplunktooltopology.py - Misner Splunk Tool Topology Builder
+Copyright (C) 2015-2018 Joe Misner <joe@misner.net>
+http://tools.misner.net/
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program; if not, write to the Free Software Foundation,
+Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301  USA
+
+Dependencies:
+- Python 64-bit v2.7.15, https://www.python.org/
+- Python module 'misnersplunktoolresolver.py'
+- Python module 'misnersplunktoolcache.py'
+
+Polled instances list their peers in different ways: cluster peers by GUID and IP address, forward servers by host and
+receiving port, deployment clients by GUID, DNS name and IP address, license masters by host:port. Every way a polled
+instance can be named is indexed once, so each peer reference is matched by dictionary lookups, trying the most
+specific identity first. Peers matching no polled instance become discovered nodes, which are indexed the same way as
+they're created, so one indexer listed by GUID on a cluster master and by IP address on forwarders is one node.
+
+Each layer is laid out as a row of slots, some free. Nodes keep their slots from one layout to the next, new nodes
+taking the free slot nearest where they sort by name, and removed nodes freeing theirs, so only a layer that fills up
+is laid out again, with room to spare. Slots are remembered for each deployment in the cache folder, a deployment
+being recognized by the nodes it shares with those remembered, so the same instances are drawn in the same places
+every time, even as a discovery is still polling.
+
+Changelog:
+2026.10.18 - initial version, Qt-free topology graph built from polled instances through GUID, host:port, IP address
+             and short name indexes
+             added aggregated topologies grouping forwarders by indexers or deployment server, with bytes forwarded
+             moved layer layout from misnersplunktool.py
+             added TopologyLayouts, caching shown topologies and their layouts for drawing and exporting
+             added incremental layouts, keeping nodes in their slots between layouts, remembered for each deployment
+             added inactive forwarding adjacencies, from the status of each forwarder's forward servers
+             first layouts leave LAYOUT_GROWTH room in each layer, so nodes added later don't move the others
+"""
+
+import json
+import time
+import hashlib
+from bisect import bisect_left, insort
+from misnersplunktoolresolver import is_ip_address
+from misnersplunktoolcache import replacing
+
+USER_NODE = 'webuser'
+
+# Layers, top to bottom, with their [topology] nodedraw_ and nodecolor_ options and title
+LAYERS = (
+    ('user', 'nodedraw_user', 'nodecolor_user', "Users"),
+    ('mc', 'nodedraw_mgmtconsole', 'nodecolor_mgmtconsole', "Management Consoles"),
+    ('shcd', 'nodedraw_shcdeployer', 'nodecolor_shcdeployer', "SHC Deployers"),
+    ('sh', 'nodedraw_searchhead', 'nodecolor_searchhead', "Search Heads"),
+    ('cm', 'nodedraw_clustermaster', 'nodecolor_clustermaster', "Cluster Masters"),
+    ('idx', 'nodedraw_indexer', 'nodecolor_indexer', "Indexers"),
+    ('lm', 'nodedraw_licensemaster', 'nodecolor_licensemaster', "License Masters"),
+    ('hf', 'nodedraw_heavyforwarder', 'nodecolor_heavyforwarder', "Heavy Forwarders"),
+    ('ds', 'nodedraw_deploymentserver', 'nodecolor_deploymentserver', "Deployment Servers"),
+    ('uf', 'nodedraw_universalforwarder', 'nodecolor_universalforwarder', "Universal Forwarders"),
+    ('input', 'nodedraw_inputs', 'nodecolor_inputs', "Non-Forwarder Inputs"),
+    ('other', 'nodedraw_others', 'nodecolor_others', "Other Instances"),
+)
+LAYER_OPTIONS = dict((layer, (draw, color)) for layer, draw, color, _ in LAYERS)
+LAYER_TITLES = dict((layer, title) for layer, _, _, title in LAYERS)
+
+# Aggregated topologies group the nodes of these layers, by the neighbours they have through one type of edge
+AGGREGATE_LAYERS = ('uf', 'input')
+AGGREGATE_EDGES = {
+    'indexers': 'datafwd',            # Forwarders sending to the same indexers
+    'deploymentserver': 'deployment'  # Deployment clients of the same deployment servers
+}
+GROUP_PREFIX = 'group'  # Group keys are 'group:<layer>:<comma-separated neighbour keys>'
+GROUP_LABEL_NAMES = 3   # Neighbours named in a group's label
+
+# Forward server statuses of a forwarder's connected receivers; others, such as 'connect_fail', are inactive
+FORWARD_ACTIVE_STATUSES = ('connect_done', 'active')
+
+LAYOUTS_FILENAME = 'layouts.json'
+LAYOUT_GROWTH = 1.5      # Slots for each node when a layer is laid out again, leaving room for new nodes
+LAYOUT_DEPLOYMENTS = 10  # Deployments whose layouts are remembered
+LAYOUT_VIEWS = 10        # Views remembered for each deployment, each an aggregation with its expanded groups
+LAYOUT_MATCH = 0.5       # Share of nodes a remembered deployment must have in common to be taken as the same one
+
+# Layer of each primary role guess, by the start of the guess, checked in order; other instances go in 'other'
+PRIMARY_ROLE_LAYERS = (
+    ("Search Head", 'sh'),
+    ("Indexer", 'idx'),
+    ("Heavy Forwarder", 'hf'),
+    ("Universal Forwarder", 'uf'),
+    ("Management Console", 'mc'),
+    ("Deployer (SHC)", 'shcd'),
+    ("Cluster Master", 'cm'),
+    ("Deployment Server", 'ds'),
+    ("License Master", 'lm'),
+    ("Forwarder", 'uf'),
+)
+
+# Further roles added to node labels: (server role, text already in the label covering it, line added)
+ROLE_LABELS = (
+    ('universal_forwarder', "Universal Forwarder", "Universal Forwarder"),
+    ('management_console', "Management Console", "Management Console"),
+    ('cluster_slave', "Indexer", "Indexer (Cluster Slave)"),
+    ('indexer', "Indexer", "Indexer (Standalone)"),
+    ('shc_deployer', "Deployer (SHC)", "Deployer (SHC)"),
+    ('shc_captain', "Search Head", "Search Head (SHC Captain)"),
+    ('shc_member', "Search Head", "Search Head (SHC Member)"),
+    ('cluster_master', "Cluster Master", "Cluster Master"),
+    ('search_head', "Search Head", "Search Head (Standalone)"),
+    ('deployment_server', "Deployment Server", "Deployment Server"),
+    ('heavyweight_forwarder', "Heavy Forwarder", "Heavy Forwarder"),
+    ('license_master', "License Master", "License Master"),
+)
+
+
+# Peer references
+# Each function returns a polled instance's peers as (guid, host, port, ip, name) tuples, None where unknown
+
+def parse_address(address):
+    """'host:port' -> (host, port), port being None if missing"""
+    host, _, port = (address or '').partition(':')
+    return host, port or None
+
+
+def _search_peers(instance):
+    for peer in instance.distributedsearch_peers or ():
+        host, port = parse_address(peer.get('peerName'))
+        yield peer.get('guid'), host, port, None, None
+
+
+def _forward_servers(instance):
+    for server in instance.forward_servers or ():
+        host, _ = parse_address(server.get('title'))  # The port is the receiving port, not the management port
+        yield None, host, None, server.get('destIp'), None
+
+
+def _cluster_peers(instance):
+    for peer in instance.cluster_peers or ():
+        host, port = parse_address(peer.location)
+        yield peer.guid, host, port, None, peer.name
+
+
+def _deployment_clients(instance):
+    for client in instance.deployment_clients or ():
+        yield client.guid, client.dns or '', client.mgmt, client.ip, client.hostname
+
+
+def _shc_deployer(instance):
+    host, port = parse_address(instance.shcluster_deployer)
+    yield None, host, port, None, None
+
+
+def _license_master(instance):
+    host, port = parse_address(instance.license_master)
+    yield None, host, port, None, None
+
+
+ENTERPRISE_LAYERS = ('sh', 'idx', 'hf', 'mc', 'shcd', 'cm', 'ds', 'uf')
+
+# Adjacencies followed, in order: (adjdraw_ option, layers of the polled instances listing peers, function returning
+# their peer references, layer of peers discovered this way, edge type named after its adjcolor_ option). Peers with no
+# clear Splunk role come last, so instances listed both ways are first discovered with their clearer role.
+ADJACENCY_TYPES = (
+    ('adjdraw_distsearch', ('sh',), _search_peers, 'idx', 'distsearch'),
+    ('adjdraw_datafwdheavyforwarder', ('hf',), _forward_servers, 'idx', 'datafwd'),
+    ('adjdraw_datafwduniversalforwarder', ('uf',), _forward_servers, 'idx', 'datafwd'),
+    ('adjdraw_datafwdinput', ('input',), _forward_servers, 'idx', 'datafwd'),
+    ('adjdraw_clustermgmt', ('cm',), _cluster_peers, 'idx', 'clustermgmt'),
+    ('adjdraw_bucketrep', ('idx',), _cluster_peers, 'idx', 'bucketrep'),
+    ('adjdraw_shcdeployment', ('sh',), _shc_deployer, 'shcd', 'shcdeployment'),
+    ('adjdraw_mgmtconsole', ('mc',), _search_peers, 'other', 'mgmtconsole'),
+    ('adjdraw_deployment', ('ds',), _deployment_clients, 'other', 'deployment'),
+    ('adjdraw_license', ENTERPRISE_LAYERS, _license_master, 'other', 'license'),
+)
+
+
+def short_name(host):
+    """Returns a hostname without its domain, lowercase, or an IP address as it is"""
+    host = (host or '').lower()
+    return host if is_ip_address(host) else host.split('.')[0]
+
+
+def instance_label(name, primary_role, roles):
+    """Returns a node label of the instance's name, primary role guess, and any further roles"""
+    label = "%s\n%s" % (name, primary_role)
+    for role, covered, line in ROLE_LABELS:
+        if role in roles and covered not in label:
+            label += "\n%s" % line
+    return label
+
+
+class TopologyNode(object):
+    """Splunk instance in a Topology, polled or discovered as a peer of a polled instance, or a group of instances in
+    an aggregated Topology"""
+    __slots__ = ('key', 'name', 'layer', 'label', 'address', 'discovered', 'members')
+
+    def __init__(self, key, name, layer, label, address=None, discovered=False, members=None):
+        self.key = key              # GUID when known, otherwise the address or name it was first known by
+        self.name = name            # Short hostname, or IP address if it didn't resolve
+        self.layer = layer
+        self.label = label
+        self.address = address      # host:port it was polled at, None for discovered nodes
+        self.discovered = discovered
+        self.members = members      # Keys of the grouped nodes, None for single instances
+
+
+class Topology(object):
+    """Graph of Splunk instances and the adjacencies between them, without any drawing. Built once by
+    build_topology(), then reused for drawing and exporting."""
+    def __init__(self):
+        self.nodes = {}  # Key -> TopologyNode, in the order added
+        self.order = []  # Keys in the order added
+        self.edges = {}  # (source key, target key, edge type) -> number of times listed
+        self.edge_bytes = {}  # (source key, target key, 'datafwd') -> bytes the receiver reports from the forwarder
+        self.edge_inactive = {}  # (source key, target key, 'datafwd') -> times listed with an inactive status
+        self.grouped = {}  # Key of each node in an expanded group -> group key, in aggregated topologies
+
+    def add_node(self, node):
+        if node.key not in self.nodes:
+            self.order.append(node.key)
+        self.nodes[node.key] = node
+        return node
+
+    def add_edge(self, source, target, edge_type):
+        """Adds an adjacency from a polled instance to a peer it lists, counting repeats"""
+        if source != target:
+            key = (source, target, edge_type)
+            self.edges[key] = self.edges.get(key, 0) + 1
+
+    def layers(self):
+        """Returns a dictionary of each layer to the keys of its nodes, in the order added"""
+        layers = dict((layer, []) for layer, _, _, _ in LAYERS)
+        for key in self.order:
+            layers[self.nodes[key].layer].append(key)
+        return layers
+
+    def visible(self, options):
+        """Returns (node keys, edges) left after hiding layers whose nodedraw_ option is off, edges being (source key,
+        target key, edge type) tuples between shown nodes"""
+        hidden = set(layer for layer, (draw, _) in LAYER_OPTIONS.iteritems() if not options.get(draw, True))
+        keys = [key for key in self.order if self.nodes[key].layer not in hidden]
+        if not hidden:
+            return keys, list(self.edges)
+        shown = set(keys)
+        return keys, [edge for edge in self.edges if edge[0] in shown and edge[1] in shown]
+
+    def aggregated(self, edge_type, minimum, expanded=(), layers=AGGREGATE_LAYERS):
+        """Returns a new Topology with the nodes of each layer having more than minimum nodes grouped by their
+        neighbours through edge_type edges, such as forwarders grouped by the indexers they forward to. Groups whose
+        key is in expanded keep their nodes, as do groups of one. Edges of grouped nodes are merged, adding up their
+        counts, bytes and inactive counts."""
+        neighbours = {}
+        for source, target, kind in self.edges:
+            if kind == edge_type:
+                neighbours.setdefault(source, set()).add(target)
+                neighbours.setdefault(target, set()).add(source)
+        groups = {}  # Group key -> member keys
+        for layer, keys in self.layers().iteritems():
+            if layer in layers and len(keys) > minimum:
+                for key in keys:
+                    group = '%s:%s:%s' % (GROUP_PREFIX, layer, ','.join(sorted(neighbours.get(key, ()))))
+                    groups.setdefault(group, []).append(key)
+
+        topology = Topology()
+        group_of = {}
+        for group, members in groups.iteritems():
+            if len(members) > 1:
+                group_of.update((key, group) for key in members)
+                if group in expanded:
+                    topology.grouped.update((key, group) for key in members)
+        for key in self.order:
+            group = group_of.get(key)
+            if group is None or group in expanded:
+                topology.add_node(self.nodes[key])
+            elif group not in topology.nodes:
+                topology.add_node(self._group_node(group, groups[group], neighbours.get(key, ())))
+        for key in topology.grouped:
+            del group_of[key]  # Expanded groups keep their nodes' edges
+
+        edges = topology.edges
+        edge_bytes = topology.edge_bytes
+        edge_inactive = topology.edge_inactive
+        for edge, count in self.edges.iteritems():
+            source, target, kind = edge
+            source, target = group_of.get(source, source), group_of.get(target, target)
+            if source != target:
+                merged = (source, target, kind)
+                edges[merged] = edges.get(merged, 0) + count
+                if edge in self.edge_bytes:
+                    edge_bytes[merged] = edge_bytes.get(merged, 0) + self.edge_bytes[edge]
+                if edge in self.edge_inactive:
+                    edge_inactive[merged] = edge_inactive.get(merged, 0) + self.edge_inactive[edge]
+        return topology
+
+    def _group_node(self, group, members, neighbours):
+        layer = self.nodes[members[0]].layer
+        names = sorted(self.nodes[key].name for key in neighbours)
+        if len(names) > GROUP_LABEL_NAMES:
+            names[GROUP_LABEL_NAMES:] = ["+%d more" % (len(names) - GROUP_LABEL_NAMES)]
+        title = LAYER_TITLES[layer]
+        return TopologyNode(group, "%d %s" % (len(members), title), layer,
+                            "%d %s\n%s" % (len(members), title, ', '.join(names) or "(none)"), members=members)
+
+    def node_color(self, key, options):
+        """Returns the node's '#rrggbb' color from its layer's nodecolor_ option"""
+        return '#' + options[LAYER_OPTIONS[self.nodes[key].layer][1]]
+
+
+def layer_positions(keys, height, alignment, static_width, buffer_width=10):
+    """Returns a dictionary of each node key to its (x, y) position on a layer at the height, x from 0-100, keys being
+    the layer's slots, None for free ones. Left- and right-aligned slots are static_width apart, and centered or
+    justified slots are spread evenly, as are aligned slots too many to fit."""
+    positions = {}
+    if not keys:
+        return positions
+    if static_width * len(keys) > 100 - buffer_width * 2:
+        alignment = 'justify'
+    if alignment == 'left':
+        for number, key in enumerate(keys):
+            if key is not None:
+                positions[key] = (buffer_width + static_width * number, height)
+    elif alignment == 'right':
+        for number, key in enumerate(keys):
+            if key is not None:
+                positions[key] = (100 - buffer_width - static_width * number, height)
+    else:  # center or justify
+        width = float(100 - buffer_width * 2) / len(keys)
+        for number, key in enumerate(keys):
+            if key is not None:
+                positions[key] = (buffer_width + width * (number + 0.5), height)
+    return positions
+
+
+def place_layer(slots, names, growth=LAYOUT_GROWTH):
+    """Updates a layer's slots, a list of node keys with None for free slots, to hold the nodes of names, a dictionary
+    of each key to its node's name. Removed nodes free their slots, and new nodes take the free slot nearest the first
+    node sorting after them by name, so nodes already placed stay put. A layer without enough free slots, or under a
+    quarter full, is laid out again sorted by name, with growth slots for each node, including the first time, so
+    nodes added later find free slots."""
+    current = set(names)
+    placed = []  # (name, key, slot) of nodes keeping their slots
+    for slot, key in enumerate(slots):
+        if key is not None:
+            if key in current:
+                placed.append((names[key], key, slot))
+            else:
+                slots[slot] = None
+    new = sorted((names[key], key) for key in current.difference(key for _, key, _ in placed))
+    free = [slot for slot, key in enumerate(slots) if key is None]
+
+    if len(new) > len(free) or len(current) * 4 < len(slots):
+        ordered = sorted((names[key], key) for key in current)
+        size = max(int(len(ordered) * growth + 0.5), len(ordered))
+        slots[:] = [None] * size
+        for number, (_, key) in enumerate(ordered):
+            slots[number * size // len(ordered)] = key  # Free slots spread between nodes
+        return
+
+    placed.sort()
+    for name, key in new:
+        i = bisect_left(placed, (name, key))
+        target = placed[i][2] if i < len(placed) else len(slots)
+        j = bisect_left(free, target)
+        if j == len(free) or j > 0 and target - free[j - 1] <= free[j] - target:
+            j -= 1
+        slot = free.pop(j)
+        slots[slot] = key
+        insort(placed, (name, key, slot))
+
+
+def layout(topology, keys, options, slots=None):
+    """Returns a dictionary of each of the node keys to its (x, y) position, both from 0-100, each layer at the
+    height of its layerheight_ option and ordered by name, aligned by its layeralignment_ option. Given slots, a
+    dictionary of each layer to its slots from an earlier layout, nodes keep their places through place_layer(), and
+    slots is updated for the next layout."""
+    shown = set(keys)
+    positions = {}
+    for layer, layer_keys in topology.layers().iteritems():
+        names = dict((key, topology.nodes[key].name) for key in layer_keys if key in shown)
+        if slots is None:
+            layer_slots = []
+            place_layer(layer_slots, names, 1)  # Not kept for another layout, so no room is left for new nodes
+        else:
+            layer_slots = slots.setdefault(layer, [])
+            place_layer(layer_slots, names)
+        positions.update(layer_positions(layer_slots, options['layerheight_' + layer],
+                                         options['layeralignment_' + layer], options['static_width']))
+    return positions
+
+
+class LayoutStore(object):
+    """Layer slots of the views of recently drawn deployments, saved to a JSON file between runs, so nodes are drawn
+    where they were last time. A topology's deployment is the remembered one sharing the most nodes with it, if at
+    least LAYOUT_MATCH of the smaller of the two, so a discovery still polling matches the finished one. Layouts start
+    over if the file is missing or can't be read."""
+    def __init__(self, filename):
+        """Constructor, taking the file, read on first use and created on first save"""
+        self.filename = filename
+        self._deployments = None  # [{'nodes': keys, 'used': time, 'views': {view: {'used': time, 'slots': slots}}}]
+        self._changed = False
+
+    def _load(self):
+        if self._deployments is not None:
+            return
+        try:
+            with open(self.filename, 'r') as f:
+                deployments = json.load(f)
+        except (IOError, ValueError):
+            deployments = []
+        self._deployments = deployments if isinstance(deployments, list) else []
+
+    def slots(self, topology):
+        """Returns a dictionary of each view of the topology's deployment to the dictionary of each layer to its slots
+        layout() takes, remembering a new deployment if none matches. Changes to it are saved by save()."""
+        self._load()
+        keys = set(topology.order)
+        keys.discard(USER_NODE)
+        best, shared = None, 0
+        for deployment in self._deployments:
+            count = len(keys.intersection(deployment['nodes']))
+            if count > shared and count >= LAYOUT_MATCH * min(len(keys), len(deployment['nodes'])):
+                best, shared = deployment, count
+        if best is None:
+            best = {'views': {}, 'used': time.time()}
+            self._deployments.append(best)
+            self._deployments.sort(key=lambda deployment: deployment.get('used', 0), reverse=True)
+            del self._deployments[LAYOUT_DEPLOYMENTS:]
+        best['nodes'] = sorted(keys)
+        best['used'] = time.time()
+        self._changed = True
+        return _Views(best['views'])
+
+    def save(self):
+        """Writes the file if anything changed. Raises IOError or OSError if the file can't be written."""
+        if not self._changed:
+            return
+        with replacing(self.filename) as f:
+            json.dump(self._deployments, f, separators=(',', ':'))
+        self._changed = False
+
+
+class _Views(object):
+    """Slots of each view of a deployment in a LayoutStore, forgetting the least recently used beyond LAYOUT_VIEWS"""
+    def __init__(self, views):
+        self._views = views
+
+    def __getitem__(self, view):
+        entry = self._views.get(view)
+        if entry is None:
+            entry = self._views[view] = {'slots': {}}
+            for old in sorted(self._views, key=lambda name: self._views[name].get('used', 0))[:-LAYOUT_VIEWS]:
+                del self._views[old]
+        entry['used'] = time.time()
+        return entry['slots']
+
+
+def view_name(aggregate_by, expanded):
+    """Returns the name of a view of a topology, aggregated by the aggregate_by option with expanded groups, under
+    which a LayoutStore remembers its layout"""
+    if not expanded:
+        return aggregate_by
+    return '%s:%s' % (aggregate_by, hashlib.sha1('\n'.join(sorted(expanded))).hexdigest()[:16])
+
+
+class TopologyLayouts(object):
+    """Shown topologies of a Topology, aggregated as set by the aggregate_ options, and their layouts, built once for
+    each set of expanded groups, so drawing or exporting one again costs nothing. Given a LayoutStore, layouts start
+    from the slots remembered for the topology's deployment, and are remembered in turn."""
+    def __init__(self, topology, options, store=None):
+        """Constructor, taking the Topology from build_topology(), the [topology] options, and an optional
+        LayoutStore"""
+        self.topology = topology
+        self.options = options
+        self.aggregate_edge = AGGREGATE_EDGES.get(options['aggregate_by'])
+        self.store = store
+        self._views = store.slots(topology) if store else None
+        self._layouts = {}  # Expanded groups -> (shown Topology, keys, edges, positions)
+
+    def get(self, expanded=()):
+        """Returns (shown Topology, node keys, edges, positions) with the groups in expanded showing their nodes,
+        keys and edges being from the shown Topology's visible() and positions from layout()"""
+        expanded = frozenset(expanded)
+        cached = self._layouts.get(expanded)
+        if cached is None:
+            shown = self.topology
+            if self.aggregate_edge:
+                shown = self.topology.aggregated(self.aggregate_edge, self.options['aggregate_minimum'], expanded)
+            keys, edges = shown.visible(self.options)
+            if self.store is None:
+                positions = layout(shown, keys, self.options)
+            else:
+                positions = layout(shown, keys, self.options,
+                                   self._views[view_name(self.options['aggregate_by'], expanded)])
+                try:
+                    self.store.save()
+                except (IOError, OSError):
+                    pass  # Only costs nodes their places next time
+            cached = self._layouts[expanded] = (shown, keys, edges, positions)
+        return cached
+
+
+class _Index(object):
+    """Every identity of the nodes added so far: GUID, host:port, IP address and short name"""
+    def __init__(self):
+        self.guids = {}
+        self.host_ports = {}
+        self.ips = {}
+        self.names = {}
+        self._short_names = {}  # Host -> short name, or None for IP addresses, as the same hosts are listed many times
+
+    def short_name(self, host):
+        """Returns short_name(host), or None if the host is an IP address"""
+        try:
+            return self._short_names[host]
+        except KeyError:
+            name = self._short_names[host] = None if is_ip_address(host) else short_name(host)
+            return name
+
+    def add(self, key, guid=None, hosts=(), port=None, ips=(), names=()):
+        """Registers a node's identities, keeping the first node registered for each"""
+        if guid:
+            self.guids.setdefault(guid.upper(), key)
+        for host in hosts:
+            if host:
+                if port:
+                    self.host_ports.setdefault('%s:%s' % (host.lower(), port), key)
+                name = self.short_name(host)
+                if name is None:
+                    self.ips.setdefault(host, key)
+                else:
+                    self.names.setdefault(name, key)
+        for ip in ips:
+            if ip:
+                self.ips.setdefault(ip, key)
+        for name in names:
+            if name:
+                self.names.setdefault(short_name(name), key)
+
+    def find(self, guid, host, port, ip, name):
+        """Returns the key of the node a peer reference names, trying the most specific identity first, or None"""
+        key = None
+        if guid:
+            key = self.guids.get(guid.upper())
+        if key is None and host and port:
+            key = self.host_ports.get('%s:%s' % (host.lower(), port))
+        host_name = self.short_name(host) if host else None
+        if key is None and ip:
+            key = self.ips.get(ip)
+        if key is None and host and host_name is None:
+            key = self.ips.get(host)
+        if key is None and name and self.short_name(name):
+            key = self.names.get(self.short_name(name))
+        if key is None and host_name:
+            key = self.names.get(host_name)
+        return key
+
+
+def _layer(primary_role):
+    for prefix, layer in PRIMARY_ROLE_LAYERS:
+        if (primary_role or '').startswith(prefix):
+            return layer
+    return 'other'
+
+
+def build_topology(instances, options, resolve=None):
+    """Returns the Topology of polled instances, given as a dictionary of the host:port each was polled at to its
+    Splunkd or PollSnapshot, following the adjacency types whose adjdraw_ option is on. The resolve function, if given,
+    takes a set of IP addresses and returns a dictionary of each to its hostname or None, and is called once with
+    every IP address naming a peer that matches no polled instance."""
+    topology = Topology()
+    index = _Index()
+    topology.add_node(TopologyNode(USER_NODE, USER_NODE, 'user', "Web User"))
+
+    # Polled instances, indexed by every identity they're known by
+    layers = dict((layer, []) for layer, _, _, _ in LAYERS)
+    keys = {}  # Address polled at -> node key
+    for address in sorted(instances):
+        instance = instances[address]
+        name = short_name(instance.server_name)
+        guid = instance.guid if instance.guid and instance.guid[0] != '(' else None  # Not '(unknown)'
+        key = guid.upper() if guid else address
+        layer = _layer(instance.primary_role)
+        topology.add_node(TopologyNode(key, name, layer, instance_label(name, instance.primary_role,
+                                                                        instance.roles or ()), address))
+        layers[layer].append((key, instance))
+        keys[address] = key
+        host, port = parse_address(address)
+        index.add(key, guid, (host, instance.mgmt_host, instance.server_name),
+                  port or instance.mgmt_port, (), (instance.server_name, instance.host))
+
+    # Web access to search heads
+    if options.get('adjdraw_web', True):
+        for key, instance in layers['sh']:
+            if instance.http_server:
+                topology.add_edge(USER_NODE, key, 'web')
+
+    # Peer references, matched to polled instances where possible
+    references = []  # (source key, peer key or reference, discovered layer, edge type)
+    unresolved = set()
+    for option, source_layers, peers, discovered_layer, edge_type in ADJACENCY_TYPES:
+        if not options.get(option, True):
+            continue
+        for source_layer in source_layers:
+            for key, instance in layers[source_layer]:
+                for reference in peers(instance):
+                    guid, host, port, ip, name = reference
+                    if host[:1] == '(' and host[-1:] == ')' or not (host or ip):
+                        continue  # '(none)', '(self)' and the like
+                    peer = index.find(*reference)
+                    if peer is None:
+                        peer = reference
+                        address = ip if not host else host if index.short_name(host) is None else None
+                        if address and not name:
+                            unresolved.add(address)
+                    references.append((key, peer, discovered_layer, edge_type))
+
+    # Peers matching no polled instance are discovered nodes, named by hostname where one is known
+    hostnames = resolve(unresolved) if resolve and unresolved else {}
+    for source, peer, discovered_layer, edge_type in references:
+        if isinstance(peer, tuple):
+            guid, host, port, ip, name = peer
+            address = host or ip
+            hostname = name or (hostnames.get(address) if is_ip_address(address) else address) or address
+            found = index.find(guid, host, port, ip, hostname)
+            if found is None:
+                name = short_name(hostname)
+                found = guid.upper() if guid else name
+                if found not in topology.nodes:
+                    topology.add_node(TopologyNode(found, name, discovered_layer, "%s\nDiscovered Node" % name,
+                                                   discovered=True))
+                index.add(found, guid, (host,), port, (ip,), (hostname,))
+            peer = found
+        topology.add_edge(source, peer, edge_type)
+
+    # Forward servers each forwarder lists without being connected to them
+    for option, source_layers, peers, _, edge_type in ADJACENCY_TYPES:
+        if peers is not _forward_servers or not options.get(option, True):
+            continue
+        for source_layer in source_layers:
+            for key, instance in layers[source_layer]:
+                for server in instance.forward_servers or ():
+                    status = (server.get('status') or 'active').lower()  # Unknown statuses aren't taken as inactive
+                    if status not in FORWARD_ACTIVE_STATUSES:
+                        host, _ = parse_address(server.get('title'))
+                        edge = (key, index.find(None, host, None, server.get('destIp'), None), edge_type)
+                        if edge in topology.edges:
+                            topology.edge_inactive[edge] = topology.edge_inactive.get(edge, 0) + 1
+
+    # Bytes each receiver reports from the forwarders sending to it
+    for address in sorted(instances):
+        for record in instances[address].cookedtcp_status or ():
+            _, _, source, _, _, _, received = record
+            host = source.rsplit(':', 1)[0] if source.count(':') == 1 else source  # Without the forwarder's port
+            forwarder = index.find(None, host, None, None, None)
+            edge = (forwarder, keys[address], 'datafwd')
+            if received and edge in topology.edges:
+                topology.edge_bytes[edge] = topology.edge_bytes.get(edge, 0) + received
+    return topology
@@ -0,0 +1,245 @@
+#!/usr/bin/env python
+"""
+misnersplunktooltopologyexport.py - Misner Splunk Tool Topology Export
+Copyright (C) 2015-2018 Joe Misner <joe@misner.net>
+http://tools.misner.net/
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program; if not, write to the Free Software Foundation,
+Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301  USA
+
+Dependencies:
+- Python 64-bit v2.7.15, https://www.python.org/
+- Python module 'matplotlib' v2.2.2, https://pypi.python.org/pypi/matplotlib
+- Python module 'misnersplunkdrecords.py'
+- Python module 'misnersplunktooltopology.py'
+
+Writes topologies to files without opening any window, so the command line tool can export them from cron jobs and
+headless hosts. Images are drawn on a matplotlib figure through the Agg or SVG canvas directly, never through pyplot,
+so no GUI backend is loaded, and matplotlib is only imported when an image is exported. GraphML and DOT files are
+written as text, keeping each node's layout position, for opening in yEd, Gephi, or Graphviz's neato -n.
+
+Changelog:
+2026.10.18 - initial version, SVG, PNG, GraphML and DOT topology export
+             edge labels in images follow the level of detail of node labels
+"""
+
+import os
+import math
+from xml.sax.saxutils import escape, quoteattr
+from misnersplunkdrecords import format_bytes
+
+# Export formats by file extension
+EXPORT_FORMATS = {
+    '.svg': 'svg',
+    '.png': 'png',
+    '.graphml': 'graphml',
+    '.dot': 'dot',
+    '.gv': 'dot',
+}
+NODE_POINTS = 12.0   # Points across a node in images, less on layers too crowded for it, half again as much for groups
+LABEL_POINTS = 60.0  # Points between a layer's nodes in images before their labels are drawn
+NAME_POINTS = 30.0   # Points between a layer's nodes in images before their names are drawn, without their roles
+
+
+def export_format(filename):
+    """Returns the export format of a filename by its extension, raising ValueError for unknown extensions"""
+    extension = os.path.splitext(filename)[1].lower()
+    if extension not in EXPORT_FORMATS:
+        raise ValueError("Unknown topology export format '%s' for %s, use one of %s"
+                         % (extension, filename, ', '.join(sorted(EXPORT_FORMATS))))
+    return EXPORT_FORMATS[extension]
+
+
+def export_topology(filename, layouts, expanded=()):
+    """Writes the topology of a TopologyLayouts to a file, in the format of its extension, with the groups in
+    expanded showing their nodes. Raises ValueError for unknown extensions, and IOError if the file can't be
+    written."""
+    fmt = export_format(filename)
+    topology, keys, edges, positions = layouts.get(expanded)
+    with open(filename, 'wb') as f:
+        if fmt == 'graphml':
+            write_graphml(f, topology, keys, edges, positions, layouts.options)
+        elif fmt == 'dot':
+            write_dot(f, topology, keys, edges, positions, layouts.options)
+        else:
+            write_image(f, fmt, topology, keys, edges, positions, layouts.options)
+
+
+def _text(value):
+    """Returns a value as a UTF-8 byte string"""
+    if isinstance(value, unicode):
+        return value.encode('utf-8')
+    return str(value)
+
+
+def _edge_label(topology, edge):
+    """Returns the forwarder count and bytes shown on an edge of a group, or None for edges between single nodes"""
+    source, target, _ = edge
+    if not (topology.nodes[source].members or topology.nodes[target].members):
+        return None
+    return ' '.join(filter(None, (str(topology.edges[edge]), format_bytes(topology.edge_bytes.get(edge)))))
+
+
+# GraphML node and edge attributes: (id, applies to, name, type)
+GRAPHML_KEYS = (
+    ('d0', 'node', 'label', 'string'),
+    ('d1', 'node', 'layer', 'string'),
+    ('d2', 'node', 'address', 'string'),
+    ('d3', 'node', 'discovered', 'boolean'),
+    ('d4', 'node', 'members', 'int'),
+    ('d5', 'node', 'color', 'string'),
+    ('d6', 'node', 'x', 'double'),
+    ('d7', 'node', 'y', 'double'),
+    ('d8', 'edge', 'type', 'string'),
+    ('d9', 'edge', 'count', 'int'),
+    ('d10', 'edge', 'bytes', 'long'),
+    ('d11', 'edge', 'color', 'string'),
+)
+
+
+def write_graphml(f, topology, keys, edges, positions, options):
+    """Writes the nodes and edges to a GraphML file object, with their layout positions and colors"""
+    f.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n')
+    for key_id, applies, name, key_type in GRAPHML_KEYS:
+        f.write('  <key id="%s" for="%s" attr.name="%s" attr.type="%s"/>\n' % (key_id, applies, name, key_type))
+    f.write('  <graph id="topology" edgedefault="directed">\n')
+    for key in keys:
+        node = topology.nodes[key]
+        x, y = positions[key]
+        f.write('    <node id=%s>\n' % quoteattr(_text(key)))
+        for key_id, value in (('d0', node.label), ('d1', node.layer), ('d2', node.address),
+                              ('d3', 'true' if node.discovered else 'false'),
+                              ('d4', len(node.members) if node.members else None),
+                              ('d5', topology.node_color(key, options)), ('d6', x), ('d7', y)):
+            if value is not None:
+                f.write('      <data key="%s">%s</data>\n' % (key_id, escape(_text(value))))
+        f.write('    </node>\n')
+    for edge in sorted(edges):  # Sorted, so exports of the same topology can be compared
+        source, target, edge_type = edge
+        f.write('    <edge source=%s target=%s>\n' % (quoteattr(_text(source)), quoteattr(_text(target))))
+        for key_id, value in (('d8', edge_type), ('d9', topology.edges[edge]), ('d10', topology.edge_bytes.get(edge)),
+                              ('d11', '#' + options['adjcolor_' + edge_type])):
+            if value is not None:
+                f.write('      <data key="%s">%s</data>\n' % (key_id, escape(_text(value))))
+        f.write('    </edge>\n')
+    f.write('  </graph>\n</graphml>\n')
+
+
+def _dot_string(value):
+    """Returns a value as a quoted DOT string"""
+    return '"%s"' % _text(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def write_dot(f, topology, keys, edges, positions, options):
+    """Writes the nodes and edges to a Graphviz DOT file object, with positions in points of the export_width and
+    export_height options, so 'neato -n' keeps the layout"""
+    width, height = options['export_width'] * 72.0 / 100, options['export_height'] * 72.0 / 100
+    f.write('digraph topology {\n'
+            '  graph [outputorder=edgesfirst, splines=false];\n'
+            '  node [shape=ellipse, style=filled, color=gray, fontsize=%s];\n'
+            '  edge [arrowhead=none, fontsize=%s, fontcolor=darkgray];\n' % (options['fontsize'], options['fontsize']))
+    for key in keys:
+        node = topology.nodes[key]
+        x, y = positions[key]
+        f.write('  %s [label=%s, fillcolor="%s", pos="%.1f,%.1f"];\n'
+                % (_dot_string(key), _dot_string(node.label), topology.node_color(key, options), x * width,
+                   y * height))
+    for edge in sorted(edges):
+        source, target, edge_type = edge
+        attributes = 'color="#%s", penwidth=%.1f' % (options['adjcolor_' + edge_type],
+                                                     1 + math.log10(topology.edges[edge]))
+        label = _edge_label(topology, edge)
+        if label:
+            attributes += ', label=%s' % _dot_string(label)
+        f.write('  %s -> %s [%s];\n' % (_dot_string(source), _dot_string(target), attributes))
+    f.write('}\n')
+
+
+def write_image(f, fmt, topology, keys, edges, positions, options):
+    """Draws the nodes and edges to a file object as a 'png' or 'svg' image, export_width by export_height inches at
+    export_dpi. Edges of each type and width are one line collection and nodes of each color one scatter, so large
+    topologies draw in seconds; labels are only drawn on layers whose nodes are far enough apart to read them, and
+    edge labels only next to such layers, as each label is drawn on its own."""
+    from matplotlib.figure import Figure
+    from matplotlib.collections import LineCollection
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    width, height = options['export_width'], options['export_height']
+    figure = Figure(figsize=(width, height), dpi=options['export_dpi'])
+    canvas = FigureCanvasAgg(figure)  # Also prints SVG, through the SVG backend
+    axes = figure.add_axes([0, 0, 1, 1])
+    axes.set_axis_off()
+    axes.set_xlim(0, 100)
+    axes.set_ylim(-8, 104)  # Room for labels under the bottom layer, 112 high
+
+    # Points between the nodes of each layer, and their size to fit
+    points_x, points_y = width * 72.0 / 100, height * 72.0 / 112
+    layers = {}
+    for key in keys:
+        layers.setdefault(topology.nodes[key].layer, []).append(positions[key][0])
+    spacing = {}
+    for layer, xs in layers.iteritems():
+        xs.sort()
+        spacing[layer] = min([x2 - x1 for x1, x2 in zip(xs, xs[1:]) if x2 > x1] or [100]) * points_x
+    sizes = dict((layer, max(min(NODE_POINTS, gap * 0.8), 1.0)) for layer, gap in spacing.iteritems())
+
+    # Edges, by type and width
+    collections = {}
+    degrees = {}
+    for edge in edges:
+        source, target, edge_type = edge
+        degrees[source] = degrees.get(source, 0) + 1
+        degrees[target] = degrees.get(target, 0) + 1
+        collections.setdefault((edge_type, round(1 + math.log10(topology.edges[edge]), 1)), []).append(
+            (positions[source], positions[target]))
+    for (edge_type, line_width), segments in collections.iteritems():
+        axes.add_collection(LineCollection(segments, colors='#' + options['adjcolor_' + edge_type], alpha=0.8,
+                                           linewidths=line_width, zorder=1), autolim=False)
+    for edge in edges:
+        label = _edge_label(topology, edge)
+        if label:
+            source, target, _ = edge
+            if degrees[source] < degrees[target]:  # Nearer the end with fewer lines, where labels overlap less
+                source, target = target, source
+            if spacing[topology.nodes[target].layer] < NAME_POINTS:
+                continue  # Too crowded to read, like the names of the nodes there
+            (x1, y1), (x2, y2) = positions[source], positions[target]
+            angle = math.degrees(math.atan2((y2 - y1) * points_y, (x2 - x1) * points_x))
+            if not -90 < angle <= 90:  # Along the line, but never upside down
+                angle -= math.copysign(180, angle)
+            axes.text(x1 * 0.3 + x2 * 0.7, y1 * 0.3 + y2 * 0.7, label, color='dimgray', fontsize=options['fontsize'],
+                      rotation=angle, rotation_mode='anchor', ha='center', va='bottom', zorder=3)
+
+    # Nodes, by color and size
+    scatters = {}
+    for key in keys:
+        node = topology.nodes[key]
+        size = sizes[node.layer]
+        scatters.setdefault((topology.node_color(key, options), size * 1.5 if node.members else size),
+                            []).append(positions[key])
+    for (color, node_size), points in scatters.iteritems():
+        xs, ys = zip(*points)
+        axes.scatter(xs, ys, s=node_size ** 2, c=color, edgecolors='gray', linewidths=0.5, zorder=2)
+
+    # Labels of layers with room for them, or just names
+    for key in keys:
+        node = topology.nodes[key]
+        gap = spacing[node.layer]
+        if gap >= NAME_POINTS:
+            axes.annotate(node.label if gap >= LABEL_POINTS else node.name, positions[key],
+                          xytext=(0, -sizes[node.layer]), textcoords='offset points', fontsize=options['fontsize'],
+                          ha='center', va='top', zorder=3)
+
+    canvas.print_figure(f, format=fmt, dpi=options['export_dpi'], facecolor='white')
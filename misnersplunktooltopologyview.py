@@ -0,0 +1,557 @@
+#!/usr/bin/env python
+"""
+misnersplunktooltopologyview.py - Misner Splunk Tool Topology View
+Copyright (C) 2015-2018 Joe Misner <joe@misner.net>
+http://tools.misner.net/
+
+This program is free software; you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation; either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program; if not, write to the Free Software Foundation,
+Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301  USA
+
+Dependencies:
+- Python 64-bit v2.7.15, https://www.python.org/
+- Python module 'PySide2' v5.11, https://pypi.python.org/pypi/PySide2
+- Python module 'misnersplunkdrecords.py'
+- Python module 'misnersplunktooltopology.py'
+- Python module 'misnersplunktooltopologyexport.py'
+- Python module 'misnersplunktoolforwarding.py'
+- Python module 'misnersplunktoolmodels.py'
+
+A graphics item for each of tens of thousands of nodes and adjacencies makes the scene gather and sort every item in
+view on each repaint, taking seconds. Instead, nodes and adjacencies are painted as the scene's background, one path
+per color for each vertical strip of the scene, so strips out of view are skipped, and the view caches the background
+so panning only paints the newly exposed edge. Nodes are found by position through each layer's nodes sorted by x.
+Labels are only worth drawing once a layer's nodes are far enough apart on screen to read them, and are graphics items
+created as their nodes first come into view at such a zoom, so thousands of forwarders never build thousands of
+labels just to hide them.
+
+Changelog:
+2026.10.18 - initial version, topology canvas with level-of-detail labels, replacing the matplotlib window
+             replaced Save Image with Export, writing the whole topology to SVG, PNG, GraphML or DOT files
+             topologies built again update the open window, repainting only the strips that changed
+             added Load Distribution window, with receiver fan-in, outputs group imbalance and a heat map
+"""
+
+import math
+from bisect import bisect_left, bisect_right
+from PySide2 import QtCore, QtGui, QtWidgets
+from misnersplunkdrecords import format_bytes, format_ratio, format_yesno
+from misnersplunktoolmodels import HeatMapModel, RowTableModel, numeric_key
+from misnersplunktooltopology import TopologyLayouts
+from misnersplunktooltopologyexport import export_topology
+
+SCENE_HEIGHT = 1000.0  # Scene units the 0-100 layer heights are spread over
+NODE_SPACING = 40.0    # Fewest scene units between nodes of the most crowded layer
+NODE_SIZE = 24.0       # Scene units across a node, half again as much for groups
+TILES = 64             # Vertical strips the scene's nodes and edges are split into, so off-screen strips are skipped
+LABEL_SPACING = 120    # Pixels between a layer's nodes on screen before their labels are shown
+ZOOM_STEP = 1.25       # Zoom factor of each mouse wheel step
+MAX_ZOOM = 4.0
+CLICK_PIXELS = 4       # Mouse movement between press and release still taken as a click
+
+
+class TopologyScene(QtWidgets.QGraphicsScene):
+    """Scene of a Topology's shown nodes and edges at their layout positions. Nodes and edges are painted as the
+    scene's background, one path for each strip of the scene and each color, and found by position through each
+    layer's nodes sorted by x; only labels are graphics items. Showing another topology repaints only the strips that
+    changed, as long as the scene keeps its scale."""
+    def __init__(self, options, parent=None):
+        """Constructor, taking the [topology] options"""
+        QtWidgets.QGraphicsScene.__init__(self, parent)
+        self.options = options
+        self.font = QtGui.QFont()
+        self.font.setPointSize(options['fontsize'])
+        self.topology = None
+        self.points = {}       # Key -> scene position
+        self.layers = {}       # Layer -> (y, sorted x positions, keys in the same order)
+        self.spacing = {}      # Layer -> scene units between its nodes
+        self.paths = {}        # Strip -> (pen, brush, path, bounds)
+        self.shapes = {}       # Strip -> set of line ends and circle corners in it
+        self.painted = []      # Paths in the order painted
+        self.label_items = {}  # Layer -> {key: label item} created so far
+        self.labeled = {}      # Layer -> True if its labels are shown at the current zoom
+        self.edge_labels = []
+        self._pens = {}
+        self._brushes = {}
+
+    def set_topology(self, topology, keys, edges, positions):
+        """Shows a Topology, given the keys and edges from its visible() and the positions from layout(), replacing
+        any shown before and repainting only the strips whose nodes or edges changed"""
+        options = self.options
+        previous = self.topology
+        self.topology = topology
+
+        # Scale x so nodes of the most crowded layer are NODE_SPACING apart, and index each layer's nodes by x
+        by_layer = {}
+        for key in keys:
+            by_layer.setdefault(topology.nodes[key].layer, []).append((positions[key][0], key))
+        gap = 100.0
+        for nodes in by_layer.itervalues():
+            nodes.sort()
+            gap = min([gap] + [x2 - x1 for (x1, _), (x2, _) in zip(nodes, nodes[1:]) if x2 > x1])
+        scale_x = max(SCENE_HEIGHT / 100, NODE_SPACING / gap)
+        scale_y = SCENE_HEIGHT / 100
+        old_points = self.points
+        self.points = dict((key, QtCore.QPointF(x * scale_x, (100 - y) * scale_y))
+                           for key, (x, y) in positions.iteritems())
+        self.layers = {}
+        self.spacing = {}
+        for layer, nodes in by_layer.iteritems():
+            xs = [x * scale_x for x, _ in nodes]
+            self.layers[layer] = ((100 - positions[nodes[0][1]][1]) * scale_y, xs, [key for _, key in nodes])
+            self.spacing[layer] = min([x2 - x1 for x1, x2 in zip(xs, xs[1:]) if x2 > x1] or [SCENE_HEIGHT])
+        width = 100 * scale_x
+        rect = QtCore.QRectF(-width * 0.05, -SCENE_HEIGHT * 0.05, width * 1.1, SCENE_HEIGHT * 1.1)
+        rescaled = rect != self.sceneRect()
+        self.setSceneRect(rect)
+        tile_width = width / TILES
+
+        # Edges, by pen and the strip of their source, under nodes by pen and strip; pens are cosmetic, so lines stay
+        # as wide at any zoom
+        for item in self.edge_labels:
+            self.removeItem(item)
+        self.edge_labels = []
+        edge_paths = {}
+        shapes = {}  # Lines and circles of each strip, as rectangle corners, to find just those that changed
+        degrees = {}
+        for source, target, _ in edges:
+            degrees[source] = degrees.get(source, 0) + 1
+            degrees[target] = degrees.get(target, 0) + 1
+        for edge in edges:
+            source, target, edge_type = edge
+            count = topology.edges[edge]
+            width = round(1 + math.log10(count), 1)
+            start, end = self.points[source], self.points[target]
+            strip = ('edge', edge_type, width, int(start.x() / tile_width))
+            path = edge_paths.get(strip)
+            if path is None:
+                path = edge_paths[strip] = QtGui.QPainterPath()
+                shapes[strip] = set()
+            path.moveTo(start)
+            path.lineTo(end)
+            shapes[strip].add((start.x(), start.y(), end.x(), end.y()))
+            if topology.nodes[source].members or topology.nodes[target].members:  # Merged edges of a group
+                text = ' '.join(filter(None, (str(count), format_bytes(topology.edge_bytes.get(edge)))))
+                if degrees[source] < degrees[target]:  # Nearer the end with fewer lines, where labels overlap less
+                    start, end = end, start
+                self.edge_labels.append(self._add_text(text, start * 0.3 + end * 0.7, QtCore.Qt.darkGray))
+        node_paths = {}
+        for key in keys:
+            node = topology.nodes[key]
+            point = self.points[key]
+            strip = ('node', topology.node_color(key, options), int(point.x() / tile_width))
+            path = node_paths.get(strip)
+            if path is None:
+                path = node_paths[strip] = QtGui.QPainterPath()
+                shapes[strip] = set()
+            radius = node_size(node) / 2
+            path.addEllipse(point, radius, radius)
+            shapes[strip].add((point.x() - radius, point.y() - radius, point.x() + radius, point.y() + radius))
+
+        # Repaint around the lines and circles that changed in each strip, or everything if the scale did or most
+        # strips changed
+        paths = {}
+        changed = []
+        for strip, path in edge_paths.iteritems():
+            paths[strip] = (self._pen(strip[1], strip[2]), QtCore.Qt.NoBrush, path, path.boundingRect())
+        for strip, path in node_paths.iteritems():
+            paths[strip] = (self._pen(None, None), self._brush(strip[1]), path, path.boundingRect())
+        for strip in set(shapes).union(self.shapes):
+            difference = shapes.get(strip, set()).symmetric_difference(self.shapes.get(strip, ()))
+            if difference:
+                xs = [x for shape in difference for x in shape[::2]]
+                ys = [y for shape in difference for y in shape[1::2]]
+                changed.append(QtCore.QRectF(QtCore.QPointF(min(xs), min(ys)), QtCore.QPointF(max(xs), max(ys))))
+        self.paths = paths
+        self.shapes = shapes
+        self.painted = [paths[strip] for strip in sorted(paths)]  # Edges first, under nodes
+        if rescaled or len(changed) > TILES:
+            self.invalidate(self.sceneRect(), QtWidgets.QGraphicsScene.BackgroundLayer)
+        else:
+            for bounds in changed:
+                self.invalidate(bounds.adjusted(-NODE_SIZE, -NODE_SIZE, NODE_SIZE, NODE_SIZE),
+                                QtWidgets.QGraphicsScene.BackgroundLayer)
+
+        # Labels of nodes gone, moved or relabeled are removed, and made again as they come into view
+        for layer in self.layers:
+            self.label_items.setdefault(layer, {})
+            self.labeled.setdefault(layer, False)
+        for layer, labels in self.label_items.iteritems():
+            for key in list(labels):
+                node = topology.nodes.get(key)
+                if (node is None or key not in self.points or self.points[key] != old_points.get(key) or
+                        node.layer != layer or node.label != previous.nodes[key].label):
+                    self.removeItem(labels.pop(key))
+
+    def _pen(self, edge_type, width):
+        """Returns the cosmetic pen of edges of a type and width, or of node outlines if edge_type is None"""
+        pen = self._pens.get((edge_type, width))
+        if pen is None:
+            if edge_type is None:
+                pen = QtGui.QPen(QtCore.Qt.gray)
+            else:
+                color = QtGui.QColor('#' + self.options['adjcolor_' + edge_type])
+                color.setAlphaF(0.8)
+                pen = QtGui.QPen(color, width)
+            pen.setCosmetic(True)
+            self._pens[(edge_type, width)] = pen
+        return pen
+
+    def _brush(self, color):
+        brush = self._brushes.get(color)
+        if brush is None:
+            brush = self._brushes[color] = QtGui.QBrush(QtGui.QColor(color))
+        return brush
+
+    def drawBackground(self, painter, rect):
+        """Paints the nodes and edges of the strips in the exposed rectangle"""
+        painter.fillRect(rect, QtCore.Qt.white)
+        for pen, brush, path, bounds in self.painted:
+            if bounds.intersects(rect):
+                painter.setPen(pen)
+                painter.setBrush(brush)
+                painter.drawPath(path)
+
+    def _add_text(self, text, point, color):
+        """Adds text centered under a point, kept the same size at any zoom"""
+        item = self.addSimpleText(text, self.font)
+        item.setBrush(color)
+        item.setFlag(QtWidgets.QGraphicsItem.ItemIgnoresTransformations)
+        item.setPos(point)
+        item.setTransform(QtGui.QTransform.fromTranslate(-item.boundingRect().width() / 2, 0))
+        return item
+
+    def node_at(self, point, tolerance=0):
+        """Returns the key of the node at a scene point, give or take tolerance scene units, or None"""
+        for layer, (y, xs, keys) in self.layers.iteritems():
+            if abs(point.y() - y) > NODE_SIZE + tolerance:
+                continue
+            i = bisect_left(xs, point.x())
+            for key in keys[max(i - 1, 0):i + 1]:
+                radius = node_size(self.topology.nodes[key]) / 2 + tolerance
+                offset = self.points[key] - point
+                if offset.x() ** 2 + offset.y() ** 2 <= radius ** 2:
+                    return key
+        return None
+
+    def show_labels(self, rect, zoom):
+        """Shows the labels of each layer whose nodes are at least LABEL_SPACING pixels apart at the zoom, hiding the
+        others, and creates any missing labels of shown layers' nodes inside the scene rectangle"""
+        for layer, (y, xs, keys) in self.layers.iteritems():
+            labeled = self.spacing[layer] * zoom >= LABEL_SPACING
+            labels = self.label_items[layer]
+            if labeled != self.labeled[layer]:
+                self.labeled[layer] = labeled
+                for label in labels.itervalues():
+                    label.setVisible(labeled)
+            if not labeled or not rect.top() - NODE_SIZE <= y <= rect.bottom() + NODE_SIZE:
+                continue
+            for key in keys[bisect_left(xs, rect.left() - self.spacing[layer]):
+                            bisect_right(xs, rect.right() + self.spacing[layer])]:
+                if key not in labels:
+                    node = self.topology.nodes[key]
+                    labels[key] = self._add_text(node.label, self.points[key] + QtCore.QPointF(0, node_size(node) / 2),
+                                                 QtCore.Qt.black)
+
+
+def node_size(node):
+    """Returns the scene units across a TopologyNode"""
+    return NODE_SIZE * 1.5 if node.members else NODE_SIZE
+
+
+class TopologyView(QtWidgets.QGraphicsView):
+    """View of a TopologyScene, panned by dragging and zoomed with the mouse wheel, emitting nodeClicked with the key
+    of a clicked node and nodeMenu with the key and screen position of a right-clicked node. The painted background is
+    cached, so panning only paints the newly exposed strip."""
+    nodeClicked = QtCore.Signal(object)
+    nodeMenu = QtCore.Signal(object, QtCore.QPoint)
+
+    def __init__(self, parent=None):
+        QtWidgets.QGraphicsView.__init__(self, parent)
+        self.setRenderHint(QtGui.QPainter.Antialiasing)
+        self.setDragMode(QtWidgets.QGraphicsView.ScrollHandDrag)
+        self.setTransformationAnchor(QtWidgets.QGraphicsView.AnchorUnderMouse)
+        self.setCacheMode(QtWidgets.QGraphicsView.CacheBackground)
+        self.setOptimizationFlags(QtWidgets.QGraphicsView.DontSavePainterState |
+                                  QtWidgets.QGraphicsView.DontAdjustForAntialiasing)
+        self._pressed = None
+        self._labels_timer = QtCore.QTimer(self)
+        self._labels_timer.setSingleShot(True)
+        self._labels_timer.timeout.connect(self.update_labels)
+
+    def zoom(self):
+        return self.transform().m11()
+
+    def fit(self):
+        """Zooms to show the whole scene"""
+        self.fitInView(self.sceneRect(), QtCore.Qt.KeepAspectRatio)
+        self.schedule_labels()
+
+    def schedule_labels(self):
+        """Updates labels once pending scrolling and zooming are done"""
+        if not self._labels_timer.isActive():
+            self._labels_timer.start(0)
+
+    def update_labels(self):
+        if self.scene() is not None:
+            rect = self.mapToScene(self.viewport().rect()).boundingRect()
+            self.scene().show_labels(rect, self.zoom())
+
+    def node_at(self, position):
+        """Returns the key of the node at a viewport position, or None"""
+        if self.scene() is None:
+            return None
+        return self.scene().node_at(self.mapToScene(position), CLICK_PIXELS / self.zoom())
+
+    def setScene(self, scene):
+        QtWidgets.QGraphicsView.setScene(self, scene)
+        self.resetCachedContent()
+
+    def viewportEvent(self, event):
+        if event.type() == QtCore.QEvent.ToolTip:
+            key = self.node_at(event.pos())
+            if key is None:
+                QtWidgets.QToolTip.hideText()
+            else:
+                QtWidgets.QToolTip.showText(event.globalPos(), self.scene().topology.nodes[key].label, self)
+            return True
+        return QtWidgets.QGraphicsView.viewportEvent(self, event)
+
+    def wheelEvent(self, event):
+        factor = ZOOM_STEP ** (event.angleDelta().y() / 120.0)
+        fitted = min(self.viewport().width() / max(self.sceneRect().width(), 1),
+                     self.viewport().height() / max(self.sceneRect().height(), 1))
+        factor = max(min(factor, MAX_ZOOM / self.zoom()), fitted / 2 / self.zoom())
+        self.scale(factor, factor)
+        self.schedule_labels()
+
+    def scrollContentsBy(self, dx, dy):
+        QtWidgets.QGraphicsView.scrollContentsBy(self, dx, dy)
+        self.schedule_labels()
+
+    def resizeEvent(self, event):
+        QtWidgets.QGraphicsView.resizeEvent(self, event)
+        self.schedule_labels()
+
+    def mousePressEvent(self, event):
+        self._pressed = event.pos() if event.button() == QtCore.Qt.LeftButton else None
+        QtWidgets.QGraphicsView.mousePressEvent(self, event)
+
+    def mouseReleaseEvent(self, event):
+        QtWidgets.QGraphicsView.mouseReleaseEvent(self, event)
+        if self._pressed is not None and (event.pos() - self._pressed).manhattanLength() <= CLICK_PIXELS:
+            key = self.node_at(event.pos())
+            if key is not None:
+                self.nodeClicked.emit(key)
+        self._pressed = None
+
+    def contextMenuEvent(self, event):
+        key = self.node_at(event.pos())
+        if key is not None:
+            self.nodeMenu.emit(key, event.globalPos())
+
+
+class TopologyWindow(QtWidgets.QMainWindow):
+    """Window showing a Topology, aggregated as set by the aggregate_ options. Clicking a group shows its nodes, and
+    clicking a polled instance emits instanceActivated with the address it was polled at. Layouts are cached, so
+    showing or hiding a group again is only a matter of updating the scene, and given a LayoutStore, nodes keep their
+    places as the topology is built again."""
+    instanceActivated = QtCore.Signal(object)
+
+    def __init__(self, topology, options, store=None, parent=None):
+        """Constructor, taking the Topology from build_topology(), the [topology] options, and an optional
+        LayoutStore"""
+        QtWidgets.QMainWindow.__init__(self, parent)
+        self.setWindowTitle("Topology")
+        self.resize(1000, 700)
+        self.store = store
+        self.layouts = TopologyLayouts(topology, options, store)
+        self.expanded = set()  # Keys of groups showing their nodes
+        self.shown = None      # Topology currently shown, aggregated or not
+
+        self.view = TopologyView(self)
+        self.view.nodeClicked.connect(self.view_nodeClicked)
+        self.view.nodeMenu.connect(self.view_nodeMenu)
+        self.view.setScene(TopologyScene(options, self))
+        self.setCentralWidget(self.view)
+        toolbar = self.addToolBar("Topology")
+        toolbar.setMovable(False)
+        toolbar.addAction("Fit", self.view.fit)
+        toolbar.addAction("Export...", self.export)
+        toolbar.addAction("Load Distribution", self.show_load)
+        self.load_window = None
+        self.show_topology()
+        self.view.fit()
+
+    def show_topology(self):
+        """Updates the scene with the expanded groups showing their nodes, keeping the current zoom and center"""
+        self.shown, keys, edges, positions = self.layouts.get(self.expanded)
+        self.view.scene().set_topology(self.shown, keys, edges, positions)
+        self.view.schedule_labels()
+        self.statusBar().showMessage("%s nodes, %s adjacencies" % (len(keys), len(edges)))
+
+    def set_topology(self, topology):
+        """Shows a Topology built again, such as with more instances polled, keeping the zoom, the center, and the
+        expanded groups still found, and repainting only what changed"""
+        self.layouts = TopologyLayouts(topology, self.layouts.options, self.store)
+        if self.expanded:
+            self.expanded.intersection_update(self.layouts.get(self.expanded)[0].grouped.itervalues())
+        center = self.view.mapToScene(self.view.viewport().rect().center())
+        self.show_topology()
+        self.view.centerOn(center)
+        if self.load_window is not None and self.load_window.isVisible():
+            self.load_window.set_topology(topology)
+
+    def set_expanded(self, group, expanded):
+        """Shows or hides the nodes of a group"""
+        if expanded:
+            self.expanded.add(group)
+        else:
+            self.expanded.discard(group)
+        center = self.view.mapToScene(self.view.viewport().rect().center())
+        self.show_topology()
+        self.view.centerOn(center)
+
+    def view_nodeClicked(self, key):
+        node = self.shown.nodes[key]
+        if node.members:
+            self.set_expanded(key, True)
+        elif node.address:
+            self.instanceActivated.emit(node.address)
+        else:
+            self.statusBar().showMessage("%s was discovered as a peer, and wasn't polled" % node.name)
+
+    def view_nodeMenu(self, key, position):
+        node = self.shown.nodes[key]
+        menu = QtWidgets.QMenu(self)
+        if node.members:
+            menu.addAction("Show %s" % node.name, lambda: self.set_expanded(key, True))
+        if node.address:
+            menu.addAction("Open Polled Data", lambda: self.instanceActivated.emit(node.address))
+        if key in self.shown.grouped:
+            menu.addAction("Group Again", lambda: self.set_expanded(self.shown.grouped[key], False))
+        if menu.actions():
+            menu.exec_(position)
+
+    def export(self):
+        """Exports the topology as shown, with any expanded groups, to an image, GraphML or DOT file"""
+        filename, _ = QtWidgets.QFileDialog.getSaveFileName(
+            self, "Export Topology", "Topology.svg",
+            "SVG Image (*.svg);;PNG Image (*.png);;GraphML (*.graphml);;Graphviz DOT (*.dot *.gv);;All Files (*.*)")
+        if not filename:
+            return
+        QtWidgets.QApplication.setOverrideCursor(QtCore.Qt.WaitCursor)
+        try:
+            export_topology(filename, self.layouts, self.expanded)
+        except (IOError, ValueError) as e:
+            QtWidgets.QMessageBox.warning(self, "Topology", "Unable to export topology to '%s'\n\n%s" % (filename, e))
+            return
+        finally:
+            QtWidgets.QApplication.restoreOverrideCursor()
+        self.statusBar().showMessage("Topology exported to %s" % filename)
+
+    def show_load(self):
+        """Shows how the forwarders spread their load over the receivers they forward to"""
+        if self.load_window is None or not self.load_window.isVisible():
+            QtWidgets.QApplication.setOverrideCursor(QtCore.Qt.WaitCursor)
+            try:
+                self.load_window = ForwarderLoadWindow(self.layouts.topology, self.layouts.options, self)
+            finally:
+                QtWidgets.QApplication.restoreOverrideCursor()
+            self.load_window.setWindowIcon(self.windowIcon())
+        self.load_window.show()
+        self.load_window.raise_()
+        self.load_window.activateWindow()
+
+    def closeEvent(self, event):
+        if self.load_window is not None:
+            self.load_window.close()
+        QtWidgets.QMainWindow.closeEvent(self, event)
+
+
+class ForwarderLoadWindow(QtWidgets.QMainWindow):
+    """Window showing how a Topology's forwarders spread their load over the receivers they forward to: the fan-in of
+    each receiver, the imbalance of each outputs group, and a heat map of each receiver's load against the even share
+    of its outputs groups, shaded fully red at the load_imbalance option"""
+    def __init__(self, topology, options, parent=None):
+        """Constructor, taking the Topology from build_topology(), not aggregated, and the [topology] options"""
+        QtWidgets.QMainWindow.__init__(self, parent, QtCore.Qt.Window)
+        self.setWindowTitle("Load Distribution")
+        self.resize(900, 500)
+        self.options = options
+        self.load = None
+
+        self.modelReceivers = RowTableModel([
+            ('Receiver', 'name'),
+            ('Forwarders', 'forwarders', numeric_key),
+            ('Active', 'active', numeric_key),
+            ('Inactive', 'inactive', numeric_key),
+            ('Outputs Groups', 'groups', numeric_key),
+            ('Bytes Received', 'bytes', numeric_key, format_bytes),
+            ('Load', 'load', numeric_key, format_ratio)
+        ], key='name', parent=self)
+        self.modelGroups = RowTableModel([
+            ('Outputs Group', 'name'),
+            ('Forwarders', 'forwarders', numeric_key),
+            ('Receivers', 'receivers', numeric_key),
+            ('Inactive', 'inactive', numeric_key),
+            ('Bytes Received', 'bytes', numeric_key, format_bytes),
+            ('Imbalance', 'imbalance', numeric_key, format_ratio),
+            ('Busiest', 'busiest'),
+            ('Imbalanced', 'imbalanced', numeric_key, format_yesno)
+        ], key='name', parent=self)
+        self.modelHeatMap = HeatMapModel(format_ratio, self.heat_tooltip, self)
+
+        tabs = QtWidgets.QTabWidget(self)
+        for title, model, sort_column, width in (("Receivers", self.modelReceivers, 1, 110),
+                                                 ("Outputs Groups", self.modelGroups, 5, 110)):
+            table = QtWidgets.QTableView(tabs)
+            table.setModel(model)
+            table.setSortingEnabled(True)
+            table.sortByColumn(sort_column, QtCore.Qt.DescendingOrder)
+            table.verticalHeader().hide()
+            table.verticalHeader().setDefaultSectionSize(20)
+            table.horizontalHeader().setDefaultSectionSize(width)
+            table.setColumnWidth(0, 240)
+            tabs.addTab(table, title)
+        heat_map = QtWidgets.QTableView(tabs)
+        heat_map.setModel(self.modelHeatMap)
+        heat_map.verticalHeader().setDefaultSectionSize(20)
+        heat_map.horizontalHeader().setDefaultSectionSize(60)
+        tabs.addTab(heat_map, "Heat Map")
+        self.setCentralWidget(tabs)
+        self.set_topology(topology)
+
+    def set_topology(self, topology):
+        """Analyzes a Topology, built again or for the first time"""
+        from misnersplunktoolforwarding import ForwarderLoad  # Imports numpy, only once the window is opened
+        self.load = ForwarderLoad(topology, self.options['load_imbalance'])
+        self.modelReceivers.update(self.load.receivers)
+        self.modelGroups.update(self.load.groups)
+        self.modelHeatMap.load(self.load.group_names(), self.load.receiver_names(), self.load.share,
+                               0.0, 1.0, self.options['load_imbalance'])
+        self.statusBar().showMessage(
+            "%s forwarders in %s outputs groups to %s receivers, %s inactive forward servers, %s imbalanced groups" % (
+                sum(group.forwarders for group in self.load.groups), len(self.load.groups),
+                len(self.load.receivers), sum(receiver.inactive for receiver in self.load.receivers),
+                sum(1 for group in self.load.groups if group.imbalanced)))
+
+    def heat_tooltip(self, row, column):
+        """Returns the tooltip of a heat map cell, with the forwarders and bytes behind its load"""
+        group, receiver = self.load.groups[row], self.load.receivers[column]
+        text = "%s receives %s an even share of the load of\n%s\n\n%s forwarders, %s inactive" % (
+            receiver.name, format_ratio(self.load.share[row, column]), group.name, self.load.forwarders[row, column],
+            self.load.inactive[row, column])
+        if self.load.bytes[row, column]:
+            text += ", %s received" % format_bytes(self.load.bytes[row, column])
+        return text